@@ -0,0 +1,285 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Per-host circuit breakers shared by all the transports to the iLOs.
+
+A dead or hung iLO costs every caller the full connection timeout and
+retries. After ``failure_threshold`` consecutive connection failures to a
+host, its circuit opens and the requests to it fail immediately with
+IloCircuitOpenError, without going to the network. After ``cooldown``
+seconds the circuit is half-open: one request is let through as a probe,
+and its outcome closes the circuit again or keeps it open for another
+cooldown.
+
+The state of the circuits can be read with get_states(), and their
+transitions followed with register_listener()::
+
+    from proliantutils import circuit_breaker
+
+    circuit_breaker.configure(failure_threshold=3, cooldown=60)
+    circuit_breaker.register_listener(
+        lambda host, old, new: print(host, old, '->', new))
+
+A failure threshold of 0 disables the circuit breakers.
+"""
+
+import contextlib
+import threading
+import time
+
+import requests
+
+from proliantutils import exception
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half-open'
+
+# Consecutive connection failures after which the circuit of a host opens.
+DEFAULT_FAILURE_THRESHOLD = 5
+# Time in seconds after which an open circuit lets a probe through.
+DEFAULT_COOLDOWN = 30
+
+# Exceptions of the requests based transports which count as failures.
+HTTP_FAILURES = (requests.exceptions.ConnectionError,
+                 requests.exceptions.Timeout)
+
+_failure_threshold = DEFAULT_FAILURE_THRESHOLD
+_cooldown = DEFAULT_COOLDOWN
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+_listeners = []
+_listeners_lock = threading.Lock()
+
+
+def _host_key(host):
+    return host.strip('[]').lower()
+
+
+class CircuitBreaker(object):
+    """Circuit breaker of the connections to one host."""
+
+    def __init__(self, host, failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+                 cooldown=DEFAULT_COOLDOWN, clock=time.monotonic):
+        """Constructor for CircuitBreaker.
+
+        :param host: address of the iLO.
+        :param failure_threshold: consecutive connection failures after
+            which the circuit opens, 0 to never open it.
+        :param cooldown: time in seconds after which an open circuit lets
+            a probe through.
+        :param clock: callable returning the current time in seconds.
+        """
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        return self._state
+
+    def _transition(self, state):
+        # Note: called with the lock held; the listeners are notified by
+        # the caller once the lock is released.
+        old_state, self._state = self._state, state
+        if state == OPEN:
+            self._opened_at = self._clock()
+        return old_state, state, self._failures
+
+    def _notify(self, transition):
+        if transition is None or transition[0] == transition[1]:
+            return
+        old_state, state, failures = transition
+        if state == OPEN:
+            LOG.warning('Circuit of %(host)s opened after %(count)d '
+                        'consecutive connection failures',
+                        {'host': self.host, 'count': failures})
+        else:
+            LOG.info('Circuit of %(host)s %(old)s -> %(new)s',
+                     {'host': self.host, 'old': old_state, 'new': state})
+        for listener in _listeners:
+            try:
+                listener(self.host, old_state, state)
+            except Exception as e:
+                LOG.debug('Circuit breaker listener %(listener)r failed: '
+                          '%(error)s', {'listener': listener, 'error': e})
+
+    def before_call(self):
+        """Lets a call through, or fails it if the circuit is open.
+
+        Every call let through must be followed by a call to end_call().
+
+        :raises: IloCircuitOpenError, if the circuit is open, or half-open
+            with a probe already in flight.
+        """
+        transition = None
+        with self._lock:
+            if self._state == CLOSED or not self.failure_threshold:
+                return
+            retry_in = self._opened_at + self.cooldown - self._clock()
+            if self._state == OPEN and retry_in <= 0:
+                transition = self._transition(HALF_OPEN)
+            if self._state == HALF_OPEN and not self._probing:
+                self._probing = True
+            else:
+                raise exception.IloCircuitOpenError(
+                    host=self.host, failures=self._failures,
+                    retry_in=max(retry_in, 0))
+        self._notify(transition)
+
+    def end_call(self, failed):
+        """Records the outcome of a call let through by before_call().
+
+        :param failed: True if the call failed to connect to the host.
+        """
+        transition = None
+        with self._lock:
+            self._probing = False
+            if not failed:
+                self._failures = 0
+                if self._state != CLOSED:
+                    transition = self._transition(CLOSED)
+            else:
+                self._failures += 1
+                if (self.failure_threshold
+                        and (self._state == HALF_OPEN
+                             or self._failures >= self.failure_threshold)):
+                    transition = self._transition(OPEN)
+        self._notify(transition)
+
+    def get_state(self):
+        """Returns the state of the circuit for monitoring.
+
+        :returns: a dictionary with the 'state' of the circuit, the number
+            of consecutive 'failures' and, while not closed, the seconds
+            before the next probe as 'retry_in'.
+        """
+        with self._lock:
+            state = {'state': self._state, 'failures': self._failures,
+                     'retry_in': None}
+            if self._state != CLOSED:
+                state['retry_in'] = max(
+                    self._opened_at + self.cooldown - self._clock(), 0)
+            return state
+
+
+def configure(failure_threshold=DEFAULT_FAILURE_THRESHOLD,
+              cooldown=DEFAULT_COOLDOWN):
+    """Sets the parameters of the circuit breakers and resets them.
+
+    :param failure_threshold: consecutive connection failures after which
+        the circuit of a host opens, 0 to disable the circuit breakers.
+    :param cooldown: time in seconds after which an open circuit lets a
+        probe through.
+    """
+    global _failure_threshold, _cooldown
+    with _breakers_lock:
+        _failure_threshold = failure_threshold
+        _cooldown = cooldown
+        _breakers.clear()
+
+
+def reset(host=None):
+    """Closes the circuit of a host, or of all the hosts.
+
+    :param host: address of the iLO, None for all of them.
+    """
+    with _breakers_lock:
+        if host is None:
+            _breakers.clear()
+        else:
+            _breakers.pop(_host_key(host), None)
+
+
+def get_breaker(host):
+    """Returns the circuit breaker of a host.
+
+    :param host: address of the iLO.
+    :returns: a CircuitBreaker object.
+    """
+    key = _host_key(host)
+    with _breakers_lock:
+        breaker = _breakers.get(key)
+        if breaker is None:
+            breaker = _breakers[key] = CircuitBreaker(
+                key, failure_threshold=_failure_threshold,
+                cooldown=_cooldown)
+        return breaker
+
+
+def get_states():
+    """Returns the state of the circuit of every host.
+
+    :returns: a dictionary of host to the dictionary returned by
+        CircuitBreaker.get_state().
+    """
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.host: breaker.get_state() for breaker in breakers}
+
+
+def register_listener(listener):
+    """Registers a callable notified of the transitions of the circuits.
+
+    :param listener: callable taking the host, the old and the new state.
+    """
+    global _listeners
+    with _listeners_lock:
+        _listeners = _listeners + [listener]
+
+
+def unregister_listener(listener):
+    """Removes a previously registered listener.
+
+    :param listener: the callable given to register_listener().
+    """
+    global _listeners
+    with _listeners_lock:
+        _listeners = [lst for lst in _listeners if lst is not listener]
+
+
+@contextlib.contextmanager
+def guard(host, failures=HTTP_FAILURES):
+    """Context manager running a call to a host through its circuit.
+
+    Exceptions propagate unchanged. Those of the ``failures`` types count
+    as connection failures; any other outcome shows that the host is
+    reachable and closes the circuit.
+
+    :param host: address of the iLO.
+    :param failures: tuple of the exception types which are connection
+        failures.
+    :raises: IloCircuitOpenError, if the circuit of the host is open.
+    """
+    breaker = get_breaker(host)
+    breaker.before_call()
+    failed = False
+    try:
+        yield breaker
+    except failures:
+        failed = True
+        raise
+    finally:
+        breaker.end_call(failed)
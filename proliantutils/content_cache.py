@@ -0,0 +1,227 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Cache on local disk of the documents shared by identical servers.
+
+The default BIOS settings and the BIOS attribute registry of a server only
+depend on its model and System ROM version, so across a fleet they are the
+same for every server of a kind. Once the cache is enabled, they are
+fetched from the first iLO of each kind only and read from the disk for
+the others::
+
+    from proliantutils import content_cache
+
+    content_cache.configure('/var/cache/proliantutils',
+                            max_size=64 * 1024 * 1024)
+
+The capabilities of every server are cached as well, keyed by the UUID of
+the server and the fingerprint of its hardware, so that they are only
+computed again when the hardware, firmware or BIOS settings change.
+
+The directory may be shared by several processes. Entries are written
+atomically, so readers never see a partial one, and the least recently
+used are removed once the total size exceeds ``max_size``.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+
+from proliantutils import json_codec
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+# Kinds of documents cached.
+BIOS_DEFAULTS = 'bios-defaults'
+BIOS_REGISTRY = 'bios-registry'
+CAPABILITIES = 'capabilities'
+
+# Default maximum total size in bytes of the entries.
+DEFAULT_MAX_SIZE = 64 * 1024 * 1024
+
+_SUFFIX = '.json'
+
+_cache = None
+_lock = threading.Lock()
+
+
+class ContentCache(object):
+    """Documents on local disk, keyed by kind, model and ROM version."""
+
+    def __init__(self, directory, max_size=DEFAULT_MAX_SIZE):
+        """Constructor for ContentCache.
+
+        :param directory: directory of the entries, created if missing.
+        :param max_size: maximum total size in bytes of the entries.
+        """
+        self.directory = directory
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _get_path(self, key):
+        digest = hashlib.sha256(json.dumps(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, key[0] + '-' + digest + _SUFFIX)
+
+    def get(self, kind, model, version):
+        """Returns a document.
+
+        :param kind: kind of the document, e.g. BIOS_DEFAULTS.
+        :param model: server model.
+        :param version: System ROM version.
+        :returns: the document, None if not in the cache.
+        """
+        key = [kind, model, version]
+        path = self._get_path(key)
+        try:
+            with open(path, 'rb') as f:
+                entry = json_codec.loads(f.read())
+            # Note: the modification time orders the entries for eviction.
+            os.utime(path)
+        except FileNotFoundError:
+            entry = None
+        except (OSError, ValueError) as e:
+            LOG.warning('Ignoring the unreadable cache entry %(path)s: '
+                        '%(error)s', {'path': path, 'error': e})
+            entry = None
+        with self._lock:
+            if entry is None or entry.get('key') != key:
+                self._misses += 1
+                return None
+            self._hits += 1
+        return entry['document']
+
+    def put(self, kind, model, version, document):
+        """Stores a document.
+
+        :param kind: kind of the document, e.g. BIOS_DEFAULTS.
+        :param model: server model.
+        :param version: System ROM version.
+        :param document: the document, a JSON serializable object.
+        """
+        key = [kind, model, version]
+        data = json_codec.dumps({'key': key, 'document': document})
+        try:
+            fd, temp_path = tempfile.mkstemp(dir=self.directory,
+                                             prefix='.tmp-')
+            try:
+                with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                    f.write(data)
+                os.replace(temp_path, self._get_path(key))
+            except Exception:
+                os.unlink(temp_path)
+                raise
+        except OSError as e:
+            LOG.warning('Could not store the %(kind)s of %(model)s '
+                        '%(version)s in the cache: %(error)s',
+                        {'kind': kind, 'model': model, 'version': version,
+                         'error': e})
+            return
+        self._evict()
+
+    def _list_entries(self):
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(_SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _evict(self):
+        entries = self._list_entries()
+        total = sum(size for mtime, size, path in entries)
+        for mtime, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            LOG.debug('Evicted %s from the cache.', path)
+
+    def clear(self):
+        """Removes all the entries."""
+        for mtime, size, path in self._list_entries():
+            try:
+                os.unlink(path)
+            except FileNotFoundError:
+                pass
+
+    def get_stats(self):
+        """Returns the statistics of the cache.
+
+        :returns: a dictionary with the number of 'hits' and 'misses' of
+            this process, and the number of 'entries' and their total
+            'size' in bytes.
+        """
+        entries = self._list_entries()
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses,
+                    'entries': len(entries),
+                    'size': sum(size for mtime, size, path in entries)}
+
+
+def configure(directory=None, max_size=DEFAULT_MAX_SIZE):
+    """Enables or disables the cache.
+
+    :param directory: directory of the entries, None to disable the cache.
+    :param max_size: maximum total size in bytes of the entries.
+    """
+    global _cache
+    with _lock:
+        _cache = (ContentCache(directory, max_size)
+                  if directory is not None else None)
+
+
+def get_cache():
+    """Returns the cache.
+
+    :returns: a ContentCache object, None if the cache is disabled.
+    """
+    return _cache
+
+
+def fetch(kind, model, version, func):
+    """Returns a document from the cache, fetching and storing it if missing.
+
+    :param kind: kind of the document, e.g. BIOS_DEFAULTS.
+    :param model: server model.
+    :param version: System ROM version.
+    :param func: callable without arguments fetching the document.
+    :returns: the document.
+    """
+    cache = _cache
+    # Note: without the model and ROM version, the document could belong
+    # to any kind of server.
+    if cache is None or not model or not version:
+        return func()
+    document = cache.get(kind, model, version)
+    if document is None:
+        LOG.debug('The %(kind)s of %(model)s %(version)s are not cached.',
+                  {'kind': kind, 'model': model, 'version': version})
+        document = func()
+        cache.put(kind, model, version, document)
+    return document
@@ -115,6 +115,38 @@ class IloConnectionError(IloError):
     def __init__(self, message):
         super(IloConnectionError, self).__init__(message)
 
+
+class IloCircuitOpenError(IloConnectionError):
+    """Circuit of the iLO is open.
+
+    This exception is raised without contacting the iLO, when the last
+    connections to it failed.
+    """
+    message = ("Not connecting to %(host)s after %(failures)s consecutive "
+               "connection failures, retrying in %(retry_in).0f seconds")
+
+    def __init__(self, message=None, **kwargs):
+        if not message:
+            message = self.message % kwargs
+
+        super(IloCircuitOpenError, self).__init__(message)
+
+
+class IloDeadlineExceededError(IloConnectionError):
+    """Deadline of the call to the iLO exceeded.
+
+    This exception is raised instead of sending a request to the iLO once
+    the deadline set by the caller has passed.
+    """
+    message = ("Deadline of %(deadline)s seconds exceeded before contacting "
+               "%(host)s")
+
+    def __init__(self, message=None, **kwargs):
+        if not message:
+            message = self.message % kwargs
+
+        super(IloDeadlineExceededError, self).__init__(message)
+
 # This is not merged with generic InvalidInputError because
 # of backward-compatibility reasons. If we changed this,
 # use-cases of excepting 'IloError' to catch 'IloInvalidInputError'
@@ -244,3 +276,14 @@ class CertificateCreationError(ProliantUtilsException):
             message = self.message % kwargs
 
         super(CertificateCreationError, self).__init__(message)
+
+
+class FirmwareRolloutHalted(ProliantUtilsException):
+    message = ("Firmware rollout halted after %(failed)s failed nodes, over "
+               "the failure budget of %(budget)s")
+
+    def __init__(self, message=None, **kwargs):
+        if not message:
+            message = self.message % kwargs
+
+        super(FirmwareRolloutHalted, self).__init__(message)
@@ -15,17 +15,26 @@
 """IloClient module"""
 
 import collections
+import copy
+import functools
+import hashlib
+import threading
+import time
 
 import netaddr
 
 from proliantutils import exception
+from proliantutils.ilo import discovery_cache
 from proliantutils.ilo import ipmi
 from proliantutils.ilo import operations
 from proliantutils.ilo import ribcl
 from proliantutils.ilo import ris
+from proliantutils.ilo import routing
 from proliantutils.ilo.snmp import snmp_cpqdisk_sizes as snmp
 from proliantutils import log
 from proliantutils.redfish import redfish
+from proliantutils import single_flight
+from proliantutils import throttling
 
 
 SUPPORTED_RIS_METHODS = [
@@ -71,6 +80,7 @@ SUPPORTED_RIS_METHODS = [
     'get_iscsi_initiator_info',
     'set_iscsi_initiator_info',
     'set_vm_status',
+    'start_firmware_update',
     'update_firmware',
     'update_persistent_boot',
 ]
@@ -103,6 +113,8 @@ SUPPORTED_REDFISH_METHODS = [
     'insert_virtual_media',
     'set_vm_status',
     'update_firmware',
+    'start_firmware_update',
+    'watch_events',
     'get_persistent_boot_device',
     'set_one_time_boot',
     'update_persistent_boot',
@@ -138,9 +150,72 @@ SUPPORTED_REDFISH_METHODS = [
     'add_ssl_certificate'
 ]
 
+# Methods without side effects: identical concurrent calls to these share
+# one call to the iLO and its result.
+COALESCED_METHODS = [
+    'get_all_licenses',
+    'get_available_disk_types',
+    'get_bios_settings_result',
+    'get_current_bios_settings',
+    'get_current_boot_mode',
+    'get_default_bios_settings',
+    'get_essential_properties',
+    'get_host_health_data',
+    'get_host_post_state',
+    'get_host_power_readings',
+    'get_host_power_status',
+    'get_host_uuid',
+    'get_http_boot_url',
+    'get_ilo_firmware_version_as_major_minor',
+    'get_iscsi_initiator_info',
+    'get_one_time_boot',
+    'get_pending_bios_settings',
+    'get_pending_boot_mode',
+    'get_persistent_boot_device',
+    'get_product_name',
+    'get_secure_boot_mode',
+    'get_server_capabilities',
+    'get_supported_boot_mode',
+    'get_vm_status',
+    'has_disk_erase_completed',
+    'read_raid_configuration',
+]
+
 LOG = log.get_logger(__name__)
 
 
+@functools.lru_cache(maxsize=None)
+def _get_dispatch_table(generation, use_redfish_only, is_ribcl_enabled,
+                        adaptive):
+    """Returns the protocols able to run each method.
+
+    :param generation: 'Gen10', 'Gen9' or None, as found in the model.
+    :param use_redfish_only: True if only Redfish may be used.
+    :param is_ribcl_enabled: whether RIBCL is enabled on a Gen10 iLO.
+    :param adaptive: True to also list RIBCL for the read methods of
+        routing.ADAPTIVE_METHODS when RIBCL and Redfish can both run them.
+    :returns: a tuple of a dictionary of method name to the tuple of the
+        names of the operation objects able to run it, the preferred one
+        first, and of that tuple for the methods missing in the dictionary.
+        An empty tuple means that the method is not implemented.
+    """
+    redfish_methods = frozenset(SUPPORTED_REDFISH_METHODS)
+    if use_redfish_only:
+        return dict.fromkeys(redfish_methods, ('redfish',)), ()
+    if generation == 'Gen10':
+        routes = dict.fromkeys(redfish_methods, ('redfish',))
+        if adaptive and is_ribcl_enabled:
+            routes.update(dict.fromkeys(
+                redfish_methods & routing.ADAPTIVE_METHODS,
+                ('redfish', 'ribcl')))
+        if is_ribcl_enabled is not None and not is_ribcl_enabled:
+            return routes, ()
+        return routes, ('ribcl',)
+    if generation == 'Gen9':
+        return dict.fromkeys(SUPPORTED_RIS_METHODS, ('ris',)), ('ribcl',)
+    return {}, ('ribcl',)
+
+
 def cache_node(cache=True):
 
     def wrapper(cls):
@@ -149,52 +224,139 @@ def cache_node(cache=True):
             return cls
         else:
             class IloClientWrapper(object):
+                """Thread safe LRU cache of client objects.
+
+                Objects are keyed by address, user name and a digest of the
+                password, so no password is kept around in the keys. An
+                object evicted from the cache (size limit or idle timeout)
+                gets its transports closed; it stays usable by whoever
+                still holds it, at the cost of reconnecting, or of taking
+                a session from the pool again with ``share_session``.
+                """
 
                 MAX_CACHE_SIZE = 1024
+                # Time in seconds after which an unused object is evicted.
+                IDLE_TIMEOUT = 60 * 60
 
                 def __init__(self, cls):
                     self.cls = cls
                     self._instances = collections.OrderedDict()
+                    self._last_used = {}
+                    self._lock = threading.Lock()
+                    self._creation_locks = {}
+                    self._hits = 0
+                    self._misses = 0
+                    self._evictions = 0
+
+                @staticmethod
+                def _get_key(address, admin, admin_pass):
+                    digest = hashlib.sha256(
+                        (admin_pass or '').encode('utf-8')).hexdigest()
+                    return (address, admin, digest)
 
                 def _if_not_exists(self, ilo_info):
                     return (ilo_info not in self._instances)
 
+                def _lookup(self, key):
+                    # Note: To be called with self._lock held.
+                    if self._if_not_exists(key):
+                        return None
+                    self._instances.move_to_end(key)
+                    self._last_used[key] = time.time()
+                    self._hits += 1
+                    return self._instances[key]
+
                 def _create_instance(self, *args, **kwargs):
-                    address = args[0]
-                    admin = args[1]
-                    admin_pass = args[2]
-                    self._instances[(address, admin, admin_pass)] = (
-                        self.cls(*args, **kwargs))
-                    # Check for max_cache_size
-                    if len(self._instances) > self.MAX_CACHE_SIZE:
-                        LOG.debug("Node cache hit the maximum size of %d." % (
-                            self.MAX_CACHE_SIZE))
-                        self._pop_oldest_node()
+                    key = self._get_key(*args[:3])
+                    instance = self.cls(*args, **kwargs)
+                    evicted = []
+                    with self._lock:
+                        self._instances[key] = instance
+                        self._last_used[key] = time.time()
+                        self._misses += 1
+                        # Check for max_cache_size
+                        if len(self._instances) > self.MAX_CACHE_SIZE:
+                            LOG.debug("Node cache hit the maximum size of "
+                                      "%d." % (self.MAX_CACHE_SIZE))
+                            evicted.append(self._pop_oldest_node())
+                    self._close_nodes(evicted)
+                    return instance
 
                 def __call__(self, *args, **kwargs):
                     if not args:
                         LOG.error("Error creating iLO object.")
                     address = args[0]
-                    admin = args[1]
-                    admin_pass = args[2]
-
-                    if self._if_not_exists((address, admin, admin_pass)):
-                        LOG.debug("Creating iLO object for node %(address)s.",
-                                  {'address': address})
-                        self._create_instance(*args, **kwargs)
-                    else:
+                    key = self._get_key(*args[:3])
+
+                    with self._lock:
+                        idle_nodes = self._sweep_idle_nodes()
+                        instance = self._lookup(key)
+                        if instance is None:
+                            creation_lock = self._creation_locks.setdefault(
+                                key, threading.Lock())
+                    self._close_nodes(idle_nodes)
+                    if instance is not None:
                         LOG.debug("Using existing object for node "
                                   "%(address)s.", {'address': address})
-                    return self._instances[(address, admin, admin_pass)]
+                        return instance
+
+                    # Note: Objects for one node are created one at a time,
+                    # so that racing callers share the first one instead of
+                    # logging in several times. Other nodes are not held up.
+                    with creation_lock:
+                        with self._lock:
+                            instance = self._lookup(key)
+                        if instance is None:
+                            LOG.debug("Creating iLO object for node "
+                                      "%(address)s.", {'address': address})
+                            try:
+                                instance = self._create_instance(*args,
+                                                                 **kwargs)
+                            finally:
+                                with self._lock:
+                                    self._creation_locks.pop(key, None)
+                    return instance
 
                 def _pop_oldest_node(self):
-                    node_keys = list(self._instances)
-                    node_key = next(iter(node_keys))
+                    # Note: To be called with self._lock held.
+                    node_key, rnode = self._instances.popitem(last=False)
+                    self._last_used.pop(node_key, None)
+                    self._evictions += 1
                     LOG.debug("Removed oldest node {} from "
-                              "cache".format(node_key))
-                    rnode = self._instances.pop(node_key, None)
-                    if rnode:
-                        del rnode
+                              "cache".format(node_key[0]))
+                    return rnode
+
+                def _sweep_idle_nodes(self):
+                    # Note: To be called with self._lock held. The least
+                    # recently used objects come first, so the sweep stops
+                    # at the first object that is still in use.
+                    idle_nodes = []
+                    expiry = time.time() - self.IDLE_TIMEOUT
+                    while self._instances:
+                        oldest_key = next(iter(self._instances))
+                        if self._last_used[oldest_key] > expiry:
+                            break
+                        idle_nodes.append(self._pop_oldest_node())
+                    return idle_nodes
+
+                def _close_nodes(self, nodes):
+                    for node in nodes:
+                        close = getattr(node, 'close', None)
+                        if close is None:
+                            continue
+                        try:
+                            close()
+                        except Exception as e:
+                            LOG.debug("Error while closing evicted node: "
+                                      "%s", e)
+
+                def stats(self):
+                    """Returns the size, hit, miss and eviction counters."""
+                    with self._lock:
+                        return {'size': len(self._instances),
+                                'hits': self._hits,
+                                'misses': self._misses,
+                                'evictions': self._evictions}
 
             return IloClientWrapper(cls)
     return wrapper
@@ -203,9 +365,29 @@ def cache_node(cache=True):
 @cache_node()
 class IloClient(operations.IloOperations):
 
+    # Attributes which get populated by protocol discovery. With lazy
+    # initialization, accessing any of them triggers the discovery.
+    _DISCOVERED_ATTRIBUTES = ('model', 'redfish', 'ris', 'is_ribcl_enabled')
+
     def __init__(self, host, login, password, timeout=60, port=443,
                  bios_password=None, cacert=None, snmp_credentials=None,
-                 use_redfish_only=False):
+                 use_redfish_only=False, share_session=False,
+                 discovery_cache=None, lazy_init=False,
+                 adaptive_routing=False):
+        """Constructor for IloClient.
+
+        :param discovery_cache: a
+            :class:`proliantutils.ilo.discovery_cache.DiscoveryCache`
+            object. When given, the model and protocol of the iLO are
+            taken from it and the RIBCL probe is skipped for iLOs known
+            to be managed over Redfish. Defaults to None (no caching).
+        :param lazy_init: if True, the iLO is not contacted until the
+            first operation (or access to the model) needs it. Defaults
+            to False.
+        :param adaptive_routing: if True, the read methods which RIBCL and
+            Redfish both implement alike go to whichever has been the
+            fastest for them on this iLO. Defaults to False (Redfish).
+        """
 
         # IPv6 Check
         # TODO(paresh) Need to test with Global IPv6 address
@@ -220,14 +402,100 @@ class IloClient(operations.IloOperations):
                                            port, cacert=cacert)
         self.host = host
         self.use_redfish_only = use_redfish_only
+        self.share_session = share_session
+        self.discovery_cache = discovery_cache
+        self._discovery_args = (login, password, bios_password, cacert)
+        self._single_flight = single_flight.SingleFlight(
+            copy_result=copy.deepcopy)
+        self.latency_router = (routing.LatencyRouter() if adaptive_routing
+                               else None)
+        self._dispatch = (None, None)
+        # Note: reentrant, the discovery reads the attributes it sets.
+        self._discovery_lock = threading.RLock()
+        self._discovering = False
+        self._discovered = False
+
+        if not lazy_init:
+            self._discover()
+
+        self.snmp_credentials = snmp_credentials
+        self._validate_snmp()
+
+    def __getattr__(self, name):
+        # Note: Only invoked when the attribute is not found the usual way,
+        # i.e. for the discovered attributes before the discovery happened.
+        if (name in self._DISCOVERED_ATTRIBUTES
+                and not self.__dict__.get('_discovered', True)):
+            self._discover()
+            if name in self.__dict__:
+                return self.__dict__[name]
+        raise AttributeError(name)
+
+    def __del__(self):
+        try:
+            if self.__dict__.get('redfish'):
+                del self.redfish
+        except AttributeError:
+            pass
+
+    def close(self):
+        """Closes the connections held towards the iLO."""
+        redfish_object = self.__dict__.get('redfish')
+        if redfish_object is not None:
+            redfish_object.close()
+
+    def _discover(self):
+        """Finds out the model and the protocol(s) to talk to the iLO.
 
-        if use_redfish_only:
+        The discovery happens once, the first thread doing it blocks the
+        others. If it fails, the next access to a discovered attribute
+        tries again.
+        """
+        with self._discovery_lock:
+            if self._discovered or self._discovering:
+                return
+            self._discovering = True
+            try:
+                self._do_discover()
+            except Exception:
+                self._reset_discovery()
+                raise
+            else:
+                self._discovered = True
+            finally:
+                self._discovering = False
+
+    def _reset_discovery(self):
+        """Drops the attributes set by a failed discovery."""
+        redfish_object = self.__dict__.get('redfish')
+        for name in self._DISCOVERED_ATTRIBUTES:
+            self.__dict__.pop(name, None)
+        if redfish_object is not None:
+            try:
+                redfish_object.close()
+            except Exception as e:
+                LOG.debug("Error while closing the Redfish object of a "
+                          "failed discovery: %s", e)
+
+    def _do_discover(self):
+        login, password, bios_password, cacert = self._discovery_args
+        host = self.host
+        cached = None
+        if self.discovery_cache is not None and not self.use_redfish_only:
+            cached = self.discovery_cache.get(host)
+
+        if self.use_redfish_only:
             self._init_redfish_object(None, host, login, password,
                                       bios_password=bios_password,
                                       cacert=cacert)
             LOG.debug(self._("Forced to use 'redfish' way to interact "
                              "with iLO. Model: %(model)s"),
                       {'model': self.model})
+        elif cached:
+            LOG.debug(self._("Using cached discovery data: %(data)s"),
+                      {'data': cached})
+            self._init_from_discovery_data(cached, host, login, password,
+                                           bios_password, cacert)
         else:
             try:
                 self.model = self.ribcl.get_product_name()
@@ -241,6 +509,7 @@ class IloClient(operations.IloOperations):
                 self._init_redfish_object(False, host, login, password,
                                           bios_password=bios_password,
                                           cacert=cacert)
+                protocol = discovery_cache.PROTOCOL_REDFISH
             else:
                 self.ribcl.init_model_based_tags(self.model)
                 if ('Gen10' in self.model):
@@ -248,30 +517,48 @@ class IloClient(operations.IloOperations):
                                               bios_password=bios_password,
                                               cacert=cacert,
                                               should_set_model=False)
+                    protocol = discovery_cache.PROTOCOL_REDFISH
                 else:
                     # Gen9
                     self.ris = ris.RISOperations(
                         host, login, password, bios_password=bios_password,
                         cacert=cacert)
+                    protocol = discovery_cache.PROTOCOL_RIS
 
-        self.snmp_credentials = snmp_credentials
-        self._validate_snmp()
+            if self.discovery_cache is not None:
+                self.discovery_cache.set(
+                    host, self.model, protocol,
+                    is_ribcl_enabled=self.__dict__.get('is_ribcl_enabled'))
+
+        throttling.set_model(host, self.model)
         LOG.debug(self._("IloClient object created. "
                          "Model: %(model)s"), {'model': self.model})
 
-    def __del__(self):
-        try:
-            if self.redfish:
-                del self.redfish
-        except AttributeError:
-            pass
+    def _init_from_discovery_data(self, data, host, login, password,
+                                  bios_password, cacert):
+        """Sets up the operation objects from cached discovery data."""
+        self.model = data['model']
+        protocol = data['protocol']
+        is_ribcl_enabled = data.get('is_ribcl_enabled')
+        if protocol == discovery_cache.PROTOCOL_REDFISH:
+            if is_ribcl_enabled:
+                self.ribcl.init_model_based_tags(self.model)
+            self._init_redfish_object(is_ribcl_enabled, host, login,
+                                      password, bios_password=bios_password,
+                                      cacert=cacert, should_set_model=False)
+        else:
+            self.ribcl.init_model_based_tags(self.model)
+            self.ris = ris.RISOperations(
+                host, login, password, bios_password=bios_password,
+                cacert=cacert)
 
     def _init_redfish_object(self, is_ribcl_enabled, redfish_controller_ip,
                              username, password, bios_password=None,
                              cacert=None, should_set_model=True):
         self.redfish = redfish.RedfishOperations(
             redfish_controller_ip, username, password,
-            bios_password=bios_password, cacert=cacert)
+            bios_password=bios_password, cacert=cacert,
+            share_session=self.share_session)
         self.is_ribcl_enabled = is_ribcl_enabled
         if should_set_model:
             self.model = self.redfish.get_product_name()
@@ -328,37 +615,83 @@ class IloClient(operations.IloOperations):
             LOG.debug(self._('SNMP credentials not provided. SNMP '
                              'inspection will not be performed.'))
 
+    def _get_routes(self, method_name):
+        """Returns the names of the operation objects able to run a method.
+
+        The dispatch table is computed once per model and protocol setup.
+        """
+        if self.use_redfish_only:
+            key = (None, True, None)
+        else:
+            key = (self.model, False, self.__dict__.get('is_ribcl_enabled'))
+        dispatch_key, table = self._dispatch
+        if dispatch_key != key:
+            generation = None
+            if not self.use_redfish_only:
+                if 'Gen10' in self.model:
+                    generation = 'Gen10'
+                elif 'Gen9' in self.model:
+                    generation = 'Gen9'
+            table = _get_dispatch_table(generation, key[1], key[2],
+                                        self.latency_router is not None)
+            self._dispatch = (key, table)
+        routes, default = table
+        return routes.get(method_name, default)
+
     def _call_method(self, method_name, *args, **kwargs):
         """Call the corresponding method using RIBCL, RIS or REDFISH
 
         Make the decision to invoke the corresponding method using RIBCL,
         RIS or REDFISH way. In case of none, throw out ``NotImplementedError``
+        Concurrent calls to the same method of ``COALESCED_METHODS`` with the
+        same arguments share one call to the iLO.
         """
-        if self.use_redfish_only:
-            if method_name in SUPPORTED_REDFISH_METHODS:
-                the_operation_object = self.redfish
-            else:
-                raise NotImplementedError()
-        else:
-            the_operation_object = self.ribcl
-            if 'Gen10' in self.model:
-                if method_name in SUPPORTED_REDFISH_METHODS:
-                    the_operation_object = self.redfish
-                else:
-                    if (self.is_ribcl_enabled is not None
-                            and not self.is_ribcl_enabled):
-                        raise NotImplementedError()
-            elif ('Gen9' in self.model) and (method_name in
-                                             SUPPORTED_RIS_METHODS):
-                the_operation_object = self.ris
-
+        routes = self._get_routes(method_name)
+        if not routes:
+            raise NotImplementedError()
+
+        if method_name in COALESCED_METHODS:
+            return self._single_flight.do(
+                single_flight.make_key(method_name, *args, **kwargs),
+                self._call_routed_method, routes, method_name, *args,
+                **kwargs)
+        return self._call_routed_method(routes, method_name, *args,
+                                        **kwargs)
+
+    def _call_routed_method(self, routes, method_name, *args, **kwargs):
+        protocol = routes[0]
+        if len(routes) > 1:
+            protocol = self.latency_router.choose(method_name, routes)
+        the_operation_object = getattr(self, protocol)
         method = getattr(the_operation_object, method_name)
 
         LOG.debug(self._("Using %(class)s for method %(method)s."),
                   {'class': type(the_operation_object).__name__,
                    'method': method_name})
 
-        return method(*args, **kwargs)
+        if len(routes) == 1:
+            return method(*args, **kwargs)
+
+        start = time.monotonic()
+        try:
+            result = method(*args, **kwargs)
+        except exception.IloConnectionError:
+            raise
+        except exception.IloError as e:
+            if protocol == routes[0]:
+                raise
+            # Note: The method is not usable through this protocol on this
+            # iLO; use the preferred protocol from now on.
+            LOG.debug(self._("%(method)s failed through %(protocol)s: "
+                             "%(error)s"),
+                      {'method': method_name, 'protocol': protocol,
+                       'error': e})
+            self.latency_router.disable(method_name, protocol)
+            return self._call_routed_method(routes[:1], method_name, *args,
+                                            **kwargs)
+        self.latency_router.record(method_name, protocol,
+                                   time.monotonic() - start)
+        return result
 
     def get_all_licenses(self):
         """Retrieve license type, key, installation date, etc."""
@@ -763,8 +1096,34 @@ class IloClient(operations.IloOperations):
         :raises: IloCommandNotSupportedError, if the command is
                  not supported on the server
         """
-        return self._call_method(
+        result = self._call_method(
             'update_firmware', firmware_url, component_type)
+        # A new iLO firmware may enable or disable protocols.
+        if (self.discovery_cache is not None
+                and component_type.lower() == 'ilo'):
+            self.discovery_cache.invalidate(self.host)
+        return result
+
+    def start_firmware_update(self, firmware_url, component_type):
+        """Starts updating the given firmware without waiting for the end.
+
+        :param firmware_url: location of the firmware
+        :param component_type: Type of component to be applied to.
+        :returns: a common.FirmwareUpdateJob object, to follow the progress
+                  and wait for the end of the update.
+        :raises: InvalidInputError, if the validation of the input fails
+        :raises: IloError, on an error from iLO
+        :raises: IloCommandNotSupportedError, if the command is
+                 not supported on the server
+        """
+        job = self._call_method(
+            'start_firmware_update', firmware_url, component_type)
+        # A new iLO firmware may enable or disable protocols.
+        if (self.discovery_cache is not None
+                and component_type.lower() == 'ilo'):
+            job.add_done_callback(
+                lambda job: self.discovery_cache.invalidate(self.host))
+        return job
 
     def inject_nmi(self):
         """Inject NMI, Non Maskable Interrupt.
@@ -778,6 +1137,20 @@ class IloClient(operations.IloOperations):
         """
         return self._call_method('inject_nmi')
 
+    def watch_events(self, listener):
+        """Tracks the state of the server from the events of the iLO.
+
+        The power and POST states, the progress of firmware updates and
+        the results of BIOS settings are then kept by the listener, which
+        offers futures to wait for them instead of polling.
+        :param listener: a proliantutils.redfish.events.EventListener
+                         object, keeping the state of the server.
+        :raises: IloError, on an error from iLO
+        :raises: IloCommandNotSupportedError, if the command is
+                 not supported on the server
+        """
+        return self._call_method('watch_events', listener)
+
     def get_host_post_state(self):
         """Request the current state of system POST.
 
@@ -833,6 +1206,8 @@ class IloClient(operations.IloOperations):
                 on the 'only_allowed_settings', either only the allowed
                 settings are set or all the supported settings that are in the
                 'data' are set.
+        :returns: a dictionary of the BIOS settings which were changed,
+                 empty if all of them already had the requested values.
         :raises: IloError, on an error from iLO.
         :raises: IloCommandNotSupportedError, if the command is not supported
                  on the server.
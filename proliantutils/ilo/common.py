@@ -15,9 +15,12 @@
 """Common functionalities used by both RIBCL and RIS."""
 
 import collections
+from concurrent import futures
 import os
+import random
 import re
 import stat
+import threading
 import time
 
 from proliantutils import exception
@@ -33,21 +36,238 @@ ILO_VER_STR_PATTERN = r"\d+\.\d+"
 SupportedBootModes = collections.namedtuple(
     'SupportedBootModes', ['boot_mode_bios', 'boot_mode_uefi'])
 
+# Polling of long running operations: delay in seconds after the first
+# poll, factor by which it grows after each poll, maximum delay, and the
+# fraction by which delays get randomly shortened.
+POLL_INTERVAL = 1
+POLL_BACKOFF = 2
+POLL_MAX_INTERVAL = 30
+POLL_JITTER = 0.2
+
+# Time in seconds given to the iLO to come back after a reset, and to a
+# firmware update to complete.
+ILO_RESET_TIMEOUT = 60
+FIRMWARE_UPDATE_TIMEOUT = 310
+
+# Maximum number of operations polled at once by wait_until_complete_async.
+POLLER_WORKERS = 64
+
+_poller_executor = None
+_poller_executor_lock = threading.Lock()
+
+
+def _poll_delays(initial_delay, interval, max_interval, backoff, jitter):
+    """Generates the delays between the polls of an operation."""
+    yield initial_delay
+    while True:
+        # Note: randomly shorten every delay so that the many nodes of a
+        # fleet, started together, do not keep polling in lockstep.
+        yield interval * random.uniform(1 - jitter, 1)
+        interval = min(interval * backoff, max_interval)
+
+
+def wait_until_complete(
+        has_operation_completed, timeout, initial_delay=0,
+        interval=POLL_INTERVAL, max_interval=POLL_MAX_INTERVAL,
+        backoff=POLL_BACKOFF, jitter=POLL_JITTER,
+        failover_exc=exception.IloError,
+        failover_msg=("Operation did not complete even after multiple "
+                      "attempts."), is_silent_loop_exit=False):
+    """Polls until the operation completes or the timeout expires.
+
+    The operation is first polled after ``initial_delay``, then at
+    growing intervals: starting at ``interval``, multiplied by ``backoff``
+    after every poll, up to ``max_interval``, and randomly shortened by up
+    to ``jitter`` of their length. An IloError raised while polling counts
+    as not completed, any other exception is raised at once.
+    :param has_operation_completed: the method to poll and it needs to
+                                    return a boolean to indicate success or
+                                    failure.
+    :param timeout: time in seconds after which polling stops.
+    :param initial_delay: delay in seconds before the first poll, default 0.
+    :param interval: delay in seconds after the first unsuccessful poll.
+    :param max_interval: maximum delay in seconds between two polls.
+    :param backoff: factor by which the delay grows after each poll.
+    :param jitter: fraction, from 0 to 1, of the random shortening of each
+                   delay.
+    :param failover_exc: the exception which gets raised in case of failure
+                         upon timeout, default IloError.
+    :param failover_msg: the msg with which the exception gets raised in case
+                         of failure upon timeout.
+    :param is_silent_loop_exit: decides if exception has to be raised (in case
+                                of failure upon timeout) or not, default
+                                False (will be raised).
+    :returns: True if the operation completed, False on a silent exit.
+    :raises: failover_exc, if the operation did not complete in time,
+             default IloError.
+    """
+    start = time.monotonic()
+    # Note: time spent sleeping counts even if the clock says otherwise,
+    # which keeps the loop bounded when time.sleep() is faked.
+    elapsed = 0
+    for delay in _poll_delays(initial_delay, interval, max_interval, backoff,
+                              jitter):
+        delay = min(delay, timeout - elapsed)
+        if delay < 0:
+            break
+        time.sleep(delay)
+        elapsed = max(elapsed + delay, time.monotonic() - start)
+        try:
+            LOG.debug("Calling '%s', %.1f seconds left",
+                      has_operation_completed.__name__,
+                      max(timeout - elapsed, 0))
+            if has_operation_completed():
+                return True
+        except exception.IloError:
+            pass
+        elapsed = max(elapsed, time.monotonic() - start)
+        if elapsed >= timeout:
+            break
+
+    LOG.debug("Timed out after %.1f seconds polling: '%s'",
+              elapsed, has_operation_completed.__name__)
+    if not is_silent_loop_exit:
+        raise failover_exc(failover_msg)
+    return False
+
+
+def _get_poller_executor():
+    global _poller_executor
+    with _poller_executor_lock:
+        if _poller_executor is None:
+            _poller_executor = futures.ThreadPoolExecutor(
+                max_workers=POLLER_WORKERS,
+                thread_name_prefix='proliantutils-poller')
+        return _poller_executor
+
+
+def wait_until_complete_async(has_operation_completed, timeout, **kwargs):
+    """Polls in the background until the operation completes.
+
+    See wait_until_complete() for the parameters.
+    :returns: a concurrent.futures.Future, whose result is the one of
+              wait_until_complete().
+    """
+    return _get_poller_executor().submit(
+        wait_until_complete, has_operation_completed, timeout, **kwargs)
+
+
+class FirmwareUpdateJob(object):
+    """Handle on a firmware update running in the background.
+
+    Returned by the ``start_firmware_update`` methods once the update has
+    been requested. The progress of the update is polled, and the iLO
+    waited for after its reset, by a background thread of its own, as a
+    firmware update takes minutes and must not wait for the others to end.
+    The caller follows the jobs through their futures and callbacks.
+    :param file_url: location of the firmware file being flashed.
+    :param state: state of the update when it was requested.
+    :param percent: percent of the update when it was requested.
+    """
+
+    def __init__(self, file_url, state=None, percent=None):
+        self.file_url = file_url
+        self.state = state
+        self.percent = percent
+        self._lock = threading.Lock()
+        self._progress_callbacks = []
+        self._future = None
+
+    def start(self, supervise):
+        """Supervises the update in the background.
+
+        :param supervise: the method waiting for the update to complete,
+                          called with a progress callback taking the state
+                          and the percent of the update. It raises on a
+                          failed update.
+        :returns: the job itself.
+        """
+        self._future = futures.Future()
+        self._future.set_running_or_notify_cancel()
+        threading.Thread(target=self._supervise, args=(supervise,),
+                         name='proliantutils-firmware-update',
+                         daemon=True).start()
+        return self
+
+    def _supervise(self, supervise):
+        try:
+            result = supervise(self._report_progress)
+        except BaseException as e:
+            self._future.set_exception(e)
+        else:
+            self._future.set_result(result)
+
+    def _report_progress(self, state, percent):
+        with self._lock:
+            if (state, percent) == (self.state, self.percent):
+                return
+            self.state, self.percent = state, percent
+            callbacks = list(self._progress_callbacks)
+        for callback in callbacks:
+            try:
+                callback(self, state, percent)
+            except Exception:
+                LOG.exception('Progress callback %r of the firmware update '
+                              'with file %s failed', callback, self.file_url)
+
+    def add_progress_callback(self, callback):
+        """Calls the callback whenever the progress of the update changes.
+
+        :param callback: callable taking the job, the state and the percent
+                         of the update. It is called from a poller thread.
+        """
+        with self._lock:
+            self._progress_callbacks.append(callback)
+
+    def add_done_callback(self, callback):
+        """Calls the callback once the update is over, with the job.
+
+        The callback is called at once if the update is already over.
+        :param callback: callable taking the job.
+        """
+        self._future.add_done_callback(lambda future: callback(self))
+
+    def done(self):
+        """Returns True if the update is over, successful or not."""
+        return self._future.done()
+
+    def result(self, timeout=None):
+        """Waits for the update to be over.
+
+        :param timeout: time in seconds to wait, forever by default.
+        :raises: IloError, if the update failed.
+        :raises: IloConnectionError, if the iLO did not come back after
+                 the update.
+        :raises: concurrent.futures.TimeoutError, if the update is not over
+                 after timeout seconds.
+        """
+        return self._future.result(timeout)
+
+    def exception(self, timeout=None):
+        """Waits for the update to be over and returns its error, if any.
+
+        :param timeout: time in seconds to wait, forever by default.
+        :returns: the exception the update failed with, or None.
+        """
+        return self._future.exception(timeout)
+
 
 def wait_for_operation_to_complete(
         has_operation_completed, retries=10, delay_bw_retries=5,
         delay_before_attempts=10, failover_exc=exception.IloError,
         failover_msg=("Operation did not complete even after multiple "
                       "attempts."), is_silent_loop_exit=False):
-    """Attempts the provided operation for a specified number of times.
+    """Attempts the provided operation for a specified amount of time.
 
-    If it runs out of attempts, then it raises an exception. On success,
-    it breaks out of the loop.
+    Kept for compatibility, see wait_until_complete(). The operation is
+    polled for as long as ``retries`` polls ``delay_bw_retries`` apart
+    used to take, with intervals growing up to ``delay_bw_retries``.
     :param has_operation_completed: the method to retry and it needs to return
                                     a boolean to indicate success or failure.
-    :param retries: number of times the operation to be (re)tried, default 10
-    :param delay_bw_retries: delay in seconds before attempting after
-                             each failure, default 5.
+    :param retries: number of times the operation used to be (re)tried,
+                    default 10
+    :param delay_bw_retries: maximum delay in seconds between two attempts,
+                             default 5.
     :param delay_before_attempts: delay in seconds before beginning any
                                   operation attempt, default 10.
     :param failover_exc: the exception which gets raised in case of failure
@@ -60,25 +280,14 @@ def wait_for_operation_to_complete(
     :raises: failover_exc, if failure happens even after all the attempts,
              default IloError.
     """
-    retry_count = retries
-    # Delay for ``delay_before_attempts`` secs, before beginning any attempt
-    time.sleep(delay_before_attempts)
-
-    while retry_count:
-        try:
-            LOG.debug("Calling '%s', retries left: %d",
-                      has_operation_completed.__name__, retry_count)
-            if has_operation_completed():
-                break
-        except exception.IloError:
-            pass
-        time.sleep(delay_bw_retries)
-        retry_count -= 1
-    else:
-        LOG.debug("Max retries exceeded with: '%s'",
-                  has_operation_completed.__name__)
-        if not is_silent_loop_exit:
-            raise failover_exc(failover_msg)
+    wait_until_complete(
+        has_operation_completed,
+        timeout=delay_before_attempts + retries * delay_bw_retries,
+        initial_delay=delay_before_attempts,
+        interval=min(POLL_INTERVAL, delay_bw_retries),
+        max_interval=delay_bw_retries,
+        failover_exc=failover_exc, failover_msg=failover_msg,
+        is_silent_loop_exit=is_silent_loop_exit)
 
 
 def wait_for_ilo_after_reset(ilo_object):
@@ -87,15 +296,24 @@ def wait_for_ilo_after_reset(ilo_object):
     is_ilo_up_after_reset = lambda: ilo_object.get_product_name() is not None
     is_ilo_up_after_reset.__name__ = 'is_ilo_up_after_reset'
 
-    wait_for_operation_to_complete(
+    wait_until_complete(
         is_ilo_up_after_reset,
+        timeout=ILO_RESET_TIMEOUT,
+        initial_delay=10,
+        max_interval=5,
         failover_exc=exception.IloConnectionError,
         failover_msg='iLO is not up after reset.'
     )
 
 
-def wait_for_ris_firmware_update_to_complete(ris_object):
-    """Continuously polls for iLO firmware update to complete."""
+def wait_for_ris_firmware_update_to_complete(ris_object,
+                                             progress_callback=None):
+    """Continuously polls for iLO firmware update to complete.
+
+    :param ris_object: RIS instance.
+    :param progress_callback: optional callable, called with the state and
+                              the percent of the update at every poll.
+    """
 
     p_state = ['IDLE']
     c_state = ['IDLE']
@@ -123,6 +341,8 @@ def wait_for_ris_firmware_update_to_complete(ris_object):
         +---------------------+--------------------+
         """
         curr_state, curr_percent = ris_object.get_firmware_update_progress()
+        if progress_callback is not None:
+            progress_callback(curr_state, curr_percent)
         p_state[0] = c_state[0]
         c_state[0] = curr_state
         if (((p_state[0] == 'PROGRESSING') and (c_state[0] in
@@ -133,9 +353,10 @@ def wait_for_ris_firmware_update_to_complete(ris_object):
             return True
         return False
 
-    wait_for_operation_to_complete(
+    wait_until_complete(
         has_firmware_flash_completed,
-        delay_bw_retries=30,
+        timeout=FIRMWARE_UPDATE_TIMEOUT,
+        initial_delay=10,
         failover_msg='iLO firmware update has failed.'
     )
     wait_for_ilo_after_reset(ris_object)
@@ -162,13 +383,14 @@ def wait_for_ribcl_firmware_update_to_complete(ribcl_object):
             return True
 
     # Note(deray): wait for 5 secs, before checking if iLO reset got triggered
-    # at every interval of 6 secs. This looping call happens for 10 times.
-    # Once it comes out of the wait of iLO reset trigger, then it starts
-    # waiting for iLO to be up again after reset.
-    wait_for_operation_to_complete(
+    # at intervals of at most 6 secs, for about a minute. Once it comes out
+    # of the wait of iLO reset trigger, then it starts waiting for iLO to be
+    # up again after reset.
+    wait_until_complete(
         is_ilo_reset_initiated,
-        delay_bw_retries=6,
-        delay_before_attempts=5,
+        timeout=65,
+        initial_delay=5,
+        max_interval=6,
         is_silent_loop_exit=True
     )
     wait_for_ilo_after_reset(ribcl_object)
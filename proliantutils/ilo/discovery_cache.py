@@ -0,0 +1,129 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Persistent cache of the model and protocol discovered for an iLO."""
+
+import json
+import os
+import tempfile
+import threading
+import time
+
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+PROTOCOL_RIS = 'ris'
+PROTOCOL_REDFISH = 'redfish'
+
+# Discovered protocol rarely changes for a given iLO; one day is a safe
+# default that still picks up hardware swaps behind the same address.
+DEFAULT_TTL = 24 * 60 * 60
+
+
+class DiscoveryCache(object):
+    """On-disk cache of iLO model and protocol, one JSON file per cache.
+
+    Every entry records the model string, the protocol used to talk to
+    the iLO and whether RIBCL is enabled. Entries expire after ``ttl``
+    seconds and are dropped whenever the iLO firmware gets flashed
+    through :class:`proliantutils.ilo.client.IloClient`, as a firmware
+    change may enable or disable protocols.
+
+    Reads never fail: a missing, unreadable or corrupt cache file is
+    treated as empty.
+    """
+
+    def __init__(self, path, ttl=DEFAULT_TTL):
+        """Constructor for DiscoveryCache.
+
+        :param path: path of the JSON file backing the cache.
+        :param ttl: time in seconds an entry stays valid.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+
+    def _load(self):
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError):
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    def _store(self, data):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            if not os.path.isdir(directory):
+                os.makedirs(directory)
+            # Note: write to a temporary file first and rename it over the
+            # cache file, so that concurrent readers (possibly in other
+            # processes) never see a partially written file.
+            fd, tmp_path = tempfile.mkstemp(dir=directory,
+                                            prefix='.discovery-')
+            try:
+                with os.fdopen(fd, 'w') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.path)
+            except Exception:
+                os.unlink(tmp_path)
+                raise
+        except (IOError, OSError, TypeError, ValueError) as e:
+            LOG.debug('Unable to write iLO discovery cache %(path)s. '
+                      'Error: %(error)s', {'path': self.path, 'error': e})
+
+    def get(self, host):
+        """Returns the cached discovery data for the host.
+
+        :param host: iLO address.
+        :returns: a dictionary with 'model', 'protocol' and
+            'is_ribcl_enabled' keys, or None if nothing valid is cached.
+        """
+        with self._lock:
+            entry = self._load().get(host)
+        if not entry:
+            return None
+        if time.time() - entry.get('timestamp', 0) > self.ttl:
+            LOG.debug('Discovery cache entry for %s has expired.', host)
+            return None
+        return entry
+
+    def set(self, host, model, protocol, is_ribcl_enabled=None):
+        """Records the discovery data for the host.
+
+        :param host: iLO address.
+        :param model: model string of the server.
+        :param protocol: PROTOCOL_REDFISH for iLOs managed over Redfish,
+            PROTOCOL_RIS otherwise.
+        :param is_ribcl_enabled: whether RIBCL is enabled on the iLO.
+        """
+        with self._lock:
+            data = self._load()
+            data[host] = {'model': model,
+                          'protocol': protocol,
+                          'is_ribcl_enabled': is_ribcl_enabled,
+                          'timestamp': time.time()}
+            self._store(data)
+
+    def invalidate(self, host):
+        """Drops the cached discovery data for the host.
+
+        :param host: iLO address.
+        """
+        with self._lock:
+            data = self._load()
+            if data.pop(host, None) is not None:
+                self._store(data)
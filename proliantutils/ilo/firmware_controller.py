@@ -35,6 +35,7 @@ import six
 from proliantutils import exception
 from proliantutils.ilo import common
 from proliantutils import log
+from proliantutils import tls
 
 if six.PY3:
     def b(x):
@@ -117,7 +118,9 @@ class FirmwareImageUploader(FirmwareImageControllerBase):
                           "Content-Type: multipart/form-data; "
                           "boundary=%s\r\n\r\n")
 
-    def upload_file_to(self, addressinfo, timeout):
+    cacert = None
+
+    def upload_file_to(self, addressinfo, timeout, cacert=None):
         """Uploads the raw firmware file to iLO
 
         Uploads the raw firmware file (already set as attribute in
@@ -125,12 +128,16 @@ class FirmwareImageUploader(FirmwareImageControllerBase):
         information is passed to this method.
         :param addressinfo: tuple of hostname and port of the iLO
         :param timeout: timeout in secs, used for connecting to iLO
+        :param cacert: a path to a CA_BUNDLE file or directory with
+            certificates of trusted CAs to verify the iLO certificate
+            with. Defaults to None (no verification).
         :raises: IloInvalidInputError, if raw firmware file not found
         :raises: IloError, for other internal problems
         :returns: the cookie so sent back from iLO on successful upload
         """
         self.hostname, self.port = addressinfo
         self.timeout = timeout
+        self.cacert = cacert
         filename = self.fw_file
 
         firmware = open(filename, 'rb').read()
@@ -174,7 +181,7 @@ class FirmwareImageUploader(FirmwareImageControllerBase):
                 data += d.decode('latin-1')
                 if not d:
                     break
-        except socket.sslerror:  # Connection closed
+        except ssl.SSLError:  # Connection closed
             e = sys.exc_info()[1]
             if not data:
                 raise exception.IloConnectionError(
@@ -190,10 +197,12 @@ class FirmwareImageUploader(FirmwareImageControllerBase):
         # return the cookie
         return cookie_match.group(1)
 
-    def _get_socket(self, sslversion=ssl.PROTOCOL_TLSv1):
+    def _get_socket(self):
         """Sets up an https connection and do an HTTP/raw socket request
 
-        :param sslversion: version of ssl session
+        The connection uses the SSL context shared by all the connections
+        to the iLOs, so it resumes the TLS session of the earlier ones.
+
         :raises: IloConnectionError, for connection failures
         :returns: ssl wrapped socket object
         """
@@ -231,17 +240,11 @@ class FirmwareImageUploader(FirmwareImageControllerBase):
 
         # wrapping the socket over ssl session
         try:
-            return ssl.wrap_socket(sock, ssl_version=sslversion)
-        except socket.sslerror:
+            context = tls.get_ssl_context(self.cacert)
+            return context.wrap_socket(sock, server_hostname=self.hostname)
+        except (ssl.SSLError, socket.error):
+            sock.close()
             e = sys.exc_info()[1]
-            msg = (getattr(e, 'reason', None)
-                   or getattr(e, 'message', None))
-            # Some older iLO s don't support TLSv1, retry with SSLv3
-            if ('wrong version number' in msg) and (
-                    sslversion == ssl.PROTOCOL_TLSv1):
-
-                return self._get_socket(ssl.PROTOCOL_SSLv3)
-
             raise exception.IloConnectionError(
                 "Cannot establish ssl session with %(hostname)s:%(port)d : "
                 "%(error)s" % {'hostname': self.hostname, 'port': self.port,
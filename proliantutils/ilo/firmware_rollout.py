@@ -0,0 +1,285 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Rollout of a firmware image across many iLOs."""
+
+from concurrent import futures
+import json
+import os
+import re
+import tempfile
+import threading
+
+from proliantutils import exception
+from proliantutils.ilo import client
+from proliantutils.ilo import firmware_controller
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+NODE_PENDING = 'pending'
+NODE_DONE = 'done'
+NODE_FAILED = 'failed'
+
+# Number of nodes flashed concurrently by default.
+DEFAULT_WAVE_SIZE = 10
+
+# Keys of a node description which are not IloClient arguments.
+_NODE_KEYS = ('address', 'username', 'password', 'rack')
+
+
+def _create_client(node):
+    kwargs = {key: value for key, value in node.items()
+              if key not in _NODE_KEYS}
+    return client.IloClient(node['address'], node['username'],
+                            node['password'], **kwargs)
+
+
+class FirmwareRollout(object):
+    """Flashes a firmware image on many iLOs, wave after wave.
+
+    The compact firmware file is extracted once, and the raw image is
+    hosted once through ``host_image`` for the iLOs which fetch it from an
+    http store (Gen9 and later), and unhosted through ``unhost_image`` once
+    the rollout is over; it is uploaded to the older ones over RIBCL.
+    Nodes are flashed ``wave_size`` at a time, concurrently, and the
+    rollout stops after a wave as soon as more than ``failure_budget``
+    nodes failed.
+
+    With ``state_path``, the state of every node is saved to a JSON file
+    as the rollout goes. Running a rollout of the same image with the same
+    file again resumes it: the nodes already flashed are skipped.
+    """
+
+    def __init__(self, nodes, firmware_file, component_type,
+                 host_image=None, wave_size=DEFAULT_WAVE_SIZE,
+                 failure_budget=0, rack_concurrency=None, state_path=None,
+                 client_factory=_create_client, unhost_image=None):
+        """Constructor for FirmwareRollout.
+
+        :param nodes: list of dictionaries with the 'address', 'username'
+            and 'password' of the iLOs, optionally their 'rack' and any
+            other IloClient keyword argument.
+        :param firmware_file: firmware file to flash, compact or raw.
+        :param component_type: type of component to be applied to.
+        :param host_image: callable taking the path of the raw image and
+            returning a URL the iLOs can fetch it from, like the ``host``
+            method of an :class:`proliantutils.ilo.image_server.ImageServer`.
+            Required when some of the iLOs are Gen9 or later.
+        :param wave_size: number of nodes flashed concurrently.
+        :param failure_budget: number of failed nodes tolerated before the
+            rollout stops.
+        :param rack_concurrency: maximum number of nodes of a rack flashed
+            at once, so that nodes fetching the image do not saturate the
+            rack uplink. Defaults to None (no limit).
+        :param state_path: path of the JSON file to save the state of the
+            rollout to. Defaults to None (no resume).
+        :param client_factory: callable taking a node and returning its
+            IloClient object.
+        :param unhost_image: callable taking the URL returned by
+            ``host_image``, called once the rollout is over, like the
+            ``unhost`` method of an
+            :class:`proliantutils.ilo.image_server.ImageServer`. Defaults
+            to None (the image stays hosted).
+        :raises: InvalidInputError, on invalid nodes or parameters, or if
+            the state file belongs to another rollout.
+        """
+        if wave_size < 1:
+            raise exception.InvalidInputError(
+                'The wave size must be at least 1, not %s.' % wave_size)
+        addresses = set()
+        for node in nodes:
+            missing = [key for key in _NODE_KEYS[:3] if key not in node]
+            if missing:
+                raise exception.InvalidInputError(
+                    'Node %(node)s is missing %(keys)s.' %
+                    {'node': node.get('address', node),
+                     'keys': ', '.join(missing)})
+            if node['address'] in addresses:
+                raise exception.InvalidInputError(
+                    'Node %s is listed more than once.' % node['address'])
+            addresses.add(node['address'])
+
+        self.nodes = list(nodes)
+        self.firmware_file = firmware_file
+        self.component_type = component_type
+        self.host_image = host_image
+        self.unhost_image = unhost_image
+        self.wave_size = wave_size
+        self.failure_budget = failure_budget
+        self.state_path = state_path
+        self._client_factory = client_factory
+        self._lock = threading.Lock()
+        self._raw_file = None
+        self._is_extracted = False
+        self._image_url = None
+        self._rack_semaphores = {}
+        if rack_concurrency:
+            for node in self.nodes:
+                if node.get('rack') is not None:
+                    self._rack_semaphores.setdefault(
+                        node['rack'],
+                        threading.BoundedSemaphore(rack_concurrency))
+        self._states = self._load_states()
+
+    def _load_states(self):
+        states = {node['address']: {'state': NODE_PENDING, 'error': None}
+                  for node in self.nodes}
+        if not self.state_path or not os.path.exists(self.state_path):
+            return states
+        try:
+            with open(self.state_path, 'r') as f:
+                data = json.load(f)
+        except (IOError, OSError, ValueError) as e:
+            raise exception.InvalidInputError(
+                'Unable to read the rollout state file %(path)s: %(error)s' %
+                {'path': self.state_path, 'error': e})
+        if (data.get('firmware_file') != self.firmware_file
+                or data.get('component_type') != self.component_type):
+            raise exception.InvalidInputError(
+                'The rollout state file %s belongs to the rollout of another '
+                'firmware.' % self.state_path)
+        for address, state in data.get('nodes', {}).items():
+            if address in states:
+                states[address] = state
+        return states
+
+    def _save_states(self):
+        # Note: called with the lock held.
+        if not self.state_path:
+            return
+        data = {'firmware_file': self.firmware_file,
+                'component_type': self.component_type,
+                'nodes': self._states}
+        directory = os.path.dirname(os.path.abspath(self.state_path))
+        try:
+            # Note: write to a temporary file first and rename it over the
+            # state file, so that a crash never leaves a truncated file.
+            fd, tmp_path = tempfile.mkstemp(dir=directory,
+                                            prefix='.rollout-')
+            with os.fdopen(fd, 'w') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.state_path)
+        except (IOError, OSError) as e:
+            LOG.warning('Unable to save the rollout state to %(path)s: '
+                        '%(error)s', {'path': self.state_path, 'error': e})
+
+    def _set_state(self, address, state, error=None):
+        with self._lock:
+            self._states[address] = {'state': state, 'error': error}
+            self._save_states()
+
+    def get_states(self):
+        """Returns the state of every node.
+
+        :returns: a dictionary of node address to a dictionary with its
+            'state', one of 'pending', 'done' or 'failed', and the 'error'
+            it failed with.
+        """
+        with self._lock:
+            return {address: dict(state)
+                    for address, state in self._states.items()}
+
+    def _get_firmware_location(self, ilo):
+        # Note(deray): like utils.process_firmware_image(), Gen9 and later
+        # iLOs fetch the firmware from an http store.
+        m = re.search(r"Gen(\d+)", ilo.model)
+        if not m or int(m.group(1)) <= 8:
+            return self._raw_file
+        with self._lock:
+            if self._image_url is None:
+                if self.host_image is None:
+                    raise exception.InvalidInputError(
+                        'The firmware image needs hosting on an http store '
+                        'for %s, but no host_image was given.' % ilo.host)
+                self._image_url = self.host_image(self._raw_file)
+                LOG.info('Firmware file %(file)s hosted at %(url)s',
+                         {'file': self._raw_file, 'url': self._image_url})
+            return self._image_url
+
+    def _flash_node(self, node):
+        address = node['address']
+        semaphore = self._rack_semaphores.get(node.get('rack'))
+        try:
+            if semaphore:
+                semaphore.acquire()
+            try:
+                ilo = self._client_factory(node)
+                ilo.update_firmware(self._get_firmware_location(ilo),
+                                    self.component_type)
+            finally:
+                if semaphore:
+                    semaphore.release()
+        except Exception as e:
+            # Note: any failure is the one of this node only; the failure
+            # budget decides whether the rollout goes on.
+            LOG.error('Flashing %(file)s on %(node)s failed: %(error)s',
+                      {'file': self.firmware_file, 'node': address,
+                       'error': e})
+            self._set_state(address, NODE_FAILED, str(e))
+            return False
+        LOG.info('Flashing %(file)s on %(node)s ... done',
+                 {'file': self.firmware_file, 'node': address})
+        self._set_state(address, NODE_DONE)
+        return True
+
+    def run(self):
+        """Flashes the nodes not flashed yet.
+
+        :returns: the state of every node, as returned by get_states().
+        :raises: InvalidInputError, for unsupported firmware file types.
+        :raises: ImageExtractionFailed, for extraction related issues.
+        :raises: FirmwareRolloutHalted, if more than ``failure_budget``
+            nodes failed.
+        """
+        pending = [node for node in self.nodes
+                   if self._states[node['address']]['state'] != NODE_DONE]
+        if not pending:
+            return self.get_states()
+
+        extractor = firmware_controller.get_fw_extractor(self.firmware_file)
+        self._raw_file, self._is_extracted = extractor.extract()
+        self._image_url = None
+        failed = 0
+        try:
+            with futures.ThreadPoolExecutor(
+                    max_workers=self.wave_size,
+                    thread_name_prefix='proliantutils-rollout') as executor:
+                for start in range(0, len(pending), self.wave_size):
+                    wave = pending[start:start + self.wave_size]
+                    LOG.info('Flashing %(file)s on %(count)d nodes, '
+                             '%(left)d left after them',
+                             {'file': self.firmware_file, 'count': len(wave),
+                              'left': len(pending) - start - len(wave)})
+                    results = executor.map(self._flash_node, wave)
+                    failed += len([ok for ok in results if not ok])
+                    if failed > self.failure_budget:
+                        raise exception.FirmwareRolloutHalted(
+                            failed=failed, budget=self.failure_budget)
+        finally:
+            if self._image_url is not None and self.unhost_image is not None:
+                try:
+                    self.unhost_image(self._image_url)
+                except Exception as e:
+                    LOG.warning('Unable to unhost the firmware image at '
+                                '%(url)s: %(error)s',
+                                {'url': self._image_url, 'error': e})
+                self._image_url = None
+            if self._is_extracted:
+                try:
+                    os.remove(self._raw_file)
+                except OSError:
+                    pass
+        return self.get_states()
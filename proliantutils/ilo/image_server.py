@@ -0,0 +1,241 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""HTTP server hosting raw firmware images for the iLOs to fetch."""
+
+import http.server
+import os
+import re
+import socket
+import socketserver
+import threading
+from urllib import parse
+import uuid
+
+from proliantutils import exception
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+_RANGE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Time in seconds after which an idle download connection is closed.
+CONNECTION_TIMEOUT = 60
+
+
+def _parse_range(header, size):
+    """Returns the (start, end) byte range asked by a Range header.
+
+    :returns: the inclusive range, None to send the whole file, or False
+              if the range cannot be satisfied.
+    """
+    match = _RANGE.match(header.strip())
+    if not match:
+        # Note: several ranges, or another unit; serving the whole file is
+        # a valid answer to those.
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the last bytes of the file.
+        length = int(last)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    timeout = CONNECTION_TIMEOUT
+
+    def log_message(self, format, *args):
+        LOG.debug('Image server: %(client)s %(message)s',
+                  {'client': self.address_string(), 'message': format % args})
+
+    def _send_headers(self, status, length, extra=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/octet-stream')
+        self.send_header('Content-Length', str(length))
+        self.send_header('Accept-Ranges', 'bytes')
+        for name, value in (extra or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+
+    def do_GET(self):
+        path = self.server.image_server.get_path(
+            parse.urlsplit(self.path).path)
+        if path is None:
+            self.send_error(404)
+            return
+        try:
+            f = open(path, 'rb')
+        except (IOError, OSError):
+            self.send_error(404)
+            return
+        with f:
+            size = os.fstat(f.fileno()).st_size
+            byte_range = _parse_range(self.headers.get('Range', ''), size)
+            if byte_range is False:
+                self._send_headers(416, 0,
+                                   {'Content-Range': 'bytes */%d' % size})
+                return
+            if byte_range is None:
+                start, end = 0, size - 1
+                self._send_headers(200, size)
+            else:
+                start, end = byte_range
+                self._send_headers(
+                    206, end - start + 1,
+                    {'Content-Range': 'bytes %d-%d/%d' % (start, end, size)})
+            if self.command == 'HEAD' or end < start:
+                return
+            self.wfile.flush()
+            # Note: socket.sendfile() uses the zero-copy os.sendfile() where
+            # the platform has it, and falls back to send() otherwise.
+            self.connection.sendfile(f, start, end - start + 1)
+
+    do_HEAD = do_GET
+
+
+class _ThreadingHTTPServer(socketserver.ThreadingMixIn,
+                           http.server.HTTPServer):
+
+    daemon_threads = True
+
+    def __init__(self, server_address, *args, **kwargs):
+        if ':' in server_address[0]:
+            self.address_family = socket.AF_INET6
+        super(_ThreadingHTTPServer, self).__init__(server_address, *args,
+                                                   **kwargs)
+
+
+class ImageServer(object):
+    """Threaded HTTP server serving local files to the iLOs.
+
+    Gen9 and later iLOs fetch the firmware to flash from an http store.
+    Files get hosted with :meth:`host`, under an unguessable URL, and are
+    served with support for range requests, which the iLOs use to resume
+    downloads, to any number of iLOs at once. The server can be used as
+    a context manager, and :meth:`host` and :meth:`unhost` as the
+    ``host_image`` and ``unhost_image`` of a
+    :class:`proliantutils.ilo.firmware_rollout.FirmwareRollout`::
+
+        with image_server.ImageServer('10.0.0.1') as server:
+            ilo.update_firmware(server.host(raw_file), 'ilo')
+    """
+
+    def __init__(self, address, port=0, bind_address=None):
+        """Constructor for ImageServer.
+
+        :param address: address the iLOs reach this host at, used in the
+            URLs of the hosted files.
+        :param port: port to listen on, defaults to a free one.
+        :param bind_address: address to listen on, defaults to
+            ``address``.
+        """
+        self.address = address
+        self.bind_address = bind_address or address
+        self._port = port
+        self._files = {}
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1] if self._httpd else self._port
+
+    def start(self):
+        """Starts serving in a background thread."""
+        if self._httpd:
+            return
+        self._httpd = _ThreadingHTTPServer((self.bind_address, self._port),
+                                           _Handler)
+        self._httpd.image_server = self
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name='proliantutils-image-server')
+        self._thread.daemon = True
+        self._thread.start()
+        LOG.info('Image server listening on %(address)s:%(port)s',
+                 {'address': self.bind_address, 'port': self.port})
+
+    def stop(self):
+        """Stops serving and unhosts all the files."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+        with self._lock:
+            urls = list(self._files)
+        for url_path in urls:
+            self._unhost(url_path)
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def host(self, path, remove=False):
+        """Hosts a file.
+
+        :param path: path of the file to serve.
+        :param remove: if True, the file gets deleted once unhosted.
+        :returns: the URL the file is served at.
+        :raises: InvalidInputError, if the file does not exist.
+        """
+        if not os.path.isfile(path):
+            raise exception.InvalidInputError(
+                'Unable to host %s, no such file.' % path)
+        self.start()
+        url_path = '/%s/%s' % (uuid.uuid4().hex,
+                               parse.quote(os.path.basename(path)))
+        with self._lock:
+            self._files[url_path] = (os.path.abspath(path), remove)
+        host = ('[%s]' % self.address if ':' in self.address
+                else self.address)
+        return 'http://%s:%d%s' % (host, self.port, url_path)
+
+    def unhost(self, url):
+        """Stops serving a file, deleting it if hosted with remove=True.
+
+        :param url: URL returned by :meth:`host`.
+        """
+        self._unhost(parse.urlsplit(url).path)
+
+    def _unhost(self, url_path):
+        with self._lock:
+            path, remove = self._files.pop(url_path, (None, False))
+        if path and remove:
+            try:
+                os.remove(path)
+            except OSError as e:
+                LOG.warning('Unable to remove the hosted file %(path)s: '
+                            '%(error)s', {'path': path, 'error': e})
+
+    def get_path(self, url_path):
+        """Returns the path of the file served at a URL path, if any."""
+        with self._lock:
+            path, remove = self._files.get(url_path, (None, False))
+        return path
@@ -364,6 +364,32 @@ class IloOperations(object):
         """
         raise exception.IloCommandNotSupportedError(ERRMSG)
 
+    def start_firmware_update(self, firmware_url, component_type):
+        """Starts updating the given firmware without waiting for the end.
+
+        :param firmware_url: location of the firmware file
+        :param component_type: Type of component to be applied to.
+        :returns: a common.FirmwareUpdateJob object, to follow the progress
+                  and wait for the end of the update.
+        :raises: InvalidInputError, if the validation of the input fails
+        :raises: IloError, on an error from iLO
+        :raises: IloConnectionError, if not able to reach iLO.
+        :raises: IloCommandNotSupportedError, if the command is
+                 not supported on the server
+        """
+        raise exception.IloCommandNotSupportedError(ERRMSG)
+
+    def watch_events(self, listener):
+        """Tracks the state of the server from the events of the iLO.
+
+        :param listener: a proliantutils.redfish.events.EventListener
+                         object, keeping the state of the server.
+        :raises: IloError, on an error from iLO
+        :raises: IloCommandNotSupportedError, if the command is
+                 not supported on the server
+        """
+        raise exception.IloCommandNotSupportedError(ERRMSG)
+
     def inject_nmi(self):
         """Inject NMI, Non Maskable Interrupt.
 
@@ -427,6 +453,8 @@ class IloOperations(object):
                 on the 'only_allowed_settings', either only the allowed
                 settings are set or all the supported settings that are in the
                 'data' are set.
+        :returns: a dictionary of the BIOS settings which were changed,
+                 empty if all of them already had the requested values.
         :raises: IloError, on an error from iLO.
         :raises: IloCommandNotSupportedError, if the command is not supported
                  on the server.
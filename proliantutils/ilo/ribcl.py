@@ -24,17 +24,21 @@ import re
 import xml.etree.ElementTree as etree
 
 from oslo_utils import strutils
-import requests
 from requests.packages import urllib3
 from requests.packages.urllib3 import exceptions as urllib3_exceptions
 import six
 
+from proliantutils import circuit_breaker
 from proliantutils import exception
 from proliantutils.ilo import common
 from proliantutils.ilo import firmware_controller
 from proliantutils.ilo import mappings
 from proliantutils.ilo import operations
+from proliantutils import instrumentation
 from proliantutils import log
+from proliantutils import throttling
+from proliantutils import timeouts
+from proliantutils import tls
 from proliantutils import utils
 
 
@@ -136,22 +140,49 @@ class RIBCLOperations(operations.IloOperations):
         if extra_headers:
             headers.update(extra_headers)
 
-        kwargs = {'headers': headers, 'data': xml}
+        # Note: Commands which change the settings take longer than those
+        # which only read them, and their latency is tracked apart.
+        operation = (instrumentation.PROTOCOL_RIBCL,
+                     timeouts.WRITE if 'MODE="write"' in xml
+                     else timeouts.READ)
+        connect_timeout, read_timeout = timeouts.get_timeouts(
+            self.host, operation, self.timeout)
+        kwargs = {'headers': headers, 'data': xml,
+                  'timeout': (connect_timeout, read_timeout)}
         if self.cacert is not None:
             kwargs['verify'] = self.cacert
         else:
             kwargs['verify'] = False
 
-        try:
-            LOG.debug(self._("POST %(url)s with request data: "
-                             "%(request_data)s"),
-                      {'url': urlstr,
-                       'request_data': MaskedRequestData(kwargs)})
-            response = requests.post(urlstr, **kwargs)
-            response.raise_for_status()
-        except Exception as e:
-            LOG.debug(self._("Unable to connect to iLO. %s"), e)
-            raise exception.IloConnectionError(e)
+        with instrumentation.track_request(
+                self.host, instrumentation.PROTOCOL_RIBCL, 'POST', urlstr,
+                bytes_out=len(xml)) as info:
+            if info:
+                info.attempt()
+                info.operation = ','.join(
+                    command.tag for login in root for tag in login
+                    for command in tag)
+            try:
+                LOG.debug(self._("POST %(url)s with request data: "
+                                 "%(request_data)s"),
+                          {'url': urlstr,
+                           'request_data': MaskedRequestData(kwargs)})
+                with throttling.limit(
+                        self.host, info,
+                        timeout=timeouts.get_remaining(self.host)), \
+                        circuit_breaker.guard(self.host), \
+                        timeouts.measure(self.host, operation, read_timeout):
+                    response = tls.get_session(kwargs['verify']).post(
+                        urlstr, **kwargs)
+                if info:
+                    info.status = response.status_code
+                    info.bytes_in = len(response.content or b'')
+                response.raise_for_status()
+            except exception.IloConnectionError:
+                raise
+            except Exception as e:
+                LOG.debug(self._("Unable to connect to iLO. %s"), e)
+                raise exception.IloConnectionError(e)
         return response.text
 
     def _create_dynamic_xml(self, cmdname, tag_name, mode, subelements=None):
@@ -636,16 +667,35 @@ class RIBCLOperations(operations.IloOperations):
     def _request_host(self):
         """Request host info from the server."""
         urlstr = 'https://%s/xmldata?item=all' % (self.host)
-        kwargs = {}
+        operation = (instrumentation.PROTOCOL_RIBCL, timeouts.READ)
+        connect_timeout, read_timeout = timeouts.get_timeouts(
+            self.host, operation, self.timeout)
+        kwargs = {'timeout': (connect_timeout, read_timeout)}
         if self.cacert is not None:
             kwargs['verify'] = self.cacert
         else:
             kwargs['verify'] = False
-        try:
-            response = requests.get(urlstr, **kwargs)
-            response.raise_for_status()
-        except Exception as e:
-            raise IloConnectionError(e)
+        with instrumentation.track_request(
+                self.host, instrumentation.PROTOCOL_RIBCL, 'GET',
+                urlstr) as info:
+            if info:
+                info.attempt()
+            try:
+                with throttling.limit(
+                        self.host, info,
+                        timeout=timeouts.get_remaining(self.host)), \
+                        circuit_breaker.guard(self.host), \
+                        timeouts.measure(self.host, operation, read_timeout):
+                    response = tls.get_session(kwargs['verify']).get(
+                        urlstr, **kwargs)
+                if info:
+                    info.status = response.status_code
+                    info.bytes_in = len(response.content or b'')
+                response.raise_for_status()
+            except exception.IloConnectionError:
+                raise
+            except Exception as e:
+                raise IloConnectionError(e)
 
         return response.text
 
@@ -1114,7 +1164,8 @@ class RIBCLOperations(operations.IloOperations):
 
         LOG.debug(self._('Uploading firmware file: %s ...'), filename)
         cookie = fw_img_processor.upload_file_to((self.host, self.port),
-                                                 self.timeout)
+                                                 self.timeout,
+                                                 cacert=self.cacert)
         # NOTE(mgoddard): Some devices return a cookie with a newline. This
         # breaks header validation in the requests library, which causes the
         # update to fail.
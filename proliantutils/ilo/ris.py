@@ -14,10 +14,17 @@
 
 __author__ = 'HPE'
 
+import collections
+from concurrent import futures
+import copy
 import hashlib
+import json
+import threading
 
 import retrying
+import six
 
+from proliantutils import content_cache
 from proliantutils import exception
 from proliantutils.ilo import common
 from proliantutils.ilo import constants
@@ -26,6 +33,7 @@ from proliantutils.ilo import mappings
 from proliantutils.ilo import operations
 from proliantutils import log
 from proliantutils import rest
+from proliantutils import timeouts
 from proliantutils import utils
 
 """ Currently this class supports only secure boot and firmware settings
@@ -58,12 +66,52 @@ POWER_STATE = {
 CLASSCODE_FOR_GPU_DEVICES = [3]
 SUBCLASSCODE_FOR_GPU_DEVICES = [0, 1, 2, 128]
 
+# Number of collection members fetched in parallel by _get_collection.
+COLLECTION_FETCH_WINDOW = 4
+
+# Number of drive collections fetched in parallel by the storage walk.
+STORAGE_WALK_WORKERS = 4
+
+# Key of the storage inventory among the memoized resources.
+_STORAGE_INVENTORY = '#StorageInventory'
+
+StorageInventory = collections.namedtuple(
+    'StorageInventory',
+    ['array_controllers', 'physical_drives', 'logical_drives'])
+StorageInventory.__doc__ = """Storage of the server as seen over RIS.
+
+The array controllers collection resource, or None if there is none, and
+the lists of physical and logical drive resources of all the controllers.
+"""
+
 MAX_RETRY_ATTEMPTS = 3  # Maximum number of attempts to be retried
 MAX_TIME_BEFORE_RETRY = 7 * 1000  # wait time in milliseconds before retry
 
 LOG = log.get_logger(__name__)
 
 
+def _memoize_resources(func):
+    """Memoizes the system and BIOS resources for the duration of the call.
+
+    Public methods decorated with it GET the ComputerSystem and the BIOS
+    resources at most once, however many helpers read them. Nested
+    decorated calls share the memo of the outermost one and any modifying
+    request issued in the meantime drops it.
+    """
+    @six.wraps(func)
+    def wrapper(self, *args, **kwargs):
+        scope = self._memo_scope
+        if getattr(scope, 'resources', None) is not None:
+            return func(self, *args, **kwargs)
+        scope.resources = {}
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            scope.resources = None
+
+    return wrapper
+
+
 class RISOperations(rest.RestConnectorBase, operations.IloOperations):
     """iLO class for RIS interface of iLO.
 
@@ -74,9 +122,42 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         super(RISOperations, self).__init__(host, login, password,
                                             bios_password=bios_password,
                                             cacert=cacert)
+        # Note: thread local, as the same object may serve several
+        # threads and the memo is only valid within one call.
+        self._memo_scope = threading.local()
+
+    def _rest_op(self, operation, suburi, request_headers, request_body):
+        """Drops the memoized resources before any modifying request."""
+        if (operation != 'GET'
+                and getattr(self._memo_scope, 'resources', None)):
+            self._memo_scope.resources.clear()
+        return super(RISOperations, self)._rest_op(
+            operation, suburi, request_headers, request_body)
+
+    def _get_memoized(self, uri):
+        """GETs the resource, from the memo when within a memoized call.
+
+        :param uri: URI of the resource.
+        :returns: a tuple of status, headers and the resource. The resource
+            is a copy the caller is free to modify.
+        """
+        resources = getattr(self._memo_scope, 'resources', None)
+        if resources is not None and uri in resources:
+            status, headers, resource = resources[uri]
+            return status, headers, copy.deepcopy(resource)
+        status, headers, resource = self._rest_get(uri)
+        if resources is not None and status < 300:
+            resources[uri] = (status, headers, copy.deepcopy(resource))
+        return status, headers, resource
 
     def _get_collection(self, collection_uri, request_headers=None):
-        """Generator function that returns collection members."""
+        """Generator function that returns collection members.
+
+        The member resources are fetched concurrently, at most
+        COLLECTION_FETCH_WINDOW of them at a time, and the next page of the
+        collection is fetched while the current one is consumed. Members
+        are yielded in the order of the collection.
+        """
 
         # get the collection
         status, headers, thecollection = self._rest_get(collection_uri)
@@ -85,54 +166,76 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = self._get_extended_error(thecollection)
             raise exception.IloError(msg)
 
-        while status < 300:
-            # verify expected type
-            # Don't limit to version 0 here as we will rev to 1.0 at some
-            # point hopefully with minimal changes
-            ctype = self._get_type(thecollection)
-            if (ctype not in ['Collection.0', 'Collection.1']):
-                raise exception.IloError("collection not found")
-
-            # if this collection has inline items, return those
-            # NOTE:  Collections are very flexible in how the represent
-            # members.  They can be inline in the collection as members
-            # of the 'Items' array, or they may be href links in the
-            # links/Members array.  The could actually be both. Typically,
-            # iLO implements the inline (Items) for only when the collection
-            # is read only.  We have to render it with the href links when an
-            # array contains PATCHable items because its complex to PATCH
-            # inline collection members.
-
-            if 'Items' in thecollection:
-                # iterate items
-                for item in thecollection['Items']:
-                    # if the item has a self uri pointer,
-                    # supply that for convenience.
-                    memberuri = None
-                    if 'links' in item and 'self' in item['links']:
-                        memberuri = item['links']['self']['href']
-                    yield 200, None, item, memberuri
-
-            # else walk the member links
-            elif ('links' in thecollection
-                  and 'Member' in thecollection['links']):
-                # iterate members
-                for memberuri in thecollection['links']['Member']:
-                    # for each member return the resource indicated by the
-                    # member link
-                    status, headers, member = self._rest_get(memberuri['href'])
-                    yield status, headers, member, memberuri['href']
-
-            # page forward if there are more pages in the collection
-            if ('links' in thecollection
-                    and 'NextPage' in thecollection['links']):
-                next_link_uri = (collection_uri + '?page=' + str(
-                                 thecollection['links']['NextPage']['page']))
-                status, headers, thecollection = self._rest_get(next_link_uri)
-
-            # else we are finished iterating the collection
-            else:
-                break
+        pending = collections.deque()
+        executor = futures.ThreadPoolExecutor(
+            max_workers=COLLECTION_FETCH_WINDOW + 1)
+        try:
+            while status < 300:
+                # verify expected type
+                # Don't limit to version 0 here as we will rev to 1.0 at
+                # some point hopefully with minimal changes
+                ctype = self._get_type(thecollection)
+                if (ctype not in ['Collection.0', 'Collection.1']):
+                    raise exception.IloError("collection not found")
+
+                # request the next page before walking this one
+                next_page = None
+                if ('links' in thecollection
+                        and 'NextPage' in thecollection['links']):
+                    next_link_uri = (collection_uri + '?page=' + str(
+                        thecollection['links']['NextPage']['page']))
+                    next_page = executor.submit(
+                        timeouts.propagate(self._rest_get), next_link_uri)
+
+                # if this collection has inline items, return those
+                # NOTE:  Collections are very flexible in how the represent
+                # members.  They can be inline in the collection as members
+                # of the 'Items' array, or they may be href links in the
+                # links/Members array.  The could actually be both.
+                # Typically, iLO implements the inline (Items) for only when
+                # the collection is read only.  We have to render it with
+                # the href links when an array contains PATCHable items
+                # because its complex to PATCH inline collection members.
+
+                if 'Items' in thecollection:
+                    # iterate items
+                    for item in thecollection['Items']:
+                        # if the item has a self uri pointer,
+                        # supply that for convenience.
+                        memberuri = None
+                        if 'links' in item and 'self' in item['links']:
+                            memberuri = item['links']['self']['href']
+                        yield 200, None, item, memberuri
+
+                # else walk the member links
+                elif ('links' in thecollection
+                      and 'Member' in thecollection['links']):
+                    member_uris = collections.deque(
+                        member['href'] for member in
+                        thecollection['links']['Member'])
+                    while member_uris or pending:
+                        while (member_uris
+                               and len(pending) < COLLECTION_FETCH_WINDOW):
+                            memberuri = member_uris.popleft()
+                            pending.append((memberuri, executor.submit(
+                                timeouts.propagate(self._rest_get),
+                                memberuri)))
+                        memberuri, job = pending.popleft()
+                        member_status, member_headers, member = job.result()
+                        yield member_status, member_headers, member, memberuri
+
+                # else we are finished iterating the collection
+                if next_page is None:
+                    break
+
+                # page forward as there are more pages in the collection
+                status, headers, thecollection = next_page.result()
+        finally:
+            # Note: the consumer may stop early, do not fetch members
+            # nobody is going to look at.
+            for memberuri, job in pending:
+                job.cancel()
+            executor.shutdown(wait=True)
 
     def _get_type(self, obj):
         """Return the type of an object."""
@@ -201,7 +304,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         """Get the system details."""
         # Assuming only one system present as part of collection,
         # as we are dealing with iLO's here.
-        status, headers, system = self._rest_get('/rest/v1/Systems/1')
+        status, headers, system = self._get_memoized('/rest/v1/Systems/1')
         if status < 300:
             stype = self._get_type(system)
             if stype not in ['ComputerSystem.0', 'ComputerSystem.1']:
@@ -221,7 +324,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
                 and 'BIOS' in system['Oem']['Hp']['links']):
             # Get the BIOS URI and Settings
             bios_uri = system['Oem']['Hp']['links']['BIOS']['href']
-            status, headers, bios_settings = self._rest_get(bios_uri)
+            status, headers, bios_settings = self._get_memoized(bios_uri)
 
             if status >= 300:
                 msg = self._get_extended_error(bios_settings)
@@ -328,22 +431,6 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
 
             return headers, array_uri, array_settings
 
-    def _create_list_of_array_controllers(self):
-        """Creates the list of Array Controller URIs.
-
-        :returns list of ArrayControllers.
-        """
-        headers, array_uri, array_settings = (
-            self._get_array_controller_resource())
-        array_uri_links = []
-        # Do not raise exception if there is no ArrayControllers
-        # as Storage can be zero at any point and if we raise
-        # exception it might fail get_server_capabilities().
-        if ('links' in array_settings
-                and 'Member' in array_settings['links']):
-            array_uri_links = array_settings['links']['Member']
-        return array_uri_links
-
     def _get_drive_type_and_speed(self):
         """Gets the disk drive type.
 
@@ -381,47 +468,83 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             drive_details.update({'has_ssd': 'true'})
         return drive_details if len(drive_details.keys()) > 0 else None
 
-    def _get_drive_resource(self, drive_name):
-        """Gets the DiskDrive resource if exists.
+    def _get_drive_collection_members(self, drive_name, controller):
+        """Returns the members of a drive collection of a controller.
 
-        :param drive_name: can be either "PhysicalDrives" or
-             "LogicalDrives".
-        :returns the list of drives.
-        :raises: IloCommandNotSupportedError if the given drive resource
+        :param drive_name: either "PhysicalDrives" or "LogicalDrives".
+        :param controller: the array controller resource.
+        :returns: the list of drive resources.
+        """
+        drives = []
+        if 'links' in controller and drive_name in controller['links']:
+            drive_uri = controller['links'][drive_name]['href']
+            _, _, collection = self._rest_get(drive_uri)
+            if 'links' in collection and 'Member' in collection['links']:
+                for drive_link in collection['links']['Member']:
+                    _, _, drive = self._rest_get(drive_link['href'])
+                    drives.append(drive)
+        return drives
+
+    def _walk_storage(self):
+        """Fetches the array controllers and all their drives.
+
+        Every controller is fetched once, then the physical and logical
+        drive collections of all the controllers are fetched concurrently.
+
+        :returns: a StorageInventory object.
+        :raises: IloCommandNotSupportedError if the SmartStorage resource
             doesn't exist.
         :raises: IloError, on an error from iLO.
         """
-        disk_details_list = []
-        array_uri_links = self._create_list_of_array_controllers()
-        # Do not raise exception if there is no disk/logical drive
+        array_resource = self._get_array_controller_resource()
+        # Do not raise exception if there is no ArrayControllers or drives
         # as Storage can be zero at any point and if we raise
         # exception it might fail get_server_capabilities().
-        for array_link in array_uri_links:
-            _, _, member_settings = (
-                self._rest_get(array_link['href']))
-
-            if ('links' in member_settings
-                    and drive_name in member_settings['links']):
-                disk_uri = member_settings['links'][drive_name]['href']
-                headers, disk_member_uri, disk_mem = (
-                    self._rest_get(disk_uri))
-                if ('links' in disk_mem
-                        and 'Member' in disk_mem['links']):
-                    for disk_link in disk_mem['links']['Member']:
-                        diskdrive_uri = disk_link['href']
-                        _, _, disk_details = (
-                            self._rest_get(diskdrive_uri))
-                        disk_details_list.append(disk_details)
-        if disk_details_list:
-            return disk_details_list
+        if not array_resource:
+            return StorageInventory(None, [], [])
+        array_settings = array_resource[2]
+        controllers = []
+        for array_link in array_settings.get('links', {}).get('Member', []):
+            _, _, controller = self._rest_get(array_link['href'])
+            controllers.append(controller)
+
+        drives = {'PhysicalDrives': [], 'LogicalDrives': []}
+        if controllers:
+            with futures.ThreadPoolExecutor(
+                    max_workers=STORAGE_WALK_WORKERS) as executor:
+                jobs = [(drive_name, executor.submit(
+                    timeouts.propagate(self._get_drive_collection_members),
+                    drive_name, controller))
+                    for controller in controllers
+                    for drive_name in sorted(drives)]
+                for drive_name, job in jobs:
+                    drives[drive_name].extend(job.result())
+        return StorageInventory(array_settings, drives['PhysicalDrives'],
+                                drives['LogicalDrives'])
+
+    def _get_storage_inventory(self):
+        """Returns the storage inventory of the server.
+
+        The walk happens at most once per memoized call, see
+        _memoize_resources. The returned inventory must not be modified.
+
+        :returns: a StorageInventory object.
+        """
+        resources = getattr(self._memo_scope, 'resources', None)
+        if resources is not None and _STORAGE_INVENTORY in resources:
+            return resources[_STORAGE_INVENTORY]
+        inventory = self._walk_storage()
+        if resources is not None:
+            resources[_STORAGE_INVENTORY] = inventory
+        return inventory
 
     def _get_logical_drive_resource(self):
         """Returns the LogicalDrives data."""
-        return self._get_drive_resource('LogicalDrives')
+        return self._get_storage_inventory().logical_drives or None
 
     def _get_physical_drive_resource(self):
         """Returns the PhysicalDrives data."""
-        return self._get_drive_resource('PhysicalDrives')
+        return self._get_storage_inventory().physical_drives or None
 
     def _get_logical_raid_levels(self):
         """Gets the different raid levels configured on a server.
@@ -450,9 +573,9 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
 
         :return: Raid support as a dictionary with true/false as its value.
         """
-        header, uri, array_resource = self._get_array_controller_resource()
+        array_controllers = self._get_storage_inventory().array_controllers
 
-        return True if array_resource['Total'] > 0 else False
+        return bool(array_controllers and array_controllers['Total'] > 0)
 
     def _get_bios_settings_resource(self, data):
         """Get the BIOS settings resource."""
@@ -462,13 +585,31 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = ('BIOS Settings resource not found.')
             raise exception.IloError(msg)
 
-        status, headers, bios_settings = self._rest_get(bios_settings_uri)
+        status, headers, bios_settings = self._get_memoized(bios_settings_uri)
         if status != 200:
             msg = self._get_extended_error(bios_settings)
             raise exception.IloError(msg)
 
         return headers, bios_settings_uri, bios_settings
 
+    def _get_pending_bios_settings(self, data):
+        """Get the pending BIOS settings, if they can be known.
+
+        :param data: Existing Bios settings of the server.
+        :returns: the pending BIOS settings as a dictionary, empty if the
+            BIOS has no settings resource, or None if they could not be
+            retrieved.
+        """
+        try:
+            bios_settings_uri = data['links']['Settings']['href']
+        except KeyError:
+            return {}
+
+        status, headers, bios_settings = self._get_memoized(bios_settings_uri)
+        if status != 200:
+            return None
+        return bios_settings
+
     def _validate_if_patch_supported(self, headers, uri):
         """Check if the PATCH Operation is allowed on the resource."""
         if not self._operation_allowed(headers, 'PATCH'):
@@ -491,10 +632,28 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         return request_headers
 
     def _change_bios_setting(self, properties):
-        """Change the bios settings to specified values."""
+        """Change the bios settings to specified values.
+
+        Only the settings which do not have the requested value pending,
+        or current when none is pending, are sent to the iLO.
+
+        :param properties: a dictionary of BIOS settings.
+        :returns: a dictionary of the BIOS settings which were changed.
+        :raises: IloError, on an error from iLO.
+        :raises: IloCommandNotSupportedError, if a setting is not supported.
+        """
         keys = properties.keys()
         # Check if the BIOS resource/property exists.
         headers, bios_uri, settings = self._check_bios_resource(keys)
+        pending = self._get_pending_bios_settings(settings)
+        if pending is not None:
+            properties = utils.get_changed_bios_settings(properties, settings,
+                                                         pending)
+            if not properties:
+                LOG.debug(self._("The BIOS settings already have the "
+                                 "requested values, nothing to apply."))
+                return properties
+
         if not self._operation_allowed(headers, 'PATCH'):
             headers, bios_uri, _ = self._get_bios_settings_resource(settings)
             self._validate_if_patch_supported(headers, bios_uri)
@@ -505,6 +664,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         if status >= 300:
             msg = self._get_extended_error(response)
             raise exception.IloError(msg)
+        return properties
 
     def _get_iscsi_settings_resource(self, data):
         """Get the iscsi settings resoure.
@@ -761,6 +921,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         system = self._get_host_details()
         return system['Model']
 
+    @_memoize_resources
     def get_secure_boot_mode(self):
         """Get the status of secure boot.
 
@@ -950,6 +1111,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         else:
             self._perform_power_op(POWER_STATE[power])
 
+    @_memoize_resources
     def get_http_boot_url(self):
         """Request the http boot url from system in uefi boot mode.
 
@@ -964,6 +1126,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = 'get_http_boot_url is not supported in the BIOS boot mode'
             raise exception.IloCommandNotSupportedInBiosError(msg)
 
+    @_memoize_resources
     def set_http_boot_url(self, url):
         """Set url to the UefiShellStartupUrl to the system in uefi boot mode.
 
@@ -978,6 +1141,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = 'set_http_boot_url is not supported in the BIOS boot mode'
             raise exception.IloCommandNotSupportedInBiosError(msg)
 
+    @_memoize_resources
     def set_iscsi_info(self, target_name, lun, ip_address,
                        port='3260', auth_method=None, username=None,
                        password=None, macs=[]):
@@ -1014,6 +1178,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = 'iSCSI boot is not supported in the BIOS boot mode'
             raise exception.IloCommandNotSupportedInBiosError(msg)
 
+    @_memoize_resources
     def unset_iscsi_info(self, macs=[]):
         """Disable iSCSI boot option in UEFI boot mode.
 
@@ -1029,6 +1194,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = 'iSCSI boot is not supported in the BIOS boot mode'
             raise exception.IloCommandNotSupportedInBiosError(msg)
 
+    @_memoize_resources
     def get_iscsi_initiator_info(self):
         """Give iSCSI initiator information of iLO.
 
@@ -1051,6 +1217,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
                    'does not exist')
             raise exception.IloCommandNotSupportedError(msg)
 
+    @_memoize_resources
     def set_iscsi_initiator_info(self, initiator_iqn):
         """Set iSCSI initiator information in iLO.
 
@@ -1071,6 +1238,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = 'iSCSI initiator cannot be set in the BIOS boot mode'
             raise exception.IloCommandNotSupportedError(msg)
 
+    @_memoize_resources
     def get_current_boot_mode(self):
         """Retrieves the current boot mode of the server.
 
@@ -1083,6 +1251,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
 
         return boot_mode.upper()
 
+    @_memoize_resources
     def get_pending_boot_mode(self):
         """Retrieves the pending boot mode of the server.
 
@@ -1097,6 +1266,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             boot_mode = 'legacy'
         return boot_mode.upper()
 
+    @_memoize_resources
     def set_pending_boot_mode(self, boot_mode):
         """Sets the boot mode of the system for next boot.
 
@@ -1122,6 +1292,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         # Change the Boot Mode
         self._change_bios_setting(boot_properties)
 
+    @_memoize_resources
     def get_supported_boot_mode(self):
         """Retrieves the supported boot mode.
 
@@ -1209,6 +1380,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         # Check if the iLO is up again.
         common.wait_for_ilo_after_reset(self)
 
+    @_memoize_resources
     def reset_bios_to_default(self):
         """Resets the BIOS settings to default values.
 
@@ -1283,14 +1455,57 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         """Return sriov enabled or not"""
         return (self._get_bios_setting('Sriov') == 'Enabled')
 
+    def _get_capabilities_fingerprint(self):
+        """Returns the fingerprint of the hardware the capabilities reflect.
+
+        It is made of the ETags of the system and BIOS resources, the
+        model and firmware versions, and the numbers of PCI devices and
+        array controllers.
+
+        :returns: the fingerprint, a string.
+        :raises: IloError, on an error from iLO.
+        """
+        status, headers, system = self._get_memoized('/rest/v1/Systems/1')
+        bios_headers, bios_uri, bios_settings = self._check_bios_resource()
+        manager, manager_uri = self._get_ilo_details()
+        try:
+            pci_devices = self._get_pci_devices().get('Total')
+        except exception.IloCommandNotSupportedError:
+            pci_devices = None
+        try:
+            array_controllers = self._get_array_controller_resource()
+        except exception.IloCommandNotSupportedError:
+            array_controllers = None
+        if array_controllers is not None:
+            array_controllers = array_controllers[2].get('Total')
+        return json.dumps([
+            headers.get('etag'), system['Model'],
+            system['Oem']['Hp']['Bios']['Current']['VersionString'],
+            manager['Firmware']['Current']['VersionString'],
+            bios_headers.get('etag'), pci_devices, array_controllers])
+
+    @_memoize_resources
     def get_server_capabilities(self):
         """Gets server properties which can be used for scheduling
 
+        When the content cache is enabled, the capabilities are memoized
+        by the fingerprint of the hardware and only computed again when it
+        changes.
+
         :returns: a dictionary of hardware properties like firmware
                   versions, server model.
         :raises: IloError, if iLO returns an error in command execution.
 
         """
+        system = self._get_host_details()
+        fingerprint = None
+        if content_cache.get_cache() is not None:
+            fingerprint = self._get_capabilities_fingerprint()
+        return content_cache.fetch(content_cache.CAPABILITIES,
+                                   system.get('UUID'), fingerprint,
+                                   self._get_server_capabilities)
+
+    def _get_server_capabilities(self):
         capabilities = {}
         system = self._get_host_details()
         capabilities['server_model'] = system['Model']
@@ -1585,6 +1800,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
 
         return boot_sources, boot_order
 
+    @_memoize_resources
     def get_persistent_boot_device(self):
         """Get current persistent boot device set for the host
 
@@ -1693,6 +1909,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = self._get_extended_error(response)
             raise exception.IloError(msg)
 
+    @_memoize_resources
     def update_persistent_boot(self, device_type=[]):
         """Changes the persistent boot device order for the host
 
@@ -1710,6 +1927,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
 
         self._update_persistent_boot(device_type, persistent=True)
 
+    @_memoize_resources
     def set_one_time_boot(self, device):
         """Configures a single boot from a specific device.
 
@@ -1720,6 +1938,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         """
         self._update_persistent_boot([device], persistent=False)
 
+    @_memoize_resources
     def get_one_time_boot(self):
         """Retrieves the current setting for the one time boot.
 
@@ -1774,6 +1993,45 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         :raises: IloCommandNotSupportedError, if the command is
                  not supported on the server
         """
+        self._request_firmware_update(file_url)
+
+        # wait till the firmware update completes.
+        common.wait_for_ris_firmware_update_to_complete(self)
+        self._check_firmware_update_result(file_url)
+
+    @firmware_controller.check_firmware_update_component
+    def start_firmware_update(self, file_url, component_type):
+        """Starts updating the given firmware without waiting for the end.
+
+        :param file_url: location of the raw firmware file. Extraction of the
+                         firmware file (if in compact format) is expected to
+                         happen prior to this invocation.
+        :param component_type: Type of component to be applied to.
+        :returns: a common.FirmwareUpdateJob object, to follow the progress
+                  and wait for the end of the update.
+        :raises: InvalidInputError, if the validation of the input fails
+        :raises: IloError, on an error from iLO
+        :raises: IloConnectionError, if not able to reach iLO.
+        :raises: IloCommandNotSupportedError, if the command is
+                 not supported on the server
+        """
+        self._request_firmware_update(file_url)
+
+        def _supervise(progress_callback):
+            common.wait_for_ris_firmware_update_to_complete(
+                self, progress_callback=progress_callback)
+            self._check_firmware_update_result(file_url)
+
+        return common.FirmwareUpdateJob(
+            file_url, state='IDLE', percent=0).start(_supervise)
+
+    def _request_firmware_update(self, file_url):
+        """Requests the iLO to flash the firmware.
+
+        :param file_url: location of the raw firmware file.
+        :raises: IloError, on an error from iLO
+        :raises: IloConnectionError, if not able to reach iLO.
+        """
         fw_update_uri = self._get_firmware_update_service_resource()
         action_data = {
             'Action': 'InstallFromURI',
@@ -1788,9 +2046,12 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
             msg = self._get_extended_error(response)
             raise exception.IloError(msg)
 
-        # wait till the firmware update completes.
-        common.wait_for_ris_firmware_update_to_complete(self)
+    def _check_firmware_update_result(self, file_url):
+        """Checks the final state of a completed firmware update.
 
+        :param file_url: location of the raw firmware file.
+        :raises: IloError, if the firmware update failed.
+        """
         try:
             state, percent = self.get_firmware_update_progress()
         except exception.IloError:
@@ -1914,6 +2175,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         raise exception.IloError("Attribute 'Oem/Hp/PostState' "
                                  "not found on system.")
 
+    @_memoize_resources
     def get_current_bios_settings(self, only_allowed_settings=False):
         """Get current BIOS settings.
 
@@ -1936,6 +2198,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
                 bios_settings, constants.SUPPORTED_BIOS_PROPERTIES)
         return bios_settings
 
+    @_memoize_resources
     def get_pending_bios_settings(self, only_allowed_settings=False):
         """Get current BIOS settings.
 
@@ -1971,6 +2234,7 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
                 config, constants.SUPPORTED_BIOS_PROPERTIES)
         return config
 
+    @_memoize_resources
     def set_bios_settings(self, data=None, only_allowed_settings=False):
         """Sets current BIOS settings to the provided data.
 
@@ -1981,6 +2245,8 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
                 on the 'only_allowed_settings', either only the allowed
                 settings are set or all the supported settings that are in
                 the 'data' are set.
+        :returns: a dictionary of the BIOS settings which were changed,
+                 empty if all of them already had the requested values.
         :raises: IloError, on an error from iLO.
         :raises: IloCommandNotSupportedError, if the command is not supported
                  on the server.
@@ -2000,8 +2266,9 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
                            constants.SUPPORTED_BIOS_PROPERTIES))
                 raise exception.IloError(msg)
 
-        self._change_bios_setting(data)
+        return self._change_bios_setting(data)
 
+    @_memoize_resources
     def get_default_bios_settings(self, only_allowed_settings=False):
         """Get default BIOS settings.
 
@@ -2016,6 +2283,20 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         :raises: IloCommandNotSupportedError, if the command is not supported
                  on the server.
         """
+        system = self._get_host_details()
+        rom_version = system['Oem']['Hp'].get('Bios', {}).get(
+            'Current', {}).get('VersionString')
+        default_settings = content_cache.fetch(
+            content_cache.BIOS_DEFAULTS, system.get('Model'), rom_version,
+            self._get_default_bios_settings)
+
+        if only_allowed_settings:
+            return utils.apply_bios_properties_filter(
+                default_settings, constants.SUPPORTED_BIOS_PROPERTIES)
+        return default_settings
+
+    def _get_default_bios_settings(self):
+        """Gets the default BIOS settings from the BaseConfigs resource."""
         headers_bios, bios_uri, bios_settings = self._check_bios_resource()
         # Get the BaseConfig resource.
         try:
@@ -2033,16 +2314,10 @@ class RISOperations(rest.RestConnectorBase, operations.IloOperations):
         for cfg in config['BaseConfigs']:
             default_settings = cfg.get('default')
             if default_settings:
-                break
-        else:
-            msg = ("Default BIOS Settings not found in 'BaseConfigs' "
-                   "resource.")
-            raise exception.IloCommandNotSupportedError(msg)
-
-        if only_allowed_settings:
-            return utils.apply_bios_properties_filter(
-                default_settings, constants.SUPPORTED_BIOS_PROPERTIES)
-        return default_settings
+                return default_settings
+        msg = ("Default BIOS Settings not found in 'BaseConfigs' "
+               "resource.")
+        raise exception.IloCommandNotSupportedError(msg)
 
     def _raise_command_not_supported(self, method):
         platform = self.get_product_name()
@@ -0,0 +1,129 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Latency based choice between the protocols able to run a method."""
+
+import threading
+
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+# Read methods returning the same values whichever of RIBCL or Redfish
+# runs them, and which can therefore go to either.
+ADAPTIVE_METHODS = frozenset([
+    'get_current_boot_mode',
+    'get_host_power_status',
+    'get_pending_boot_mode',
+    'get_product_name',
+    'get_supported_boot_mode',
+])
+
+
+class LatencyRouter(object):
+    """Routes methods to the protocol which has been the fastest for them.
+
+    Every protocol able to run a method is first tried ``min_samples``
+    times. The method then goes to the protocol with the lowest moving
+    average of latency, while one call out of ``probe_interval`` goes to
+    another one so that its latency stays up to date.
+    """
+
+    def __init__(self, min_samples=3, probe_interval=50, smoothing=0.2):
+        """Constructor for LatencyRouter.
+
+        :param min_samples: number of calls timed on every protocol before
+            choosing between them.
+        :param probe_interval: one call out of this number goes to a
+            protocol other than the fastest one.
+        :param smoothing: weight of the latest call in the moving average
+            of the latency, between 0 and 1.
+        """
+        self.min_samples = min_samples
+        self.probe_interval = probe_interval
+        self.smoothing = smoothing
+        self._lock = threading.Lock()
+        # (method name, protocol) -> [number of samples, average latency]
+        self._latencies = {}
+        self._calls = {}
+        self._disabled = set()
+
+    def choose(self, method_name, protocols):
+        """Chooses the protocol to run a method with.
+
+        :param method_name: name of the method.
+        :param protocols: sequence of the protocols able to run the method,
+            the preferred one first.
+        :returns: one of the protocols.
+        """
+        candidates = [protocol for protocol in protocols
+                      if (method_name, protocol) not in self._disabled]
+        if len(candidates) < 2:
+            return candidates[0] if candidates else protocols[0]
+
+        with self._lock:
+            calls = self._calls[method_name] = (
+                self._calls.get(method_name, 0) + 1)
+            stats = [self._latencies.get((method_name, protocol), [0, 0.0])
+                     for protocol in candidates]
+            for protocol, (samples, latency) in zip(candidates, stats):
+                if samples < self.min_samples:
+                    return protocol
+            ranked = [protocol for protocol, (samples, latency) in sorted(
+                zip(candidates, stats), key=lambda item: item[1][1])]
+        if self.probe_interval and calls % self.probe_interval == 0:
+            others = ranked[1:]
+            return others[(calls // self.probe_interval) % len(others)]
+        return ranked[0]
+
+    def record(self, method_name, protocol, elapsed):
+        """Records the latency of a successful call.
+
+        :param method_name: name of the method.
+        :param protocol: the protocol which ran it.
+        :param elapsed: duration of the call in seconds.
+        """
+        with self._lock:
+            stats = self._latencies.setdefault((method_name, protocol),
+                                               [0, elapsed])
+            stats[0] += 1
+            stats[1] += self.smoothing * (elapsed - stats[1])
+
+    def disable(self, method_name, protocol):
+        """Stops routing a method to a protocol which failed to run it.
+
+        :param method_name: name of the method.
+        :param protocol: the protocol which failed.
+        """
+        LOG.debug('Not routing %(method)s to %(protocol)s anymore.',
+                  {'method': method_name, 'protocol': protocol})
+        with self._lock:
+            self._disabled.add((method_name, protocol))
+
+    def get_stats(self):
+        """Returns the latencies measured so far.
+
+        :returns: a dictionary of method name to a dictionary of protocol
+            to the number of 'samples' and the average 'latency' in
+            seconds, and whether the protocol is 'disabled'.
+        """
+        with self._lock:
+            stats = {}
+            for (method_name, protocol), (samples, latency) in (
+                    self._latencies.items()):
+                stats.setdefault(method_name, {})[protocol] = {
+                    'samples': samples, 'latency': latency,
+                    'disabled': (method_name, protocol) in self._disabled}
+            return stats
@@ -16,13 +16,17 @@
 __author__ = 'HPE'
 
 import os
+import time
 
 from pysnmp import hlapi
+from pysnmp.proto import errind
 from pysnmp.smi import builder
 from pysnmp.smi import view
 
+from proliantutils import circuit_breaker
 from proliantutils import exception
 from proliantutils import log
+from proliantutils import timeouts
 
 LOG = log.get_logger(__name__)
 
@@ -40,6 +44,13 @@ mBuilder.addMibSources(builder.DirMibSource(cpq_mibs_path))
 mibBuilder = mBuilder.loadModules('CPQIDA-MIB', 'CPQSCSI-MIB')
 mibViewController = view.MibViewController(mibBuilder)
 
+# Timeout in seconds of one SNMP request and number of retries after it.
+SNMP_TIMEOUT = 3
+SNMP_RETRIES = 3
+# Minimum timeout in seconds derived from the latency of the iLO.
+SNMP_TIMEOUT_FLOOR = 1
+SNMP_OPERATION = ('snmp', timeouts.READ)
+
 # A dictionary of supported mapped snmp attributes
 MAPPED_SNMP_ATTRIBUTES = {
     'authProtocol': {
@@ -116,17 +127,35 @@ def _parse_mibs(iLOIP, snmp_credentials):
     :raises exception.InvalidInputError if pysnmp is unable to get
             SNMP data due to wrong inputs provided.
     :raises exception.IloError if pysnmp raises any exception.
+    :raises exception.IloCircuitOpenError if the last SNMP requests to
+            the iLO timed out.
+    :raises exception.IloDeadlineExceededError if the deadline of the
+            call has passed.
     """
     result = {}
     usm_user_obj = _create_usm_user_obj(snmp_credentials)
+    timeout = timeouts.get_timeouts(iLOIP, SNMP_OPERATION, SNMP_TIMEOUT,
+                                    read_floor=SNMP_TIMEOUT_FLOOR)[1]
+    retries = SNMP_RETRIES
+    remaining = timeouts.get_remaining(iLOIP)
+    if remaining is not None:
+        # Note: Fit the retries within the time left; pysnmp has no
+        # overall timeout of its own.
+        retries = max(min(retries, int(remaining // timeout) - 1), 0)
+    tracker = timeouts.get_tracker(iLOIP)
+    breaker = circuit_breaker.get_breaker(iLOIP)
+    breaker.before_call()
+    timed_out = False
     try:
+        started = time.monotonic()
         for(errorIndication,
             errorStatus,
             errorIndex,
             varBinds) in hlapi.nextCmd(
                 hlapi.SnmpEngine(),
                 usm_user_obj,
-                hlapi.UdpTransportTarget((iLOIP, 161), timeout=3, retries=3),
+                hlapi.UdpTransportTarget((iLOIP, 161), timeout=timeout,
+                                         retries=retries),
                 hlapi.ContextData(),
                 # cpqida cpqDaPhyDrvTable Drive Array Physical Drive Table
                 hlapi.ObjectType(
@@ -142,6 +171,9 @@ def _parse_mibs(iLOIP, snmp_credentials):
 
             if errorIndication:
                 LOG.error(errorIndication)
+                timed_out = isinstance(errorIndication, errind.RequestTimedOut)
+                if timed_out:
+                    tracker.record(SNMP_OPERATION, timeout)
                 msg = "SNMP failed to traverse MIBs %s", errorIndication
                 raise exception.IloSNMPInvalidInputFailure(msg)
             else:
@@ -153,6 +185,8 @@ def _parse_mibs(iLOIP, snmp_credentials):
                     LOG.error(msg)
                     raise exception.IloSNMPInvalidInputFailure(msg)
                 else:
+                    tracker.record(SNMP_OPERATION,
+                                   time.monotonic() - started)
                     for varBindTableRow in varBinds:
                         name, val = tuple(varBindTableRow)
                         oid, label, suffix = (
@@ -167,10 +201,13 @@ def _parse_mibs(iLOIP, snmp_credentials):
                             result[key] = {}
                             result[key][label[-1]] = {}
                         result[key][label[-1]][suffix] = val
+            started = time.monotonic()
     except Exception as e:
         msg = "SNMP library failed with error %s", e
         LOG.error(msg)
         raise exception.IloSNMPExceptionFailure(msg)
+    finally:
+        breaker.end_call(timed_out)
     return result
 
 
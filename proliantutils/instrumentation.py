@@ -0,0 +1,300 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Instrumentation hooks for the requests sent to the iLO.
+
+Every HTTP request issued by the RIBCL, RIS and Redfish transports is
+reported to the registered hooks, once when it starts and once when it
+ends::
+
+    from proliantutils import instrumentation
+
+    histogram = instrumentation.HistogramHook()
+    instrumentation.register_hook(histogram)
+    ...
+    print(histogram.snapshot())
+
+Hooks must be cheap and must not block; errors raised by a hook are
+logged and otherwise ignored.
+"""
+
+import bisect
+import contextlib
+import re
+import threading
+import time
+
+from six.moves.urllib import parse as urlparse
+
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+PROTOCOL_RIBCL = 'ribcl'
+PROTOCOL_RIS = 'ris'
+PROTOCOL_REDFISH = 'redfish'
+
+_ID_SEGMENT = re.compile(
+    r'^(\d+|[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-'
+    r'[0-9a-fA-F]{4}-[0-9a-fA-F]{12})$')
+
+_hooks = []
+_hooks_lock = threading.Lock()
+
+
+def get_uri_template(uri):
+    """Returns the URI with host, query and identifiers stripped.
+
+    For example, ``https://1.2.3.4/redfish/v1/Systems/1/?$expand=.``
+    becomes ``/redfish/v1/Systems/{id}/``.
+
+    :param uri: an absolute URL or a path.
+    :returns: the templated path.
+    """
+    path = urlparse.urlparse(uri).path
+    return '/'.join('{id}' if _ID_SEGMENT.match(segment) else segment
+                    for segment in path.split('/'))
+
+
+def get_response_size(response):
+    """Returns the size of the body of a response, as received.
+
+    :param response: a requests.Response object.
+    :returns: the number of bytes of the body, compressed if it was.
+    """
+    # Note: urllib3 counts the bytes read from the connection, before
+    # they are decompressed.
+    size = getattr(getattr(response, 'raw', None), 'tell', lambda: None)()
+    if isinstance(size, int) and size:
+        return size
+    return len(response.content or b'')
+
+
+class RequestInfo(object):
+    """Details of one request sent to the iLO.
+
+    ``status``, ``bytes_in``, ``elapsed`` and ``error`` are only known
+    when the request ends. ``queue_wait`` is the part of ``elapsed``
+    spent waiting for the per-host limits of
+    :mod:`proliantutils.throttling`.
+    """
+
+    def __init__(self, host, protocol, method, uri, operation=None,
+                 bytes_out=0):
+        self.host = host
+        self.protocol = protocol
+        self.method = method
+        self.uri_template = get_uri_template(uri)
+        # Protocol specific name of the operation, e.g. the RIBCL command.
+        self.operation = operation
+        self.status = None
+        self.bytes_out = bytes_out
+        self.bytes_in = 0
+        self.attempts = 0
+        self.elapsed = None
+        self.queue_wait = 0.0
+        self.error = None
+
+    @property
+    def retries(self):
+        return max(self.attempts - 1, 0)
+
+    def attempt(self):
+        """Records one (re)try of the request."""
+        self.attempts += 1
+
+    def __repr__(self):
+        return ('<RequestInfo %(protocol)s %(method)s %(host)s%(uri)s '
+                'status=%(status)s elapsed=%(elapsed)s>' %
+                {'protocol': self.protocol, 'method': self.method,
+                 'host': self.host, 'uri': self.uri_template,
+                 'status': self.status, 'elapsed': self.elapsed})
+
+
+class InstrumentationHook(object):
+    """Base class of the instrumentation hooks."""
+
+    def on_request_start(self, info):
+        """Called before the request is sent.
+
+        :param info: a RequestInfo object.
+        """
+
+    def on_request_end(self, info):
+        """Called once the request completed or failed.
+
+        :param info: a RequestInfo object.
+        """
+
+
+def register_hook(hook):
+    """Registers an instrumentation hook for all the transports.
+
+    :param hook: an InstrumentationHook object.
+    """
+    global _hooks
+    with _hooks_lock:
+        # Note: Replace the list rather than appending to it, so that
+        # requests in flight iterate a stable snapshot without locking.
+        _hooks = _hooks + [hook]
+
+
+def unregister_hook(hook):
+    """Removes a previously registered instrumentation hook.
+
+    :param hook: an InstrumentationHook object.
+    """
+    global _hooks
+    with _hooks_lock:
+        _hooks = [h for h in _hooks if h is not hook]
+
+
+def is_enabled():
+    """Returns True if any instrumentation hook is registered."""
+    return bool(_hooks)
+
+
+def _fire(hooks, event, info):
+    for hook in hooks:
+        try:
+            getattr(hook, event)(info)
+        except Exception as e:
+            LOG.debug('Instrumentation hook %(hook)r failed on %(event)s: '
+                      '%(error)s', {'hook': hook, 'event': event, 'error': e})
+
+
+@contextlib.contextmanager
+def track_request(host, protocol, method, uri, operation=None, bytes_out=0):
+    """Context manager reporting a request to the registered hooks.
+
+    The caller fills in ``status``, ``bytes_in`` and calls ``attempt()``
+    on the yielded RequestInfo. Exceptions propagate unchanged; their
+    class name is recorded as ``error`` and an HTTP status carried by
+    the exception, if any, as ``status``.
+
+    :param host: iLO address.
+    :param protocol: one of PROTOCOL_RIBCL, PROTOCOL_RIS or
+        PROTOCOL_REDFISH.
+    :param method: HTTP method.
+    :param uri: URL or path of the request.
+    :param operation: protocol specific name of the operation.
+    :param bytes_out: size of the request body.
+    :returns: a RequestInfo object, or None when no hook is registered.
+    """
+    hooks = _hooks
+    if not hooks:
+        yield None
+        return
+
+    info = RequestInfo(host, protocol, method, uri, operation=operation,
+                       bytes_out=bytes_out)
+    _fire(hooks, 'on_request_start', info)
+    start = time.monotonic()
+    try:
+        yield info
+    except Exception as e:
+        info.error = type(e).__name__
+        if info.status is None:
+            info.status = getattr(e, 'status_code', None)
+        raise
+    finally:
+        info.elapsed = time.monotonic() - start
+        _fire(hooks, 'on_request_end', info)
+
+
+class StatsdHook(InstrumentationHook):
+    """Reports requests as statsd style counters and timers.
+
+    The client is any object with the ``incr(name, count)`` and
+    ``timing(name, milliseconds)`` methods of the common statsd clients.
+    Metric names are ``<prefix>.<protocol>.<metric>``; per host or per
+    URI names are avoided on purpose to keep the number of metrics
+    bounded.
+    """
+
+    def __init__(self, client, prefix='proliantutils'):
+        self.client = client
+        self.prefix = prefix
+
+    def on_request_end(self, info):
+        name = '%s.%s' % (self.prefix, info.protocol)
+        self.client.incr(name + '.requests', 1)
+        if info.error or (info.status is not None and info.status >= 400):
+            self.client.incr(name + '.errors', 1)
+        if info.retries:
+            self.client.incr(name + '.retries', info.retries)
+        self.client.incr(name + '.bytes_in', info.bytes_in)
+        self.client.incr(name + '.bytes_out', info.bytes_out)
+        self.client.timing('%s.%s' % (name, info.method.lower()),
+                           info.elapsed * 1000)
+        if info.queue_wait:
+            self.client.timing(name + '.queue_wait', info.queue_wait * 1000)
+
+
+class HistogramHook(InstrumentationHook):
+    """Aggregates request latencies in memory.
+
+    Requests are grouped by host, protocol, method and URI template
+    (RIBCL requests by command). Each group keeps the count, the total,
+    minimum and maximum latency, the transferred bytes and a latency
+    histogram over ``buckets`` (upper bounds in seconds).
+    """
+
+    DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._stats = {}
+
+    def on_request_end(self, info):
+        key = (info.host, info.protocol, info.method,
+               info.operation or info.uri_template)
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = {'count': 0, 'errors': 0, 'retries': 0,
+                         'total': 0.0, 'min': None, 'max': None,
+                         'bytes_in': 0, 'bytes_out': 0,
+                         'buckets': [0] * (len(self.buckets) + 1)}
+                self._stats[key] = stats
+            stats['count'] += 1
+            if info.error or (info.status is not None and info.status >= 400):
+                stats['errors'] += 1
+            stats['retries'] += info.retries
+            stats['total'] += info.elapsed
+            stats['min'] = (info.elapsed if stats['min'] is None
+                            else min(stats['min'], info.elapsed))
+            stats['max'] = (info.elapsed if stats['max'] is None
+                            else max(stats['max'], info.elapsed))
+            stats['bytes_in'] += info.bytes_in
+            stats['bytes_out'] += info.bytes_out
+            stats['buckets'][bisect.bisect_left(self.buckets,
+                                                info.elapsed)] += 1
+
+    def snapshot(self):
+        """Returns a copy of the aggregated data.
+
+        :returns: a dictionary keyed by (host, protocol, method,
+            operation or URI template) tuples.
+        """
+        with self._lock:
+            return {key: dict(value, buckets=list(value['buckets']))
+                    for key, value in self._stats.items()}
+
+    def reset(self):
+        """Drops the aggregated data."""
+        with self._lock:
+            self._stats = {}
@@ -44,7 +44,7 @@ _FIRMWARE_UPDATE_SUM_ARGSINFO = {
     },
     'checksum': {
         'description': (
-            "The md5 checksum of the SPP image file."
+            "The md5, sha256 or sha512 checksum of the SPP image file."
         ),
         'required': True,
     },
@@ -258,7 +258,8 @@ class ProliantHardwareManager(hardware.GenericHardwareManager):
         :param port: A list of dictionaries containing information of ports
             for the node.
         :param url: URL of SPP (Service Pack for Proliant) ISO.
-        :param checksum: MD5 checksum of SPP ISO to verify the image.
+        :param checksum: MD5, SHA-256 or SHA-512 checksum of SPP ISO to
+            verify the image.
         :param components: List of filenames of the firmware components to be
             flashed. If not provided, the firmware update is performed on all
             the firmware components.
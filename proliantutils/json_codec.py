@@ -0,0 +1,116 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Encoding and decoding of the JSON documents exchanged with the iLOs.
+
+BIOS attributes and mappings, PCI devices and storage configurations are
+large documents, and decoding them with the standard library costs CPU
+time for every request. The codec used is the fastest one installed,
+orjson when available, and can be chosen with set_codec()::
+
+    from proliantutils import json_codec
+
+    json_codec.set_codec('json')
+
+A document the selected codec cannot encode, e.g. with non string keys,
+is encoded with the standard library instead.
+"""
+
+import json
+
+from oslo_utils import importutils
+
+from proliantutils import exception
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+orjson = importutils.try_import('orjson')
+
+JSON = 'json'
+ORJSON = 'orjson'
+
+
+def _orjson_dumps(obj):
+    try:
+        return orjson.dumps(obj).decode('utf-8')
+    except TypeError:
+        return json.dumps(obj)
+
+
+_CODECS = {JSON: (json.loads, json.dumps)}
+if orjson is not None:
+    _CODECS[ORJSON] = (orjson.loads, _orjson_dumps)
+
+# Codecs by order of preference.
+_PREFERENCE = (ORJSON, JSON)
+
+_codec = None
+_loads = None
+_dumps = None
+
+
+def get_available_codecs():
+    """Returns the names of the codecs which can be used.
+
+    :returns: a list of codec names, the fastest first.
+    """
+    return [name for name in _PREFERENCE if name in _CODECS]
+
+
+def get_codec():
+    """Returns the name of the codec in use."""
+    return _codec
+
+
+def set_codec(name=None):
+    """Selects the codec to use.
+
+    :param name: name of the codec, None for the fastest one available.
+    :raises: InvalidInputError, if the codec is not available.
+    """
+    global _codec, _loads, _dumps
+    if name is None:
+        name = get_available_codecs()[0]
+    if name not in _CODECS:
+        raise exception.InvalidInputError(
+            'JSON codec %(name)s is not available, use one of %(codecs)s.',
+            name=name, codecs=', '.join(get_available_codecs()))
+    _loads, _dumps = _CODECS[name]
+    _codec = name
+    LOG.debug('Using the %s JSON codec.', name)
+
+
+def loads(data):
+    """Decodes a JSON document.
+
+    :param data: the document, as str or bytes.
+    :returns: the decoded object.
+    :raises: ValueError, if the document is not valid JSON.
+    """
+    return _loads(data)
+
+
+def dumps(obj):
+    """Encodes an object as a JSON document.
+
+    :param obj: the object to encode.
+    :returns: the document, as str.
+    :raises: TypeError, if the object cannot be encoded.
+    """
+    return _dumps(obj)
+
+
+set_codec()
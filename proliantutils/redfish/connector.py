@@ -14,11 +14,48 @@
 
 __author__ = 'HPE'
 
+import contextlib
+import functools
+import json
+import re
+
 import retrying
 from six.moves.urllib.parse import urlparse
 from sushy import connector
 from sushy import exceptions
 
+from proliantutils import circuit_breaker
+from proliantutils import instrumentation
+from proliantutils import json_codec
+from proliantutils import single_flight
+from proliantutils import throttling
+from proliantutils import timeouts
+from proliantutils import tls
+
+
+# Note: sushy raises ConnectionError for all the failures to reach the
+# BMC, timeouts included.
+_CONNECTION_FAILURES = (exceptions.ConnectionError,)
+
+# Content codings accepted for the responses to GET requests of the large
+# documents.
+ACCEPT_ENCODING = 'gzip, deflate'
+
+# Paths of the large documents which are only read: the BIOS attributes,
+# mappings and base configs, the attribute registries, the PCI devices and
+# the storage resources. The others keep the identity coding sushy asks
+# for, since the iLO gives weak ETags to compressed responses and sushy
+# sends the ETags of the resources it PATCHes in If-Match.
+_COMPRESSED_PATHS = re.compile(
+    r'/(bios(/mappings|/baseconfigs)?'
+    r'|pcidevices(/[^/]+)?'
+    r'|(smartstorage|storage)(/.*)?'
+    r'|(registries|registrystore)/.*)/?$', re.IGNORECASE)
+
+
+def _decode_json(response, **kwargs):
+    return json_codec.loads(response.content)
+
 
 class HPEConnector(connector.Connector):
     """Class that extends base Sushy Connector class
@@ -30,13 +67,20 @@ class HPEConnector(connector.Connector):
     MAX_RETRY_ATTEMPTS = 3  # Maximum number of attempts to be retried
     MAX_TIME_BEFORE_RETRY = 2 * 1000  # wait time in milliseconds before retry
 
-    @retrying.retry(
-        retry_on_exception=(
-            lambda e: isinstance(e, exceptions.ConnectionError)),
-        stop_max_attempt_number=MAX_RETRY_ATTEMPTS,
-        wait_fixed=MAX_TIME_BEFORE_RETRY)
+    def __init__(self, url, *args, **kwargs):
+        super(HPEConnector, self).__init__(url, *args, **kwargs)
+        # Note: sushy mounts its own adapter when asked for a TLS version
+        # or ciphers; otherwise connect with the SSL context shared with
+        # the other protocols, which resumes the TLS sessions.
+        if not (kwargs.get('tls_min_version') or kwargs.get('tls_ciphers')):
+            self._session.mount('https://', tls.SSLContextAdapter(
+                tls.get_ssl_context(self._verify)))
+        # Note: Concurrent identical GETs share one request and its
+        # response, whose body is already read when it is returned.
+        self._get_flight = single_flight.SingleFlight()
+
     def _op(self, method, path='', data=None, headers=None,
-            blocking=False, timeout=60):
+            blocking=False, timeout=60, **kwargs):
         """Overrides the base method to support retrying the operation.
 
         :param method: The HTTP method to be used, e.g: GET, POST,
@@ -46,16 +90,117 @@ class HPEConnector(connector.Connector):
         :param headers: Optional dictionary of headers.
         :param blocking: Whether to block for asynchronous operations.
         :param timeout: Max time in seconds to wait for blocking async call.
+        :param kwargs: Optional keyword arguments of the
+            connector.Connector's _op method.
         :returns: The response from the connector.Connector's _op method.
         """
-        resp = super(HPEConnector, self)._op(method, path, data=data,
-                                             headers=headers,
-                                             blocking=blocking,
-                                             timeout=timeout,
-                                             allow_redirects=False)
+        if kwargs.get('server_side_retries_left') is not None:
+            # Note: sushy sends the request again this way, e.g. once it
+            # renewed the session after a 401, from within the request
+            # being run, which already went through the single flight,
+            # the circuit breaker and the limiter.
+            return super(HPEConnector, self)._op(
+                method, path, data=data, headers=headers, blocking=blocking,
+                timeout=timeout, **kwargs)
+        if method == 'GET' and data is None:
+            # Note: the large documents, e.g. BIOS attributes and mappings,
+            # are several times smaller compressed.
+            if (_COMPRESSED_PATHS.search(urlparse(path).path)
+                    and not any(name.lower() == 'accept-encoding'
+                                for name in headers or {})):
+                headers = dict(headers or {},
+                               **{'Accept-Encoding': ACCEPT_ENCODING})
+            key = (path, tuple(sorted((headers or {}).items())), blocking,
+                   timeout, tuple(sorted(kwargs.items())))
+            return self._get_flight.do(key, self._tracked_op, method, path,
+                                       headers=headers, blocking=blocking,
+                                       timeout=timeout, **kwargs)
+        return self._tracked_op(method, path, data=data, headers=headers,
+                                blocking=blocking, timeout=timeout, **kwargs)
+
+    def _tracked_op(self, method, path, data=None, headers=None,
+                    blocking=False, timeout=60, **kwargs):
+        with instrumentation.track_request(
+                urlparse(self._url).netloc, instrumentation.PROTOCOL_REDFISH,
+                method, path) as info:
+            # Note: requests encodes the body with the json module.
+            if info and data is not None:
+                info.bytes_out = len(json.dumps(data))
+            resp = self._retried_op(info, method, path, data=data,
+                                    headers=headers, blocking=blocking,
+                                    timeout=timeout, **kwargs)
+            # Note: sushy decodes the responses with ``resp.json()``.
+            resp.json = functools.partial(_decode_json, resp)
+            if info:
+                info.status = resp.status_code
+                info.bytes_in = instrumentation.get_response_size(resp)
+            return resp
+
+    def open_stream(self, path, timeout):
+        """Opens a response whose body is read as it comes.
+
+        Used for the streams of events, which are not retried, throttled
+        nor instrumented like the other requests as they last for long.
+        :param path: The sub-URI path to the stream.
+        :param timeout: Tuple of the time in seconds to connect and to
+            wait for the next data of the stream.
+        :returns: The response, to be closed by the caller.
+        """
+        return super(HPEConnector, self)._op(
+            'GET', path, headers={'Accept': 'text/event-stream'},
+            timeout=timeout, stream=True)
+
+    @retrying.retry(
+        retry_on_exception=(
+            lambda e: isinstance(e, exceptions.ConnectionError)),
+        stop_max_attempt_number=MAX_RETRY_ATTEMPTS,
+        wait_fixed=MAX_TIME_BEFORE_RETRY)
+    def _retried_op(self, info, method, path, data=None, headers=None,
+                    blocking=False, timeout=60, **kwargs):
+        if info:
+            info.attempt()
+        # Note: sushy's get() and the other methods pass timeout=None for
+        # its default timeout.
+        if timeout is None:
+            timeout = (getattr(self, '_default_request_timeout', None)
+                       or timeouts.DEFAULT_TIMEOUT)
+        host = urlparse(self._url).hostname
+        operation = (instrumentation.PROTOCOL_REDFISH,
+                     timeouts.get_operation_class(method))
+        connect_timeout, read_timeout = timeouts.get_timeouts(
+            host, operation, timeout)
+        # Note: sushy also waits for up to ``timeout`` seconds for the
+        # asynchronous operations to end when blocking. That wait, which
+        # can last minutes, is not a latency of the iLO and the blocking
+        # operations are not measured.
+        request_timeout = (read_timeout if blocking
+                           else (connect_timeout, read_timeout))
+        measured = (contextlib.nullcontext() if blocking
+                    else timeouts.measure(host, operation, read_timeout))
+        # Note: waiting for the limiter says nothing of the host, it is
+        # done before the call goes through the circuit breaker.
+        with throttling.limit(host, info,
+                              timeout=timeouts.get_remaining(host)), \
+                circuit_breaker.guard(host, failures=_CONNECTION_FAILURES), \
+                measured:
+            resp = super(HPEConnector, self)._op(
+                method, path, data=data, headers=headers, blocking=blocking,
+                timeout=request_timeout,
+                **dict({'allow_redirects': False}, **kwargs))
         # With IPv6, Gen10 server gives redirection response with new path with
         # a prefix of '/' so this check is required
         if resp.status_code == 308:
+            if info:
+                info.attempt()
             path = urlparse(resp.headers['Location']).path
-            resp = super(HPEConnector, self)._op(method, path, data, headers)
+            connect_timeout, read_timeout = timeouts.get_timeouts(
+                host, operation, timeout)
+            with throttling.limit(host, info,
+                                  timeout=timeouts.get_remaining(host)), \
+                    circuit_breaker.guard(host,
+                                          failures=_CONNECTION_FAILURES), \
+                    timeouts.measure(host, operation, read_timeout):
+                resp = super(HPEConnector, self)._op(
+                    method, path, data, headers,
+                    timeout=(connect_timeout, read_timeout), **kwargs)
         return resp
@@ -0,0 +1,510 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Tracking of the state of servers from the Redfish events of their iLOs.
+
+The power and POST states, the progress of firmware updates and the
+results of BIOS settings otherwise have to be polled. An EventListener
+keeps them in memory for every watched server, and reads a resource again
+only when the iLO reports that it changed. Waiting for a state is then a
+future completed by the events::
+
+    from proliantutils.redfish import events
+
+    listener = events.EventListener()
+    redfish_ops.watch_events(listener)
+    redfish_ops.set_host_power('ON')
+    listener.wait_for(redfish_ops.host, events.POWER_STATE,
+                      'On').result(timeout=300)
+
+By default the events are read from the Server-Sent Events stream of each
+iLO, one connection per server. Alternatively the iLOs post them to an
+EventReceiver, which only needs a listening socket for the whole fleet::
+
+    receiver = events.EventReceiver(port=8443, ssl_context=ssl_context)
+    receiver.start()
+    listener = events.EventListener(receiver, 'https://10.0.0.1:8443/')
+"""
+
+import collections
+from concurrent import futures
+import http.server
+import posixpath
+import threading
+
+import requests
+from six.moves.urllib import parse
+import sushy
+
+from proliantutils import exception
+from proliantutils import json_codec
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+# Names of the properties of the state of a server.
+POWER_STATE = 'PowerState'
+POST_STATE = 'PostState'
+FIRMWARE_UPDATE_STATE = 'FirmwareUpdateState'
+FIRMWARE_UPDATE_PERCENT = 'FirmwareUpdatePercent'
+BIOS_SETTINGS_MESSAGES = 'BiosSettingsMessages'
+
+# Properties of the state, by path of their resource relative to the
+# Redfish root, and field in the resource.
+TRACKED_RESOURCES = {
+    'Systems/1': {
+        POWER_STATE: ['PowerState'],
+        POST_STATE: ['Oem', 'Hpe', 'PostState'],
+    },
+    'Systems/1/Bios': {
+        BIOS_SETTINGS_MESSAGES: ['@Redfish.Settings', 'Messages'],
+    },
+    'UpdateService': {
+        FIRMWARE_UPDATE_STATE: ['Oem', 'Hpe', 'State'],
+        FIRMWARE_UPDATE_PERCENT: ['Oem', 'Hpe', 'FlashProgressPercent'],
+    },
+}
+
+# Resource read again on an event without origin, e.g. a power alert.
+DEFAULT_ORIGIN = 'Systems/1'
+
+# Delay in seconds before reading the event stream of an iLO again after
+# it was interrupted.
+STREAM_RECONNECT_INTERVAL = 5
+
+
+def _host_key(host):
+    return host.strip('[]').lower()
+
+
+def _get_field(document, field):
+    for name in field:
+        if not isinstance(document, dict):
+            return None
+        document = document.get(name)
+    return document
+
+
+def _parse_stream(lines):
+    """Generates the events of a Server-Sent Events stream.
+
+    :param lines: iterable of the lines of the stream, as str.
+    :returns: generator of the decoded events.
+    """
+    data = []
+    for line in lines:
+        if line:
+            field, sep, value = line.partition(':')
+            # Note: the other fields, e.g. id, and the comments sent to
+            # keep the connection alive are not used.
+            if field == 'data':
+                data.append(value[1:] if value.startswith(' ') else value)
+            continue
+        if not data:
+            continue
+        try:
+            yield json_codec.loads('\n'.join(data))
+        except ValueError as e:
+            LOG.debug('Ignoring the undecodable event %(data)s: %(error)s',
+                      {'data': data, 'error': e})
+        data = []
+
+
+class _StreamWatcher(threading.Thread):
+    """Reads the event stream of an iLO until stopped."""
+
+    def __init__(self, listener, host, root):
+        super(_StreamWatcher, self).__init__(
+            name='proliantutils-events-%s' % host, daemon=True)
+        self._listener = listener
+        self._host = host
+        self._root = root
+        self._stopped = threading.Event()
+        self._response = None
+
+    def run(self):
+        connected = False
+        while not self._stopped.is_set():
+            try:
+                self._response = (
+                    self._root.get_event_service().open_stream())
+                if self._stopped.is_set():
+                    self._response.close()
+                    break
+                # Note: the events sent while disconnected are lost.
+                if connected:
+                    self._listener.refresh(self._host)
+                connected = True
+                for payload in _parse_stream(
+                        self._response.iter_lines(decode_unicode=True)):
+                    self._listener.handle_event(self._host, payload)
+            except (exception.IloError, sushy.exceptions.SushyError,
+                    requests.exceptions.RequestException) as e:
+                if self._stopped.is_set():
+                    break
+                LOG.warning('The event stream of %(host)s was interrupted: '
+                            '%(error)s', {'host': self._host, 'error': e})
+            except Exception:
+                if self._stopped.is_set():
+                    break
+                # Note: keep watching, the state would be stale otherwise.
+                LOG.exception('Failed to handle the event stream of %s',
+                              self._host)
+            self._stopped.wait(STREAM_RECONNECT_INTERVAL)
+
+    def stop(self):
+        self._stopped.set()
+        response = self._response
+        if response is not None:
+            response.close()
+
+
+class _WatchedHost(object):
+
+    def __init__(self, root, root_prefix):
+        self.root = root
+        self.root_prefix = root_prefix
+        self.subscription = None
+        self.watcher = None
+
+    def get_relative_path(self, uri):
+        path = parse.urlparse(uri).path.rstrip('/')
+        prefix = self.root_prefix.rstrip('/') + '/'
+        return path[len(prefix):] if path.startswith(prefix) else path
+
+
+class EventListener(object):
+    """In-memory state of servers, updated from the events of their iLOs.
+
+    The state of a server is a dictionary of the properties named by the
+    keys of TRACKED_RESOURCES, e.g. POWER_STATE, holding the values of the
+    Redfish fields, e.g. 'On'.
+    """
+
+    def __init__(self, receiver=None, destination=None):
+        """Constructor for EventListener.
+
+        :param receiver: EventReceiver the iLOs post the events to, None to
+            read their event streams instead.
+        :param destination: URL of the receiver, as reached from the iLOs.
+        :raises: InvalidInputError, if a receiver is given without its
+            destination.
+        """
+        if receiver is not None and not destination:
+            raise exception.InvalidInputError(
+                'The destination of the event receiver is required.')
+        self.destination = destination
+        self._lock = threading.Lock()
+        self._hosts = {}
+        self._states = {}
+        self._waiters = collections.defaultdict(list)
+        if receiver is not None:
+            receiver.add_handler(self.handle_event)
+
+    def add_host(self, host, root, root_prefix='/redfish/v1/'):
+        """Watches the events of a server.
+
+        The server is subscribed to, or its event stream read, and its
+        state read once.
+        :param host: address of the iLO.
+        :param root: the HPESushy object of the iLO, which must stay open
+            while the server is watched.
+        :param root_prefix: path of the Redfish root.
+        :raises: IloError, on an error from iLO.
+        """
+        key = _host_key(host)
+        watched = _WatchedHost(root, root_prefix)
+        with self._lock:
+            if key in self._hosts:
+                return
+            self._hosts[key] = watched
+        try:
+            if self.destination:
+                watched.subscription = root.get_event_service().subscribe(
+                    self.destination, key)
+            else:
+                watched.watcher = _StreamWatcher(self, key, root)
+                watched.watcher.start()
+        except (exception.IloError, sushy.exceptions.SushyError) as e:
+            with self._lock:
+                del self._hosts[key]
+            msg = ('Could not watch the events of %(host)s. Error '
+                   '%(error)s' % {'host': host, 'error': e})
+            LOG.debug(msg)
+            raise exception.IloError(msg)
+        self.refresh(key)
+
+    def remove_host(self, host):
+        """Stops watching the events of a server.
+
+        The subscription is deleted and the futures waiting for a state of
+        the server are cancelled.
+        :param host: address of the iLO.
+        """
+        key = _host_key(host)
+        with self._lock:
+            watched = self._hosts.pop(key, None)
+            self._states.pop(key, None)
+            waiters = self._waiters.pop(key, [])
+        for predicate, future in waiters:
+            future.cancel()
+        if watched is None:
+            return
+        if watched.watcher is not None:
+            watched.watcher.stop()
+        if watched.subscription:
+            try:
+                watched.root.get_event_service().unsubscribe(
+                    watched.subscription)
+            except (exception.IloError, sushy.exceptions.SushyError) as e:
+                LOG.warning('Could not delete the event subscription of '
+                            '%(host)s: %(error)s', {'host': host, 'error': e})
+
+    def close(self):
+        """Stops watching the events of all the servers."""
+        with self._lock:
+            hosts = list(self._hosts)
+        for host in hosts:
+            self.remove_host(host)
+
+    def _get_watched(self, host):
+        watched = self._hosts.get(_host_key(host))
+        if watched is None:
+            raise exception.InvalidInputError(
+                'The events of %(host)s are not watched.', host=host)
+        return watched
+
+    def refresh(self, host, paths=None):
+        """Reads the state of a server from its iLO.
+
+        :param host: address of the iLO.
+        :param paths: paths of the resources to read, all the ones of
+            TRACKED_RESOURCES by default.
+        :raises: InvalidInputError, if the server is not watched.
+        """
+        watched = self._get_watched(host)
+        changes = {}
+        for path in paths or TRACKED_RESOURCES:
+            try:
+                document = watched.root._conn.get(
+                    posixpath.join(watched.root_prefix, path)).json()
+            except sushy.exceptions.SushyError as e:
+                LOG.debug('Could not read %(path)s of %(host)s: %(error)s',
+                          {'path': path, 'host': host, 'error': e})
+                continue
+            for name, field in TRACKED_RESOURCES[path].items():
+                changes[name] = _get_field(document, field)
+        self._update(host, changes)
+
+    def handle_event(self, context, payload):
+        """Reads again the resources an event reports a change of.
+
+        :param context: the context of the subscription, the address of
+            the iLO.
+        :param payload: the decoded event, with its 'Events' records.
+        """
+        try:
+            watched = self._get_watched(context)
+        except exception.InvalidInputError:
+            LOG.debug('Ignoring an event of %s, which is not watched.',
+                      context)
+            return
+        origins = set()
+        for record in payload.get('Events') or []:
+            origin = _get_field(record, ['OriginOfCondition', '@odata.id'])
+            origins.add(watched.get_relative_path(origin) if origin
+                        else DEFAULT_ORIGIN)
+        # Note: a change of a subresource, e.g. the pending BIOS settings,
+        # may change the state kept from its parents.
+        paths = [path for path in TRACKED_RESOURCES
+                 if any(origin == path or origin.startswith(path + '/')
+                        for origin in origins)]
+        if paths:
+            self.refresh(context, paths)
+
+    def get_state(self, host):
+        """Returns the state of a server.
+
+        :param host: address of the iLO.
+        :returns: a copy of the state, a dictionary.
+        """
+        with self._lock:
+            return dict(self._states.get(_host_key(host), {}))
+
+    def _update(self, host, changes):
+        key = _host_key(host)
+        with self._lock:
+            if key not in self._hosts:
+                return
+            state = self._states.setdefault(key, {})
+            state.update(changes)
+        self._notify(key)
+
+    def _notify(self, key):
+        with self._lock:
+            state = dict(self._states.get(key, {}))
+            waiters = list(self._waiters.get(key, []))
+        for waiter in waiters:
+            predicate, future = waiter
+            try:
+                if not predicate(state):
+                    continue
+            except Exception as e:
+                result = e
+            else:
+                result = None
+            # Note: only the thread removing the waiter completes it.
+            with self._lock:
+                try:
+                    self._waiters[key].remove(waiter)
+                except ValueError:
+                    continue
+            if not future.set_running_or_notify_cancel():
+                continue
+            if result is None:
+                future.set_result(state)
+            else:
+                future.set_exception(result)
+
+    def _discard(self, key, waiter):
+        with self._lock:
+            try:
+                self._waiters[key].remove(waiter)
+            except ValueError:
+                pass
+
+    def wait_until(self, host, predicate):
+        """Waits for the state of a server to satisfy a condition.
+
+        :param host: address of the iLO.
+        :param predicate: callable taking the state and returning True
+            once it is the one waited for. It is called from the thread
+            handling the events.
+        :returns: a concurrent.futures.Future, whose result is the state
+            satisfying the condition. Cancelling it stops waiting.
+        :raises: InvalidInputError, if the server is not watched.
+        """
+        key = _host_key(host)
+        future = futures.Future()
+        waiter = (predicate, future)
+        with self._lock:
+            self._get_watched(key)
+            self._waiters[key].append(waiter)
+        future.add_done_callback(lambda future: self._discard(key, waiter))
+        self._notify(key)
+        return future
+
+    def wait_for(self, host, name, value):
+        """Waits for a property of the state of a server to have a value.
+
+        :param host: address of the iLO.
+        :param name: name of the property, e.g. POWER_STATE.
+        :param value: Redfish value waited for, e.g. 'On'.
+        :returns: a concurrent.futures.Future, see wait_until().
+        :raises: InvalidInputError, if the server is not watched.
+        """
+        return self.wait_until(host, lambda state: state.get(name) == value)
+
+
+class _EventRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        LOG.debug('Event receiver: ' + format, *args)
+
+    def _reply(self, status):
+        self.send_response(status)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            payload = json_codec.loads(self.rfile.read(length))
+        except ValueError:
+            self._reply(400)
+            return
+        # Note: the context is in the records of the older events.
+        context = payload.get('Context') or _get_field(
+            (payload.get('Events') or [{}])[0], ['Context'])
+        if not context:
+            self._reply(400)
+            return
+        self._reply(204)
+        self.server.receiver.dispatch(context, payload)
+
+
+class _ThreadingHTTPServer(http.server.ThreadingHTTPServer):
+
+    daemon_threads = True
+
+
+class EventReceiver(object):
+    """HTTP server receiving the events posted by the iLOs."""
+
+    def __init__(self, address='', port=0, ssl_context=None):
+        """Constructor for EventReceiver.
+
+        :param address: address to listen on, all by default.
+        :param port: port to listen on, a free one by default.
+        :param ssl_context: server side ssl.SSLContext holding the
+            certificate of the receiver. The iLOs only post to HTTPS URLs.
+        """
+        self.address = address
+        self.port = port
+        self.ssl_context = ssl_context
+        self._handlers = []
+        self._httpd = None
+        self._thread = None
+
+    def add_handler(self, handler):
+        """Calls the handler for every event received.
+
+        :param handler: callable taking the context of the subscription
+            and the decoded event. It is called from the receiver threads.
+        """
+        self._handlers.append(handler)
+
+    def dispatch(self, context, payload):
+        for handler in self._handlers:
+            try:
+                handler(context, payload)
+            except Exception:
+                LOG.exception('Event handler %(handler)r failed on an event '
+                              'of %(context)s',
+                              {'handler': handler, 'context': context})
+
+    def start(self):
+        """Starts listening."""
+        self._httpd = _ThreadingHTTPServer((self.address, self.port),
+                                           _EventRequestHandler)
+        self._httpd.receiver = self
+        if self.ssl_context is not None:
+            self._httpd.socket = self.ssl_context.wrap_socket(
+                self._httpd.socket, server_side=True)
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name='proliantutils-event-receiver',
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops listening."""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
@@ -19,6 +19,7 @@ import sushy
 from proliantutils.redfish import connector as prutils_connector
 from proliantutils.redfish.resources.account_service import account_service
 from proliantutils.redfish.resources.chassis import chassis
+from proliantutils.redfish.resources import event_service
 from proliantutils.redfish.resources.manager import manager
 from proliantutils.redfish.resources.system import system
 from proliantutils.redfish.resources import update_service
@@ -65,6 +66,11 @@ class HPESushy(sushy.Sushy):
         if self._conn:
             self._conn.close()
 
+    def logout(self):
+        """Deletes the Redfish session held by this object, if any."""
+        if self._auth:
+            self._auth.close()
+
     def get_system_collection_path(self):
         return utils.get_subresource_path_by(self, 'Systems')
 
@@ -100,6 +106,17 @@ class HPESushy(sushy.Sushy):
                 HPEUpdateService(self._conn, update_service_url,
                                  redfish_version=self.redfish_version))
 
+    def get_event_service(self):
+        """Return a HPEEventService object
+
+        :returns: The EventService object
+        """
+        event_service_url = utils.get_subresource_path_by(self,
+                                                          'EventService')
+        return event_service.HPEEventService(
+            self._conn, event_service_url,
+            redfish_version=self.redfish_version)
+
     def get_account_service(self):
         """Return a HPEAccountService object"""
         account_service_url = utils.get_subresource_path_by(self,
@@ -20,6 +20,7 @@ import os
 import re
 import subprocess
 import tempfile
+import threading
 
 from OpenSSL.crypto import FILETYPE_ASN1
 from OpenSSL.crypto import load_certificate
@@ -28,6 +29,7 @@ from six.moves.urllib import parse
 import sushy
 from sushy import utils
 
+from proliantutils import content_cache
 from proliantutils import exception
 from proliantutils.ilo import common
 from proliantutils.ilo import constants as ilo_cons
@@ -37,9 +39,11 @@ from proliantutils import log
 from proliantutils.redfish import main
 from proliantutils.redfish.resources import gpu_common
 from proliantutils.redfish.resources.manager import constants as mgr_cons
+from proliantutils.redfish.resources.system import bios
 from proliantutils.redfish.resources.system import constants as sys_cons
 from proliantutils.redfish.resources.system.storage \
     import common as common_storage
+from proliantutils.redfish import session_manager
 from proliantutils.redfish import utils as rf_utils
 from proliantutils import utils as common_utils
 
@@ -152,7 +156,8 @@ class RedfishOperations(operations.IloOperations):
     """
 
     def __init__(self, redfish_controller_ip, username, password,
-                 bios_password=None, cacert=None, root_prefix='/redfish/v1/'):
+                 bios_password=None, cacert=None, root_prefix='/redfish/v1/',
+                 share_session=False):
         """A class representing supported RedfishOperations
 
         :param redfish_controller_ip: The ip address of the Redfish controller.
@@ -167,6 +172,9 @@ class RedfishOperations(operations.IloOperations):
             the directory. Defaults to None.
         :param root_prefix: The default URL prefix. This part includes
             the root service and version. Defaults to /redfish/v1
+        :param share_session: If True, the Redfish session is taken from
+            the process wide session pool and shared with other objects
+            talking to the same iLO as the same user. Defaults to False.
         """
         super(RedfishOperations, self).__init__()
         address = ('https://' + redfish_controller_ip)
@@ -177,11 +185,30 @@ class RedfishOperations(operations.IloOperations):
         self.host = redfish_controller_ip
         self._root_prefix = root_prefix
         self._username = username
+        self._share_session = share_session
+        self._session_key = None
+        self._connect_args = (address, password, verify)
+        self._connect_lock = threading.Lock()
+        self._sushy_object = None
+        self._connect()
 
+    def _connect(self):
+        """Creates the Redfish connection or takes the shared session.
+
+        :raises: IloConnectionError, if the Redfish controller cannot be
+            reached.
+        """
+        address, password, verify = self._connect_args
         try:
-            self._sushy = main.HPESushy(
-                address, username=username, password=password,
-                root_prefix=root_prefix, verify=verify)
+            if self._share_session:
+                self._session_key, self._sushy_object = (
+                    session_manager.SESSION_MANAGER.acquire(
+                        address, self._username, password,
+                        root_prefix=self._root_prefix, verify=verify))
+            else:
+                self._sushy_object = main.HPESushy(
+                    address, username=self._username, password=password,
+                    root_prefix=self._root_prefix, verify=verify)
         except sushy.exceptions.SushyError as e:
             msg = (self._('The Redfish controller at "%(controller)s" has '
                           'thrown error. Error %(error)s') %
@@ -189,13 +216,40 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloConnectionError(msg)
 
+    @property
+    def _sushy(self):
+        # Note: close() releases the shared session; whoever still holds
+        # this object takes one from the pool again on its next operation.
+        if self._sushy_object is None:
+            with self._connect_lock:
+                if self._sushy_object is None:
+                    self._connect()
+        return self._sushy_object
+
     def __del__(self):
         try:
-            if self._sushy:
-                self._sushy.close()
+            self.close()
         except AttributeError:
             pass
 
+    def close(self):
+        """Closes the Redfish connection or releases the shared session."""
+        if self._share_session:
+            with self._connect_lock:
+                key, self._session_key = self._session_key, None
+                self._sushy_object = None
+            if key is not None:
+                session_manager.SESSION_MANAGER.release(key)
+        elif self._sushy_object:
+            self._sushy_object.close()
+
+    def config_transaction(self):
+        """Starts a batch of configuration changes.
+
+        :returns: a ConfigTransaction object.
+        """
+        return ConfigTransaction(self)
+
     def _get_sushy_system(self, system_id):
         """Get the sushy system for system_id
 
@@ -581,6 +635,28 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloError(msg)
 
+    @firmware_controller.check_firmware_update_component
+    def start_firmware_update(self, file_url, component_type):
+        """Starts updating the given firmware without waiting for the end.
+
+        :param file_url: location of the raw firmware file. Extraction of the
+                         firmware file (if in compact format) is expected to
+                         happen prior to this invocation.
+        :param component_type: Type of component to be applied to.
+        :returns: a common.FirmwareUpdateJob object, to follow the progress
+                  and wait for the end of the update.
+        :raises: IloError, on an error from iLO.
+        """
+        try:
+            update_service_inst = self._sushy.get_update_service()
+            return update_service_inst.start_firmware_update(self, file_url)
+        except sushy.exceptions.SushyError as e:
+            msg = (self._('The Redfish controller failed to update firmware '
+                          'with firmware %(file)s Error %(error)s') %
+                   {'file': file_url, 'error': str(e)})
+            LOG.debug(msg)
+            raise exception.IloError(msg)
+
     def _is_boot_mode_uefi(self):
         """Checks if the system is in uefi boot mode.
 
@@ -616,21 +692,29 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloError(msg)
 
-    def set_pending_boot_mode(self, boot_mode):
-        """Sets the boot mode of the system for next boot.
+    def _validate_boot_mode(self, boot_mode):
+        """Check if the boot mode is valid.
 
         :param boot_mode: either 'uefi' or 'legacy'.
         :raises: IloInvalidInputError, on an invalid input.
-        :raises: IloError, on an error from iLO.
         """
-        sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
-
         if boot_mode.upper() not in BOOT_MODE_MAP_REV.keys():
             msg = (('Invalid Boot mode: "%(boot_mode)s" specified, valid boot '
                     'modes are either "uefi" or "legacy"')
                    % {'boot_mode': boot_mode})
             raise exception.IloInvalidInputError(msg)
 
+    def set_pending_boot_mode(self, boot_mode):
+        """Sets the boot mode of the system for next boot.
+
+        :param boot_mode: either 'uefi' or 'legacy'.
+        :raises: IloInvalidInputError, on an invalid input.
+        :raises: IloError, on an error from iLO.
+        """
+        sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
+
+        self._validate_boot_mode(boot_mode)
+
         try:
             sushy_system.bios_settings.pending_settings.set_pending_boot_mode(
                 BOOT_MODE_MAP_REV.get(boot_mode.upper()))
@@ -642,15 +726,12 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloError(msg)
 
-    def update_persistent_boot(self, devices=[]):
-        """Changes the persistent boot device order for the host
+    def _validate_boot_devices(self, devices):
+        """Check if the boot devices are valid.
 
-        :param devices: ordered list of boot devices
-        :raises: IloError, on an error from iLO.
+        :param devices: list of boot devices.
         :raises: IloInvalidInputError, if the given input is not valid.
         """
-        sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
-        # Check if the input is valid
         for item in devices:
             if item.upper() not in DEVICE_COMMON_TO_REDFISH:
                 msg = (self._('Invalid input "%(device)s". Valid devices: '
@@ -658,6 +739,16 @@ class RedfishOperations(operations.IloOperations):
                        {'device': item})
                 raise exception.IloInvalidInputError(msg)
 
+    def update_persistent_boot(self, devices=[]):
+        """Changes the persistent boot device order for the host
+
+        :param devices: ordered list of boot devices
+        :raises: IloError, on an error from iLO.
+        :raises: IloInvalidInputError, if the given input is not valid.
+        """
+        sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
+        self._validate_boot_devices(devices)
+
         try:
             sushy_system.update_persistent_boot(
                 devices, persistent=True)
@@ -1188,14 +1279,68 @@ class RedfishOperations(operations.IloOperations):
                 ironic_sec_capabilities.update(p_dict)
         return ironic_sec_capabilities
 
+    def _get_members_count(self, resource, subresource_path):
+        """Returns the number of members of a collection, None if missing.
+
+        :param resource: the resource linking to the collection.
+        :param subresource_path: JSON field of the collection link.
+        """
+        try:
+            path = rf_utils.get_subresource_path_by(resource,
+                                                    subresource_path)
+        except exception.MissingAttributeError:
+            return None
+        collection = resource._conn.get(path).json()
+        return collection.get('Members@odata.count',
+                              len(collection.get('Members', [])))
+
+    def _get_capabilities_fingerprint(self, sushy_system, sushy_manager):
+        """Returns the fingerprint of the hardware the capabilities reflect.
+
+        It is made of the ETags of the System and BIOS resources, the
+        model and firmware versions, and the numbers of PCI devices and
+        storage subsystems, which costs a few small requests instead of
+        walking the whole resource tree.
+
+        :param sushy_system: the sushy system.
+        :param sushy_manager: the sushy manager.
+        :returns: the fingerprint, a string.
+        """
+        return json.dumps([
+            sushy_system.json.get('@odata.etag'), sushy_system.model,
+            sushy_system.rom_version, sushy_manager.firmware_version,
+            sushy_system.bios_settings.json.get('@odata.etag'),
+            self._get_members_count(sushy_system,
+                                    ['Oem', 'Hpe', 'Links', 'PCIDevices']),
+            self._get_members_count(sushy_system, 'Storage')])
+
     def get_server_capabilities(self):
         """Returns the server capabilities
 
+        When the content cache is enabled, the capabilities are memoized
+        by the fingerprint of the hardware and only computed again when it
+        changes.
+
         raises: IloError on an error from iLO.
         """
-        capabilities = {}
         sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
         sushy_manager = self._get_sushy_manager(PROLIANT_MANAGER_ID)
+        fingerprint = None
+        if content_cache.get_cache() is not None:
+            try:
+                fingerprint = self._get_capabilities_fingerprint(
+                    sushy_system, sushy_manager)
+            except sushy.exceptions.SushyError as e:
+                LOG.debug(self._("Could not get the fingerprint of the "
+                                 "hardware. Error %(error)s"),
+                          {'error': e})
+        return content_cache.fetch(
+            content_cache.CAPABILITIES, sushy_system.uuid, fingerprint,
+            lambda: self._get_server_capabilities(sushy_system,
+                                                  sushy_manager))
+
+    def _get_server_capabilities(self, sushy_system, sushy_manager):
+        capabilities = {}
         sushy_chassis = self._get_sushy_chassis(PROLIANT_CHASSIS_ID)
         try:
             count = len(sushy_system.pci_devices.gpu_devices)
@@ -1428,15 +1573,16 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloError(msg)
 
-    def _change_iscsi_target_settings(self, iscsi_info, macs=[]):
-        """Change iSCSI target settings.
+    def _get_iscsi_target_data(self, sushy_system, iscsi_info, macs=[]):
+        """Get the iSCSI settings setting a target on the NICs.
 
-        :param macs: List of target mac for iSCSI.
+        :param sushy_system: the sushy system instance.
         :param iscsi_info: A dictionary that contains information of iSCSI
                            target like target_name, lun, ip_address, port etc.
+        :param macs: List of target mac for iSCSI.
+        :returns: a dictionary of iSCSI settings.
         :raises: IloError, on an error from iLO.
         """
-        sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
         association_names = []
         try:
             if macs:
@@ -1468,7 +1614,7 @@ class RedfishOperations(operations.IloOperations):
                     association_names.index(association_name) + 1)
                 iscsi_infos.append(data)
 
-            iscsi_data = {'iSCSISources': iscsi_infos}
+            return {'iSCSISources': iscsi_infos}
         except sushy.exceptions.SushyError as e:
             msg = (self._('The Redfish controller failed to get the '
                           'bios mappings. Error %(error)s')
@@ -1476,6 +1622,18 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloError(msg)
 
+    def _change_iscsi_target_settings(self, iscsi_info, macs=[]):
+        """Change iSCSI target settings.
+
+        :param macs: List of target mac for iSCSI.
+        :param iscsi_info: A dictionary that contains information of iSCSI
+                           target like target_name, lun, ip_address, port etc.
+        :raises: IloError, on an error from iLO.
+        """
+        sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
+        iscsi_data = self._get_iscsi_target_data(sushy_system, iscsi_info,
+                                                 macs)
+
         try:
             (sushy_system.bios_settings.iscsi_resource.
              iscsi_settings.update_iscsi_settings(iscsi_data))
@@ -1486,6 +1644,27 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloError(msg)
 
+    def _get_iscsi_target_info(self, target_name, lun, ip_address,
+                               port='3260', auth_method=None, username=None,
+                               password=None):
+        """Get the iSCSI target information of a target.
+
+        See set_iscsi_info() for the parameters.
+        :returns: a dictionary of iSCSI target information.
+        """
+        iscsi_info = {}
+        iscsi_info['iSCSITargetName'] = target_name
+        iscsi_info['iSCSILUN'] = lun
+        iscsi_info['iSCSITargetIpAddress'] = ip_address
+        iscsi_info['iSCSITargetTcpPort'] = int(port)
+        iscsi_info['iSCSITargetInfoViaDHCP'] = False
+        iscsi_info['iSCSIConnection'] = 'Enabled'
+        if (auth_method == 'CHAP'):
+            iscsi_info['iSCSIAuthenticationMethod'] = 'Chap'
+            iscsi_info['iSCSIChapUsername'] = username
+            iscsi_info['iSCSIChapSecret'] = password
+        return iscsi_info
+
     def set_iscsi_info(self, target_name, lun, ip_address,
                        port='3260', auth_method=None, username=None,
                        password=None, macs=[]):
@@ -1505,17 +1684,9 @@ class RedfishOperations(operations.IloOperations):
                  in the bios boot mode.
         """
         if(self._is_boot_mode_uefi()):
-            iscsi_info = {}
-            iscsi_info['iSCSITargetName'] = target_name
-            iscsi_info['iSCSILUN'] = lun
-            iscsi_info['iSCSITargetIpAddress'] = ip_address
-            iscsi_info['iSCSITargetTcpPort'] = int(port)
-            iscsi_info['iSCSITargetInfoViaDHCP'] = False
-            iscsi_info['iSCSIConnection'] = 'Enabled'
-            if (auth_method == 'CHAP'):
-                iscsi_info['iSCSIAuthenticationMethod'] = 'Chap'
-                iscsi_info['iSCSIChapUsername'] = username
-                iscsi_info['iSCSIChapSecret'] = password
+            iscsi_info = self._get_iscsi_target_info(
+                target_name, lun, ip_address, port, auth_method, username,
+                password)
             self._change_iscsi_target_settings(iscsi_info, macs)
         else:
             msg = 'iSCSI boot is not supported in the BIOS boot mode'
@@ -1602,6 +1773,17 @@ class RedfishOperations(operations.IloOperations):
             LOG.debug(msg)
             raise exception.IloError(msg)
 
+    def watch_events(self, listener):
+        """Tracks the state of the server from the events of the iLO.
+
+        The Redfish connection must stay open while the server is watched.
+        :param listener: a proliantutils.redfish.events.EventListener
+                         object, keeping the state of the server.
+        :raises: IloError, on an error from iLO.
+        """
+        listener.add_host(self.host, self._sushy,
+                          root_prefix=self._root_prefix)
+
     def get_host_post_state(self):
         """Get the current state of system POST.
 
@@ -1727,6 +1909,55 @@ class RedfishOperations(operations.IloOperations):
                 attributes, ilo_cons.SUPPORTED_REDFISH_BIOS_PROPERTIES)
         return attributes
 
+    def _validate_allowed_bios_settings(self, data):
+        """Check if only allowed BIOS settings are in the data.
+
+        :param data: a dictionary of BIOS settings.
+        :raises: IloError, if some of the settings are not allowed.
+        """
+        unsupported_settings = [key for key in data if key not in (
+            ilo_cons.SUPPORTED_REDFISH_BIOS_PROPERTIES)]
+        if unsupported_settings:
+            msg = ("Could not apply settings as one or more settings are"
+                   " not supported. Unsupported settings are %s."
+                   " Supported settings are %s." % (
+                       unsupported_settings,
+                       ilo_cons.SUPPORTED_REDFISH_BIOS_PROPERTIES))
+            raise exception.IloError(msg)
+
+    def _validate_bios_attributes(self, sushy_system, data):
+        """Validates BIOS settings against the BIOS attribute registry.
+
+        The registry takes several requests to fetch, so it is only used
+        when the content cache is enabled and then fetched once per model
+        and System ROM version.
+
+        :param sushy_system: the sushy system.
+        :param data: a dictionary of BIOS settings.
+        :raises: IloInvalidInputError, if some of the settings are invalid.
+        """
+        if content_cache.get_cache() is None:
+            return
+        bios_settings = sushy_system.bios_settings
+        if not bios_settings.attribute_registry:
+            return
+        try:
+            registries_path = rf_utils.get_subresource_path_by(
+                self._sushy, 'Registries')
+            attributes = content_cache.fetch(
+                content_cache.BIOS_REGISTRY, sushy_system.model,
+                sushy_system.rom_version,
+                lambda: bios_settings.get_attribute_registry(
+                    registries_path))
+        except (sushy.exceptions.SushyError,
+                exception.MissingAttributeError) as e:
+            LOG.debug(self._('Not validating the BIOS settings, the BIOS '
+                             'attribute registry is not available. Error '
+                             '%(error)s'), {'error': e})
+            return
+        if attributes:
+            bios.validate_settings(data, attributes)
+
     def set_bios_settings(self, data=None, only_allowed_settings=False):
         """Sets current BIOS settings to the provided data.
 
@@ -1737,6 +1968,8 @@ class RedfishOperations(operations.IloOperations):
                 on the 'only_allowed_settings', either only the allowed
                 settings are set or all the supported settings that are in the
                 'data' are set.
+        :returns: a dictionary of the BIOS settings which were changed,
+                 empty if all of them already had the requested values.
         :raises: IloError, on an error from iLO.
         :raises: IloCommandNotSupportedError, if the command is not supported
                  on the server.
@@ -1747,17 +1980,18 @@ class RedfishOperations(operations.IloOperations):
 
         sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
         if only_allowed_settings:
-            unsupported_settings = [key for key in data if key not in (
-                ilo_cons.SUPPORTED_REDFISH_BIOS_PROPERTIES)]
-            if unsupported_settings:
-                msg = ("Could not apply settings as one or more settings are"
-                       " not supported. Unsupported settings are %s."
-                       " Supported settings are %s." % (
-                           unsupported_settings,
-                           ilo_cons.SUPPORTED_REDFISH_BIOS_PROPERTIES))
-                raise exception.IloError(msg)
+            self._validate_allowed_bios_settings(data)
         try:
-            settings_required = sushy_system.bios_settings.pending_settings
+            bios_settings = sushy_system.bios_settings
+            settings_required = bios_settings.pending_settings
+            data = common_utils.get_changed_bios_settings(
+                data, bios_settings.json.get('Attributes', {}),
+                settings_required.json.get('Attributes'))
+            if not data:
+                LOG.debug(self._("The BIOS settings already have the "
+                                 "requested values, nothing to apply."))
+                return data
+            self._validate_bios_attributes(sushy_system, data)
             settings_required.update_bios_data_by_patch(data)
         except sushy.exceptions.SushyError as e:
             msg = (self._('The pending BIOS Settings resource not found.'
@@ -1765,6 +1999,7 @@ class RedfishOperations(operations.IloOperations):
                    {'error': str(e)})
             LOG.debug(msg)
             raise exception.IloError(msg)
+        return data
 
     def get_default_bios_settings(self, only_allowed_settings=False):
         """Get default BIOS settings.
@@ -1780,7 +2015,10 @@ class RedfishOperations(operations.IloOperations):
         """
         sushy_system = self._get_sushy_system(PROLIANT_SYSTEM_ID)
         try:
-            settings = sushy_system.bios_settings.default_settings
+            settings = content_cache.fetch(
+                content_cache.BIOS_DEFAULTS, sushy_system.model,
+                sushy_system.rom_version,
+                lambda: sushy_system.bios_settings.default_settings)
         except sushy.exceptions.SushyError as e:
             msg = (self._('The default BIOS Settings were not found. Error '
                           '%(error)s') %
@@ -2052,3 +2290,213 @@ class RedfishOperations(operations.IloOperations):
                    {'error': str(e)})
             LOG.debug(msg)
             raise exception.IloError(msg)
+
+
+class ConfigTransaction(object):
+    """Batch of configuration changes of the system.
+
+    The changes are collected first and applied together by commit().
+    Changes to the same settings resource are merged into one PATCH, so
+    that configuring a server for deployment takes a handful of requests
+    instead of fetching the system and PATCHing for each change::
+
+        transaction = redfish_ops.config_transaction()
+        transaction.set_pending_boot_mode('uefi')
+        transaction.set_bios_settings({'Sriov': 'Enabled'})
+        transaction.set_iscsi_info('iqn.2011-07.com:example', 1,
+                                   '10.10.1.30')
+        transaction.set_secure_boot_mode(True)
+        transaction.update_persistent_boot(['ISCSI'])
+        result = transaction.commit()
+
+    It can be used as a context manager as well, in which case the changes
+    are committed when the block exits without an error.
+
+    The changes are applied in this order: BIOS settings, including the
+    boot mode, iSCSI settings, secure boot and persistent boot device.
+    The iLO has no transactions, if applying a change fails the changes
+    applied before it are not rolled back.
+    """
+
+    def __init__(self, operations):
+        self._ops = operations
+        self._bios_settings = {}
+        self._boot_mode = None
+        self._iscsi_target = None
+        self._iscsi_initiator = None
+        self._secure_boot = None
+        self._persistent_boot = None
+        self._committed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None and not self._committed:
+            self.commit()
+
+    def set_bios_settings(self, data=None, only_allowed_settings=False):
+        """Adds BIOS settings to the transaction.
+
+        See RedfishOperations.set_bios_settings() for the parameters.
+        :raises: IloError, if the data is empty or has unsupported settings.
+        """
+        if not data:
+            raise exception.IloError("Could not apply settings with"
+                                     " empty data")
+        if only_allowed_settings:
+            self._ops._validate_allowed_bios_settings(data)
+        self._bios_settings.update(data)
+
+    def set_pending_boot_mode(self, boot_mode):
+        """Adds the boot mode of the system for next boot.
+
+        :param boot_mode: either 'uefi' or 'legacy'.
+        :raises: IloInvalidInputError, on an invalid input.
+        """
+        self._ops._validate_boot_mode(boot_mode)
+        self._boot_mode = BOOT_MODE_MAP_REV.get(boot_mode.upper())
+        self._bios_settings.update(bios.get_boot_mode_settings(
+            self._boot_mode))
+
+    def set_iscsi_info(self, target_name, lun, ip_address,
+                       port='3260', auth_method=None, username=None,
+                       password=None, macs=[]):
+        """Adds iSCSI target details to the transaction.
+
+        See RedfishOperations.set_iscsi_info() for the parameters.
+        """
+        self._iscsi_target = (self._ops._get_iscsi_target_info(
+            target_name, lun, ip_address, port, auth_method, username,
+            password), macs)
+
+    def unset_iscsi_info(self, macs=[]):
+        """Adds the disabling of iSCSI boot to the transaction.
+
+        :param macs: List of target macs for iSCSI.
+        """
+        self._iscsi_target = ({'iSCSIConnection': 'Disabled'}, macs)
+
+    def set_iscsi_initiator_info(self, initiator_iqn):
+        """Adds the iSCSI initiator to the transaction.
+
+        :param initiator_iqn: Initiator iqn for iLO.
+        """
+        self._iscsi_initiator = initiator_iqn
+
+    def set_secure_boot_mode(self, secure_boot_enable):
+        """Adds enabling or disabling secure boot to the transaction.
+
+        :param secure_boot_enable: True, if secure boot needs to be
+               enabled for next boot, else False.
+        :raises: IloError, on an invalid input.
+        """
+        if not isinstance(secure_boot_enable, bool):
+            msg = ('The parameter "%(parameter)s" value "%(value)s" is '
+                   'invalid. Valid values are: True/False.' %
+                   {'parameter': 'secure_boot_enable',
+                    'value': secure_boot_enable})
+            raise exception.IloError(msg)
+        self._secure_boot = secure_boot_enable
+
+    def update_persistent_boot(self, devices=[]):
+        """Adds the persistent boot device order to the transaction.
+
+        :param devices: ordered list of boot devices
+        :raises: IloInvalidInputError, if the given input is not valid.
+        """
+        self._ops._validate_boot_devices(devices)
+        self._persistent_boot = devices
+
+    def _is_boot_mode_uefi(self, sushy_system):
+        # Note: iSCSI and secure boot settings apply on next boot as well,
+        # so the boot mode to check is the one requested in this
+        # transaction, if any.
+        if self._boot_mode is not None:
+            return self._boot_mode == sys_cons.BIOS_BOOT_MODE_UEFI
+        return (sushy_system.bios_settings.boot_mode
+                == sys_cons.BIOS_BOOT_MODE_UEFI)
+
+    def _apply_bios_settings(self, sushy_system):
+        bios_settings = sushy_system.bios_settings
+        pending_settings = bios_settings.pending_settings
+        data = common_utils.get_changed_bios_settings(
+            self._bios_settings, bios_settings.json.get('Attributes', {}),
+            pending_settings.json.get('Attributes'))
+        if data:
+            self._ops._validate_bios_attributes(sushy_system, data)
+            pending_settings.update_bios_data_by_patch(data)
+        return data
+
+    def _apply_iscsi_settings(self, sushy_system):
+        iscsi_data = {}
+        if self._iscsi_target:
+            iscsi_data.update(self._ops._get_iscsi_target_data(
+                sushy_system, *self._iscsi_target))
+        if self._iscsi_initiator:
+            iscsi_data['iSCSIInitiatorName'] = self._iscsi_initiator
+        (sushy_system.bios_settings.iscsi_resource.
+         iscsi_settings.update_iscsi_settings(iscsi_data))
+        return iscsi_data
+
+    def _apply_secure_boot(self, sushy_system):
+        sushy_system.secure_boot.enable_secure_boot(self._secure_boot)
+        return self._secure_boot
+
+    def _apply_persistent_boot(self, sushy_system):
+        sushy_system.update_persistent_boot(self._persistent_boot,
+                                            persistent=True)
+        return self._persistent_boot
+
+    def commit(self):
+        """Applies the changes of the transaction.
+
+        :returns: a dictionary with an entry for each kind of change
+            applied: 'bios_settings', the BIOS settings which were changed;
+            'iscsi_settings', the iSCSI settings; 'secure_boot', whether
+            secure boot was enabled; 'persistent_boot', the boot devices.
+        :raises: IloError, on an error from iLO or if the transaction was
+            already committed.
+        :raises: IloCommandNotSupportedInBiosError, if iSCSI or secure boot
+            changes are requested and the system is in the BIOS boot mode.
+        """
+        if self._committed:
+            raise exception.IloError(self._ops._(
+                'The configuration transaction was already committed.'))
+        self._committed = True
+
+        steps = []
+        if self._bios_settings:
+            steps.append(('bios_settings', self._apply_bios_settings))
+        if self._iscsi_target or self._iscsi_initiator:
+            steps.append(('iscsi_settings', self._apply_iscsi_settings))
+        if self._secure_boot is not None:
+            steps.append(('secure_boot', self._apply_secure_boot))
+        if self._persistent_boot:
+            steps.append(('persistent_boot', self._apply_persistent_boot))
+
+        result = {}
+        if not steps:
+            return result
+
+        sushy_system = self._ops._get_sushy_system(PROLIANT_SYSTEM_ID)
+        try:
+            if ((self._iscsi_target or self._iscsi_initiator
+                 or self._secure_boot is not None)
+                    and not self._is_boot_mode_uefi(sushy_system)):
+                msg = (self._ops._('System is not in UEFI boot mode. '
+                                   'iSCSI and "SecureBoot" related resources '
+                                   'cannot be changed.'))
+                raise exception.IloCommandNotSupportedInBiosError(msg)
+
+            for name, apply_step in steps:
+                result[name] = apply_step(sushy_system)
+        except (sushy.exceptions.SushyError,
+                exception.InvalidInputError) as e:
+            msg = (self._ops._('The Redfish controller failed to apply the '
+                               'configuration changes. Applied so far: '
+                               '%(applied)s. Error: %(error)s') %
+                   {'applied': ', '.join(result) or 'none', 'error': str(e)})
+            LOG.debug(msg)
+            raise exception.IloError(msg)
+        return result
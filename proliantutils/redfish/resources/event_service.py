@@ -0,0 +1,98 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+__author__ = 'HPE'
+
+from six.moves.urllib import parse
+import sushy
+from sushy.resources import base
+from sushy.resources.eventservice import eventservice
+
+from proliantutils import exception
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+# Types of the events subscribed to.
+EVENT_TYPES = ['StatusChange', 'ResourceUpdated', 'ResourceAdded',
+               'ResourceRemoved', 'Alert']
+
+# Time in seconds to connect to the iLO, and to wait for the next line of
+# the event stream before reconnecting.
+STREAM_TIMEOUT = (30, 600)
+
+
+class HPEEventService(eventservice.EventService):
+    """Class that extends the functionality of EventService resource class
+
+    This class extends the functionality of EventService resource class
+    from sushy to subscribe to the events and read their stream.
+    """
+
+    sse_uri = base.Field('ServerSentEventUri')
+
+    def subscribe(self, destination, context, event_types=None):
+        """Subscribes a destination to the events of the iLO.
+
+        :param destination: URL the iLO posts the events to. The iLO
+            only posts to HTTPS URLs.
+        :param context: string the iLO sends along with every event.
+        :param event_types: list of the types of events, EVENT_TYPES by
+            default.
+        :returns: the path of the subscription.
+        :raises: IloError, on an error from iLO.
+        """
+        payload = {'Destination': destination,
+                   'Context': context,
+                   'EventTypes': event_types or EVENT_TYPES,
+                   'Protocol': 'Redfish'}
+        try:
+            response = self._conn.post(
+                self._get_subscriptions_collection_path(), data=payload)
+        except sushy.exceptions.SushyError as e:
+            msg = (('The Redfish controller failed to subscribe %(url)s to '
+                    'the events. Error %(error)s') %
+                   {'url': destination, 'error': str(e)})
+            LOG.debug(msg)
+            raise exception.IloError(msg)
+        return parse.urlparse(response.headers.get('Location', '')).path
+
+    def unsubscribe(self, subscription):
+        """Deletes a subscription.
+
+        :param subscription: path of the subscription.
+        :raises: IloError, on an error from iLO.
+        """
+        try:
+            self._conn.delete(subscription)
+        except sushy.exceptions.SushyError as e:
+            msg = (('The Redfish controller failed to delete the event '
+                    'subscription %(subscription)s. Error %(error)s') %
+                   {'subscription': subscription, 'error': str(e)})
+            LOG.debug(msg)
+            raise exception.IloError(msg)
+
+    def open_stream(self, timeout=STREAM_TIMEOUT):
+        """Opens the stream of the Server-Sent Events of the iLO.
+
+        :param timeout: tuple of the time in seconds to connect and to
+            wait for the next line of the stream.
+        :returns: the response, whose body is read as the events come.
+        :raises: IloError, if the iLO does not stream the events.
+        """
+        if not self.sse_uri:
+            raise exception.IloError('The Redfish controller does not '
+                                     'stream the events.')
+        return self._conn.open_stream(self.sse_uri, timeout=timeout)
@@ -24,6 +24,9 @@ from proliantutils import log
 
 LOG = log.get_logger(__name__)
 
+# Time in seconds given to the iLO to generate a CSR.
+CSR_TIMEOUT = 310
+
 
 class ActionsField(base.CompositeField):
     generate_csr = (sushy_common.
@@ -116,8 +119,9 @@ class HttpsCert(base.ResourceBase):
                 return False
             return True
 
-        common.wait_for_operation_to_complete(
-            has_csr_created, delay_bw_retries=30,
+        common.wait_until_complete(
+            has_csr_created, timeout=CSR_TIMEOUT,
+            initial_delay=common.POLL_INTERVAL,
             failover_msg='Generating CSR has failed.'
         )
 
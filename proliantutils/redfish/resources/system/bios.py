@@ -34,10 +34,84 @@ BOOT_SOURCE_TARGET_TO_PARTIAL_STRING_MAP = {
 }
 
 
+def get_boot_mode_settings(boot_mode):
+    """Returns the BIOS settings selecting a boot mode.
+
+    :param boot_mode: either sys_cons.BIOS_BOOT_MODE_LEGACY_BIOS,
+     sys_cons.BIOS_BOOT_MODE_UEFI.
+    :returns: a dictionary of BIOS settings.
+    """
+    bios_properties = {
+        'BootMode': mappings.GET_BIOS_BOOT_MODE_MAP_REV.get(boot_mode)
+    }
+
+    if boot_mode == sys_cons.BIOS_BOOT_MODE_UEFI:
+        bios_properties['UefiOptimizedBoot'] = 'Enabled'
+
+    return bios_properties
+
+
+# Fields of the attribute registry entries used for validating settings.
+_REGISTRY_ATTRIBUTE_FIELDS = ('Type', 'ReadOnly', 'LowerBound', 'UpperBound',
+                              'MinLength', 'MaxLength')
+
+
+def validate_settings(settings, attributes):
+    """Validates BIOS settings against the BIOS attribute registry.
+
+    :param settings: a dictionary of BIOS settings.
+    :param attributes: a dictionary of attribute name to its registry
+        entry, as returned by BIOSSettings.get_attribute_registry().
+    :raises: IloInvalidInputError, if some of the settings are unknown,
+        read-only or have invalid values.
+    """
+    errors = []
+    for name, value in settings.items():
+        attribute = attributes.get(name)
+        if attribute is None:
+            errors.append('%s is not a BIOS setting' % name)
+            continue
+        if attribute.get('ReadOnly'):
+            errors.append('%s is read-only' % name)
+            continue
+        attribute_type = attribute.get('Type')
+        if attribute_type == 'Enumeration':
+            if value not in attribute.get('Values', ()):
+                errors.append('%s must be one of %s' % (
+                    name, ', '.join(attribute.get('Values', ()))))
+        elif attribute_type == 'Integer':
+            if not isinstance(value, int) or isinstance(value, bool):
+                errors.append('%s must be an integer' % name)
+            elif ((attribute.get('LowerBound') is not None
+                   and value < attribute['LowerBound'])
+                  or (attribute.get('UpperBound') is not None
+                      and value > attribute['UpperBound'])):
+                errors.append('%s must be between %s and %s' % (
+                    name, attribute.get('LowerBound'),
+                    attribute.get('UpperBound')))
+        elif attribute_type in ('String', 'Password'):
+            if not isinstance(value, str):
+                errors.append('%s must be a string' % name)
+            elif ((attribute.get('MinLength') is not None
+                   and len(value) < attribute['MinLength'])
+                  or (attribute.get('MaxLength') is not None
+                      and len(value) > attribute['MaxLength'])):
+                errors.append('%s must be %s to %s characters long' % (
+                    name, attribute.get('MinLength', 0),
+                    attribute.get('MaxLength')))
+        elif attribute_type == 'Boolean':
+            if not isinstance(value, bool):
+                errors.append('%s must be a boolean' % name)
+    if errors:
+        raise exception.IloInvalidInputError(
+            'Invalid BIOS settings: %s.' % '; '.join(errors))
+
+
 class BIOSSettings(base.ResourceBase):
     """Class that defines the functionality for BIOS Resources."""
 
     messages = base.Field(['@Redfish.Settings', 'Messages'])
+    attribute_registry = base.Field('AttributeRegistry')
     boot_mode = base.MappedField(["Attributes", "BootMode"],
                                  mappings.GET_BIOS_BOOT_MODE_MAP)
 
@@ -129,6 +203,40 @@ class BIOSSettings(base.ResourceBase):
                 self, ["Oem", "Hpe", "Links", "BaseConfigs"]),
             redfish_version=self.redfish_version)
 
+    def get_attribute_registry(self, registries_path):
+        """Returns the attributes of the BIOS attribute registry.
+
+        :param registries_path: path of the Registries collection.
+        :returns: a dictionary of attribute name to the registry entry
+            fields needed to validate its settings, empty if the iLO does
+            not publish the registry.
+        """
+        registries = self._conn.get(registries_path).json()
+        for member in registries.get('Members', []):
+            path = member['@odata.id']
+            if path.rstrip('/').rsplit('/', 1)[-1] == self.attribute_registry:
+                break
+        else:
+            LOG.debug('The BIOS attribute registry %s is not published.',
+                      self.attribute_registry)
+            return {}
+        locations = self._conn.get(path).json().get('Location', [])
+        uris = [location['Uri'] for location in locations
+                if location.get('Language', 'en').startswith('en')]
+        if not uris:
+            return {}
+        registry = self._conn.get(uris[0]).json()
+        attributes = {}
+        for entry in registry.get('RegistryEntries', {}).get('Attributes',
+                                                             []):
+            attribute = {field: entry[field]
+                         for field in _REGISTRY_ATTRIBUTE_FIELDS
+                         if entry.get(field) is not None}
+            attribute['Values'] = [value['ValueName']
+                                   for value in entry.get('Value', [])]
+            attributes[entry['AttributeName']] = attribute
+        return attributes
+
     def update_bios_to_default(self):
         """Updates bios default settings"""
         self.pending_settings.update_bios_data_by_post(
@@ -154,14 +262,7 @@ class BIOSPendingSettings(base.ResourceBase):
         :param boot_mode: either sys_cons.BIOS_BOOT_MODE_LEGACY_BIOS,
          sys_cons.BIOS_BOOT_MODE_UEFI.
         """
-        bios_properties = {
-            'BootMode': mappings.GET_BIOS_BOOT_MODE_MAP_REV.get(boot_mode)
-        }
-
-        if boot_mode == sys_cons.BIOS_BOOT_MODE_UEFI:
-            bios_properties['UefiOptimizedBoot'] = 'Enabled'
-
-        self.update_bios_data_by_patch(bios_properties)
+        self.update_bios_data_by_patch(get_boot_mode_settings(boot_mode))
 
     def update_bios_data_by_post(self, data):
         """Update bios data by post
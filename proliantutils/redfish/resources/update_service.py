@@ -54,11 +54,10 @@ class HPEUpdateService(base.ResourceBase):
                                       resource=self._path))
         return fw_update_action
 
-    def flash_firmware(self, redfish_inst, file_url):
-        """Perform firmware flashing on a redfish system
+    def _request_firmware_update(self, file_url):
+        """Requests the iLO to flash the firmware.
 
         :param file_url: url to firmware bits.
-        :param redfish_inst: redfish instance
         :raises: IloError, on an error from iLO.
         """
         action_data = {
@@ -74,7 +73,12 @@ class HPEUpdateService(base.ResourceBase):
             LOG.debug(msg)  # noqa
             raise exception.IloError(msg)
 
-        self.wait_for_redfish_firmware_update_to_complete(redfish_inst)
+    def _check_firmware_update_result(self, file_url):
+        """Checks the final state of a completed firmware update.
+
+        :param file_url: url to firmware bits.
+        :raises: IloError, if the firmware update failed.
+        """
         try:
             state, percent = self.get_firmware_update_progress()
         except sushy.exceptions.SushyError as e:
@@ -93,10 +97,45 @@ class HPEUpdateService(base.ResourceBase):
         else:  # "Complete" | "Idle"
             LOG.info('Flashing firmware file: %s ... done', file_url)
 
-    def wait_for_redfish_firmware_update_to_complete(self, redfish_object):
+    def flash_firmware(self, redfish_inst, file_url):
+        """Perform firmware flashing on a redfish system
+
+        :param file_url: url to firmware bits.
+        :param redfish_inst: redfish instance
+        :raises: IloError, on an error from iLO.
+        """
+        self._request_firmware_update(file_url)
+        self.wait_for_redfish_firmware_update_to_complete(redfish_inst)
+        self._check_firmware_update_result(file_url)
+
+    def start_firmware_update(self, redfish_inst, file_url):
+        """Starts firmware flashing on a redfish system without waiting.
+
+        The update is requested right away, its completion and the reset of
+        the iLO are waited for in the background.
+        :param file_url: url to firmware bits.
+        :param redfish_inst: redfish instance
+        :returns: a common.FirmwareUpdateJob object.
+        :raises: IloError, if the iLO refused the update.
+        """
+        self._request_firmware_update(file_url)
+
+        def _supervise(progress_callback):
+            self.wait_for_redfish_firmware_update_to_complete(
+                redfish_inst, progress_callback=progress_callback)
+            self._check_firmware_update_result(file_url)
+
+        return common.FirmwareUpdateJob(
+            file_url, state='Idle', percent=0).start(_supervise)
+
+    def wait_for_redfish_firmware_update_to_complete(self, redfish_object,
+                                                     progress_callback=None):
         """Continuously polls for iLO firmware update to complete.
 
         :param redfish_object: redfish instance
+        :param progress_callback: optional callable, called with the state
+                                  and the percent of the update at every
+                                  poll.
         """
         p_state = ['Idle']
         c_state = ['Idle']
@@ -119,6 +158,8 @@ class HPEUpdateService(base.ResourceBase):
             :returns: True upon firmware update completion otherwise False
             """
             curr_state, curr_percent = self.get_firmware_update_progress()
+            if progress_callback is not None:
+                progress_callback(curr_state, curr_percent)
             p_state[0] = c_state[0]
             c_state[0] = curr_state
             if (((p_state[0] in ['Updating', 'Verifying',
@@ -130,9 +171,10 @@ class HPEUpdateService(base.ResourceBase):
                 return True
             return False
 
-        common.wait_for_operation_to_complete(
+        common.wait_until_complete(
             has_firmware_flash_completed,
-            delay_bw_retries=30,
+            timeout=common.FIRMWARE_UPDATE_TIMEOUT,
+            initial_delay=10,
             failover_msg='iLO firmware update has failed.'
         )
         common.wait_for_ilo_after_reset(redfish_object)
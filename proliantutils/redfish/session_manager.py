@@ -0,0 +1,165 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Process wide pool of shared, authenticated Redfish sessions."""
+
+__author__ = 'HPE'
+
+import hashlib
+import threading
+
+from sushy import auth as sushy_auth
+
+from proliantutils import log
+from proliantutils.redfish import main
+
+
+LOG = log.get_logger(__name__)
+
+
+class SharedSessionAuth(sushy_auth.SessionOrBasicAuth):
+    """Session authentication shared by many RedfishOperations objects.
+
+    When several holders of the same session receive a 401 at the same
+    time, only the first one re-authenticates. The others find the token
+    already renewed and simply retry their request with it.
+    """
+
+    def __init__(self, username=None, password=None):
+        super(SharedSessionAuth, self).__init__(username=username,
+                                                password=password)
+        self._refresh_lock = threading.Lock()
+
+    def refresh_session(self):
+        """Renews the session token unless another holder already did it."""
+        stale_key = self.get_session_key()
+        with self._refresh_lock:
+            if self.get_session_key() != stale_key:
+                LOG.debug('Redfish session was already renewed by another '
+                          'holder.')
+                return
+            super(SharedSessionAuth, self).refresh_session()
+
+
+class _SharedSession(object):
+    """Book keeping for one pooled HPESushy object."""
+
+    def __init__(self):
+        self.sushy = None
+        self.refcount = 0
+        self.create_lock = threading.Lock()
+
+
+class SessionManager(object):
+    """Hands out reference counted HPESushy objects.
+
+    Sessions are keyed by the Redfish address and the user name. A digest
+    of the password is part of the key as well, so that a caller with
+    different credentials never rides on somebody else's session. The
+    iLO session is logged out once the last reference is released.
+    Expired tokens (401 responses) are renewed by the sushy connector
+    through :class:`SharedSessionAuth`.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+
+    @staticmethod
+    def _get_key(address, username, password, root_prefix, verify):
+        digest = hashlib.sha256(
+            (password or '').encode('utf-8')).hexdigest()
+        return (address, username, digest, root_prefix, verify)
+
+    def acquire(self, address, username, password,
+                root_prefix='/redfish/v1/', verify=True):
+        """Returns a shared HPESushy object for the given credentials.
+
+        A new session is created only if none exists for the key. Every
+        call must be paired with :meth:`release`.
+
+        :param address: The base URL to the Redfish controller.
+        :param username: User account with admin/server-profile access
+            privilege
+        :param password: User account password
+        :param root_prefix: The default URL prefix.
+        :param verify: Either a boolean value or a path to a CA_BUNDLE.
+        :returns: a tuple of the session key and the HPESushy object.
+        :raises: sushy.exceptions.SushyError, if the session could not be
+            created.
+        """
+        key = self._get_key(address, username, password, root_prefix,
+                            verify)
+        with self._lock:
+            entry = self._sessions.setdefault(key, _SharedSession())
+            entry.refcount += 1
+
+        try:
+            # Note: Creating the session costs a round-trip to the iLO, so
+            # it is done under the per entry lock only. Sessions to other
+            # hosts are not held up by it.
+            with entry.create_lock:
+                if entry.sushy is None:
+                    LOG.debug('Creating shared Redfish session for '
+                              '%(user)s@%(address)s',
+                              {'user': username, 'address': address})
+                    entry.sushy = main.HPESushy(
+                        address, root_prefix=root_prefix, verify=verify,
+                        auth=SharedSessionAuth(username=username,
+                                               password=password))
+        except Exception:
+            self._release_key(key)
+            raise
+
+        return key, entry.sushy
+
+    def release(self, key):
+        """Drops a reference taken by :meth:`acquire`.
+
+        :param key: the session key returned by :meth:`acquire`.
+        """
+        self._release_key(key)
+
+    def _release_key(self, key):
+        with self._lock:
+            entry = self._sessions.get(key)
+            if entry is None:
+                return
+            entry.refcount -= 1
+            if entry.refcount > 0:
+                return
+            del self._sessions[key]
+
+        if entry.sushy is not None:
+            LOG.debug('Closing shared Redfish session to %s', key[0])
+            try:
+                entry.sushy.logout()
+            except Exception as e:
+                LOG.debug('Ignoring error while logging out from %(address)s.'
+                          ' Error: %(error)s',
+                          {'address': key[0], 'error': str(e)})
+            entry.sushy.close()
+
+    def get_refcount(self, key):
+        """Returns the number of references held on a session."""
+        with self._lock:
+            entry = self._sessions.get(key)
+            return entry.refcount if entry else 0
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sessions)
+
+
+SESSION_MANAGER = SessionManager()
@@ -17,22 +17,31 @@
 __author__ = 'HPE'
 
 import base64
+import copy
 import gzip
-import json
 
-import requests
 from requests.packages import urllib3
 from requests.packages.urllib3 import exceptions as urllib3_exceptions
 import retrying
 import six
 from six.moves.urllib import parse as urlparse
 
+from proliantutils import circuit_breaker
 from proliantutils import exception
+from proliantutils import instrumentation
+from proliantutils import json_codec
 from proliantutils import log
+from proliantutils import single_flight
+from proliantutils import throttling
+from proliantutils import timeouts
+from proliantutils import tls
 
 
 REDIRECTION_ATTEMPTS = 5
 
+# Content codings accepted for the responses to GET requests.
+ACCEPT_ENCODING = 'gzip, deflate'
+
 LOG = log.get_logger(__name__)
 
 
@@ -47,6 +56,9 @@ class RestConnectorBase(object):
         # Message registry support
         self.message_registries = {}
         self.cacert = cacert
+        # Concurrent identical GETs share one request and its response.
+        self._get_flight = single_flight.SingleFlight(
+            copy_result=copy.deepcopy)
 
         # By default, requests logs following message if verify=False
         #   InsecureRequestWarning: Unverified HTTPS request is
@@ -81,7 +93,7 @@ class RestConnectorBase(object):
             LOG.debug(self._("Received compressed response for "
                              "url %(url)s."), {'url': url})
             uncompressed_string = (gzipper.read().decode('UTF-8'))
-            response_body = json.loads(uncompressed_string)
+            response_body = json_codec.loads(uncompressed_string)
 
         except Exception as e:
             LOG.debug(
@@ -121,6 +133,15 @@ class RestConnectorBase(object):
                 request_headers['Content-Type'] = ('application/'
                                                    'x-www-form-urlencoded')
 
+        # Note: The large documents, e.g. BIOS settings or PCI devices, are
+        # several times smaller compressed. ``requests`` decompresses them.
+        if operation == 'GET':
+            request_headers.setdefault('Accept-Encoding', ACCEPT_ENCODING)
+
+        data = json_codec.dumps(request_body)
+        operation_class = (instrumentation.PROTOCOL_RIS,
+                           timeouts.get_operation_class(operation))
+
         """Helper methods to retry and keep retrying on redirection - START"""
 
         def retry_if_response_asks_for_redirection(response):
@@ -157,9 +178,14 @@ class RestConnectorBase(object):
         def _fetch_response():
 
             url = retry_if_response_asks_for_redirection.url
+            if info:
+                info.attempt()
 
+            connect_timeout, read_timeout = timeouts.get_timeouts(
+                url.hostname, operation_class)
             kwargs = {'headers': request_headers,
-                      'data': json.dumps(request_body)}
+                      'data': data,
+                      'timeout': (connect_timeout, read_timeout)}
             if self.cacert is not None:
                 kwargs['verify'] = self.cacert
             else:
@@ -173,9 +199,18 @@ class RestConnectorBase(object):
                        'restreq_path': url.geturl(),
                        'restreq_body': request_body})
 
-            request_method = getattr(requests, operation.lower())
+            request_method = getattr(tls.get_session(kwargs['verify']),
+                                     operation.lower())
             try:
-                response = request_method(url.geturl(), **kwargs)
+                with throttling.limit(
+                        url.hostname, info,
+                        timeout=timeouts.get_remaining(url.hostname)), \
+                        circuit_breaker.guard(url.hostname), \
+                        timeouts.measure(url.hostname, operation_class,
+                                         read_timeout):
+                    response = request_method(url.geturl(), **kwargs)
+            except exception.IloConnectionError:
+                raise
             except Exception as e:
                 LOG.debug(self._("Unable to connect to iLO. %s"), e)
                 raise exception.IloConnectionError(e)
@@ -184,31 +219,40 @@ class RestConnectorBase(object):
 
         """Helper methods to retry and keep retrying on redirection - END"""
 
-        try:
-            # Note(deray): This is a trick to use the function attributes
-            # to overwrite variable/s (in our case ``url``) and use the
-            # modified one in nested functions, i.e. :func:`_fetch_response`
-            # and :func:`retry_if_response_asks_for_redirection`
-            retry_if_response_asks_for_redirection.url = url
-
-            response = _fetch_response()
-        except retrying.RetryError as e:
-            # Redirected for REDIRECTION_ATTEMPTS - th time. Throw error
-            msg = (self._("URL Redirected %(times)s times continuously. "
-                          "URL used: %(start_url)s More info: %(error)s") %
-                   {'start_url': start_url, 'times': REDIRECTION_ATTEMPTS,
-                    'error': str(e)})
-            LOG.debug(msg)
-            raise exception.IloConnectionError(msg)
+        with instrumentation.track_request(
+                self.host, instrumentation.PROTOCOL_RIS, operation, suburi,
+                bytes_out=len(data)) as info:
+            try:
+                # Note(deray): This is a trick to use the function
+                # attributes to overwrite variable/s (in our case ``url``)
+                # and use the modified one in nested functions, i.e.
+                # :func:`_fetch_response` and
+                # :func:`retry_if_response_asks_for_redirection`
+                retry_if_response_asks_for_redirection.url = url
+
+                response = _fetch_response()
+            except retrying.RetryError as e:
+                # Redirected for REDIRECTION_ATTEMPTS - th time. Throw error
+                msg = (self._("URL Redirected %(times)s times "
+                              "continuously. URL used: %(start_url)s "
+                              "More info: %(error)s") %
+                       {'start_url': start_url,
+                        'times': REDIRECTION_ATTEMPTS, 'error': str(e)})
+                LOG.debug(msg)
+                raise exception.IloConnectionError(msg)
+
+            if info:
+                info.status = response.status_code
+                info.bytes_in = instrumentation.get_response_size(response)
 
         response_body = {}
         if response.text:
             try:
-                response_body = json.loads(response.text)
+                response_body = json_codec.loads(response.text)
             except (TypeError, ValueError):
                 # Note(deray): If it doesn't decode as json, then
                 # resources may return gzipped content.
-                # ``json.loads`` on python3 raises TypeError when
+                # ``json_codec.loads`` on python3 raises TypeError when
                 # ``response.text`` is gzipped one.
                 response_body = (
                     self._get_response_body_from_gzipped_content(url,
@@ -228,7 +272,9 @@ class RestConnectorBase(object):
 
         HTTP response codes could be 500, 404 etc.
         """
-        return self._rest_op('GET', suburi, request_headers, None)
+        key = (suburi, tuple(sorted((request_headers or {}).items())))
+        return self._get_flight.do(key, self._rest_op, 'GET', suburi,
+                                   request_headers, None)
 
     def _rest_patch(self, suburi, request_headers, request_body):
         """REST PATCH operation.
@@ -0,0 +1,141 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Coalescing of identical concurrent calls.
+
+Periodic tasks running in parallel, like power state sync and inspection,
+often read the same data from an iLO at the same time. With a SingleFlight
+group, the first caller of a key runs the call while the callers arriving
+with the same key before it ends wait for it, and get its result or its
+exception instead of running the call again::
+
+    flight = single_flight.SingleFlight(copy_result=copy.deepcopy)
+    state = flight.do('power', operations.get_host_power_status)
+
+Only calls without side effects may be coalesced.
+"""
+
+import threading
+
+
+class _Call(object):
+    """A call in flight, and the outcome shared with its followers."""
+
+    def __init__(self, owner):
+        self.owner = owner
+        self.done = threading.Event()
+        self.followers = 0
+        self.result = None
+        self.error = None
+
+
+class SingleFlight(object):
+    """Group of calls where concurrent calls with the same key run once."""
+
+    def __init__(self, copy_result=None):
+        """Constructor for SingleFlight.
+
+        :param copy_result: callable returning a copy of a result, e.g.
+            copy.deepcopy, so that callers sharing a result can modify it
+            safely. None to hand the same object to all of them.
+        """
+        self._copy_result = copy_result
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._executed = 0
+        self._coalesced = 0
+
+    def do(self, key, func, *args, **kwargs):
+        """Runs a call, or waits for the identical one already running.
+
+        A call with an unhashable key, or made by the thread already
+        running the call of that key, runs on its own.
+
+        :param key: hashable identifying the call and its arguments.
+        :param func: the callable to run.
+        :param args: positional arguments of the callable.
+        :param kwargs: keyword arguments of the callable.
+        :returns: the result of the callable.
+        :raises: the exception raised by the callable.
+        """
+        try:
+            hash(key)
+        except TypeError:
+            return func(*args, **kwargs)
+
+        thread = threading.get_ident()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call(thread)
+                self._executed += 1
+                leader = True
+            elif call.owner == thread:
+                call = None
+            else:
+                call.followers += 1
+                self._coalesced += 1
+                leader = False
+
+        if call is None:
+            return func(*args, **kwargs)
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return self._copy(call.result)
+
+        try:
+            call.result = func(*args, **kwargs)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        # Note: No follower can join once the call is out of self._calls.
+        # The result kept for the followers must not change while they
+        # copy it, so the leader gets a copy too.
+        if call.followers:
+            return self._copy(call.result)
+        return call.result
+
+    def _copy(self, result):
+        if self._copy_result is None:
+            return result
+        return self._copy_result(result)
+
+    def get_stats(self):
+        """Returns the counters of the group.
+
+        :returns: a dictionary with the number of calls 'executed', the
+            number of calls 'coalesced' into another one and the number
+            of calls 'in_flight'.
+        """
+        with self._lock:
+            return {'executed': self._executed,
+                    'coalesced': self._coalesced,
+                    'in_flight': len(self._calls)}
+
+
+def make_key(*args, **kwargs):
+    """Returns a key identifying a call from its arguments.
+
+    :param args: positional arguments of the call.
+    :param kwargs: keyword arguments of the call.
+    :returns: a tuple, which is unhashable if any argument is.
+    """
+    return args + tuple(sorted(kwargs.items()))
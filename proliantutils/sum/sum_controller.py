@@ -164,7 +164,8 @@ def update_firmware(node, url, checksum, components=None):
 
     :param node: A dictionary of the node object.
     :param url: URL of SPP (Service Pack for Proliant) ISO.
-    :param checksum: MD5 checksum of SPP ISO to verify the image.
+    :param checksum: MD5, SHA-256 or SHA-512 checksum of SPP ISO to verify
+        the image.
     :param components: List of filenames of the firmware components to be
         flashed. If not provided, the firmware update is performed on all
         the firmware components.
@@ -0,0 +1,199 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Routes serving the unit test sample outputs as an iLO would."""
+
+import copy
+import json
+import os
+import re
+
+from proliantutils.tests.benchmark import server
+from proliantutils.tests.ilo import ribcl_sample_outputs
+
+
+REDFISH_SAMPLES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'redfish', 'json_samples')
+
+# Variants picked when a sample file holds several versions of the same
+# resource; the others only exist for specific unit tests.
+_DEFAULT_VARIANTS = ('default', 'Default')
+
+_EMPTY = server.Response(b'{}')
+
+# The iLO advertises the permitted methods of every resource, which is
+# used to detect optional features.
+_ALLOW = {'Allow': 'GET, HEAD, POST, PATCH, PUT, DELETE'}
+
+
+def _iter_resources(document):
+    if '@odata.id' in document:
+        yield document
+        return
+    # Note: several resources or several variants of one resource. The
+    # default variant goes first so that it wins over the other ones.
+    keys = sorted(document, key=lambda k: k not in _DEFAULT_VARIANTS)
+    for key in keys:
+        value = document[key]
+        if isinstance(value, dict) and '@odata.id' in value:
+            yield value
+
+
+def _collection(path, members):
+    return {'@odata.id': path,
+            'Members': [{'@odata.id': member} for member in members],
+            'Members@odata.count': len(members)}
+
+
+def _add_missing_resources(resources):
+    # Note: the samples only cover what the unit tests need; fill in the
+    # few resources the benchmarked flows walk through on top of them.
+    system = '/redfish/v1/Systems/1/'
+    processor = system + 'Processors/1/'
+    resources.setdefault(system + 'Processors/',
+                         _collection(system + 'Processors/', [processor]))
+    resources.setdefault(processor, {
+        '@odata.id': processor, 'Id': '1', 'ProcessorType': 'CPU',
+        'ProcessorArchitecture': 'x86', 'TotalCores': 8,
+        'TotalThreads': 16, 'Status': {'State': 'Enabled'}})
+    nics = [path for path in resources
+            if path.startswith(system + 'EthernetInterfaces/')]
+    resources.setdefault(system + 'EthernetInterfaces/',
+                         _collection(system + 'EthernetInterfaces/', nics))
+    config = resources.get('/redfish/v1/systems/1/smartstorageconfig/')
+    if config:
+        settings = dict(config, **{
+            '@odata.id': '/redfish/v1/systems/1/smartstorageconfig/'
+                         'settings/'})
+        resources.setdefault(settings['@odata.id'], settings)
+
+
+def load_redfish_resources(directory=REDFISH_SAMPLES_DIR):
+    """Returns the Redfish sample resources keyed by their path.
+
+    :param directory: directory holding the JSON samples.
+    :returns: a dictionary of path to resource document.
+    """
+    resources = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        with open(os.path.join(directory, name)) as f:
+            document = json.load(f)
+        for resource in _iter_resources(document):
+            resources.setdefault(resource['@odata.id'], resource)
+    _add_missing_resources(resources)
+    return resources
+
+
+def _session(method, path, body):
+    return server.Response(
+        b'{}', status=201,
+        headers={'X-Auth-Token': 'bench-token',
+                 'Location': '/redfish/v1/SessionService/Sessions/1/'})
+
+
+class FirmwareUpdate(object):
+    """Simulates the progress of a firmware update on the UpdateService.
+
+    The state is 'Idle' until an update gets requested, then goes through
+    ``steps`` polls in 'Updating' state before turning 'Complete'.
+    """
+
+    def __init__(self, resource, steps=2):
+        self.resource = resource
+        self.steps = steps
+        self._polls = None
+
+    def start(self, method, path, body):
+        self._polls = 0
+        return _EMPTY
+
+    def get(self, method, path, body):
+        if self._polls is None:
+            state = 'Idle'
+        elif self._polls < self.steps:
+            self._polls += 1
+            state = 'Updating'
+        else:
+            state = 'Complete'
+        resource = copy.deepcopy(self.resource)
+        resource['Oem']['Hpe']['State'] = state
+        resource['Oem']['Hpe']['FlashProgressPercent'] = (
+            None if state == 'Complete' else 50)
+        return server.Response(json.dumps(resource), headers=_ALLOW)
+
+
+def add_redfish_routes(replay, resources=None):
+    """Serves the Redfish samples from the replay server.
+
+    GET requests return the sample resources, session creation returns a
+    token, firmware updates progress as described in FirmwareUpdate and
+    every other modifying request is accepted with an empty body.
+
+    :param replay: a ReplayServer object.
+    :param resources: dictionary of path to resource document, defaults
+        to the unit test samples.
+    """
+    resources = resources or load_redfish_resources()
+    for path, resource in resources.items():
+        replay.add_route('GET', path,
+                         server.Response(json.dumps(resource),
+                                         headers=_ALLOW))
+    replay.add_route('POST', '/redfish/v1/SessionService/Sessions/',
+                     _session)
+    update_service = resources.get('/redfish/v1/UpdateService/')
+    if update_service:
+        update = FirmwareUpdate(update_service)
+        replay.add_route('GET', update_service['@odata.id'], update.get)
+        replay.add_route(
+            'POST',
+            update_service['Actions']['#UpdateService.SimpleUpdate']['target'],
+            update.start)
+    for method in ('POST', 'PATCH', 'PUT', 'DELETE'):
+        replay.add_fallback(method, lambda *args: _EMPTY)
+
+
+_RIBCL_COMMAND = re.compile(r'<(?:SERVER_INFO|RIB_INFO|USER_INFO)[^>]*>\s*'
+                            r'<([A-Z_]+)')
+
+# RIBCL command to sample response.
+RIBCL_RESPONSES = {
+    'GET_PRODUCT_NAME': ribcl_sample_outputs.GET_PRODUCT_NAME,
+    'GET_HOST_POWER_STATUS': ribcl_sample_outputs.GET_HOST_POWER_STATUS_XML,
+    'GET_ONE_TIME_BOOT': ribcl_sample_outputs.GET_ONE_TIME_BOOT_XML,
+    'GET_PERSISTENT_BOOT':
+        ribcl_sample_outputs.GET_PERSISTENT_BOOT_DEVICE_HDD_UEFI_XML,
+    'GET_ALL_LICENSES': ribcl_sample_outputs.GET_ALL_LICENSES_XML,
+    'GET_VM_STATUS': ribcl_sample_outputs.GET_VM_STATUS_XML,
+    'GET_POWER_READINGS': ribcl_sample_outputs.GET_HOST_POWER_READINGS,
+}
+
+
+def _ribcl(method, path, body):
+    match = _RIBCL_COMMAND.search(body.decode('utf-8', 'replace'))
+    command = match and match.group(1)
+    if command not in RIBCL_RESPONSES:
+        return server.Response(b'', status=400, content_type='text/xml')
+    return server.Response(RIBCL_RESPONSES[command], content_type='text/xml')
+
+
+def add_ribcl_routes(replay):
+    """Serves the RIBCL samples from the replay server.
+
+    :param replay: a ReplayServer object.
+    """
+    replay.add_route('POST', '/ribcl', _ribcl)
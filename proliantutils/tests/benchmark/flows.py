@@ -0,0 +1,103 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""The client flows measured by the benchmark.
+
+A flow is made of a ``setup`` callable, which gets the replay server
+and returns the object to operate on, and of a ``run`` callable doing the
+measured work on that object. Only ``run`` is measured.
+"""
+
+import collections
+
+from proliantutils.ilo import client
+from proliantutils.ilo import ribcl
+
+
+Flow = collections.namedtuple('Flow', ['name', 'description', 'setup',
+                                       'run'])
+
+
+_clients = []
+
+
+def _redfish_client(replay):
+    # Note: bypass the cache of IloClient objects, every run starts cold.
+    ilo = client.IloClient.cls(replay.address, 'admin', 'password',
+                               use_redfish_only=True)
+    _clients.append(ilo)
+    return ilo
+
+
+def close_clients():
+    """Logs out and closes the clients created by the flows so far.
+
+    This has to happen while the replay server is up, otherwise logging
+    out at garbage collection time keeps retrying against a closed port.
+    """
+    while _clients:
+        ilo = _clients.pop()
+        ilo.redfish._sushy.logout()
+        ilo.close()
+
+
+def _ribcl_client(replay):
+    ilo = ribcl.RIBCLOperations('127.0.0.1', 'admin', 'password',
+                                port=replay.port)
+    ilo.init_model_based_tags('ProLiant DL380 Gen9')
+    return ilo
+
+
+FLOWS = [
+    Flow('redfish-connect', 'IloClient creation over Redfish',
+         lambda replay: replay, _redfish_client),
+    Flow('redfish-capabilities', 'get_server_capabilities over Redfish',
+         _redfish_client, lambda ilo: ilo.get_server_capabilities()),
+    Flow('redfish-essential-properties',
+         'get_essential_properties over Redfish',
+         _redfish_client, lambda ilo: ilo.get_essential_properties()),
+    Flow('redfish-bios-get', 'get_current_bios_settings over Redfish',
+         _redfish_client, lambda ilo: ilo.get_current_bios_settings()),
+    Flow('redfish-bios-set', 'set_bios_settings over Redfish',
+         _redfish_client,
+         lambda ilo: ilo.set_bios_settings({'BootMode': 'LegacyBios'})),
+    Flow('redfish-raid-read', 'read_raid_configuration over Redfish',
+         _redfish_client, lambda ilo: ilo.read_raid_configuration()),
+    Flow('redfish-firmware-update', 'update_firmware of the iLO over Redfish',
+         _redfish_client,
+         lambda ilo: ilo.update_firmware('http://127.0.0.1/ilo5.bin', 'ilo')),
+    Flow('ribcl-product-name', 'get_product_name over RIBCL',
+         _ribcl_client, lambda ilo: ilo.get_product_name()),
+    Flow('ribcl-power-status', 'get_host_power_status over RIBCL',
+         _ribcl_client, lambda ilo: ilo.get_host_power_status()),
+    Flow('ribcl-one-time-boot', 'get_one_time_boot over RIBCL',
+         _ribcl_client, lambda ilo: ilo.get_one_time_boot()),
+]
+
+
+def get_flows(names=None):
+    """Returns the flows with the given names, all of them by default.
+
+    :param names: list of flow names.
+    :returns: a list of Flow objects.
+    :raises: ValueError, if a flow name is unknown.
+    """
+    if not names:
+        return list(FLOWS)
+    by_name = {flow.name: flow for flow in FLOWS}
+    unknown = set(names) - set(by_name)
+    if unknown:
+        raise ValueError('Unknown flows: %s' % ', '.join(sorted(unknown)))
+    return [by_name[name] for name in names]
@@ -0,0 +1,163 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Measures the bytes on the wire and decoding cost of the large documents.
+
+Usage::
+
+    python -m proliantutils.tests.benchmark.payloads --iterations 1000 \\
+        [--document bios-registry=captured.json] --output results.json
+
+For the BIOS settings, mappings and base configurations documents of the
+unit test samples, and any document given with ``--document``, the size
+uncompressed, gzipped and deflated is reported, along with the CPU time
+in microseconds to decompress it and to decode it with every available
+JSON codec of :mod:`proliantutils.json_codec`.
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+import time
+import zlib
+
+from proliantutils import json_codec
+from proliantutils.tests.benchmark import fixtures
+from proliantutils.tests.ilo import ris_sample_outputs
+
+
+def _redfish_sample(name):
+    def _load():
+        with open(os.path.join(fixtures.REDFISH_SAMPLES_DIR, name)) as f:
+            document = json.load(f)
+        return json.dumps(document.get('Default', document)).encode('utf-8')
+    return _load
+
+
+def _ris_sample(document):
+    return lambda: document.encode('utf-8')
+
+
+DOCUMENTS = {
+    'redfish-bios': _redfish_sample('bios.json'),
+    'redfish-bios-mappings': _redfish_sample('bios_mappings.json'),
+    'redfish-bios-base-configs': _redfish_sample('bios_base_configs.json'),
+    'redfish-smart-storage-config': _redfish_sample(
+        'smart_storage_config.json'),
+    'ris-bios': _ris_sample(ris_sample_outputs.GET_BIOS_SETTINGS),
+    'ris-bios-mappings': _ris_sample(ris_sample_outputs.GET_BIOS_MAPPINGS),
+}
+
+
+def _cpu_time(func, data, iterations):
+    start = time.process_time()
+    for _ in range(iterations):
+        func(data)
+    return (time.process_time() - start) / iterations * 1e6
+
+
+def measure(body, iterations=100):
+    """Measures one document.
+
+    :param body: the document, as bytes.
+    :param iterations: number of times every operation is timed.
+    :returns: a dictionary with the sizes in bytes and the CPU times in
+        microseconds.
+    """
+    gzipped = gzip.compress(body)
+    result = {'identity': len(body),
+              'gzip': len(gzipped),
+              'deflate': len(zlib.compress(body)),
+              'gunzip_us': _cpu_time(gzip.decompress, gzipped, iterations),
+              'decode_us': {}}
+    previous = json_codec.get_codec()
+    try:
+        for codec in json_codec.get_available_codecs():
+            json_codec.set_codec(codec)
+            result['decode_us'][codec] = _cpu_time(json_codec.loads, body,
+                                                   iterations)
+    finally:
+        json_codec.set_codec(previous)
+    return result
+
+
+def run(documents=None, iterations=100):
+    """Measures the documents.
+
+    :param documents: a dictionary of name to callable returning the
+        document as bytes, DOCUMENTS by default.
+    :param iterations: number of times every operation is timed.
+    :returns: a dictionary of document name to measurements.
+    """
+    documents = DOCUMENTS if documents is None else documents
+    return {name: measure(load(), iterations)
+            for name, load in sorted(documents.items())}
+
+
+def format_results(results):
+    codecs = json_codec.get_available_codecs()
+    header = '%-30s %9s %9s %9s %11s' % (
+        'document', 'identity', 'gzip', 'deflate', 'gunzip (us)')
+    lines = [header + ''.join(' %13s' % ('%s (us)' % codec)
+                              for codec in codecs)]
+    for name, result in results.items():
+        line = '%-30s %9d %9d %9d %11.1f' % (
+            name, result['identity'], result['gzip'], result['deflate'],
+            result['gunzip_us'])
+        lines.append(line + ''.join(' %13.1f' % result['decode_us'][codec]
+                                    for codec in codecs))
+    return '\n'.join(lines)
+
+
+def _read_file(path):
+    def _load():
+        with open(path, 'rb') as f:
+            return f.read()
+    return _load
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Measure the size and decoding cost of the large '
+                    'documents returned by the iLO.')
+    parser.add_argument('--document', action='append', default=[],
+                        metavar='NAME=PATH',
+                        help='additional JSON document to measure, e.g. '
+                             'captured from an iLO; can be repeated')
+    parser.add_argument('--iterations', type=int, default=100,
+                        help='number of times every operation is timed')
+    parser.add_argument('--output', help='file to write the JSON results to')
+    args = parser.parse_args(argv)
+
+    documents = dict(DOCUMENTS)
+    for document in args.document:
+        name, sep, path = document.partition('=')
+        if not sep:
+            parser.error('--document must be NAME=PATH')
+        documents[name] = _read_file(path)
+
+    results = run(documents, iterations=args.iterations)
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
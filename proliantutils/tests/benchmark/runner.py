@@ -0,0 +1,225 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Runs the client flows against the replay server and reports the cost.
+
+Usage::
+
+    python -m proliantutils.tests.benchmark.runner --latency 0.02 \\
+        --jitter 0.01 --bandwidth 1000000 --iterations 5 \\
+        --output results.json [--baseline previous.json] \\
+        [--no-compression]
+
+For every flow the number of round-trips, the bytes sent and received
+(compressed, as on the wire), the wall time and the time the client spent
+sleeping (polling delays, retry waits) are reported. Sleeps are not
+actually performed, they are accounted for in the ``slept`` column
+instead, so that long polling loops such as firmware updates do not slow
+down the benchmark.
+
+With ``--baseline`` the exit status is 1 if any flow needs more
+round-trips or bytes than in the baseline, or is slower than the baseline
+by more than ``--threshold``.
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from unittest import mock
+import warnings
+
+from proliantutils import instrumentation
+from proliantutils.tests.benchmark import fixtures
+from proliantutils.tests.benchmark import flows
+from proliantutils.tests.benchmark import server
+
+
+class _Recorder(instrumentation.InstrumentationHook):
+
+    def __init__(self):
+        self.round_trips = 0
+        self.retries = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def on_request_end(self, info):
+        self.round_trips += max(info.attempts, 1)
+        self.retries += info.retries
+        self.bytes_in += info.bytes_in
+        self.bytes_out += info.bytes_out
+
+
+def run_flow(flow, replay, iterations=1):
+    """Runs a flow and measures it.
+
+    :param flow: a flows.Flow object.
+    :param replay: a started server.ReplayServer object.
+    :param iterations: number of times to run the flow.
+    :returns: a dictionary with the measurements.
+    """
+    walls = []
+    slept = [0.0]
+
+    def _sleep(seconds):
+        slept[0] += seconds
+
+    result = {'description': flow.description, 'error': None}
+    for _ in range(iterations):
+        target = flow.setup(replay)
+        recorder = _Recorder()
+        slept[0] = 0.0
+        instrumentation.register_hook(recorder)
+        start = time.monotonic()
+        try:
+            with mock.patch.object(time, 'sleep', _sleep):
+                flow.run(target)
+        except Exception as e:
+            result['error'] = '%s: %s' % (type(e).__name__, e)
+        finally:
+            walls.append(time.monotonic() - start)
+            instrumentation.unregister_hook(recorder)
+            flows.close_clients()
+        # Note: the replayed responses do not change between iterations,
+        # so do the counters; keep those of the last run.
+        result.update(round_trips=recorder.round_trips,
+                      retries=recorder.retries,
+                      bytes_in=recorder.bytes_in,
+                      bytes_out=recorder.bytes_out,
+                      slept=slept[0])
+        if result['error']:
+            break
+    result.update(wall=statistics.median(walls), wall_min=min(walls))
+    return result
+
+
+def run(flow_names=None, profile=None, iterations=1, compression=True):
+    """Runs the flows against a fresh replay server.
+
+    :param flow_names: names of the flows to run, all of them by default.
+    :param profile: a server.NetworkProfile object.
+    :param iterations: number of times to run every flow.
+    :param compression: whether the server compresses the responses when
+        the client accepts it.
+    :returns: a dictionary of flow name to measurements.
+    """
+    selected = flows.get_flows(flow_names)
+    results = {}
+    with server.ReplayServer(profile=profile,
+                             compression=compression) as replay:
+        fixtures.add_redfish_routes(replay)
+        fixtures.add_ribcl_routes(replay)
+        for flow in selected:
+            results[flow.name] = run_flow(flow, replay, iterations)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """Returns the regressions of results over a baseline.
+
+    :param results: results as returned by run().
+    :param baseline: results of a previous run.
+    :param threshold: tolerated relative increase of the wall time.
+    :returns: a list of human readable regressions.
+    """
+    regressions = []
+    for name, result in sorted(results.items()):
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        if result['error'] and not previous.get('error'):
+            regressions.append('%s: now fails with %s'
+                               % (name, result['error']))
+            continue
+        for key in ('round_trips', 'bytes_in', 'bytes_out'):
+            if result[key] > previous.get(key, result[key]):
+                regressions.append('%s: %s went from %s to %s'
+                                   % (name, key, previous[key], result[key]))
+        if result['wall'] > previous.get('wall', 0) * (1 + threshold):
+            regressions.append('%s: wall time went from %.3fs to %.3fs'
+                               % (name, previous['wall'], result['wall']))
+    return regressions
+
+
+def format_results(results):
+    lines = ['%-30s %6s %7s %10s %10s %9s %9s' %
+             ('flow', 'trips', 'retries', 'bytes in', 'bytes out',
+              'wall (s)', 'slept (s)')]
+    for name, result in results.items():
+        lines.append('%-30s %6d %7d %10d %10d %9.3f %9.1f' %
+                     (name, result['round_trips'], result['retries'],
+                      result['bytes_in'], result['bytes_out'],
+                      result['wall'], result['slept']))
+        if result['error']:
+            lines.append('    ERROR: %s' % result['error'])
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Benchmark the proliantutils client flows against '
+                    'replayed iLO responses.')
+    parser.add_argument('--flow', action='append', dest='flows',
+                        help='flow to run, can be repeated; all by default. '
+                             'Available: %s' % ', '.join(
+                                 flow.name for flow in flows.FLOWS))
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help='latency in seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0,
+                        help='maximum random delay in seconds added on top '
+                             'of the latency')
+    parser.add_argument('--bandwidth', type=int, default=None,
+                        help='response throughput in bytes per second')
+    parser.add_argument('--seed', type=int, default=0,
+                        help='seed of the jitter')
+    parser.add_argument('--no-compression', action='store_false',
+                        dest='compression',
+                        help='never compress the responses')
+    parser.add_argument('--iterations', type=int, default=3,
+                        help='number of runs of every flow')
+    parser.add_argument('--output', help='file to write the JSON results to')
+    parser.add_argument('--baseline',
+                        help='JSON results of a previous run to compare to')
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help='tolerated relative increase of the wall time '
+                             'over the baseline')
+    args = parser.parse_args(argv)
+
+    # The replay server uses a self-signed certificate.
+    warnings.filterwarnings('ignore', message='Unverified HTTPS request')
+
+    profile = server.NetworkProfile(latency=args.latency, jitter=args.jitter,
+                                    bandwidth=args.bandwidth, seed=args.seed)
+    results = run(args.flows, profile=profile, iterations=args.iterations,
+                  compression=args.compression)
+    print(format_results(results))
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        for regression in regressions:
+            print('REGRESSION %s' % regression)
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,252 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Local HTTPS stand-in for an iLO replaying recorded responses."""
+
+import datetime
+import gzip
+import http.server
+import ipaddress
+import os
+import random
+import shutil
+import ssl
+import tempfile
+import threading
+
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.hazmat.primitives import serialization
+from cryptography.x509.oid import NameOID
+
+
+class Response(object):
+    """A canned HTTP response."""
+
+    def __init__(self, body=b'', status=200, headers=None,
+                 content_type='application/json'):
+        self.body = body.encode('utf-8') if isinstance(body, str) else body
+        self.status = status
+        self.headers = dict(headers or {})
+        self.headers.setdefault('Content-Type', content_type)
+
+
+# Responses smaller than this are not worth compressing, the iLO sends
+# them as is.
+MIN_COMPRESSED_SIZE = 1024
+
+NOT_FOUND = Response(b'{"error": {"code": "Base.1.0.ResourceMissingAtURI"}}',
+                     status=404)
+
+
+class NetworkProfile(object):
+    """Simulated network and BMC characteristics.
+
+    :param latency: fixed delay in seconds added to every response.
+    :param jitter: maximum random delay in seconds added on top of the
+        latency.
+    :param bandwidth: response throughput in bytes per second, or None
+        for unlimited.
+    :param seed: seed of the jitter random generator, so that runs are
+        reproducible.
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, bandwidth=None, seed=0):
+        self.latency = latency
+        self.jitter = jitter
+        self.bandwidth = bandwidth
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self, size):
+        """Returns the time in seconds to serve a response of the size."""
+        with self._lock:
+            delay = self.latency + self._random.uniform(0, self.jitter)
+        if self.bandwidth:
+            delay += float(size) / self.bandwidth
+        return delay
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, format, *args):
+        pass
+
+    def _handle(self):
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+        server = self.server.replay
+        response = server.dispatch(self.command, self.path, body)
+        body = response.body
+        headers = dict(response.headers)
+        if (server.compression and len(body) >= MIN_COMPRESSED_SIZE
+                and 'gzip' in self.headers.get('Accept-Encoding', '')):
+            body = gzip.compress(body)
+            headers['Content-Encoding'] = 'gzip'
+        # Note: not time.sleep(), the benchmark runner fakes it to skip
+        # the polling delays of the client.
+        server.stopped.wait(server.profile.delay(len(body)))
+        self.send_response(response.status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        if self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_GET = do_POST = do_PATCH = do_PUT = do_DELETE = do_HEAD = _handle
+
+
+class _ThreadingHTTPServer(http.server.ThreadingHTTPServer):
+
+    daemon_threads = True
+
+
+class ReplayServer(object):
+    """HTTPS server answering requests from registered routes.
+
+    Routes map an HTTP method and a path to a :class:`Response`, or to a
+    callable taking ``(method, path, body)`` and returning one. Paths are
+    matched without query string, case insensitively and ignoring the
+    trailing slash, which is how the iLO treats them too.
+
+    Use as a context manager::
+
+        with ReplayServer(profile=NetworkProfile(latency=0.02)) as server:
+            server.add_route('GET', '/redfish/v1/', Response('{}'))
+            ... talk to server.address ...
+
+    Like the iLO, the server compresses the large responses with gzip when
+    the client accepts it, unless ``compression`` is False.
+    """
+
+    def __init__(self, profile=None, compression=True):
+        self.profile = profile or NetworkProfile()
+        self.compression = compression
+        self._routes = {}
+        self._fallbacks = []
+        self._lock = threading.Lock()
+        self._httpd = None
+        self._thread = None
+        self._certdir = None
+        self.stopped = threading.Event()
+        self.requests = []
+
+    @staticmethod
+    def _normalize(path):
+        return path.split('?', 1)[0].rstrip('/').lower() or '/'
+
+    def add_route(self, method, path, response):
+        """Registers the response to a method and path.
+
+        :param method: HTTP method.
+        :param path: path of the resource.
+        :param response: a Response object or a callable returning one.
+        """
+        self._routes[(method.upper(), self._normalize(path))] = response
+
+    def add_fallback(self, method, handler):
+        """Registers a handler for the unrouted requests of a method.
+
+        :param method: HTTP method.
+        :param handler: callable taking ``(method, path, body)`` and
+            returning a Response, or None to let the next fallback try.
+        """
+        self._fallbacks.append((method.upper(), handler))
+
+    def dispatch(self, method, path, body):
+        with self._lock:
+            self.requests.append((method, path, len(body)))
+        response = self._routes.get((method, self._normalize(path)))
+        if callable(response):
+            response = response(method, path, body)
+        for fallback_method, handler in self._fallbacks:
+            if response is not None:
+                break
+            if fallback_method == method:
+                response = handler(method, path, body)
+        return response or NOT_FOUND
+
+    def _create_certificate(self):
+        key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME,
+                                             u'localhost')])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        cert = (x509.CertificateBuilder()
+                .subject_name(name).issuer_name(name)
+                .public_key(key.public_key())
+                .serial_number(x509.random_serial_number())
+                .not_valid_before(now - datetime.timedelta(minutes=5))
+                .not_valid_after(now + datetime.timedelta(days=1))
+                .add_extension(x509.SubjectAlternativeName(
+                    [x509.IPAddress(ipaddress.ip_address(u'127.0.0.1'))]),
+                    critical=False)
+                .sign(key, hashes.SHA256()))
+        self._certdir = tempfile.mkdtemp(prefix='proliantutils-bench-')
+        certfile = os.path.join(self._certdir, 'cert.pem')
+        keyfile = os.path.join(self._certdir, 'key.pem')
+        with open(certfile, 'wb') as f:
+            f.write(cert.public_bytes(serialization.Encoding.PEM))
+        with open(keyfile, 'wb') as f:
+            f.write(key.private_bytes(
+                serialization.Encoding.PEM,
+                serialization.PrivateFormat.TraditionalOpenSSL,
+                serialization.NoEncryption()))
+        return certfile, keyfile
+
+    def start(self):
+        """Starts serving on a free port of the loopback interface."""
+        self.stopped.clear()
+        certfile, keyfile = self._create_certificate()
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        self._httpd = _ThreadingHTTPServer(('127.0.0.1', 0), _Handler)
+        self._httpd.replay = self
+        self._httpd.socket = context.wrap_socket(self._httpd.socket,
+                                                 server_side=True)
+        self._thread = threading.Thread(target=self._httpd.serve_forever,
+                                        name='replay-server', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Stops the server and removes its certificate."""
+        self.stopped.set()
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._thread.join()
+            self._httpd = None
+        if self._certdir:
+            shutil.rmtree(self._certdir, ignore_errors=True)
+            self._certdir = None
+
+    @property
+    def port(self):
+        return self._httpd.server_address[1]
+
+    @property
+    def address(self):
+        """The ``host:port`` to use as iLO address."""
+        return '127.0.0.1:%d' % self.port
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
@@ -0,0 +1,124 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import warnings
+
+import testtools
+
+from proliantutils import json_codec
+from proliantutils.tests.benchmark import fixtures
+from proliantutils.tests.benchmark import payloads
+from proliantutils.tests.benchmark import runner
+from proliantutils.tests.benchmark import server
+
+
+class NetworkProfileTestCase(testtools.TestCase):
+
+    def test_delay(self):
+        profile = server.NetworkProfile(latency=0.1, jitter=0.05,
+                                        bandwidth=1000)
+        delay = profile.delay(500)
+        self.assertGreaterEqual(delay, 0.6)
+        self.assertLessEqual(delay, 0.65)
+        # Same seed, same jitter.
+        self.assertEqual(
+            server.NetworkProfile(jitter=1, seed=3).delay(0),
+            server.NetworkProfile(jitter=1, seed=3).delay(0))
+
+
+class FixturesTestCase(testtools.TestCase):
+
+    def test_load_redfish_resources(self):
+        resources = fixtures.load_redfish_resources()
+        self.assertIn('/redfish/v1/', resources)
+        # The default variant of multi-variant samples wins.
+        system = resources['/redfish/v1/Systems/1/']
+        self.assertEqual('1', system['Id'])
+        self.assertIn('/redfish/v1/Systems/1/Processors/', resources)
+
+    def test_firmware_update(self):
+        update = fixtures.FirmwareUpdate(
+            {'Oem': {'Hpe': {'State': 'Idle'}}}, steps=1)
+        states = []
+        for request in ('get', 'start', 'get', 'get', 'get'):
+            response = getattr(update, request)('GET', '/', b'')
+            if request == 'get':
+                states.append(response.body)
+        self.assertIn(b'"Idle"', states[0])
+        self.assertIn(b'"Updating"', states[1])
+        self.assertIn(b'"Complete"', states[2])
+        self.assertIn(b'"Complete"', states[3])
+
+
+class RunnerTestCase(testtools.TestCase):
+
+    def test_run(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore',
+                                    message='Unverified HTTPS request')
+            results = runner.run(['redfish-bios-get', 'redfish-bios-set',
+                                  'redfish-firmware-update',
+                                  'ribcl-power-status'])
+
+        for name, result in results.items():
+            self.assertIsNone(result['error'], name)
+        self.assertEqual(2, results['redfish-bios-get']['round_trips'])
+        self.assertGreater(results['redfish-bios-get']['bytes_in'], 0)
+        self.assertGreater(results['redfish-bios-set']['bytes_out'], 0)
+        self.assertGreater(results['redfish-firmware-update']['slept'], 0)
+        self.assertEqual(1, results['ribcl-power-status']['round_trips'])
+        self.assertGreater(results['ribcl-power-status']['bytes_out'], 0)
+
+    def test_run_compression(self):
+        with warnings.catch_warnings():
+            warnings.filterwarnings('ignore',
+                                    message='Unverified HTTPS request')
+            compressed = runner.run(['redfish-bios-get'])
+            uncompressed = runner.run(['redfish-bios-get'],
+                                      compression=False)
+
+        self.assertLess(compressed['redfish-bios-get']['bytes_in'],
+                        uncompressed['redfish-bios-get']['bytes_in'])
+
+    def test_compare(self):
+        baseline = {'a': {'error': None, 'round_trips': 2, 'bytes_in': 10,
+                          'bytes_out': 0, 'wall': 1.0},
+                    'b': {'error': None, 'round_trips': 2, 'bytes_in': 10,
+                          'bytes_out': 0, 'wall': 1.0}}
+        results = {'a': {'error': None, 'round_trips': 3, 'bytes_in': 10,
+                         'bytes_out': 0, 'wall': 1.1},
+                   'b': {'error': None, 'round_trips': 1, 'bytes_in': 5,
+                         'bytes_out': 0, 'wall': 2.0},
+                   'c': {'error': 'boom', 'round_trips': 0, 'bytes_in': 0,
+                         'bytes_out': 0, 'wall': 0}}
+
+        self.assertEqual(['a: round_trips went from 2 to 3',
+                          'b: wall time went from 1.000s to 2.000s'],
+                         runner.compare(results, baseline, 0.2))
+
+
+class PayloadsTestCase(testtools.TestCase):
+
+    def test_run(self):
+        results = payloads.run(iterations=1)
+
+        self.assertEqual(sorted(payloads.DOCUMENTS), sorted(results))
+        bios = results['redfish-bios']
+        self.assertLess(bios['gzip'], bios['identity'])
+        self.assertLess(bios['deflate'], bios['identity'])
+        self.assertEqual(sorted(json_codec.get_available_codecs()),
+                         sorted(bios['decode_us']))
+        self.assertIn('redfish-bios-mappings',
+                      payloads.format_results(results))
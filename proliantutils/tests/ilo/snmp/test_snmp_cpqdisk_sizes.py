@@ -17,6 +17,11 @@
 import unittest
 from unittest import mock
 
+from pysnmp.proto import errind
+
+from proliantutils import circuit_breaker
+from proliantutils import exception
+from proliantutils import timeouts
 from proliantutils.ilo.snmp import snmp_cpqdisk_sizes as snmp
 from proliantutils.tests.ilo.snmp import snmp_sample_output
 
@@ -69,3 +74,40 @@ class SnmpTestCase(unittest.TestCase):
                     'SNMPv2-SMI::enterprises.232.3.2.5.1.1.45.2.3':
                     {'cpqDaPhyDrvSize': '286102'}}
         self.assertEqual(expected, actual)
+
+    @mock.patch.object(snmp, '_create_usm_user_obj')
+    @mock.patch.object(snmp, 'hlapi')
+    def test__parse_mibs_timeouts_open_circuit(self, hlapi_mock, usm_mock):
+        circuit_breaker.configure(failure_threshold=2)
+        self.addCleanup(circuit_breaker.configure)
+        hlapi_mock.nextCmd.side_effect = lambda *args, **kwargs: iter(
+            [(errind.requestTimedOut, None, None, None)])
+
+        for i in range(2):
+            self.assertRaises(exception.IloSNMPExceptionFailure,
+                              snmp._parse_mibs, 'a.b.c.d', {})
+
+        self.assertRaises(exception.IloCircuitOpenError,
+                          snmp._parse_mibs, 'a.b.c.d', {})
+        self.assertEqual(2, hlapi_mock.nextCmd.call_count)
+
+    @mock.patch.object(snmp, '_create_usm_user_obj')
+    @mock.patch.object(snmp, 'hlapi')
+    def test__parse_mibs_retries_within_deadline(self, hlapi_mock,
+                                                 usm_mock):
+        hlapi_mock.nextCmd.return_value = iter([])
+
+        with timeouts.deadline(5):
+            snmp._parse_mibs('a.b.c.d', {})
+
+        hlapi_mock.UdpTransportTarget.assert_called_once_with(
+            ('a.b.c.d', 161), timeout=3, retries=0)
+
+    @mock.patch.object(snmp, '_create_usm_user_obj')
+    @mock.patch.object(snmp, 'hlapi')
+    def test__parse_mibs_deadline_exceeded(self, hlapi_mock, usm_mock):
+        with timeouts.deadline(0):
+            self.assertRaises(exception.IloDeadlineExceededError,
+                              snmp._parse_mibs, 'a.b.c.d', {})
+
+        self.assertFalse(hlapi_mock.nextCmd.called)
@@ -14,6 +14,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 """Test class for Client Module."""
+import threading
+import time
 from unittest import mock
 
 import testtools
@@ -25,6 +27,7 @@ from proliantutils.ilo import ribcl
 from proliantutils.ilo import ris
 from proliantutils.ilo.snmp import snmp_cpqdisk_sizes
 from proliantutils.redfish import redfish
+from proliantutils.redfish import session_manager
 
 
 def get_cls_wrapper(cls, cache=True):
@@ -62,17 +65,19 @@ class IloClientWrapperTestCase(testtools.TestCase):
 
     wrapper_cls = decorated_cls.__class__
 
+    def _get_key(self, address, admin, password):
+        return IloClientWrapperTestCase.wrapper_cls._get_key(
+            address, admin, password)
+
     @mock.patch.object(wrapper_cls, '_create_instance')
     @mock.patch.object(wrapper_cls, '_if_not_exists')
     def test___call___already_created(self, exists_mock, create_mock):
         exists_mock.return_value = True
-        try:
-            wrapper_obj = IloClientWrapperTestCase.wrapper_cls(
-                IloClientWrapperTestCase.original_cls)
-            wrapper_obj('a.b.c.d', 'abcd', 'deaf')
-        except KeyError:
-            pass
-        exists_mock.assert_called_once_with(('a.b.c.d', 'abcd', 'deaf'))
+        wrapper_obj = IloClientWrapperTestCase.wrapper_cls(
+            IloClientWrapperTestCase.original_cls)
+        wrapper_obj('a.b.c.d', 'abcd', 'deaf')
+        key = self._get_key('a.b.c.d', 'abcd', 'deaf')
+        exists_mock.assert_has_calls([mock.call(key), mock.call(key)])
         create_mock.assert_called_once_with('a.b.c.d', 'abcd', 'deaf')
 
     @mock.patch.object(wrapper_cls, '_create_instance')
@@ -85,9 +90,32 @@ class IloClientWrapperTestCase(testtools.TestCase):
             wrapper_obj('a.b.c.d', 'abcd', 'deaf')
         except KeyError:
             pass
-        exists_mock.assert_called_once_with(('a.b.c.d', 'abcd', 'deaf'))
+        exists_mock.assert_called_once_with(
+            self._get_key('a.b.c.d', 'abcd', 'deaf'))
         create_mock.assert_not_called()
 
+    def test___call___hit_refreshes_recency(self):
+        wrapper_obj = IloClientWrapperTestCase.wrapper_cls(
+            IloClientWrapperTestCase.original_cls)
+        wrapper_obj.MAX_CACHE_SIZE = 2
+        first = wrapper_obj('a.b.c.d', 'abcd', 'deaf')
+        wrapper_obj('e.f.g.h', 'efgh', 'deaf')
+        self.assertIs(first, wrapper_obj('a.b.c.d', 'abcd', 'deaf'))
+        wrapper_obj('i.j.k.l', 'ijkl', 'deaf')
+        self.assertIn(self._get_key('a.b.c.d', 'abcd', 'deaf'),
+                      wrapper_obj._instances)
+        self.assertNotIn(self._get_key('e.f.g.h', 'efgh', 'deaf'),
+                         wrapper_obj._instances)
+        self.assertEqual({'size': 2, 'hits': 1, 'misses': 3,
+                          'evictions': 1}, wrapper_obj.stats())
+
+    def test__get_key_hides_password(self):
+        key = self._get_key('a.b.c.d', 'abcd', 'deaf')
+        self.assertEqual('a.b.c.d', key[0])
+        self.assertEqual('abcd', key[1])
+        self.assertNotIn('deaf', key)
+        self.assertNotEqual(key, self._get_key('a.b.c.d', 'abcd', 'beef'))
+
     @mock.patch.object(original_cls, '__init__')
     @mock.patch.object(wrapper_cls, '_pop_oldest_node')
     def test__create_instance(self, pop_mock, init_mock):
@@ -118,9 +146,77 @@ class IloClientWrapperTestCase(testtools.TestCase):
         wrapper_obj('a.b.c.d', 'abcd', 'deaf')
         wrapper_obj('e.f.g.h', 'efgh', 'deaf')
         wrapper_obj('i.j.k.l', 'ijkl', 'deaf')
-        self.assertIn(('i.j.k.l', 'ijkl', 'deaf'), wrapper_obj._instances)
-        self.assertIn(('e.f.g.h', 'efgh', 'deaf'), wrapper_obj._instances)
-        self.assertNotIn(('a.b.c.d', 'ijkl', 'deaf'), wrapper_obj._instances)
+        self.assertIn(self._get_key('i.j.k.l', 'ijkl', 'deaf'),
+                      wrapper_obj._instances)
+        self.assertIn(self._get_key('e.f.g.h', 'efgh', 'deaf'),
+                      wrapper_obj._instances)
+        self.assertNotIn(self._get_key('a.b.c.d', 'abcd', 'deaf'),
+                         wrapper_obj._instances)
+
+    def test__pop_oldest_node_closes_node(self):
+        wrapper_obj = IloClientWrapperTestCase.wrapper_cls(
+            lambda *args: mock.MagicMock())
+        wrapper_obj.MAX_CACHE_SIZE = 1
+        first = wrapper_obj('a.b.c.d', 'abcd', 'deaf')
+        wrapper_obj('e.f.g.h', 'efgh', 'deaf')
+        first.close.assert_called_once_with()
+
+    @mock.patch.object(session_manager, 'SESSION_MANAGER', autospec=True)
+    def test_evicted_node_stays_usable(self, manager_mock):
+        conn = mock.MagicMock()
+        conn.get_system_collection_path.return_value = (
+            '/redfish/v1/Systems/')
+        conn.get_system.return_value.model = 'ProLiant DL380 Gen10'
+        manager_mock.acquire.side_effect = [('key1', conn), ('key2', conn),
+                                            ('key1', conn)]
+        wrapper_obj = IloClientWrapperTestCase.wrapper_cls(
+            client.IloClient.cls)
+        wrapper_obj.MAX_CACHE_SIZE = 1
+        first = wrapper_obj('1.2.3.4', 'admin', 'Admin',
+                            use_redfish_only=True, share_session=True)
+        wrapper_obj('1.2.3.5', 'admin', 'Admin', use_redfish_only=True,
+                    share_session=True)
+
+        manager_mock.release.assert_called_once_with('key1')
+        self.assertEqual('ProLiant DL380 Gen10', first.get_product_name())
+        self.assertEqual(3, manager_mock.acquire.call_count)
+        manager_mock.acquire.assert_called_with(
+            'https://1.2.3.4', 'admin', 'Admin', root_prefix='/redfish/v1/',
+            verify=False)
+
+    def test___call___sweeps_idle_nodes(self):
+        wrapper_obj = IloClientWrapperTestCase.wrapper_cls(
+            lambda *args: mock.MagicMock())
+        first = wrapper_obj('a.b.c.d', 'abcd', 'deaf')
+        with mock.patch.object(client.time, 'time',
+                               return_value=(time.time()
+                                             + wrapper_obj.IDLE_TIMEOUT
+                                             + 1)):
+            second = wrapper_obj('a.b.c.d', 'abcd', 'deaf')
+        self.assertIsNot(first, second)
+        first.close.assert_called_once_with()
+        self.assertEqual(1, wrapper_obj.stats()['evictions'])
+
+    def test___call___concurrent_creation(self):
+        created = []
+
+        def _slow_init(*args):
+            created.append(args)
+            time.sleep(0.1)
+            return mock.MagicMock()
+
+        wrapper_obj = IloClientWrapperTestCase.wrapper_cls(_slow_init)
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(
+                wrapper_obj('a.b.c.d', 'abcd', 'deaf')))
+            for i in range(5)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(1, len(created))
+        self.assertEqual(1, len(set(id(r) for r in results)))
 
 
 class IloClientInitTestCase(testtools.TestCase):
@@ -214,7 +310,7 @@ class IloClientInitTestCase(testtools.TestCase):
             "1.2.3.4", "admin", "Admin", 120, 4430, cacert='/somewhere')
         redfish_mock.assert_called_once_with(
             "1.2.3.4", "admin", "Admin", bios_password='foo',
-            cacert='/somewhere')
+            cacert='/somewhere', share_session=False)
         self.assertEqual(
             {'address': "1.2.3.4", 'username': "admin", 'password': "Admin"},
             c.ipmi_host_info)
@@ -241,7 +337,7 @@ class IloClientInitTestCase(testtools.TestCase):
             "1.2.3.4", "admin", "Admin", 120, 4430, cacert='/somewhere')
         redfish_mock.assert_called_once_with(
             "1.2.3.4", "admin", "Admin", bios_password='foo',
-            cacert='/somewhere')
+            cacert='/somewhere', share_session=False)
         self.assertEqual(
             {'address': "1.2.3.4", 'username': "admin", 'password': "Admin"},
             c.ipmi_host_info)
@@ -250,6 +346,144 @@ class IloClientInitTestCase(testtools.TestCase):
         self.assertFalse(c.is_ribcl_enabled)
         self.assertFalse(hasattr(c, 'ris'))
 
+    @mock.patch.object(ribcl, 'RIBCLOperations')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test_init_lazy(self, redfish_mock, ribcl_mock):
+        ribcl_obj_mock = ribcl_mock.return_value
+        ribcl_obj_mock.get_product_name.return_value = 'ProLiant DL180 Gen10'
+
+        c = client.IloClient.cls("1.2.3.4", "admin", "Admin",
+                                 lazy_init=True)
+
+        self.assertFalse(ribcl_obj_mock.get_product_name.called)
+        self.assertFalse(redfish_mock.called)
+        self.assertEqual('ProLiant DL180 Gen10', c.model)
+        redfish_mock.assert_called_once_with(
+            "1.2.3.4", "admin", "Admin", bios_password=None,
+            cacert=None, share_session=False)
+        self.assertTrue(c.is_ribcl_enabled)
+        self.assertFalse(hasattr(c, 'ris'))
+        # Discovery happens once.
+        c.model
+        ribcl_obj_mock.get_product_name.assert_called_once_with()
+
+    @mock.patch.object(ribcl, 'RIBCLOperations')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test_init_lazy_discovery_retried(self, redfish_mock, ribcl_mock):
+        ribcl_mock.return_value.get_product_name.side_effect = (
+            exception.IloError('RIBCL is disabled'))
+        redfish_mock.side_effect = [
+            exception.IloConnectionError('unreachable'), mock.DEFAULT]
+        redfish_mock.return_value.get_product_name.return_value = (
+            'ProLiant DL180 Gen10')
+
+        c = client.IloClient.cls("1.2.3.4", "admin", "Admin",
+                                 lazy_init=True)
+
+        self.assertRaises(exception.IloConnectionError, getattr, c, 'model')
+        self.assertEqual('ProLiant DL180 Gen10', c.model)
+        self.assertFalse(c.is_ribcl_enabled)
+        self.assertEqual(redfish_mock.return_value, c.redfish)
+        self.assertEqual(2, redfish_mock.call_count)
+
+    @mock.patch.object(ribcl, 'RIBCLOperations')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test_init_lazy_concurrent_discovery(self, redfish_mock, ribcl_mock):
+        probing = threading.Event()
+        release = threading.Event()
+
+        def get_product_name():
+            probing.set()
+            release.wait(5)
+            return 'ProLiant DL180 Gen10'
+
+        ribcl_obj_mock = ribcl_mock.return_value
+        ribcl_obj_mock.get_product_name.side_effect = get_product_name
+        c = client.IloClient.cls("1.2.3.4", "admin", "Admin",
+                                 lazy_init=True)
+        models = []
+        threads = [threading.Thread(target=lambda: models.append(c.model))
+                   for i in range(2)]
+
+        threads[0].start()
+        self.assertTrue(probing.wait(5))
+        threads[1].start()
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(['ProLiant DL180 Gen10'] * 2, models)
+        ribcl_obj_mock.get_product_name.assert_called_once_with()
+        redfish_mock.assert_called_once_with(
+            "1.2.3.4", "admin", "Admin", bios_password=None,
+            cacert=None, share_session=False)
+
+    @mock.patch.object(ribcl, 'RIBCLOperations')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test_init_discovery_cache_miss(self, redfish_mock, ribcl_mock):
+        ribcl_mock.return_value.get_product_name.side_effect = (
+            exception.IloError('RIBCL is disabled'))
+        redfish_mock.return_value.get_product_name.return_value = (
+            'ProLiant DL180 Gen10')
+        cache_mock = mock.MagicMock()
+        cache_mock.get.return_value = None
+
+        client.IloClient.cls("1.2.3.4", "admin", "Admin",
+                             discovery_cache=cache_mock)
+
+        cache_mock.get.assert_called_once_with("1.2.3.4")
+        cache_mock.set.assert_called_once_with(
+            "1.2.3.4", 'ProLiant DL180 Gen10', 'redfish',
+            is_ribcl_enabled=False)
+
+    @mock.patch.object(ribcl, 'RIBCLOperations')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test_init_discovery_cache_hit_redfish(self, redfish_mock,
+                                              ribcl_mock):
+        cache_mock = mock.MagicMock()
+        cache_mock.get.return_value = {'model': 'ProLiant DL180 Gen10',
+                                       'protocol': 'redfish',
+                                       'is_ribcl_enabled': False}
+
+        c = client.IloClient.cls("1.2.3.4", "admin", "Admin",
+                                 discovery_cache=cache_mock)
+
+        self.assertFalse(ribcl_mock.return_value.get_product_name.called)
+        self.assertFalse(redfish_mock.return_value.get_product_name.called)
+        self.assertFalse(cache_mock.set.called)
+        self.assertEqual('ProLiant DL180 Gen10', c.model)
+        self.assertFalse(c.is_ribcl_enabled)
+        self.assertIsNotNone(c.redfish)
+
+    @mock.patch.object(ribcl, 'RIBCLOperations')
+    @mock.patch.object(ris, 'RISOperations')
+    def test_init_discovery_cache_hit_ris(self, ris_mock, ribcl_mock):
+        cache_mock = mock.MagicMock()
+        cache_mock.get.return_value = {'model': 'ProLiant BL460c Gen9',
+                                       'protocol': 'ris',
+                                       'is_ribcl_enabled': None}
+
+        c = client.IloClient.cls("1.2.3.4", "admin", "Admin",
+                                 discovery_cache=cache_mock)
+
+        self.assertFalse(ribcl_mock.return_value.get_product_name.called)
+        ribcl_mock.return_value.init_model_based_tags.assert_called_once_with(
+            'ProLiant BL460c Gen9')
+        ris_mock.assert_called_once_with(
+            "1.2.3.4", "admin", "Admin", bios_password=None, cacert=None)
+        self.assertEqual('ProLiant BL460c Gen9', c.model)
+
+    @mock.patch.object(ribcl, 'RIBCLOperations')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test_init_with_share_session_set(
+            self, redfish_mock, ribcl_mock):
+        c = client.IloClient.cls("1.2.3.4", "admin", "Admin",
+                                 use_redfish_only=True, share_session=True)
+        redfish_mock.assert_called_once_with(
+            "1.2.3.4", "admin", "Admin", bios_password=None,
+            cacert=None, share_session=True)
+        self.assertTrue(c.share_session)
+
     @mock.patch.object(ribcl, 'RIBCLOperations')
     @mock.patch.object(redfish, 'RedfishOperations')
     def test_init_with_use_redfish_only_set(
@@ -262,7 +496,7 @@ class IloClientInitTestCase(testtools.TestCase):
             "1.2.3.4", "admin", "Admin", 120, 4430, cacert='/somewhere')
         redfish_mock.assert_called_once_with(
             "1.2.3.4", "admin", "Admin", bios_password='foo',
-            cacert='/somewhere')
+            cacert='/somewhere', share_session=False)
         self.assertEqual(
             {'address': "1.2.3.4", 'username': "admin", 'password': "Admin"},
             c.ipmi_host_info)
@@ -418,6 +652,41 @@ class IloClientTestCase(testtools.TestCase):
         self.client._call_method('reset_ilo')
         ilo_mock.assert_called_once_with()
 
+    def _call_concurrently(self, method_name, *args):
+        release = threading.Event()
+        operation_mock = mock.MagicMock(
+            side_effect=lambda *args: release.wait() and 'result')
+        setattr(self.client.ribcl, method_name, operation_mock)
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(
+                self.client._call_method(method_name, *args)))
+            for i in range(3)]
+        for thread in threads:
+            thread.start()
+        # Note: Wait until every thread is either in the call or waiting
+        # for the call of another thread.
+        deadline = time.monotonic() + 10
+        while (operation_mock.call_count
+               + self.client._single_flight.get_stats()['coalesced'] < 3):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(['result'] * 3, results)
+        return operation_mock
+
+    def test__call_method_coalesces_reads(self):
+        power_mock = self._call_concurrently('get_host_power_status')
+
+        power_mock.assert_called_once_with()
+
+    def test__call_method_does_not_coalesce_writes(self):
+        power_mock = self._call_concurrently('set_host_power', 'ON')
+
+        self.assertEqual(3, power_mock.call_count)
+
     """
     Testing ``_call_method`` with Redfish support.
 
@@ -483,6 +752,94 @@ class IloClientTestCase(testtools.TestCase):
         self.assertRaises(NotImplementedError,
                           self.client._call_method, 'reset_ilo')
 
+    @mock.patch.object(ribcl.RIBCLOperations, 'get_product_name')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test__call_method_dispatch_table_follows_model(
+            self, redfish_mock, ribcl_product_name_mock):
+        ribcl_product_name_mock.return_value = 'ProLiant DL380 Gen10'
+        self.client = client.IloClient.cls("1.2.3.4", "admin", "secret")
+        self.client.ris = mock.MagicMock()
+
+        self.client._call_method('get_host_power_status')
+        self.client.model = 'ProLiant DL380 Gen9'
+        self.client._call_method('get_host_power_status')
+
+        (redfish_mock.return_value.get_host_power_status.
+         assert_called_once_with())
+        self.client.ris.get_host_power_status.assert_called_once_with()
+
+    @mock.patch.object(ribcl.RIBCLOperations, 'get_host_power_status')
+    @mock.patch.object(ribcl.RIBCLOperations, 'get_product_name')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test__call_method_adaptive_routing(self, redfish_mock,
+                                           ribcl_product_name_mock,
+                                           ribcl_power_mock):
+        ribcl_product_name_mock.return_value = 'ProLiant DL380 Gen10'
+        self.client = client.IloClient.cls("1.2.3.4", "admin", "secret",
+                                           adaptive_routing=True)
+        router = self.client.latency_router
+        for i in range(router.min_samples):
+            router.record('get_host_power_status', 'redfish', 0.5)
+            router.record('get_host_power_status', 'ribcl', 0.1)
+        ribcl_power_mock.return_value = 'ON'
+        redfish_power_mock = (
+            redfish_mock.return_value.get_host_power_status)
+
+        self.assertEqual('ON',
+                         self.client._call_method('get_host_power_status'))
+        self.client._call_method('reset_server')
+
+        ribcl_power_mock.assert_called_once_with()
+        self.assertFalse(redfish_power_mock.called)
+        redfish_mock.return_value.reset_server.assert_called_once_with()
+        self.assertEqual(
+            router.min_samples + 1,
+            router.get_stats()['get_host_power_status']['ribcl']['samples'])
+
+    @mock.patch.object(ribcl.RIBCLOperations, 'get_one_time_boot')
+    @mock.patch.object(ribcl.RIBCLOperations, 'get_product_name')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test__call_method_adaptive_routing_one_time_boot(
+            self, redfish_mock, ribcl_product_name_mock, ribcl_boot_mock):
+        ribcl_product_name_mock.return_value = 'ProLiant DL380 Gen10'
+        self.client = client.IloClient.cls("1.2.3.4", "admin", "secret",
+                                           adaptive_routing=True)
+        router = self.client.latency_router
+        for i in range(router.min_samples):
+            router.record('get_one_time_boot', 'redfish', 0.5)
+            router.record('get_one_time_boot', 'ribcl', 0.1)
+
+        self.client._call_method('get_one_time_boot')
+
+        (redfish_mock.return_value.get_one_time_boot.
+         assert_called_once_with())
+        self.assertFalse(ribcl_boot_mock.called)
+
+    @mock.patch.object(ribcl.RIBCLOperations, 'get_host_power_status')
+    @mock.patch.object(ribcl.RIBCLOperations, 'get_product_name')
+    @mock.patch.object(redfish, 'RedfishOperations')
+    def test__call_method_adaptive_routing_fallback(
+            self, redfish_mock, ribcl_product_name_mock, ribcl_power_mock):
+        ribcl_product_name_mock.return_value = 'ProLiant DL380 Gen10'
+        self.client = client.IloClient.cls("1.2.3.4", "admin", "secret",
+                                           adaptive_routing=True)
+        router = self.client.latency_router
+        for i in range(router.min_samples):
+            router.record('get_host_power_status', 'redfish', 0.5)
+        ribcl_power_mock.side_effect = (
+            exception.IloCommandNotSupportedError('not supported'))
+        redfish_power_mock = (
+            redfish_mock.return_value.get_host_power_status)
+        redfish_power_mock.return_value = 'OFF'
+
+        self.assertEqual('OFF',
+                         self.client._call_method('get_host_power_status'))
+        self.assertEqual('OFF',
+                         self.client._call_method('get_host_power_status'))
+
+        ribcl_power_mock.assert_called_once_with()
+        self.assertEqual(2, redfish_power_mock.call_count)
+
     @mock.patch.object(redfish, 'RedfishOperations',
                        spec_set=True, autospec=True)
     def test__call_method_with_use_redfish_only_set(self, redfish_mock):
@@ -1164,6 +1521,59 @@ class IloClientTestCase(testtools.TestCase):
                                                   some_url,
                                                   some_component_type)
 
+    def test_close(self):
+        self.client.redfish = mock.MagicMock()
+        self.client.close()
+        self.client.redfish.close.assert_called_once_with()
+
+    def test_close_no_redfish(self):
+        self.client.close()
+
+    @mock.patch.object(client.IloClient.cls, '_call_method')
+    def test_update_firmware_invalidates_discovery_cache(
+            self, _call_method_mock):
+        self.client.discovery_cache = mock.MagicMock()
+        self.client.update_firmware('some-url', 'ilo')
+        self.client.discovery_cache.invalidate.assert_called_once_with(
+            '1.2.3.4')
+
+    @mock.patch.object(client.IloClient.cls, '_call_method')
+    def test_update_firmware_keeps_discovery_cache(self, _call_method_mock):
+        self.client.discovery_cache = mock.MagicMock()
+        self.client.update_firmware('some-url', 'bios')
+        self.assertFalse(self.client.discovery_cache.invalidate.called)
+
+    @mock.patch.object(client.IloClient.cls, '_call_method')
+    def test_watch_events(self, _call_method_mock):
+        listener = mock.MagicMock()
+        self.client.watch_events(listener)
+        _call_method_mock.assert_called_once_with('watch_events', listener)
+
+    @mock.patch.object(client.IloClient.cls, '_call_method')
+    def test_start_firmware_update(self, _call_method_mock):
+        job = self.client.start_firmware_update('some-url', 'ilo')
+        _call_method_mock.assert_called_once_with(
+            'start_firmware_update', 'some-url', 'ilo')
+        self.assertEqual(_call_method_mock.return_value, job)
+
+    @mock.patch.object(client.IloClient.cls, '_call_method')
+    def test_start_firmware_update_invalidates_discovery_cache_when_done(
+            self, _call_method_mock):
+        self.client.discovery_cache = mock.MagicMock()
+        job = self.client.start_firmware_update('some-url', 'ilo')
+        self.assertFalse(self.client.discovery_cache.invalidate.called)
+        done_callback = job.add_done_callback.call_args[0][0]
+        done_callback(job)
+        self.client.discovery_cache.invalidate.assert_called_once_with(
+            '1.2.3.4')
+
+    @mock.patch.object(client.IloClient.cls, '_call_method')
+    def test_start_firmware_update_keeps_discovery_cache(
+            self, _call_method_mock):
+        self.client.discovery_cache = mock.MagicMock()
+        job = self.client.start_firmware_update('some-url', 'bios')
+        self.assertFalse(job.add_done_callback.called)
+
     @mock.patch.object(ris.RISOperations, 'hold_pwr_btn')
     def test_hold_pwr_btn_gen9(self, hold_pwr_btn_mock):
         self.client.model = 'Gen9'
@@ -14,6 +14,7 @@
 #    under the License.
 """Test Class for Common Operations."""
 
+import threading
 import time
 import unittest
 from unittest import mock
@@ -73,7 +74,10 @@ class IloCommonModuleTestCase(unittest.TestCase):
         self.assertRaises(exception.IloError,
                           common.wait_for_ilo_after_reset,
                           self.ribcl)
-        self.assertEqual(10, name_mock.call_count)
+        self.assertEqual(time_mock.call_count, name_mock.call_count)
+        self.assertAlmostEqual(
+            common.ILO_RESET_TIMEOUT,
+            sum(c[0][0] for c in time_mock.call_args_list), places=1)
         name_mock.assert_called_with()
 
     @mock.patch.object(time, 'sleep')
@@ -131,7 +135,11 @@ class IloCommonModuleTestCase(unittest.TestCase):
         self.assertRaises(exception.IloError,
                           common.wait_for_ris_firmware_update_to_complete,
                           self.ris)
-        self.assertEqual(10, get_firmware_update_progress_mock.call_count)
+        self.assertEqual(sleep_mock.call_count,
+                         get_firmware_update_progress_mock.call_count)
+        self.assertAlmostEqual(
+            common.FIRMWARE_UPDATE_TIMEOUT,
+            sum(c[0][0] for c in sleep_mock.call_args_list), places=1)
 
     @mock.patch.object(time, 'sleep')
     @mock.patch.object(ris.RISOperations, 'get_firmware_update_progress')
@@ -166,14 +174,216 @@ class IloCommonModuleTestCase(unittest.TestCase):
     def test_wait_for_ribcl_firmware_update_silent_if_reset_exc_not_captured(
             self, get_product_name_mock, sleep_mock):
         # | GIVEN |
-        get_product_name_mock.side_effect = [
-            'Rap metal', 'Death metal', 'Black metal', 'Extreme metal',
-            'Folk metal', 'Gothic metal', 'Power metal', 'War metal',
-            'Thrash metal', 'Groove metal']
+        get_product_name_mock.return_value = 'Rap metal'
         # | WHEN |
         common.wait_for_ribcl_firmware_update_to_complete(self.ribcl)
         # | THEN |
-        self.assertEqual(10, get_product_name_mock.call_count)
+        self.assertEqual(sleep_mock.call_count,
+                         get_product_name_mock.call_count)
+        self.assertAlmostEqual(
+            65, sum(c[0][0] for c in sleep_mock.call_args_list), places=1)
+
+    @mock.patch.object(common.random, 'uniform', lambda a, b: b)
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_complete_backoff(self, sleep_mock):
+        # | GIVEN |
+        operation = mock.MagicMock(__name__='operation')
+        operation.side_effect = [False, exception.IloError('error'), False,
+                                 False, False, True]
+        # | WHEN |
+        result = common.wait_until_complete(operation, timeout=100,
+                                            initial_delay=3, max_interval=6)
+        # | THEN |
+        self.assertTrue(result)
+        self.assertEqual([mock.call(3), mock.call(1), mock.call(2),
+                          mock.call(4), mock.call(6), mock.call(6)],
+                         sleep_mock.call_args_list)
+        self.assertEqual(6, operation.call_count)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_complete_jitter(self, sleep_mock):
+        # | GIVEN |
+        operation = mock.MagicMock(__name__='operation', return_value=False)
+        # | WHEN |
+        common.wait_until_complete(operation, timeout=1000,
+                                   max_interval=10, jitter=0.5,
+                                   is_silent_loop_exit=True)
+        # | THEN |
+        delays = [c[0][0] for c in sleep_mock.call_args_list]
+        self.assertEqual(0, delays[0])
+        for delay in delays[5:-1]:
+            self.assertTrue(5 <= delay <= 10)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_complete_timeout(self, sleep_mock):
+        # | GIVEN |
+        operation = mock.MagicMock(__name__='operation', return_value=False)
+        # | WHEN | & | THEN |
+        self.assertRaisesRegex(exception.IloConnectionError, 'timed out',
+                               common.wait_until_complete, operation,
+                               timeout=20,
+                               failover_exc=exception.IloConnectionError,
+                               failover_msg='timed out')
+        self.assertEqual(sleep_mock.call_count, operation.call_count)
+        self.assertAlmostEqual(
+            20, sum(c[0][0] for c in sleep_mock.call_args_list), places=1)
+
+    @mock.patch.object(time, 'monotonic')
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_complete_slow_operation(self, sleep_mock,
+                                                monotonic_mock):
+        # | GIVEN |
+        # Every poll takes 15 seconds.
+        monotonic_mock.side_effect = [0, 0, 15, 15, 30, 30]
+        operation = mock.MagicMock(__name__='operation', return_value=False)
+        # | WHEN |
+        result = common.wait_until_complete(operation, timeout=20,
+                                            is_silent_loop_exit=True)
+        # | THEN |
+        self.assertFalse(result)
+        self.assertEqual(2, operation.call_count)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_complete_unexpected_error(self, sleep_mock):
+        # | GIVEN |
+        operation = mock.MagicMock(__name__='operation',
+                                   side_effect=[False, ValueError])
+        # | WHEN | & | THEN |
+        self.assertRaises(ValueError, common.wait_until_complete,
+                          operation, timeout=100)
+        self.assertEqual(2, operation.call_count)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_complete_async(self, sleep_mock):
+        # | GIVEN |
+        operation = mock.MagicMock(__name__='operation',
+                                   side_effect=[False, True])
+        # | WHEN |
+        future = common.wait_until_complete_async(operation, timeout=100)
+        # | THEN |
+        self.assertTrue(future.result(timeout=10))
+        self.assertEqual(2, operation.call_count)
+
+    @mock.patch.object(time, 'sleep')
+    def test_wait_until_complete_async_timeout(self, sleep_mock):
+        # | GIVEN |
+        operation = mock.MagicMock(__name__='operation', return_value=False)
+        # | WHEN |
+        future = common.wait_until_complete_async(operation, timeout=5)
+        # | THEN |
+        self.assertRaises(exception.IloError, future.result, 10)
+
+    @mock.patch.object(time, 'sleep')
+    @mock.patch.object(ris.RISOperations, 'get_firmware_update_progress')
+    @mock.patch.object(common, 'wait_for_ilo_after_reset', lambda x: None)
+    def test_wait_for_ris_firmware_update_to_complete_progress_callback(
+            self, get_firmware_update_progress_mock, sleep_mock):
+        # | GIVEN |
+        get_firmware_update_progress_mock.side_effect = [('PROGRESSING', 25),
+                                                         ('COMPLETED', 100)]
+        progress_callback = mock.MagicMock()
+        # | WHEN |
+        common.wait_for_ris_firmware_update_to_complete(
+            self.ris, progress_callback=progress_callback)
+        # | THEN |
+        progress_callback.assert_has_calls([mock.call('PROGRESSING', 25),
+                                            mock.call('COMPLETED', 100)])
+
+    def test_firmware_update_job(self):
+        # | GIVEN |
+        def supervise(progress_callback):
+            for state, percent in [('PROGRESSING', 25), ('PROGRESSING', 25),
+                                   ('PROGRESSING', 50), ('COMPLETED', 100)]:
+                progress_callback(state, percent)
+
+        progress_callback = mock.MagicMock()
+        done_callback = mock.MagicMock()
+        job = common.FirmwareUpdateJob('fw_file_url')
+        job.add_progress_callback(progress_callback)
+        # | WHEN |
+        job.start(supervise)
+        job.result(timeout=10)
+        job.add_done_callback(done_callback)
+        # | THEN |
+        self.assertTrue(job.done())
+        self.assertIsNone(job.exception())
+        self.assertEqual(('COMPLETED', 100), (job.state, job.percent))
+        progress_callback.assert_has_calls([
+            mock.call(job, 'PROGRESSING', 25),
+            mock.call(job, 'PROGRESSING', 50),
+            mock.call(job, 'COMPLETED', 100)])
+        self.assertEqual(3, progress_callback.call_count)
+        done_callback.assert_called_once_with(job)
+
+    @mock.patch.object(common, 'POLLER_WORKERS', 1)
+    def test_firmware_update_jobs_run_concurrently(self):
+        # | GIVEN |
+        release = threading.Event()
+        started = threading.Semaphore(0)
+
+        def supervise(progress_callback):
+            started.release()
+            release.wait(10)
+            progress_callback('COMPLETED', 100)
+
+        jobs = [common.FirmwareUpdateJob('fw_file_url', state='IDLE',
+                                         percent=0)
+                for i in range(3)]
+        # | WHEN |
+        for job in jobs:
+            job.start(supervise)
+        # | THEN |
+        for job in jobs:
+            self.assertEqual(('IDLE', 0), (job.state, job.percent))
+        for job in jobs:
+            self.assertTrue(started.acquire(timeout=10))
+        release.set()
+        for job in jobs:
+            job.result(timeout=10)
+            self.assertEqual(('COMPLETED', 100), (job.state, job.percent))
+
+    def test_firmware_update_job_fails(self):
+        # | GIVEN |
+        error = exception.IloError('Unable to update firmware')
+        supervise = mock.MagicMock(side_effect=error)
+        job = common.FirmwareUpdateJob('fw_file_url')
+        # | WHEN |
+        job.start(supervise)
+        # | THEN |
+        self.assertRaises(exception.IloError, job.result, 10)
+        self.assertIs(error, job.exception())
+
+    def test_firmware_update_job_progress_callback_error_ignored(self):
+        # | GIVEN |
+        def supervise(progress_callback):
+            progress_callback('PROGRESSING', 25)
+            progress_callback('COMPLETED', 100)
+
+        bad_callback = mock.MagicMock(side_effect=ValueError)
+        progress_callback = mock.MagicMock()
+        job = common.FirmwareUpdateJob('fw_file_url')
+        job.add_progress_callback(bad_callback)
+        job.add_progress_callback(progress_callback)
+        # | WHEN |
+        job.start(supervise)
+        job.result(timeout=10)
+        # | THEN |
+        self.assertEqual(2, bad_callback.call_count)
+        self.assertEqual(2, progress_callback.call_count)
+
+    @mock.patch.object(common, 'wait_until_complete')
+    def test_wait_for_operation_to_complete(self, wait_mock):
+        # | GIVEN |
+        operation = mock.MagicMock(__name__='operation')
+        # | WHEN |
+        common.wait_for_operation_to_complete(
+            operation, retries=5, delay_bw_retries=30,
+            delay_before_attempts=2, is_silent_loop_exit=True)
+        # | THEN |
+        wait_mock.assert_called_once_with(
+            operation, timeout=152, initial_delay=2, interval=1,
+            max_interval=30, failover_exc=exception.IloError,
+            failover_msg=mock.ANY, is_silent_loop_exit=True)
 
     @ddt.data(('/path/to/file.scexe', 'file', '.scexe'),
               ('/path/to/.hidden', '.hidden', ''),
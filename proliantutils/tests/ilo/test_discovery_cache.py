@@ -0,0 +1,95 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+
+import testtools
+
+from proliantutils.ilo import discovery_cache
+
+
+class DiscoveryCacheTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(DiscoveryCacheTestCase, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.path = os.path.join(self.tmpdir, 'cache', 'discovery.json')
+        self.cache = discovery_cache.DiscoveryCache(self.path, ttl=60)
+
+    def test_get_missing_file(self):
+        self.assertIsNone(self.cache.get('1.2.3.4'))
+
+    def test_get_corrupt_file(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, 'w') as f:
+            f.write('{not json')
+        self.assertIsNone(self.cache.get('1.2.3.4'))
+
+    def test_set_and_get(self):
+        self.cache.set('1.2.3.4', 'ProLiant DL380 Gen10',
+                       discovery_cache.PROTOCOL_REDFISH,
+                       is_ribcl_enabled=False)
+
+        # A fresh object reads the data persisted by the first one.
+        other = discovery_cache.DiscoveryCache(self.path)
+        entry = other.get('1.2.3.4')
+        self.assertEqual('ProLiant DL380 Gen10', entry['model'])
+        self.assertEqual('redfish', entry['protocol'])
+        self.assertFalse(entry['is_ribcl_enabled'])
+        self.assertIsNone(other.get('1.2.3.5'))
+
+    def test_get_expired(self):
+        self.cache.set('1.2.3.4', 'ProLiant BL460c Gen9',
+                       discovery_cache.PROTOCOL_RIS)
+        with mock.patch.object(time, 'time',
+                               return_value=time.time() + 61):
+            self.assertIsNone(self.cache.get('1.2.3.4'))
+
+    def test_invalidate(self):
+        self.cache.set('1.2.3.4', 'ProLiant BL460c Gen9',
+                       discovery_cache.PROTOCOL_RIS)
+        self.cache.set('1.2.3.5', 'ProLiant BL460c Gen9',
+                       discovery_cache.PROTOCOL_RIS)
+        self.cache.invalidate('1.2.3.4')
+        self.assertIsNone(self.cache.get('1.2.3.4'))
+        self.assertIsNotNone(self.cache.get('1.2.3.5'))
+
+    @mock.patch.object(tempfile, 'mkstemp', autospec=True)
+    def test_set_write_error_ignored(self, mkstemp_mock):
+        mkstemp_mock.side_effect = OSError('read-only file system')
+        self.cache.set('1.2.3.4', 'ProLiant BL460c Gen9',
+                       discovery_cache.PROTOCOL_RIS)
+        self.assertIsNone(self.cache.get('1.2.3.4'))
+
+    def test_set_unserializable_ignored(self):
+        self.cache.set('1.2.3.4', 'ProLiant BL460c Gen9',
+                       discovery_cache.PROTOCOL_RIS)
+        self.cache.set('1.2.3.5', object(), discovery_cache.PROTOCOL_RIS)
+        self.assertIsNotNone(self.cache.get('1.2.3.4'))
+        self.assertIsNone(self.cache.get('1.2.3.5'))
+        self.assertEqual(['discovery.json'],
+                         os.listdir(os.path.dirname(self.path)))
+
+    @mock.patch.object(os, 'replace', autospec=True)
+    def test_set_replace_error_removes_temporary_file(self, replace_mock):
+        replace_mock.side_effect = OSError('permission denied')
+        self.cache.set('1.2.3.4', 'ProLiant BL460c Gen9',
+                       discovery_cache.PROTOCOL_RIS)
+        self.assertEqual([], os.listdir(os.path.dirname(self.path)))
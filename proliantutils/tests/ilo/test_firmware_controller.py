@@ -16,6 +16,7 @@
 import distutils.spawn
 import os
 import shutil
+import ssl
 import tempfile
 import unittest
 from unittest import mock
@@ -26,6 +27,7 @@ from six.moves import builtins as __builtin__
 from proliantutils import exception
 from proliantutils.ilo import common
 from proliantutils.ilo import firmware_controller
+from proliantutils import tls
 
 
 @ddt.ddt
@@ -523,9 +525,9 @@ class FirmwareImageUploaderTestCase(unittest.TestCase):
                           ('host', 'port'), 60)
 
     @mock.patch.object(firmware_controller, 'socket')
-    @mock.patch.object(firmware_controller, 'ssl')
+    @mock.patch.object(tls, 'get_ssl_context', autospec=True)
     def test__get_socket_returns_ssl_wrapped_socket_if_all_goes_well(
-            self, ssl_mock, socket_mock):
+            self, get_ssl_context_mock, socket_mock):
         # | GIVEN |
         socket_mock.getaddrinfo().__iter__.return_value = [
             # (family, socktype, proto, canonname, sockaddr),
@@ -550,8 +552,34 @@ class FirmwareImageUploaderTestCase(unittest.TestCase):
             mock.call().settimeout('timeout'),
             mock.call().connect(('0.0.0.0-some-address', 80)),
         ])
-        self.assertTrue(ssl_mock.wrap_socket.called)
-        self.assertEqual(returned_sock, ssl_mock.wrap_socket())
+        get_ssl_context_mock.assert_called_once_with(None)
+        wrap_socket_mock = get_ssl_context_mock.return_value.wrap_socket
+        wrap_socket_mock.assert_called_once_with(
+            socket_mock.socket.return_value, server_hostname='host')
+        self.assertEqual(wrap_socket_mock.return_value, returned_sock)
+
+    @mock.patch.object(firmware_controller, 'socket')
+    @mock.patch.object(tls, 'get_ssl_context', autospec=True)
+    def test__get_socket_throws_exception_on_ssl_error(
+            self, get_ssl_context_mock, socket_mock):
+        # | GIVEN |
+        socket_mock.getaddrinfo().__iter__.return_value = [
+            (2, 1, 6, '', ('1.2.3.4', 443)),
+        ]
+        socket_mock.error = OSError
+        get_ssl_context_mock.return_value.wrap_socket.side_effect = (
+            ssl.SSLError('certificate verify failed'))
+        fw_img_uploader = (firmware_controller.
+                           FirmwareImageUploader('any_raw_file'))
+        fw_img_uploader.hostname = 'host'
+        fw_img_uploader.port = 443
+        fw_img_uploader.timeout = 'timeout'
+        fw_img_uploader.cacert = '/path/to/ca'
+        # | WHEN | & | THEN |
+        self.assertRaises(exception.IloConnectionError,
+                          fw_img_uploader._get_socket)
+        get_ssl_context_mock.assert_called_once_with('/path/to/ca')
+        socket_mock.socket.return_value.close.assert_called_once_with()
 
     @ddt.data(('foo.bar.blah.blah', exception.IloConnectionError),)
     @ddt.unpack
@@ -0,0 +1,255 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+import testtools
+
+from proliantutils import exception
+from proliantutils.ilo import client
+from proliantutils.ilo import firmware_controller
+from proliantutils.ilo import firmware_rollout
+
+
+def _nodes(count, **kwargs):
+    return [dict(address='10.0.0.%d' % i, username='admin',
+                 password='password', **kwargs) for i in range(count)]
+
+
+class FirmwareRolloutTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(FirmwareRolloutTestCase, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.state_path = os.path.join(self.tmpdir, 'rollout.json')
+        extractor_patcher = mock.patch.object(
+            firmware_controller, 'get_fw_extractor', autospec=True)
+        self.get_fw_extractor_mock = extractor_patcher.start()
+        self.addCleanup(extractor_patcher.stop)
+        self.extract_mock = self.get_fw_extractor_mock.return_value.extract
+        self.extract_mock.return_value = ('/tmp/ilo5_275.bin', False)
+        self.host_image = mock.MagicMock(return_value='http://store/ilo.bin')
+        self.clients = {}
+        self.failing = set()
+
+    def _client_factory(self, node):
+        ilo = mock.MagicMock(model=node.get('model', 'ProLiant DL380 Gen10'),
+                             host=node['address'])
+        if node['address'] in self.failing:
+            ilo.update_firmware.side_effect = exception.IloError('failed')
+        self.clients[node['address']] = ilo
+        return ilo
+
+    def _rollout(self, nodes, **kwargs):
+        kwargs.setdefault('host_image', self.host_image)
+        return firmware_rollout.FirmwareRollout(
+            nodes, 'ilo5_275.fwpkg', 'ilo',
+            client_factory=self._client_factory, **kwargs)
+
+    def test_run(self):
+        rollout = self._rollout(_nodes(5), wave_size=2)
+
+        states = rollout.run()
+
+        self.assertEqual({firmware_rollout.NODE_DONE},
+                         {state['state'] for state in states.values()})
+        self.assertEqual(5, len(states))
+        self.get_fw_extractor_mock.assert_called_once_with('ilo5_275.fwpkg')
+        self.host_image.assert_called_once_with('/tmp/ilo5_275.bin')
+        for ilo in self.clients.values():
+            ilo.update_firmware.assert_called_once_with(
+                'http://store/ilo.bin', 'ilo')
+
+    def test_run_unhosts_image(self):
+        unhost_image = mock.MagicMock()
+        self.failing = {'10.0.0.0'}
+        rollout = self._rollout(_nodes(2), unhost_image=unhost_image)
+
+        self.assertRaises(exception.FirmwareRolloutHalted, rollout.run)
+
+        unhost_image.assert_called_once_with('http://store/ilo.bin')
+
+    def test_run_gen8_does_not_unhost(self):
+        unhost_image = mock.MagicMock()
+        rollout = self._rollout(_nodes(1, model='ProLiant DL380 Gen8'),
+                                unhost_image=unhost_image)
+
+        rollout.run()
+
+        self.assertFalse(unhost_image.called)
+
+    def test_run_concurrently(self):
+        barrier = threading.Barrier(3, timeout=10)
+
+        def update_firmware(*args):
+            # Note: times out unless the whole wave runs at once.
+            barrier.wait()
+
+        def factory(node):
+            ilo = self._client_factory(node)
+            ilo.update_firmware.side_effect = update_firmware
+            return ilo
+
+        rollout = firmware_rollout.FirmwareRollout(
+            _nodes(3), 'ilo5_275.fwpkg', 'ilo', host_image=self.host_image,
+            wave_size=3, client_factory=factory)
+
+        states = rollout.run()
+
+        self.assertEqual({firmware_rollout.NODE_DONE},
+                         {state['state'] for state in states.values()})
+
+    def test_run_gen8_uploads_raw_file(self):
+        rollout = self._rollout(_nodes(1, model='ProLiant DL380 Gen8'),
+                                host_image=None)
+
+        rollout.run()
+
+        self.clients['10.0.0.0'].update_firmware.assert_called_once_with(
+            '/tmp/ilo5_275.bin', 'ilo')
+
+    def test_run_without_host_image(self):
+        rollout = self._rollout(_nodes(1), host_image=None,
+                                failure_budget=1)
+
+        states = rollout.run()
+
+        self.assertEqual(firmware_rollout.NODE_FAILED,
+                         states['10.0.0.0']['state'])
+        self.assertIn('no host_image', states['10.0.0.0']['error'])
+
+    @mock.patch.object(os, 'remove', autospec=True)
+    def test_run_removes_extracted_file(self, remove_mock):
+        self.extract_mock.return_value = ('/tmp/ilo5_275.bin', True)
+        rollout = self._rollout(_nodes(1))
+
+        rollout.run()
+
+        remove_mock.assert_called_once_with('/tmp/ilo5_275.bin')
+
+    def test_run_within_failure_budget(self):
+        self.failing = {'10.0.0.1'}
+        rollout = self._rollout(_nodes(4), wave_size=2, failure_budget=1)
+
+        states = rollout.run()
+
+        self.assertEqual(firmware_rollout.NODE_FAILED,
+                         states['10.0.0.1']['state'])
+        self.assertEqual('failed', states['10.0.0.1']['error'])
+        self.assertEqual(firmware_rollout.NODE_DONE,
+                         states['10.0.0.3']['state'])
+
+    def test_run_halts_over_failure_budget(self):
+        self.failing = {'10.0.0.0', '10.0.0.1'}
+        rollout = self._rollout(_nodes(4), wave_size=2, failure_budget=1)
+
+        self.assertRaisesRegex(exception.FirmwareRolloutHalted,
+                               'after 2 failed nodes', rollout.run)
+
+        states = rollout.get_states()
+        self.assertEqual(firmware_rollout.NODE_PENDING,
+                         states['10.0.0.2']['state'])
+        self.assertNotIn('10.0.0.2', self.clients)
+
+    def test_run_limits_rack_concurrency(self):
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def update_firmware(*args):
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            threading.Event().wait(0.05)
+            with lock:
+                running[0] -= 1
+
+        def factory(node):
+            ilo = self._client_factory(node)
+            ilo.update_firmware.side_effect = update_firmware
+            return ilo
+
+        rollout = firmware_rollout.FirmwareRollout(
+            _nodes(4, rack='r1'), 'ilo5_275.fwpkg', 'ilo',
+            host_image=self.host_image, wave_size=4, rack_concurrency=1,
+            client_factory=factory)
+
+        rollout.run()
+
+        self.assertEqual(1, peak[0])
+
+    def test_run_resumes(self):
+        self.failing = {'10.0.0.0', '10.0.0.1'}
+        rollout = self._rollout(_nodes(4), wave_size=2,
+                                state_path=self.state_path)
+        self.assertRaises(exception.FirmwareRolloutHalted, rollout.run)
+        with open(self.state_path) as f:
+            saved = json.load(f)
+        self.assertEqual('ilo5_275.fwpkg', saved['firmware_file'])
+        self.assertEqual(firmware_rollout.NODE_FAILED,
+                         saved['nodes']['10.0.0.0']['state'])
+
+        self.failing = set()
+        self.clients = {}
+        rollout = self._rollout(_nodes(4), wave_size=2,
+                                state_path=self.state_path)
+        states = rollout.run()
+
+        self.assertEqual({firmware_rollout.NODE_DONE},
+                         {state['state'] for state in states.values()})
+        self.assertEqual(4, len(self.clients))
+
+        self.clients = {}
+        rollout = self._rollout(_nodes(4), state_path=self.state_path)
+        rollout.run()
+        self.assertEqual({}, self.clients)
+        self.assertEqual(2, self.extract_mock.call_count)
+
+    def test_state_of_another_rollout(self):
+        with open(self.state_path, 'w') as f:
+            json.dump({'firmware_file': 'other.fwpkg',
+                       'component_type': 'ilo', 'nodes': {}}, f)
+
+        self.assertRaisesRegex(exception.InvalidInputError,
+                               'another firmware', self._rollout,
+                               _nodes(1), state_path=self.state_path)
+
+    def test_invalid_nodes(self):
+        self.assertRaisesRegex(exception.InvalidInputError, 'password',
+                               self._rollout,
+                               [{'address': '10.0.0.1', 'username': 'x'}])
+        self.assertRaisesRegex(exception.InvalidInputError,
+                               'more than once', self._rollout,
+                               _nodes(1) + _nodes(1))
+        self.assertRaises(exception.InvalidInputError, self._rollout,
+                          _nodes(1), wave_size=0)
+
+    @mock.patch.object(client, 'IloClient', autospec=True)
+    def test__create_client(self, ilo_client_mock):
+        node = {'address': '10.0.0.1', 'username': 'admin',
+                'password': 'password', 'rack': 'r1',
+                'use_redfish_only': True}
+
+        ilo = firmware_rollout._create_client(node)
+
+        self.assertEqual(ilo_client_mock.return_value, ilo)
+        ilo_client_mock.assert_called_once_with(
+            '10.0.0.1', 'admin', 'password', use_redfish_only=True)
@@ -0,0 +1,165 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from concurrent import futures
+import os
+import shutil
+import tempfile
+
+import ddt
+import requests
+import testtools
+
+from proliantutils import exception
+from proliantutils.ilo import image_server
+
+
+@ddt.ddt
+class ParseRangeTestCase(testtools.TestCase):
+
+    @ddt.data(('bytes=0-9', (0, 9)),
+              ('bytes=10-', (10, 99)),
+              ('bytes=90-200', (90, 99)),
+              ('bytes=-10', (90, 99)),
+              ('bytes=-200', (0, 99)),
+              ('bytes=100-', False),
+              ('bytes=20-10', False),
+              ('bytes=-0', False),
+              ('', None),
+              ('bytes=0-1,5-6', None),
+              ('items=0-1', None))
+    @ddt.unpack
+    def test__parse_range(self, header, expected):
+        self.assertEqual(expected, image_server._parse_range(header, 100))
+
+
+class ImageServerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(ImageServerTestCase, self).setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.content = bytes(bytearray(range(256))) * 64
+        self.path = os.path.join(self.tmpdir, 'ilo5 275.bin')
+        with open(self.path, 'wb') as f:
+            f.write(self.content)
+        self.server = image_server.ImageServer('127.0.0.1')
+        self.addCleanup(self.server.stop)
+
+    def test_get(self):
+        url = self.server.host(self.path)
+
+        response = requests.get(url, timeout=10)
+
+        self.assertTrue(url.startswith(
+            'http://127.0.0.1:%d/' % self.server.port))
+        self.assertTrue(url.endswith('/ilo5%20275.bin'))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.content, response.content)
+        self.assertEqual('bytes', response.headers['Accept-Ranges'])
+
+    def test_get_range(self):
+        url = self.server.host(self.path)
+
+        response = requests.get(url, headers={'Range': 'bytes=100-199'},
+                                timeout=10)
+
+        self.assertEqual(206, response.status_code)
+        self.assertEqual(self.content[100:200], response.content)
+        self.assertEqual('bytes 100-199/%d' % len(self.content),
+                         response.headers['Content-Range'])
+
+    def test_get_range_not_satisfiable(self):
+        url = self.server.host(self.path)
+
+        response = requests.get(
+            url, headers={'Range': 'bytes=%d-' % len(self.content)},
+            timeout=10)
+
+        self.assertEqual(416, response.status_code)
+        self.assertEqual('bytes */%d' % len(self.content),
+                         response.headers['Content-Range'])
+
+    def test_head(self):
+        url = self.server.host(self.path)
+
+        response = requests.head(url, timeout=10)
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(str(len(self.content)),
+                         response.headers['Content-Length'])
+        self.assertEqual(b'', response.content)
+
+    def test_get_unknown(self):
+        self.server.host(self.path)
+
+        response = requests.get('http://127.0.0.1:%d/x/ilo5%%20275.bin'
+                                % self.server.port, timeout=10)
+
+        self.assertEqual(404, response.status_code)
+
+    def test_get_concurrent(self):
+        url = self.server.host(self.path)
+
+        with futures.ThreadPoolExecutor(max_workers=8) as executor:
+            responses = list(executor.map(
+                lambda i: requests.get(url, timeout=10), range(16)))
+
+        for response in responses:
+            self.assertEqual(self.content, response.content)
+
+    def test_unhost(self):
+        url = self.server.host(self.path)
+
+        self.server.unhost(url)
+
+        self.assertEqual(404, requests.get(url, timeout=10).status_code)
+        self.assertTrue(os.path.exists(self.path))
+
+    def test_unhost_remove(self):
+        url = self.server.host(self.path, remove=True)
+
+        self.server.unhost(url)
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_stop_removes_files(self):
+        self.server.host(self.path, remove=True)
+
+        self.server.stop()
+
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_host_missing_file(self):
+        self.assertRaises(exception.InvalidInputError, self.server.host,
+                          os.path.join(self.tmpdir, 'missing.bin'))
+
+    def test_context_manager(self):
+        with image_server.ImageServer('127.0.0.1') as server:
+            url = server.host(self.path)
+            self.assertEqual(200, requests.get(url, timeout=10).status_code)
+        self.assertRaises(requests.exceptions.ConnectionError, requests.get,
+                          url, timeout=10)
+
+    def test_get_ipv6(self):
+        server = image_server.ImageServer('::1')
+        self.addCleanup(server.stop)
+        url = server.host(self.path)
+
+        response = requests.get(url, timeout=10)
+
+        self.assertTrue(url.startswith('http://[::1]:%d/' % server.port))
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(self.content, response.content)
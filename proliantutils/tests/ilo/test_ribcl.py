@@ -28,11 +28,14 @@ from requests.packages import urllib3
 from requests.packages.urllib3 import exceptions as urllib3_exceptions
 import xmltodict
 
+from proliantutils import circuit_breaker
 from proliantutils import exception
 from proliantutils.ilo import common
 from proliantutils.ilo import constants as cons
 from proliantutils.ilo import ribcl
 from proliantutils.tests.ilo import ribcl_sample_outputs as constants
+from proliantutils import timeouts
+from proliantutils import tls
 from proliantutils import utils
 
 
@@ -120,7 +123,7 @@ class IloRibclTestCase(unittest.TestCase):
         self.assertEqual(self.ilo.NIC_INFORMATION_TAG, "NIC_INFORMATION")
 
     @mock.patch.object(ribcl.RIBCLOperations, '_serialize_xml')
-    @mock.patch.object(requests, 'post')
+    @mock.patch.object(requests.Session, 'post')
     def test__request_ilo_without_verify(self, post_mock, serialize_mock):
         response_mock = mock.MagicMock(text='returned-text')
         serialize_mock.return_value = 'serialized-xml'
@@ -132,32 +135,34 @@ class IloRibclTestCase(unittest.TestCase):
             'https://x.x.x.x:443/ribcl',
             headers={"Content-length": '14'},
             data='serialized-xml',
-            verify=False)
+            timeout=(60, 60), verify=False)
         response_mock.raise_for_status.assert_called_once_with()
         self.assertEqual('returned-text', retval)
 
     @mock.patch.object(ribcl.RIBCLOperations, '_serialize_xml')
-    @mock.patch.object(requests, 'post')
-    def test__request_ilo_with_verify(self, post_mock, serialize_mock):
+    @mock.patch.object(tls, 'get_session', autospec=True)
+    def test__request_ilo_with_verify(self, get_session_mock, serialize_mock):
         self.ilo = ribcl.RIBCLOperations(
             "x.x.x.x", "admin", "Admin", 60, 443,
             cacert='/somepath')
         response_mock = mock.MagicMock(text='returned-text')
         serialize_mock.return_value = 'serialized-xml'
+        post_mock = get_session_mock.return_value.post
         post_mock.return_value = response_mock
 
         retval = self.ilo._request_ilo('xml-obj')
 
+        get_session_mock.assert_called_once_with('/somepath')
         post_mock.assert_called_once_with(
             'https://x.x.x.x:443/ribcl',
             headers={"Content-length": '14'},
             data='serialized-xml',
-            verify='/somepath')
+            timeout=(60, 60), verify='/somepath')
         response_mock.raise_for_status.assert_called_once_with()
         self.assertEqual('returned-text', retval)
 
     @mock.patch.object(ribcl.RIBCLOperations, '_serialize_xml')
-    @mock.patch.object(requests, 'post')
+    @mock.patch.object(requests.Session, 'post')
     def test__request_ilo_raises(self, post_mock, serialize_mock):
         serialize_mock.return_value = 'serialized-xml'
         post_mock.side_effect = Exception
@@ -170,7 +175,36 @@ class IloRibclTestCase(unittest.TestCase):
             'https://x.x.x.x:443/ribcl',
             headers={"Content-length": '14'},
             data='serialized-xml',
-            verify=False)
+            timeout=(60, 60), verify=False)
+
+    @mock.patch.object(ribcl.RIBCLOperations, '_serialize_xml')
+    @mock.patch.object(requests.Session, 'post')
+    def test__request_ilo_circuit_open(self, post_mock, serialize_mock):
+        circuit_breaker.configure(failure_threshold=2)
+        self.addCleanup(circuit_breaker.configure)
+        serialize_mock.return_value = 'serialized-xml'
+        post_mock.side_effect = requests.ConnectionError
+
+        for i in range(2):
+            self.assertRaises(exception.IloConnectionError,
+                              self.ilo._request_ilo, 'xml-obj')
+        self.assertRaises(exception.IloCircuitOpenError,
+                          self.ilo._request_ilo, 'xml-obj')
+        self.assertRaises(exception.IloCircuitOpenError,
+                          self.ilo._request_host)
+
+        self.assertEqual(2, post_mock.call_count)
+
+    @mock.patch.object(ribcl.RIBCLOperations, '_serialize_xml')
+    @mock.patch.object(requests.Session, 'post')
+    def test__request_ilo_deadline_exceeded(self, post_mock, serialize_mock):
+        serialize_mock.return_value = 'serialized-xml'
+
+        with timeouts.deadline(0):
+            self.assertRaises(exception.IloDeadlineExceededError,
+                              self.ilo._request_ilo, 'xml-obj')
+
+        self.assertFalse(post_mock.called)
 
     @mock.patch.object(ribcl.RIBCLOperations, '_request_ilo')
     def test_login_fail(self, request_ilo_mock):
@@ -516,22 +550,25 @@ class IloRibclTestCase(unittest.TestCase):
             self.assertIn('MINIMUM_POWER_READING', result)
             self.assertIn('AVERAGE_POWER_READING', result)
 
-    @mock.patch.object(requests, 'get')
-    def test__request_host_with_verify(self, request_mock):
+    @mock.patch.object(tls, 'get_session', autospec=True)
+    def test__request_host_with_verify(self, get_session_mock):
         self.ilo = ribcl.RIBCLOperations(
             "x.x.x.x", "admin", "Admin", 60, 443,
             cacert='/somepath')
         response_mock = mock.MagicMock(text='foo')
+        request_mock = get_session_mock.return_value.get
         request_mock.return_value = response_mock
 
         retval = self.ilo._request_host()
 
+        get_session_mock.assert_called_once_with('/somepath')
         request_mock.assert_called_once_with(
-            "https://x.x.x.x/xmldata?item=all", verify='/somepath')
+            "https://x.x.x.x/xmldata?item=all",
+            timeout=(60, 60), verify='/somepath')
         response_mock.raise_for_status.assert_called_once_with()
         self.assertEqual('foo', retval)
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
     def test__request_host_without_verify(self, request_mock):
         response_mock = mock.MagicMock(text='foo')
         request_mock.return_value = response_mock
@@ -539,11 +576,12 @@ class IloRibclTestCase(unittest.TestCase):
         retval = self.ilo._request_host()
 
         request_mock.assert_called_once_with(
-            "https://x.x.x.x/xmldata?item=all", verify=False)
+            "https://x.x.x.x/xmldata?item=all",
+            timeout=(60, 60), verify=False)
         response_mock.raise_for_status.assert_called_once_with()
         self.assertEqual('foo', retval)
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
     def test__request_host_raises(self, request_mock):
         request_mock.side_effect = Exception
 
@@ -551,7 +589,8 @@ class IloRibclTestCase(unittest.TestCase):
                           self.ilo._request_host)
 
         request_mock.assert_called_once_with(
-            "https://x.x.x.x/xmldata?item=all", verify=False)
+            "https://x.x.x.x/xmldata?item=all",
+            timeout=(60, 60), verify=False)
 
     @mock.patch.object(ribcl.RIBCLOperations, '_request_host')
     def test_get_host_uuid(self, request_host_mock):
@@ -836,7 +875,7 @@ class IloRibclTestCase(unittest.TestCase):
         self.ilo.update_firmware('raw_fw_file.bin', 'ilo')
         # | THEN |
         upload_file_to_mock.assert_called_once_with(
-            (self.ilo.host, self.ilo.port), self.ilo.timeout)
+            (self.ilo.host, self.ilo.port), self.ilo.timeout, cacert=None)
 
         ref_root_xml_string = constants.UPDATE_ILO_FIRMWARE_INPUT_XML % (
             self.ilo.password, self.ilo.login, 12345, 'raw_fw_file.bin')
@@ -874,7 +913,7 @@ class IloRibclTestCase(unittest.TestCase):
         self.ilo.update_firmware('raw_fw_file.bin', 'power_pic')
         # | THEN |
         upload_file_to_mock.assert_called_once_with(
-            (self.ilo.host, self.ilo.port), self.ilo.timeout)
+            (self.ilo.host, self.ilo.port), self.ilo.timeout, cacert=None)
 
         ref_root_xml_string = constants.UPDATE_NONILO_FIRMWARE_INPUT_XML % (
             self.ilo.password, self.ilo.login, 12345, 'raw_fw_file.bin')
@@ -17,6 +17,8 @@
 """Test class for RIS Module."""
 
 import json
+import shutil
+import tempfile
 from unittest import mock
 
 import ddt
@@ -24,6 +26,7 @@ from requests.packages import urllib3
 from requests.packages.urllib3 import exceptions as urllib3_exceptions
 import testtools
 
+from proliantutils import content_cache
 from proliantutils import exception
 from proliantutils.ilo import common
 from proliantutils.ilo import constants
@@ -659,6 +662,57 @@ class IloRisTestCase(testtools.TestCase):
         capabilities = self.client.get_server_capabilities()
         self.assertEqual(expected_caps, capabilities)
 
+    @mock.patch.object(ris.RISOperations, '_get_server_capabilities')
+    @mock.patch.object(ris.RISOperations, '_get_capabilities_fingerprint')
+    @mock.patch.object(ris.RISOperations, '_get_host_details')
+    def test_get_server_capabilities_cached(self, get_details_mock,
+                                            fingerprint_mock,
+                                            capabilities_mock):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        content_cache.configure(directory)
+        self.addCleanup(content_cache.configure)
+        get_details_mock.return_value = json.loads(
+            ris_outputs.RESPONSE_BODY_FOR_REST_OP)
+        fingerprint_mock.side_effect = ['fingerprint', 'fingerprint',
+                                        'new fingerprint']
+        capabilities_mock.side_effect = [{'server_model': 'Gen9'},
+                                         {'server_model': 'Gen9 Plus'}]
+
+        self.assertEqual({'server_model': 'Gen9'},
+                         self.client.get_server_capabilities())
+        self.assertEqual({'server_model': 'Gen9'},
+                         self.client.get_server_capabilities())
+        self.assertEqual({'server_model': 'Gen9 Plus'},
+                         self.client.get_server_capabilities())
+        self.assertEqual(2, capabilities_mock.call_count)
+
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
+    @mock.patch.object(ris.RISOperations, '_get_pci_devices')
+    @mock.patch.object(ris.RISOperations, '_get_ilo_details')
+    @mock.patch.object(ris.RISOperations, '_check_bios_resource')
+    @mock.patch.object(ris.RISOperations, '_get_memoized')
+    def test__get_capabilities_fingerprint(self, get_mock, check_bios_mock,
+                                           get_ilo_details_mock,
+                                           pci_mock, array_mock):
+        system = json.loads(ris_outputs.RESPONSE_BODY_FOR_REST_OP)
+        get_mock.return_value = (200, {'etag': 'W/"1A2B"'}, system)
+        check_bios_mock.return_value = (ris_outputs.GET_HEADERS,
+                                        '/rest/v1/systems/1/bios', {})
+        get_ilo_details_mock.return_value = (
+            json.loads(ris_outputs.GET_MANAGER_DETAILS),
+            '/rest/v1/Managers/1')
+        pci_mock.return_value = {'Total': 6}
+        array_mock.side_effect = exception.IloCommandNotSupportedError(
+            'error')
+
+        fingerprint = self.client._get_capabilities_fingerprint()
+
+        self.assertEqual(['W/"1A2B"', 'ProLiant BL460c Gen9',
+                          'I36 v1.40 (01/28/2015)', 'iLO 4 v2.20',
+                          'W/"715B59E6"', 6, None], json.loads(fingerprint))
+        get_mock.assert_called_once_with('/rest/v1/Systems/1')
+
     @mock.patch.object(ris.RISOperations, '_get_ilo_details')
     def test_get_ilo_firmware_version_as_major_minor(
             self, get_ilo_details_mock):
@@ -1195,6 +1249,76 @@ class IloRisTestCase(testtools.TestCase):
                           'fw_file_url',
                           'ilo')
 
+    @mock.patch.object(ris.RISOperations,
+                       '_get_firmware_update_service_resource',
+                       autospec=True)
+    @mock.patch.object(ris.RISOperations, '_rest_post', autospec=True)
+    @mock.patch.object(ris.common, 'wait_for_ris_firmware_update_to_complete',
+                       autospec=True)
+    @mock.patch.object(ris.RISOperations, 'get_firmware_update_progress',
+                       autospec=True)
+    def test_start_firmware_update(
+            self, get_firmware_update_progress_mock,
+            wait_for_ris_firmware_update_to_complete_mock, _rest_post_mock,
+            _get_firmware_update_service_resource_mock):
+        # | GIVEN |
+        _rest_post_mock.return_value = 200, 'some-headers', 'response'
+        get_firmware_update_progress_mock.return_value = 'COMPLETED', 100
+
+        def wait(ris_object, progress_callback):
+            progress_callback('PROGRESSING', 50)
+
+        wait_for_ris_firmware_update_to_complete_mock.side_effect = wait
+        # | WHEN |
+        job = self.client.start_firmware_update('fw_file_url', 'ilo')
+        job.result(timeout=10)
+        # | THEN |
+        _rest_post_mock.assert_called_once_with(
+            self.client, mock.ANY, None, {'Action': 'InstallFromURI',
+                                          'FirmwareURI': 'fw_file_url',
+                                          })
+        self.assertEqual(('PROGRESSING', 50), (job.state, job.percent))
+        get_firmware_update_progress_mock.assert_called_once_with(
+            self.client)
+
+    @mock.patch.object(
+        ris.RISOperations, '_get_firmware_update_service_resource',
+        autospec=True)
+    @mock.patch.object(ris.RISOperations, '_rest_post', autospec=True)
+    @mock.patch.object(ris.common, 'wait_for_ris_firmware_update_to_complete',
+                       autospec=True)
+    def test_start_firmware_update_throws_if_post_operation_fails(
+            self, wait_for_ris_firmware_update_to_complete_mock,
+            _rest_post_mock, _get_firmware_update_service_resource_mock):
+        # | GIVEN |
+        _rest_post_mock.return_value = 500, 'some-headers', 'response'
+        # | WHEN | & | THEN |
+        self.assertRaises(exception.IloError,
+                          self.client.start_firmware_update,
+                          'fw_file_url',
+                          'cpld')
+        self.assertFalse(wait_for_ris_firmware_update_to_complete_mock.called)
+
+    @mock.patch.object(ris.RISOperations,
+                       '_get_firmware_update_service_resource',
+                       autospec=True)
+    @mock.patch.object(ris.RISOperations, '_rest_post', autospec=True)
+    @mock.patch.object(ris.common, 'wait_for_ris_firmware_update_to_complete',
+                       autospec=True)
+    @mock.patch.object(ris.RISOperations, 'get_firmware_update_progress',
+                       autospec=True)
+    def test_start_firmware_update_error_in_update(
+            self, get_firmware_update_progress_mock,
+            wait_for_ris_firmware_update_to_complete_mock, _rest_post_mock,
+            _get_firmware_update_service_resource_mock):
+        # | GIVEN |
+        _rest_post_mock.return_value = 200, 'some-headers', 'response'
+        get_firmware_update_progress_mock.return_value = 'ERROR', 0
+        # | WHEN |
+        job = self.client.start_firmware_update('fw_file_url', 'ilo')
+        # | THEN |
+        self.assertRaises(exception.IloError, job.result, 10)
+
     @mock.patch.object(ris.RISOperations,
                        '_get_firmware_update_service_resource',
                        autospec=True)
@@ -1442,10 +1566,12 @@ class IloRisTestCase(testtools.TestCase):
         check_bios_mock.assert_called_once_with()
         bios_filter_mock.assert_not_called()
 
+    @mock.patch.object(ris.RISOperations, '_get_host_details')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     @mock.patch.object(ris.RISOperations, '_check_bios_resource')
     def test_get_default_bios_settings_filter_true(self, check_bios_mock,
-                                                   rest_get_mock):
+                                                   rest_get_mock,
+                                                   host_details_mock):
         bios_uri = '/rest/v1/systems/1/bios'
         settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
         check_bios_mock.return_value = (ris_outputs.GET_HEADERS,
@@ -1465,11 +1591,13 @@ class IloRisTestCase(testtools.TestCase):
             "/rest/v1/systems/1/bios/BaseConfigs")
         self.assertEqual(expected_value, actual_value)
 
+    @mock.patch.object(ris.RISOperations, '_get_host_details')
     @mock.patch.object(utils, 'apply_bios_properties_filter')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     @mock.patch.object(ris.RISOperations, '_check_bios_resource')
     def test_get_default_bios_settings_filter_false(
-            self, check_bios_mock, rest_get_mock, filter_mock):
+            self, check_bios_mock, rest_get_mock, filter_mock,
+            host_details_mock):
 
         bios_uri = '/rest/v1/systems/1/bios'
         settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
@@ -1490,8 +1618,28 @@ class IloRisTestCase(testtools.TestCase):
         self.assertEqual(expected_value, actual_value)
         filter_mock.assert_not_called()
 
+    @mock.patch.object(ris.RISOperations, '_get_default_bios_settings')
+    @mock.patch.object(ris.RISOperations, '_get_host_details')
+    def test_get_default_bios_settings_cached(self, host_details_mock,
+                                              default_settings_mock):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        content_cache.configure(directory)
+        self.addCleanup(content_cache.configure)
+        host_details_mock.return_value = json.loads(
+            ris_outputs.RESPONSE_BODY_FOR_REST_OP)
+        default_settings_mock.return_value = {'BootMode': 'Uefi'}
+
+        for i in range(2):
+            self.assertEqual({'BootMode': 'Uefi'},
+                             self.client.get_default_bios_settings(False))
+
+        default_settings_mock.assert_called_once_with()
+
+    @mock.patch.object(ris.RISOperations, '_get_host_details')
     @mock.patch.object(ris.RISOperations, '_check_bios_resource')
-    def test_get_default_bios_settings_no_links(self, check_bios_mock):
+    def test_get_default_bios_settings_no_links(self, check_bios_mock,
+                                                host_details_mock):
         bios_uri = '/rest/v1/systems/1/bios'
         settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
         check_bios_mock.return_value = (ris_outputs.GET_HEADERS,
@@ -1501,11 +1649,13 @@ class IloRisTestCase(testtools.TestCase):
                           self.client.get_default_bios_settings, False)
         check_bios_mock.assert_called_once_with()
 
+    @mock.patch.object(ris.RISOperations, '_get_host_details')
     @mock.patch.object(ris.RISOperations, '_get_extended_error')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     @mock.patch.object(ris.RISOperations, '_check_bios_resource')
     def test_get_default_bios_settings_check_extended_error(
-            self, check_bios_mock, rest_get_mock, ext_err_mock):
+            self, check_bios_mock, rest_get_mock, ext_err_mock,
+            host_details_mock):
 
         bios_uri = '/rest/v1/systems/1/bios'
         settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
@@ -1518,12 +1668,14 @@ class IloRisTestCase(testtools.TestCase):
         check_bios_mock.assert_called_once_with()
         ext_err_mock.assert_called_once_with(base_config)
 
+    @mock.patch.object(ris.RISOperations, '_get_host_details')
     @mock.patch.object(utils, 'apply_bios_properties_filter')
     @mock.patch.object(ris.RISOperations, '_get_extended_error')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     @mock.patch.object(ris.RISOperations, '_check_bios_resource')
     def test_get_default_bios_settings_no_default_settings(
-            self, check_bios_mock, rest_get_mock, ext_err_mock, filter_mock):
+            self, check_bios_mock, rest_get_mock, ext_err_mock, filter_mock,
+            host_details_mock):
 
         bios_uri = '/rest/v1/systems/1/bios'
         settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
@@ -1678,6 +1830,69 @@ class TestRISOperationsPrivateMethods(testtools.TestCase):
         super(TestRISOperationsPrivateMethods, self).setUp()
         self.client = ris.RISOperations("1.2.3.4", "admin", "Admin")
 
+    def _mock_collection(self, get_mock, pages, status=200):
+        collection_uri = '/rest/v1/Managers/1/NICs'
+        resources = {}
+        for index, members in enumerate(pages):
+            page = {'Type': 'Collection.1.0.0',
+                    'links': {'Member': [{'href': uri} for uri in members]}}
+            if index + 1 < len(pages):
+                page['links']['NextPage'] = {'page': index + 1}
+            uri = collection_uri + ('?page=%d' % index if index else '')
+            resources[uri] = page
+            for member in members:
+                resources[member] = {'Id': member}
+        get_mock.side_effect = lambda uri: (
+            status if uri in resources else 404, ris_outputs.GET_HEADERS,
+            resources.get(uri, {}))
+        return collection_uri
+
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_collection(self, get_mock):
+        pages = [['/rest/v1/Managers/1/NICs/%d' % i for i in range(6)],
+                 ['/rest/v1/Managers/1/NICs/%d' % i for i in range(6, 9)]]
+        collection_uri = self._mock_collection(get_mock, pages)
+
+        members = list(self.client._get_collection(collection_uri))
+
+        expected = [(200, ris_outputs.GET_HEADERS, {'Id': uri}, uri)
+                    for uri in pages[0] + pages[1]]
+        self.assertEqual(expected, members)
+        self.assertEqual(11, get_mock.call_count)
+
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_collection_items(self, get_mock):
+        items = {'Type': 'Collection.0.9.5',
+                 'Items': [{'Id': '1',
+                            'links': {'self': {'href': '/rest/v1/x/1'}}},
+                           {'Id': '2'}]}
+        get_mock.return_value = (200, ris_outputs.GET_HEADERS, items)
+
+        members = list(self.client._get_collection('/rest/v1/x'))
+
+        self.assertEqual([(200, None, items['Items'][0], '/rest/v1/x/1'),
+                          (200, None, items['Items'][1], None)], members)
+        get_mock.assert_called_once_with('/rest/v1/x')
+
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_collection_fail(self, get_mock):
+        get_mock.return_value = (404, ris_outputs.GET_HEADERS, {})
+        self.assertRaises(exception.IloError, list,
+                          self.client._get_collection('/rest/v1/x'))
+
+    @mock.patch.object(ris, 'COLLECTION_FETCH_WINDOW', 2)
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_collection_stops_fetching_when_closed(self, get_mock):
+        pages = [['/rest/v1/Managers/1/NICs/%d' % i for i in range(6)]]
+        collection_uri = self._mock_collection(get_mock, pages)
+
+        collection = self.client._get_collection(collection_uri)
+        self.assertEqual(pages[0][0], next(collection)[3])
+        collection.close()
+
+        # The collection, the first member and at most the window.
+        self.assertLessEqual(get_mock.call_count, 4)
+
     @mock.patch.object(ris.RISOperations, 'get_current_boot_mode')
     def test__is_boot_mode_uefi_uefi(self, get_current_boot_mode_mock):
         get_current_boot_mode_mock.return_value = 'UEFI'
@@ -1690,12 +1905,64 @@ class TestRISOperationsPrivateMethods(testtools.TestCase):
         result = self.client._is_boot_mode_uefi()
         self.assertFalse(result)
 
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_host_details_not_memoized(self, get_mock):
+        system = json.loads(ris_outputs.RESPONSE_BODY_FOR_REST_OP)
+        get_mock.return_value = (200, ris_outputs.GET_HEADERS, system)
+        self.client._get_host_details()
+        self.client._get_host_details()
+        self.assertEqual(2, get_mock.call_count)
+
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_host_details_memoized(self, get_mock):
+        system = json.loads(ris_outputs.RESPONSE_BODY_FOR_REST_OP)
+        bios = json.loads(ris_outputs.GET_BIOS_SETTINGS)
+        get_mock.side_effect = [(200, ris_outputs.GET_HEADERS, system),
+                                (200, ris_outputs.GET_HEADERS, bios),
+                                (200, ris_outputs.GET_HEADERS, system)]
+
+        @ris._memoize_resources
+        def _read(client):
+            first = client._get_host_details()
+            first['Model'] = 'modified by the caller'
+            second = client._get_host_details()
+            client._check_bios_resource()
+            client._check_bios_resource()
+            return second
+
+        self.assertEqual(system['Model'], _read(self.client)['Model'])
+        self.assertEqual([mock.call('/rest/v1/Systems/1'),
+                          mock.call('/rest/v1/systems/1/bios')],
+                         get_mock.call_args_list)
+        # The memo does not outlive the call.
+        self.client._get_host_details()
+        self.assertEqual(3, get_mock.call_count)
+
+    @mock.patch('proliantutils.rest.v1.RestConnectorBase._rest_op')
+    def test__get_host_details_memo_dropped_on_write(self, op_mock):
+        system = json.loads(ris_outputs.RESPONSE_BODY_FOR_REST_OP)
+        op_mock.return_value = (200, ris_outputs.GET_HEADERS, system)
+
+        @ris._memoize_resources
+        def _read_write_read(client):
+            client._get_host_details()
+            client._get_host_details()
+            client._rest_patch('/rest/v1/Systems/1', None, {})
+            client._get_host_details()
+
+        _read_write_read(self.client)
+        self.assertEqual(['GET', 'PATCH', 'GET'],
+                         [c[0][0] for c in op_mock.call_args_list])
+
+    @mock.patch.object(ris.RISOperations, '_get_pending_bios_settings')
     @mock.patch.object(ris.RISOperations, '_rest_patch')
     @mock.patch.object(ris.RISOperations, '_check_bios_resource')
-    def test___change_bios_setting(self, check_bios_mock, patch_mock):
+    def test___change_bios_setting(self, check_bios_mock, patch_mock,
+                                   pending_mock):
         bios_uri = '/rest/v1/systems/1/bios'
         properties = {'fake-property': 'fake-value'}
         settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
+        pending_mock.return_value = {}
         check_bios_mock.return_value = (ris_outputs.GET_HEADERS,
                                         bios_uri, settings)
         patch_mock.return_value = (200, ris_outputs.GET_HEADERS,
@@ -1704,6 +1971,84 @@ class TestRISOperationsPrivateMethods(testtools.TestCase):
         check_bios_mock.assert_called_once_with(properties.keys())
         patch_mock.assert_called_once_with(bios_uri, {}, properties)
 
+    @mock.patch.object(ris.RISOperations, '_get_pending_bios_settings')
+    @mock.patch.object(ris.RISOperations, '_rest_patch')
+    @mock.patch.object(ris.RISOperations, '_check_bios_resource')
+    def test___change_bios_setting_only_changed(self, check_bios_mock,
+                                                patch_mock, pending_mock):
+        bios_uri = '/rest/v1/systems/1/bios'
+        properties = {'BootMode': 'Uefi', 'Sriov': 'Enabled',
+                      'ProcTurbo': 'Disabled'}
+        settings = {'BootMode': 'Uefi', 'Sriov': 'Disabled',
+                    'ProcTurbo': 'Enabled'}
+        check_bios_mock.return_value = (ris_outputs.GET_HEADERS,
+                                        bios_uri, settings)
+        pending_mock.return_value = {'BootMode': 'LegacyBios',
+                                     'Sriov': 'Enabled'}
+        patch_mock.return_value = (200, ris_outputs.GET_HEADERS,
+                                   ris_outputs.REST_POST_RESPONSE)
+
+        changed = self.client._change_bios_setting(properties)
+
+        expected = {'BootMode': 'Uefi', 'ProcTurbo': 'Disabled'}
+        self.assertEqual(expected, changed)
+        pending_mock.assert_called_once_with(settings)
+        patch_mock.assert_called_once_with(bios_uri, {}, expected)
+
+    @mock.patch.object(ris.RISOperations, '_get_pending_bios_settings')
+    @mock.patch.object(ris.RISOperations, '_rest_patch')
+    @mock.patch.object(ris.RISOperations, '_check_bios_resource')
+    def test___change_bios_setting_nothing_to_apply(self, check_bios_mock,
+                                                    patch_mock, pending_mock):
+        settings = {'BootMode': 'Uefi', 'Sriov': 'Disabled'}
+        check_bios_mock.return_value = (ris_outputs.GET_HEADERS,
+                                        '/rest/v1/systems/1/bios', settings)
+        pending_mock.return_value = {'Sriov': 'Enabled'}
+
+        changed = self.client._change_bios_setting({'BootMode': 'Uefi',
+                                                    'Sriov': 'Enabled'})
+
+        self.assertEqual({}, changed)
+        self.assertFalse(patch_mock.called)
+
+    @mock.patch.object(ris.RISOperations, '_get_pending_bios_settings')
+    @mock.patch.object(ris.RISOperations, '_rest_patch')
+    @mock.patch.object(ris.RISOperations, '_check_bios_resource')
+    def test___change_bios_setting_pending_unknown(self, check_bios_mock,
+                                                   patch_mock, pending_mock):
+        bios_uri = '/rest/v1/systems/1/bios'
+        properties = {'BootMode': 'Uefi'}
+        check_bios_mock.return_value = (ris_outputs.GET_HEADERS, bios_uri,
+                                        {'BootMode': 'Uefi'})
+        pending_mock.return_value = None
+        patch_mock.return_value = (200, ris_outputs.GET_HEADERS,
+                                   ris_outputs.REST_POST_RESPONSE)
+
+        changed = self.client._change_bios_setting(properties)
+
+        self.assertEqual(properties, changed)
+        patch_mock.assert_called_once_with(bios_uri, {}, properties)
+
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_pending_bios_settings(self, get_mock):
+        settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
+        pending = json.loads(ris_outputs.GET_BIOS_PENDING_SETTINGS)
+        get_mock.return_value = (200, ris_outputs.GET_HEADERS, pending)
+        self.assertEqual(pending,
+                         self.client._get_pending_bios_settings(settings))
+        get_mock.assert_called_once_with(
+            settings['links']['Settings']['href'])
+
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_pending_bios_settings_fail(self, get_mock):
+        settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
+        get_mock.return_value = (404, ris_outputs.GET_HEADERS, {})
+        self.assertIsNone(self.client._get_pending_bios_settings(settings))
+
+    def test__get_pending_bios_settings_no_settings_link(self):
+        self.assertEqual({}, self.client._get_pending_bios_settings({}))
+
+    @mock.patch.object(ris.RISOperations, '_get_pending_bios_settings')
     @mock.patch.object(ris.RISOperations, '_validate_if_patch_supported')
     @mock.patch.object(ris.RISOperations, '_operation_allowed')
     @mock.patch.object(ris.RISOperations, '_get_bios_settings_resource')
@@ -1711,10 +2056,11 @@ class TestRISOperationsPrivateMethods(testtools.TestCase):
     @mock.patch.object(ris.RISOperations, '_check_bios_resource')
     def test___change_bios_setting_fail(self, check_bios_mock, patch_mock,
                                         settings_mock, op_mock,
-                                        validate_mock):
+                                        validate_mock, pending_mock):
         bios_uri = '/rest/v1/systems/1/bios/Settings'
         properties = {'fake-property': 'fake-value'}
         settings = json.loads(ris_outputs.GET_BIOS_SETTINGS)
+        pending_mock.return_value = {}
         op_mock.return_value = False
         settings_mock.return_value = (ris_outputs.GET_HEADERS,
                                       bios_uri, settings)
@@ -2476,19 +2822,6 @@ class TestRISOperationsPrivateMethods(testtools.TestCase):
                           self.client._get_array_controller_resource)
         get_mock.assert_called_once_with(array_uri)
 
-    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
-    def test__create_list_of_array_controllers(self, array_mock):
-        array_data = json.loads(ris_outputs.ARRAY_SETTINGS)
-        array_uri = '/rest/v1/Systems/1/SmartStorage/ArrayControllers'
-        array_mock.return_value = (ris_outputs.GET_HEADERS,
-                                   array_uri,
-                                   array_data)
-        expected_uri_links = (
-            [{u'href': u'/rest/v1/Systems/1/SmartStorage/ArrayControllers/0'}])
-        uri_links = self.client._create_list_of_array_controllers()
-        self.assertEqual(expected_uri_links, uri_links)
-        array_mock.assert_called_once_with()
-
     @mock.patch.object(ris.RISOperations, '_get_physical_drive_resource')
     def test__get_drive_type_and_speed(self, disk_details_mock):
         disk_details_mock.return_value = (
@@ -2499,65 +2832,112 @@ class TestRISOperationsPrivateMethods(testtools.TestCase):
         self.assertEqual(expected_out, out)
         disk_details_mock.assert_called_once_with()
 
-    @mock.patch.object(ris.RISOperations, '_create_list_of_array_controllers')
+    def _mock_storage(self, get_mock, array_mock,
+                      disk_collection=ris_outputs.DISK_COLLECTION,
+                      logical_collection=ris_outputs.LOGICAL_COLLECTION):
+        array_mock.return_value = (ris_outputs.GET_HEADERS,
+                                   '/rest/v1/Systems/1/SmartStorage/'
+                                   'ArrayControllers',
+                                   json.loads(ris_outputs.ARRAY_SETTINGS))
+        controller = json.loads(ris_outputs.ARRAY_MEM_SETTINGS)
+        disks = json.loads(disk_collection)
+        logicals = json.loads(logical_collection)
+        resources = {
+            '/rest/v1/Systems/1/SmartStorage/ArrayControllers/0': controller,
+            controller['links']['PhysicalDrives']['href']: disks,
+            controller['links']['LogicalDrives']['href']: logicals,
+        }
+        for collection, details in ((disks, ris_outputs.DISK_DETAILS_LIST),
+                                    (logicals, ris_outputs.LOGICAL_DETAILS)):
+            for member in collection['links'].get('Member', []):
+                resources[member['href']] = json.loads(details)
+        get_mock.side_effect = lambda uri: (ris_outputs.GET_HEADERS, uri,
+                                            resources[uri])
+
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_storage_inventory(self, get_mock, array_mock):
+        self._mock_storage(get_mock, array_mock)
+
+        inventory = self.client._get_storage_inventory()
+
+        self.assertEqual(json.loads(ris_outputs.ARRAY_SETTINGS),
+                         inventory.array_controllers)
+        self.assertEqual([json.loads(ris_outputs.DISK_DETAILS_LIST)],
+                         inventory.physical_drives)
+        self.assertEqual([json.loads(ris_outputs.LOGICAL_DETAILS)],
+                         inventory.logical_drives)
+        array_mock.assert_called_once_with()
+        # The controller, both drive collections and their members.
+        self.assertEqual(5, get_mock.call_count)
+
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_storage_inventory_memoized(self, get_mock, array_mock):
+        self._mock_storage(get_mock, array_mock)
+
+        @ris._memoize_resources
+        def _get_all_drives(ilo):
+            return (ilo._get_physical_drive_resource(),
+                    ilo._get_logical_drive_resource(),
+                    ilo._is_raid_supported())
+
+        physical, logical, raid = _get_all_drives(self.client)
+
+        self.assertEqual([json.loads(ris_outputs.DISK_DETAILS_LIST)],
+                         physical)
+        self.assertEqual([json.loads(ris_outputs.LOGICAL_DETAILS)], logical)
+        self.assertTrue(raid)
+        array_mock.assert_called_once_with()
+        self.assertEqual(5, get_mock.call_count)
+
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
+    @mock.patch.object(ris.RISOperations, '_rest_get')
+    def test__get_storage_inventory_no_array_controller(
+            self, get_mock, array_mock):
+        array_mock.return_value = None
+
+        inventory = self.client._get_storage_inventory()
+
+        self.assertEqual(ris.StorageInventory(None, [], []), inventory)
+        self.assertFalse(get_mock.called)
+
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     def test__get_drive_resource_physical(self, get_mock, array_mock):
-        array_mock.return_value = (
-            [{u'href': u'/rest/v1/Systems/1/SmartStorage/ArrayControllers/0'}])
-        get_mock.side_effect = [(ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.ARRAY_MEM_SETTINGS)),
-                                (ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.DISK_COLLECTION)),
-                                (ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.DISK_DETAILS_LIST))]
+        self._mock_storage(get_mock, array_mock)
         out = self.client._get_physical_drive_resource()
         expected_out = []
         expected_out.append(json.loads(ris_outputs.DISK_DETAILS_LIST))
         self.assertEqual(expected_out, out)
         array_mock.assert_called_once_with()
 
-    @mock.patch.object(ris.RISOperations, '_create_list_of_array_controllers')
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     def test__get_drive_resource_logical(self, get_mock, array_mock):
-        array_mock.return_value = (
-            [{u'href': u'/rest/v1/Systems/1/SmartStorage/ArrayControllers/0'}])
-        get_mock.side_effect = [(ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.ARRAY_MEM_SETTINGS)),
-                                (ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.LOGICAL_COLLECTION)),
-                                (ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.LOGICAL_DETAILS))]
+        self._mock_storage(get_mock, array_mock)
         out = self.client._get_logical_drive_resource()
         expected_out = []
         expected_out.append(json.loads(ris_outputs.LOGICAL_DETAILS))
         self.assertEqual(expected_out, out)
         array_mock.assert_called_once_with()
 
-    @mock.patch.object(ris.RISOperations, '_create_list_of_array_controllers')
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     def test__get_drive_resource_no_physical_disk(self, get_mock, array_mock):
-        array_mock.return_value = (
-            [{u'href': u'/rest/v1/Systems/1/SmartStorage/ArrayControllers/0'}])
-        disk_col_no_disk = json.loads(ris_outputs.DISK_COLLECTION_NO_DISK)
-        get_mock.side_effect = [(ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.ARRAY_MEM_SETTINGS)),
-                                (ris_outputs.GET_HEADERS, 'xyz',
-                                 disk_col_no_disk)]
+        self._mock_storage(get_mock, array_mock,
+                           disk_collection=ris_outputs.DISK_COLLECTION_NO_DISK)
         out = self.client._get_physical_drive_resource()
         self.assertIsNone(out)
         array_mock.assert_called_once_with()
 
-    @mock.patch.object(ris.RISOperations, '_create_list_of_array_controllers')
+    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
     @mock.patch.object(ris.RISOperations, '_rest_get')
     def test__get_drive_resource_no_logical_drive(self, get_mock, array_mock):
-        array_mock.return_value = (
-            [{u'href': u'/rest/v1/Systems/1/SmartStorage/ArrayControllers/0'}])
-        log_col_no_drive = json.loads(ris_outputs.LOGICAL_COLLECTION_NO_DRIVE)
-        get_mock.side_effect = [(ris_outputs.GET_HEADERS, 'xyz',
-                                 json.loads(ris_outputs.ARRAY_MEM_SETTINGS)),
-                                (ris_outputs.GET_HEADERS, 'xyz',
-                                 log_col_no_drive)]
-        out = self.client._get_physical_drive_resource()
+        self._mock_storage(
+            get_mock, array_mock,
+            logical_collection=ris_outputs.LOGICAL_COLLECTION_NO_DRIVE)
+        out = self.client._get_logical_drive_resource()
         self.assertIsNone(out)
         array_mock.assert_called_once_with()
 
@@ -2751,25 +3131,30 @@ class TestRISOperationsPrivateMethods(testtools.TestCase):
         self.assertEqual(nvdimm_n_status_return, expected_nvdimm_n_status)
         self.assertTrue(bios_mock.called)
 
-    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
-    def test__is_raid_supported(self, get_array_mock):
+    @mock.patch.object(ris.RISOperations, '_get_storage_inventory')
+    def test__is_raid_supported(self, inventory_mock):
         array_settings = json.loads(ris_outputs.ARRAY_SETTINGS)
-        get_array_mock.return_value = (200, ris_outputs.GET_HEADERS,
-                                       array_settings)
+        inventory_mock.return_value = ris.StorageInventory(array_settings,
+                                                           [], [])
         expt_ret = True
         ret = self.client._is_raid_supported()
         self.assertEqual(ret, expt_ret)
-        get_array_mock.assert_called_once_with()
+        inventory_mock.assert_called_once_with()
 
-    @mock.patch.object(ris.RISOperations, '_get_array_controller_resource')
-    def test__is_raid_supported_false(self, get_array_mock):
+    @mock.patch.object(ris.RISOperations, '_get_storage_inventory')
+    def test__is_raid_supported_false(self, inventory_mock):
         array_settings = json.loads(ris_outputs.ARRAY_SETTING_NO_CONTROLLER)
-        get_array_mock.return_value = (200, ris_outputs.GET_HEADERS,
-                                       array_settings)
+        inventory_mock.return_value = ris.StorageInventory(array_settings,
+                                                           [], [])
         expt_ret = False
         ret = self.client._is_raid_supported()
         self.assertEqual(ret, expt_ret)
-        get_array_mock.assert_called_once_with()
+        inventory_mock.assert_called_once_with()
+
+    @mock.patch.object(ris.RISOperations, '_get_storage_inventory')
+    def test__is_raid_supported_no_array_controller(self, inventory_mock):
+        inventory_mock.return_value = ris.StorageInventory(None, [], [])
+        self.assertFalse(self.client._is_raid_supported())
 
     @mock.patch.object(ris.RISOperations, 'get_product_name')
     def test_read_raid_configuration(self, product_name_mock):
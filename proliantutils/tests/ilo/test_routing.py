@@ -0,0 +1,78 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import testtools
+
+from proliantutils.ilo import routing
+
+
+class LatencyRouterTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(LatencyRouterTestCase, self).setUp()
+        self.router = routing.LatencyRouter(min_samples=2, probe_interval=5,
+                                            smoothing=0.5)
+        self.protocols = ('redfish', 'ribcl')
+
+    def _route(self, latencies, count):
+        chosen = []
+        for i in range(count):
+            protocol = self.router.choose('get_host_power_status',
+                                          self.protocols)
+            self.router.record('get_host_power_status', protocol,
+                               latencies[protocol])
+            chosen.append(protocol)
+        return chosen
+
+    def test_choose_samples_every_protocol_first(self):
+        chosen = self._route({'redfish': 0.3, 'ribcl': 0.1}, 4)
+
+        self.assertEqual(['redfish', 'redfish', 'ribcl', 'ribcl'], chosen)
+
+    def test_choose_fastest_and_probes(self):
+        chosen = self._route({'redfish': 0.3, 'ribcl': 0.1}, 10)
+
+        self.assertEqual(['redfish'] + ['ribcl'] * 4 + ['redfish'],
+                         chosen[4:])
+
+    def test_choose_follows_latency_changes(self):
+        self._route({'redfish': 0.3, 'ribcl': 0.1}, 4)
+
+        chosen = self._route({'redfish': 0.3, 'ribcl': 1.0}, 4)
+
+        # Note: The first call is a probe of Redfish.
+        self.assertEqual(['redfish', 'ribcl', 'redfish', 'redfish'], chosen)
+
+    def test_choose_single_protocol(self):
+        self.assertEqual('redfish',
+                         self.router.choose('get_host_power_status',
+                                            ('redfish',)))
+
+    def test_disable(self):
+        self.router.disable('get_host_power_status', 'ribcl')
+
+        chosen = self._route({'redfish': 0.3, 'ribcl': 0.1}, 6)
+
+        self.assertEqual(['redfish'] * 6, chosen)
+
+    def test_get_stats(self):
+        self.router.record('get_product_name', 'redfish', 0.5)
+        self.router.record('get_product_name', 'redfish', 0.25)
+        self.router.disable('get_product_name', 'redfish')
+
+        self.assertEqual(
+            {'get_product_name': {'redfish': {'samples': 2, 'latency': 0.375,
+                                              'disabled': True}}},
+            self.router.get_stats())
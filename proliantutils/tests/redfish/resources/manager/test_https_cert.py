@@ -128,4 +128,8 @@ class HttpsCertTestCase(testtools.TestCase):
         get_generate_csr_refresh_mock.side_effect = exc
         self.assertRaises(exception.IloError,
                           self.https_cert_inst.wait_for_csr_to_create)
-        self.assertEqual(10, get_generate_csr_refresh_mock.call_count)
+        self.assertEqual(sleep_mock.call_count,
+                         get_generate_csr_refresh_mock.call_count)
+        self.assertAlmostEqual(
+            https_cert.CSR_TIMEOUT,
+            sum(c[0][0] for c in sleep_mock.call_args_list), places=1)
@@ -16,6 +16,7 @@
 import json
 from unittest import mock
 
+import ddt
 import sushy
 import testtools
 
@@ -272,6 +273,77 @@ class BIOSSettingsTestCase(testtools.TestCase):
                               bios.BIOSBaseConfigs)
         self.assertFalse(default_settings._is_stale)
 
+    def test_get_attribute_registry(self):
+        with open('proliantutils/tests/redfish/'
+                  'json_samples/bios_attribute_registry.json', 'r') as f:
+            registry = json.loads(f.read())
+        self.conn.get.return_value.json.side_effect = [
+            registry['Registries'], registry['RegistryFile'],
+            registry['Registry']]
+
+        attributes = self.bios_inst.get_attribute_registry(
+            '/redfish/v1/Registries/')
+
+        self.assertEqual({'Type': 'Enumeration', 'ReadOnly': False,
+                          'Values': ['Uefi', 'LegacyBios']},
+                         attributes['BootMode'])
+        self.assertEqual({'Type': 'Integer', 'ReadOnly': False,
+                          'LowerBound': 0, 'UpperBound': 60, 'Values': []},
+                         attributes['PostBootProgress'])
+        self.conn.get.assert_called_with(
+            '/redfish/v1/RegistryStore/attributeregistries/en/'
+            'BiosAttributeRegistryU31.v1_1_00/')
+
+    def test_get_attribute_registry_not_published(self):
+        with open('proliantutils/tests/redfish/'
+                  'json_samples/bios_attribute_registry.json', 'r') as f:
+            registry = json.loads(f.read())
+        registry['Registries']['Members'].pop()
+        self.conn.get.return_value.json.side_effect = [
+            registry['Registries']]
+
+        self.assertEqual({}, self.bios_inst.get_attribute_registry(
+            '/redfish/v1/Registries/'))
+
+
+@ddt.ddt
+class ValidateSettingsTestCase(testtools.TestCase):
+
+    ATTRIBUTES = {
+        'BootMode': {'Type': 'Enumeration', 'ReadOnly': False,
+                     'Values': ['Uefi', 'LegacyBios']},
+        'MemClearWarmReset': {'Type': 'Enumeration', 'ReadOnly': True,
+                              'Values': ['Enabled', 'Disabled']},
+        'PostBootProgress': {'Type': 'Integer', 'LowerBound': 0,
+                             'UpperBound': 60, 'Values': []},
+        'UrlBootFile': {'Type': 'String', 'MinLength': 0, 'MaxLength': 8,
+                        'Values': []},
+        'Flag': {'Type': 'Boolean', 'Values': []},
+    }
+
+    def test_validate_settings(self):
+        bios.validate_settings({'BootMode': 'Uefi', 'PostBootProgress': 60,
+                                'UrlBootFile': 'http://', 'Flag': True},
+                               self.ATTRIBUTES)
+
+    @ddt.data(({'Foo': 'Bar'}, 'Foo is not a BIOS setting'),
+              ({'MemClearWarmReset': 'Enabled'},
+               'MemClearWarmReset is read-only'),
+              ({'BootMode': 'Uefi1'},
+               'BootMode must be one of Uefi, LegacyBios'),
+              ({'PostBootProgress': 61},
+               'PostBootProgress must be between 0 and 60'),
+              ({'PostBootProgress': '1'},
+               'PostBootProgress must be an integer'),
+              ({'UrlBootFile': 'http://foo'},
+               'UrlBootFile must be 0 to 8 characters long'),
+              ({'Flag': 'True'}, 'Flag must be a boolean'))
+    @ddt.unpack
+    def test_validate_settings_invalid(self, settings, error):
+        self.assertRaisesRegex(exception.IloInvalidInputError, error,
+                               bios.validate_settings, settings,
+                               self.ATTRIBUTES)
+
 
 class BIOSBaseConfigsTestCase(testtools.TestCase):
 
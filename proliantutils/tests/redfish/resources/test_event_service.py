@@ -0,0 +1,100 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+from unittest import mock
+
+import sushy
+import testtools
+
+from proliantutils import exception
+from proliantutils.redfish.resources import event_service
+
+
+class HPEEventServiceTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(HPEEventServiceTestCase, self).setUp()
+        self.conn = mock.MagicMock()
+        with open('proliantutils/tests/redfish/'
+                  'json_samples/event_service.json', 'r') as f:
+            self.conn.get.return_value.json.return_value = json.loads(f.read())
+        self.es_inst = event_service.HPEEventService(
+            self.conn, '/redfish/v1/EventService/',
+            redfish_version='1.0.2')
+
+    def test_attributes(self):
+        self.assertEqual('/redfish/v1/EventService/SSE/',
+                         self.es_inst.sse_uri)
+
+    def test_subscribe(self):
+        self.conn.post.return_value.headers = {
+            'Location': 'https://1.2.3.4/redfish/v1/EventService/'
+                        'Subscriptions/7/'}
+
+        subscription = self.es_inst.subscribe('https://10.0.0.1:8443/',
+                                              '1.2.3.4')
+
+        self.assertEqual('/redfish/v1/EventService/Subscriptions/7/',
+                         subscription)
+        self.conn.post.assert_called_once_with(
+            '/redfish/v1/EventService/Subscriptions/',
+            data={'Destination': 'https://10.0.0.1:8443/',
+                  'Context': '1.2.3.4',
+                  'EventTypes': event_service.EVENT_TYPES,
+                  'Protocol': 'Redfish'})
+
+    def test_subscribe_event_types(self):
+        self.conn.post.return_value.headers = {}
+        self.es_inst.subscribe('https://10.0.0.1:8443/', '1.2.3.4',
+                               event_types=['Alert'])
+
+        self.assertEqual(['Alert'],
+                         self.conn.post.call_args[1]['data']['EventTypes'])
+
+    def test_subscribe_fail(self):
+        self.conn.post.side_effect = sushy.exceptions.SushyError
+        self.assertRaisesRegex(
+            exception.IloError,
+            'The Redfish controller failed to subscribe',
+            self.es_inst.subscribe, 'https://10.0.0.1:8443/', '1.2.3.4')
+
+    def test_unsubscribe(self):
+        self.es_inst.unsubscribe('/redfish/v1/EventService/Subscriptions/7/')
+        self.conn.delete.assert_called_once_with(
+            '/redfish/v1/EventService/Subscriptions/7/')
+
+    def test_unsubscribe_fail(self):
+        self.conn.delete.side_effect = sushy.exceptions.SushyError
+        self.assertRaisesRegex(
+            exception.IloError,
+            'The Redfish controller failed to delete the event subscription',
+            self.es_inst.unsubscribe,
+            '/redfish/v1/EventService/Subscriptions/7/')
+
+    def test_open_stream(self):
+        response = self.es_inst.open_stream()
+        self.assertEqual(self.conn.open_stream.return_value, response)
+        self.conn.open_stream.assert_called_once_with(
+            '/redfish/v1/EventService/SSE/',
+            timeout=event_service.STREAM_TIMEOUT)
+
+    def test_open_stream_not_supported(self):
+        self.es_inst.json.pop('ServerSentEventUri')
+        self.es_inst._parse_attributes(self.es_inst.json)
+        self.assertRaisesRegex(
+            exception.IloError,
+            'does not stream the events',
+            self.es_inst.open_stream)
@@ -158,6 +158,82 @@ class HPEUpdateServiceTestCase(testtools.TestCase):
                         called)
         self.assertTrue(get_firmware_update_progress_mock.called)
 
+    @mock.patch.object(update_service.HPEUpdateService,
+                       'get_firmware_update_progress', autospec=True)
+    @mock.patch.object(update_service.HPEUpdateService,
+                       'wait_for_redfish_firmware_update_to_complete',
+                       autospec=True)
+    def test_start_firmware_update(
+            self, wait_for_redfish_firmware_update_to_complete_mock,
+            get_firmware_update_progress_mock):
+        # | GIVEN |
+        target_uri = ('/redfish/v1/UpdateService/Actions/'
+                      'UpdateService.SimpleUpdate/')
+        get_firmware_update_progress_mock.return_value = 'Complete', None
+
+        def wait(us_inst, redfish_inst, progress_callback):
+            progress_callback('Updating', 50)
+
+        wait_for_redfish_firmware_update_to_complete_mock.side_effect = wait
+        # | WHEN |
+        job = self.us_inst.start_firmware_update(self.rf_client, 'web_url')
+        job.result(timeout=10)
+        # | THEN |
+        self.us_inst._conn.post.assert_called_once_with(
+            target_uri, data={'ImageURI': 'web_url'})
+        self.assertEqual('web_url', job.file_url)
+        self.assertEqual(('Updating', 50), (job.state, job.percent))
+        get_firmware_update_progress_mock.assert_called_once_with(
+            self.us_inst)
+
+    @mock.patch.object(update_service.HPEUpdateService,
+                       'wait_for_redfish_firmware_update_to_complete',
+                       autospec=True)
+    def test_start_firmware_update_post_fails(
+            self, wait_for_redfish_firmware_update_to_complete_mock):
+        # | GIVEN |
+        self.us_inst._conn.post.side_effect = sushy.exceptions.SushyError
+        # | WHEN | & | THEN |
+        self.assertRaisesRegex(
+            exception.IloError,
+            'The Redfish controller failed to update firmware',
+            self.us_inst.start_firmware_update, self.rf_client, 'web_url')
+        self.assertFalse(
+            wait_for_redfish_firmware_update_to_complete_mock.called)
+
+    @mock.patch.object(update_service.HPEUpdateService,
+                       'get_firmware_update_progress', autospec=True)
+    @mock.patch.object(update_service.HPEUpdateService,
+                       'wait_for_redfish_firmware_update_to_complete',
+                       autospec=True)
+    def test_start_firmware_update_in_error_state(
+            self, wait_for_redfish_firmware_update_to_complete_mock,
+            get_firmware_update_progress_mock):
+        # | GIVEN |
+        get_firmware_update_progress_mock.return_value = 'Error', 0
+        # | WHEN |
+        job = self.us_inst.start_firmware_update(self.rf_client, 'web_url')
+        # | THEN |
+        self.assertRaisesRegex(exception.IloError,
+                               'Unable to update firmware', job.result, 10)
+
+    @mock.patch.object(time, 'sleep')
+    @mock.patch.object(update_service.HPEUpdateService,
+                       'get_firmware_update_progress', autospec=True)
+    @mock.patch.object(common, 'wait_for_ilo_after_reset', lambda x: None)
+    def test_wait_for_redfish_firmware_update_to_complete_progress_callback(
+            self, get_firmware_update_progress_mock, sleep_mock):
+        # | GIVEN |
+        get_firmware_update_progress_mock.side_effect = [('Updating', 25),
+                                                         ('Complete', None)]
+        progress_callback = mock.MagicMock()
+        # | WHEN |
+        self.us_inst.wait_for_redfish_firmware_update_to_complete(
+            self.rf_client, progress_callback=progress_callback)
+        # | THEN |
+        progress_callback.assert_has_calls([mock.call('Updating', 25),
+                                            mock.call('Complete', None)])
+
     @mock.patch.object(time, 'sleep')
     @mock.patch.object(update_service.HPEUpdateService,
                        'get_firmware_update_progress', autospec=True)
@@ -236,7 +312,11 @@ class HPEUpdateServiceTestCase(testtools.TestCase):
                           (self.us_inst.
                            wait_for_redfish_firmware_update_to_complete),
                           self.rf_client)
-        self.assertEqual(10, get_firmware_update_progress_mock.call_count)
+        self.assertEqual(sleep_mock.call_count,
+                         get_firmware_update_progress_mock.call_count)
+        self.assertAlmostEqual(
+            common.FIRMWARE_UPDATE_TIMEOUT,
+            sum(c[0][0] for c in sleep_mock.call_args_list), places=1)
 
     @mock.patch.object(update_service.HPEUpdateService, 'refresh',
                        autospec=True)
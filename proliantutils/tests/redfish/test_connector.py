@@ -13,12 +13,18 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+import time
 from unittest import mock
 
 from sushy import connector
 from sushy import exceptions
 import testtools
 
+from proliantutils import circuit_breaker
+from proliantutils import exception
+from proliantutils import throttling
+from proliantutils import timeouts
 from proliantutils.redfish import connector as hpe_connector
 
 
@@ -39,7 +45,7 @@ class HPEConnectorTestCase(testtools.TestCase):
         hpe_conn._op('GET', path='fake/path', data=None, headers=headers)
         conn_mock.assert_called_once_with(hpe_conn, 'GET', path='fake/path',
                                           data=None, headers=headers,
-                                          blocking=False, timeout=60,
+                                          blocking=False, timeout=(60, 60),
                                           allow_redirects=False)
         self.assertEqual(1, conn_mock.call_count)
 
@@ -90,9 +96,281 @@ class HPEConnectorTestCase(testtools.TestCase):
         res = hpe_conn._op('GET', path='fake/path',
                            data=None, headers=headers)
         calls = [mock.call(hpe_conn, 'GET', path='fake/path', data=None,
-                           headers=headers, blocking=False, timeout=60,
+                           headers=headers, blocking=False, timeout=(60, 60),
                            allow_redirects=False),
                  mock.call(hpe_conn, 'GET', path='/new/path', data=None,
-                           headers=headers)]
+                           headers=headers, timeout=(60, 60))]
         conn_mock.assert_has_calls(calls)
         self.assertEqual(res.status_code, 200)
+
+    @mock.patch('retrying.time.sleep', lambda *args: None)
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_circuit_open(self, conn_mock):
+        circuit_breaker.configure(failure_threshold=2)
+        self.addCleanup(circuit_breaker.configure)
+        conn_mock.side_effect = exceptions.ConnectionError(
+            url='https://foo.bar', error='boom')
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        self.assertRaises(exception.IloCircuitOpenError, hpe_conn._op,
+                          'GET', path='fake/path')
+
+        self.assertEqual(2, conn_mock.call_count)
+        self.assertEqual('open',
+                         circuit_breaker.get_states()['foo.bar']['state'])
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_queue_timeout_keeps_circuit_open(self, conn_mock):
+        circuit_breaker.configure(failure_threshold=1, cooldown=0)
+        self.addCleanup(circuit_breaker.configure)
+        throttling.configure(default={'concurrency': 1})
+        self.addCleanup(throttling.configure)
+        breaker = circuit_breaker.get_breaker('foo.bar')
+        breaker.before_call()
+        breaker.end_call(True)
+        acquired = threading.Event()
+        release = threading.Event()
+
+        def hold():
+            with throttling.limit('foo.bar'):
+                acquired.set()
+                release.wait(10)
+
+        holder = threading.Thread(target=hold)
+        holder.start()
+        self.addCleanup(holder.join)
+        self.addCleanup(release.set)
+        self.assertTrue(acquired.wait(10))
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        with timeouts.deadline(0.1):
+            self.assertRaises(exception.IloConnectionError, hpe_conn._op,
+                              'GET', path='fake/path')
+
+        self.assertFalse(conn_mock.called)
+        state = circuit_breaker.get_states()['foo.bar']
+        self.assertEqual('open', state['state'])
+        self.assertEqual(1, state['failures'])
+
+    def _op_concurrently(self, conn_mock, method, data=None):
+        release = threading.Event()
+        response = mock.MagicMock(status_code=200)
+        conn_mock.side_effect = (
+            lambda *args, **kwargs: release.wait() and response)
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(
+                hpe_conn._op(method, path='fake/path', data=data)))
+            for i in range(3)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 10
+        while (conn_mock.call_count
+               + hpe_conn._get_flight.get_stats()['coalesced'] < 3):
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+        self.assertEqual([response] * 3, results)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_coalesces_concurrent_gets(self, conn_mock):
+        self._op_concurrently(conn_mock, 'GET')
+
+        self.assertEqual(1, conn_mock.call_count)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_does_not_coalesce_posts(self, conn_mock):
+        self._op_concurrently(conn_mock, 'POST', data={'Action': 'Reset'})
+
+        self.assertEqual(3, conn_mock.call_count)
+
+    @mock.patch('retrying.time.sleep', lambda *args: None)
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_within_deadline(self, conn_mock):
+        conn_mock.side_effect = exceptions.ConnectionError(
+            url='https://foo.bar', error='boom')
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        with timeouts.deadline(10):
+            self.assertRaises(exceptions.ConnectionError, hpe_conn._op,
+                              'GET', path='fake/path')
+
+        for call in conn_mock.call_args_list:
+            connect_timeout, read_timeout = call[1]['timeout']
+            self.assertLessEqual(read_timeout, 10)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_deadline_exceeded(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        with timeouts.deadline(0):
+            self.assertRaises(exception.IloDeadlineExceededError,
+                              hpe_conn._op, 'GET', path='fake/path')
+
+        self.assertFalse(conn_mock.called)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test_get_default_timeout(self, conn_mock):
+        conn_mock.return_value = mock.MagicMock(status_code=200)
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        hpe_conn.get('fake/path')
+
+        self.assertEqual((60, 60), conn_mock.call_args[1]['timeout'])
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test_get_default_timeout_adaptive(self, conn_mock):
+        timeouts.configure(adaptive=True)
+        self.addCleanup(timeouts.configure)
+        tracker = timeouts.get_tracker('foo.bar')
+        for i in range(timeouts.MIN_SAMPLES):
+            tracker.record(('redfish', timeouts.READ), 5)
+        conn_mock.return_value = mock.MagicMock(status_code=200)
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        with timeouts.deadline(30):
+            hpe_conn.get('fake/path')
+
+        connect_timeout, read_timeout = conn_mock.call_args[1]['timeout']
+        self.assertLessEqual(connect_timeout, 20)
+        self.assertLessEqual(read_timeout, 15)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_blocking_not_measured(self, conn_mock):
+        conn_mock.return_value = mock.MagicMock(status_code=200)
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        with mock.patch.object(timeouts, 'measure') as measure_mock:
+            hpe_conn._op('POST', path='fake/path', data={}, blocking=True)
+            self.assertFalse(measure_mock.called)
+            hpe_conn._op('POST', path='fake/path', data={})
+
+        measure_mock.assert_called_once_with(
+            'foo.bar', ('redfish', timeouts.WRITE), 60)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test_get_http_error(self, conn_mock):
+        response = mock.MagicMock(status_code=404)
+        response.json.side_effect = ValueError
+        conn_mock.side_effect = exceptions.HTTPError(
+            'GET', 'https://foo.bar:1234/fake/path', response)
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        self.assertRaises(exceptions.HTTPError, hpe_conn.get, 'fake/path')
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_compressed_documents(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        for path in ('/redfish/v1/Systems/1/bios/',
+                     '/redfish/v1/systems/1/bios/mappings/',
+                     '/redfish/v1/systems/1/bios/baseconfigs',
+                     '/redfish/v1/Systems/1/PCIDevices/',
+                     '/redfish/v1/Systems/1/PCIDevices/1/',
+                     '/redfish/v1/Systems/1/SmartStorage/ArrayControllers/0/',
+                     '/redfish/v1/Systems/1/Storage/DE00A000/',
+                     '/redfish/v1/Registries/BiosAttributeRegistryU30/',
+                     'https://foo.bar:1234/redfish/v1/RegistryStore/'
+                     'registries/en/BiosAttributeRegistryU30.json'):
+            hpe_conn._op('GET', path=path)
+
+            self.assertEqual({'Accept-Encoding': 'gzip, deflate'},
+                             conn_mock.call_args[1]['headers'], path)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_patched_resources_not_compressed(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        for path in ('/redfish/v1/Systems/1/',
+                     '/redfish/v1/systems/1/bios/settings/',
+                     '/redfish/v1/systems/1/smartstorageconfig/settings/',
+                     '/redfish/v1/Managers/1/SecureBoot/'):
+            hpe_conn._op('GET', path=path)
+
+            self.assertIsNone(conn_mock.call_args[1]['headers'], path)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_keeps_accept_encoding(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        hpe_conn._op('GET', path='/redfish/v1/Systems/1/bios/',
+                     headers={'accept-encoding': 'identity'})
+
+        self.assertEqual({'accept-encoding': 'identity'},
+                         conn_mock.call_args[1]['headers'])
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_post_no_accept_encoding(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        hpe_conn._op('POST', path='fake/path', data={'Action': 'Reset'})
+
+        self.assertIsNone(conn_mock.call_args[1]['headers'])
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_forwards_keyword_arguments(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        hpe_conn._op('GET', path='fake/path', allow_reauth=False)
+
+        self.assertFalse(conn_mock.call_args[1]['allow_reauth'])
+        self.assertFalse(conn_mock.call_args[1]['allow_redirects'])
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_sushy_retry(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        with mock.patch.object(hpe_conn, '_tracked_op') as tracked_mock:
+            resp = hpe_conn._op('GET', path='fake/path', timeout=(60, 60),
+                                server_side_retries_left=2,
+                                allow_reauth=False, allow_redirects=False)
+
+        self.assertEqual(conn_mock.return_value, resp)
+        self.assertFalse(tracked_mock.called)
+        conn_mock.assert_called_once_with(
+            hpe_conn, 'GET', 'fake/path', data=None, headers=None,
+            blocking=False, timeout=(60, 60), server_side_retries_left=2,
+            allow_reauth=False, allow_redirects=False)
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test__op_response_json(self, conn_mock):
+        conn_mock.return_value = mock.MagicMock(
+            status_code=200, content=b'{"Attributes": {"a": 1}}')
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        resp = hpe_conn._op('GET', path='fake/path')
+
+        self.assertEqual({'Attributes': {'a': 1}}, resp.json())
+
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test_open_stream(self, conn_mock):
+        hpe_conn = hpe_connector.HPEConnector(
+            'https://foo.bar:1234', verify=False)
+
+        resp = hpe_conn.open_stream('/redfish/v1/EventService/SSE',
+                                    timeout=(30, 600))
+
+        self.assertEqual(conn_mock.return_value, resp)
+        conn_mock.assert_called_once_with(
+            hpe_conn, 'GET', '/redfish/v1/EventService/SSE',
+            headers={'Accept': 'text/event-stream'}, timeout=(30, 600),
+            stream=True)
@@ -0,0 +1,364 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+from unittest import mock
+
+import requests
+import sushy
+import testtools
+
+from proliantutils import exception
+from proliantutils.redfish import events
+
+
+def _event(origin=None, context=None):
+    record = {'EventType': 'ResourceUpdated',
+              'MessageId': 'ResourceEvent.1.0.ResourceChanged'}
+    if origin is not None:
+        record['OriginOfCondition'] = {'@odata.id': origin}
+    payload = {'Events': [record]}
+    if context is not None:
+        payload['Context'] = context
+    return payload
+
+
+class ParseStreamTestCase(testtools.TestCase):
+
+    def test__parse_stream(self):
+        lines = [': keep alive', '', 'id: 1', 'data: {"Events":', 'data: []}',
+                 '', 'data:{"Context": "1.2.3.4"}', '', 'data: {', '',
+                 'data: {"Id": 2}']
+        self.assertEqual([{'Events': []}, {'Context': '1.2.3.4'}],
+                         list(events._parse_stream(lines)))
+
+
+class EventListenerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(EventListenerTestCase, self).setUp()
+        self.documents = {
+            '/redfish/v1/Systems/1': {
+                'PowerState': 'Off',
+                'Oem': {'Hpe': {'PostState': 'PowerOff'}}},
+            '/redfish/v1/Systems/1/Bios': {
+                '@Redfish.Settings': {'Messages': []}},
+            '/redfish/v1/UpdateService': {
+                'Oem': {'Hpe': {'State': 'Idle',
+                                'FlashProgressPercent': 0}}},
+        }
+        self.root = mock.MagicMock()
+        self.root._conn.get.side_effect = self._get
+        self.receiver = mock.MagicMock()
+        self.listener = events.EventListener(self.receiver,
+                                             'https://10.0.0.1:8443/')
+        self.addCleanup(self.listener.close)
+        self.event_service = self.root.get_event_service.return_value
+        self.event_service.subscribe.return_value = (
+            '/redfish/v1/EventService/Subscriptions/7/')
+
+    def _get(self, path):
+        if path not in self.documents:
+            raise sushy.exceptions.SushyError()
+        return mock.MagicMock(**{'json.return_value': self.documents[path]})
+
+    def _get_paths(self):
+        return [args[0] for args, kwargs in self.root._conn.get.call_args_list]
+
+    def test_init_receiver_without_destination(self):
+        self.assertRaises(exception.InvalidInputError,
+                          events.EventListener, self.receiver)
+
+    def test_init_adds_handler(self):
+        self.receiver.add_handler.assert_called_once_with(
+            self.listener.handle_event)
+
+    def test_add_host(self):
+        self.listener.add_host('[FE80::1]', self.root)
+
+        self.event_service.subscribe.assert_called_once_with(
+            'https://10.0.0.1:8443/', 'fe80::1')
+        self.assertEqual({events.POWER_STATE: 'Off',
+                          events.POST_STATE: 'PowerOff',
+                          events.BIOS_SETTINGS_MESSAGES: [],
+                          events.FIRMWARE_UPDATE_STATE: 'Idle',
+                          events.FIRMWARE_UPDATE_PERCENT: 0},
+                         self.listener.get_state('fe80::1'))
+
+    def test_add_host_missing_resource(self):
+        del self.documents['/redfish/v1/UpdateService']
+
+        self.listener.add_host('1.2.3.4', self.root)
+
+        self.assertEqual({events.POWER_STATE: 'Off',
+                          events.POST_STATE: 'PowerOff',
+                          events.BIOS_SETTINGS_MESSAGES: []},
+                         self.listener.get_state('1.2.3.4'))
+
+    def test_add_host_fail(self):
+        self.event_service.subscribe.side_effect = exception.IloError('boom')
+
+        self.assertRaisesRegex(exception.IloError,
+                               'Could not watch the events of 1.2.3.4',
+                               self.listener.add_host, '1.2.3.4', self.root)
+        self.assertRaises(exception.InvalidInputError,
+                          self.listener.wait_for, '1.2.3.4',
+                          events.POWER_STATE, 'On')
+
+    @mock.patch.object(events, '_StreamWatcher', autospec=True)
+    def test_add_host_stream(self, watcher_mock):
+        listener = events.EventListener()
+
+        listener.add_host('1.2.3.4', self.root)
+
+        watcher_mock.assert_called_once_with(listener, '1.2.3.4', self.root)
+        watcher_mock.return_value.start.assert_called_once_with()
+        self.event_service.subscribe.assert_not_called()
+        listener.remove_host('1.2.3.4')
+        watcher_mock.return_value.stop.assert_called_once_with()
+
+    def test_remove_host(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        future = self.listener.wait_for('1.2.3.4', events.POWER_STATE, 'On')
+
+        self.listener.remove_host('1.2.3.4')
+
+        self.assertTrue(future.cancelled())
+        self.event_service.unsubscribe.assert_called_once_with(
+            '/redfish/v1/EventService/Subscriptions/7/')
+        self.assertEqual({}, self.listener.get_state('1.2.3.4'))
+
+    def test_remove_host_unsubscribe_fail(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        self.event_service.unsubscribe.side_effect = (
+            sushy.exceptions.SushyError)
+
+        self.listener.remove_host('1.2.3.4')
+
+        self.assertRaises(exception.InvalidInputError,
+                          self.listener.refresh, '1.2.3.4')
+
+    def test_handle_event(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        self.root._conn.get.reset_mock()
+        self.documents['/redfish/v1/Systems/1']['PowerState'] = 'On'
+
+        self.listener.handle_event(
+            '1.2.3.4', _event('/redfish/v1/Systems/1/'))
+
+        self.assertEqual(['/redfish/v1/Systems/1'], self._get_paths())
+        self.assertEqual(
+            'On', self.listener.get_state('1.2.3.4')[events.POWER_STATE])
+
+    def test_handle_event_subresource(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        self.root._conn.get.reset_mock()
+
+        self.listener.handle_event(
+            '1.2.3.4', _event('https://1.2.3.4/redfish/v1/Systems/1/Bios/'
+                              'Settings/'))
+
+        self.assertEqual(['/redfish/v1/Systems/1',
+                          '/redfish/v1/Systems/1/Bios'], self._get_paths())
+
+    def test_handle_event_no_origin(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        self.root._conn.get.reset_mock()
+
+        self.listener.handle_event('1.2.3.4', _event())
+
+        self.assertEqual(['/redfish/v1/Systems/1'], self._get_paths())
+
+    def test_handle_event_untracked_origin(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        self.root._conn.get.reset_mock()
+
+        self.listener.handle_event(
+            '1.2.3.4', _event('/redfish/v1/Chassis/1/'))
+
+        self.root._conn.get.assert_not_called()
+
+    def test_handle_event_unwatched_host(self):
+        self.listener.handle_event(
+            '1.2.3.4', _event('/redfish/v1/Systems/1/'))
+        self.root._conn.get.assert_not_called()
+
+    def test_wait_for(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        future = self.listener.wait_for('1.2.3.4', events.POWER_STATE, 'On')
+        self.assertFalse(future.done())
+
+        self.documents['/redfish/v1/Systems/1']['PowerState'] = 'On'
+        self.listener.handle_event(
+            '1.2.3.4', _event('/redfish/v1/Systems/1/'))
+
+        self.assertEqual('On', future.result(0)[events.POWER_STATE])
+
+    def test_wait_for_current_state(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        future = self.listener.wait_for('1.2.3.4', events.POWER_STATE, 'Off')
+        self.assertEqual('Off', future.result(0)[events.POWER_STATE])
+
+    def test_wait_for_cancelled(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        future = self.listener.wait_for('1.2.3.4', events.POWER_STATE, 'On')
+
+        self.assertTrue(future.cancel())
+
+        self.assertEqual([], self.listener._waiters['1.2.3.4'])
+
+    def test_wait_until_predicate_fail(self):
+        self.listener.add_host('1.2.3.4', self.root)
+        future = self.listener.wait_until('1.2.3.4',
+                                          mock.Mock(side_effect=KeyError))
+        self.assertIsInstance(future.exception(0), KeyError)
+
+    def test_wait_for_unwatched_host(self):
+        self.assertRaisesRegex(exception.InvalidInputError,
+                               'The events of 1.2.3.4 are not watched',
+                               self.listener.wait_for, '1.2.3.4',
+                               events.POWER_STATE, 'On')
+
+
+class StreamWatcherTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(StreamWatcherTestCase, self).setUp()
+        self.listener = mock.MagicMock()
+        self.root = mock.MagicMock()
+        self.open_stream = self.root.get_event_service.return_value.open_stream
+        self.watcher = events._StreamWatcher(self.listener, '1.2.3.4',
+                                             self.root)
+
+    @staticmethod
+    def _response(*lines):
+        return mock.MagicMock(**{'iter_lines.return_value': iter(lines)})
+
+    def test_run(self):
+        self.listener.handle_event.side_effect = (
+            lambda host, payload: self.watcher.stop())
+        self.open_stream.return_value = self._response(
+            'data: {"Events": []}', '')
+
+        self.watcher.run()
+
+        self.listener.handle_event.assert_called_once_with(
+            '1.2.3.4', {'Events': []})
+        self.listener.refresh.assert_not_called()
+        self.open_stream.return_value.close.assert_called_once_with()
+
+    @mock.patch.object(events, 'STREAM_RECONNECT_INTERVAL', 0)
+    def test_run_reconnect(self):
+        self.listener.handle_event.side_effect = (
+            lambda host, payload: self.watcher.stop())
+        self.open_stream.side_effect = [
+            sushy.exceptions.ConnectionError(url='url', error='boom'),
+            self._response(),
+            self._response('data: {"Events": []}', '')]
+
+        self.watcher.run()
+
+        self.assertEqual(3, self.open_stream.call_count)
+        self.listener.refresh.assert_called_once_with('1.2.3.4')
+        self.listener.handle_event.assert_called_once_with(
+            '1.2.3.4', {'Events': []})
+
+    @mock.patch.object(events, 'STREAM_RECONNECT_INTERVAL', 0)
+    def test_run_handler_fail(self):
+        self.listener.handle_event.side_effect = [ValueError, None]
+        self.open_stream.side_effect = [
+            self._response('data: {"Id": 1}', ''),
+            self._response('data: {"Id": 2}', '')]
+        self.listener.refresh.side_effect = (
+            lambda host: self.watcher.stop())
+
+        self.watcher.run()
+
+        self.assertEqual(2, self.listener.handle_event.call_count)
+
+    def test_run_stopped(self):
+        self.watcher.stop()
+        self.open_stream.return_value = self._response()
+
+        self.watcher.run()
+
+        self.assertFalse(self.open_stream.called)
+
+
+class EventReceiverTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(EventReceiverTestCase, self).setUp()
+        self.receiver = events.EventReceiver('127.0.0.1')
+        self.received = threading.Event()
+        self.handler = mock.Mock(
+            side_effect=lambda context, payload: self.received.set())
+        self.receiver.add_handler(self.handler)
+        self.receiver.start()
+        self.addCleanup(self.receiver.stop)
+        self.url = 'http://127.0.0.1:%d/' % self.receiver.port
+
+    def test_receive(self):
+        payload = _event('/redfish/v1/Systems/1/', context='1.2.3.4')
+
+        response = requests.post(self.url, json=payload)
+
+        self.assertEqual(204, response.status_code)
+        self.assertTrue(self.received.wait(5))
+        self.handler.assert_called_once_with('1.2.3.4', payload)
+
+    def test_receive_record_context(self):
+        payload = _event('/redfish/v1/Systems/1/')
+        payload['Events'][0]['Context'] = '1.2.3.4'
+
+        requests.post(self.url, json=payload)
+
+        self.assertTrue(self.received.wait(5))
+        self.handler.assert_called_once_with('1.2.3.4', payload)
+
+    def test_receive_handler_fail(self):
+        self.handler.side_effect = ValueError
+        self.receiver.add_handler(
+            lambda context, payload: self.received.set())
+
+        response = requests.post(self.url, json=_event(context='1.2.3.4'))
+
+        self.assertEqual(204, response.status_code)
+        self.assertTrue(self.received.wait(5))
+
+    def test_receive_invalid(self):
+        response = requests.post(self.url, data=b'{')
+        self.assertEqual(400, response.status_code)
+        self.handler.assert_not_called()
+
+    def test_receive_without_context(self):
+        response = requests.post(self.url, json=_event())
+        self.assertEqual(400, response.status_code)
+        self.handler.assert_not_called()
+
+    def test_listener(self):
+        listener = events.EventListener(self.receiver, self.url)
+        self.addCleanup(listener.close)
+        root = mock.MagicMock()
+        state = {'PowerState': 'Off'}
+        root._conn.get.return_value.json.side_effect = lambda: dict(state)
+        listener.add_host('1.2.3.4', root)
+        future = listener.wait_for('1.2.3.4', events.POWER_STATE, 'On')
+
+        state['PowerState'] = 'On'
+        requests.post(self.url, json=_event('/redfish/v1/Systems/1/',
+                                            context='1.2.3.4'))
+
+        self.assertEqual('On', future.result(5)[events.POWER_STATE])
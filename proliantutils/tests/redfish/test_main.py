@@ -23,6 +23,7 @@ from proliantutils import exception
 from proliantutils.redfish import connector
 from proliantutils.redfish import main
 from proliantutils.redfish.resources.account_service import account_service
+from proliantutils.redfish.resources import event_service
 from proliantutils.redfish.resources.manager import manager
 from proliantutils.redfish.resources.system import system
 from proliantutils.redfish.resources import update_service
@@ -92,6 +93,15 @@ class HPESushyTestCase(testtools.TestCase):
             self.hpe_sushy._conn, "/redfish/v1/UpdateService/",
             self.hpe_sushy.redfish_version)
 
+    @mock.patch.object(event_service, 'HPEEventService', autospec=True)
+    def test_get_event_service(self, mock_event_service):
+        es_inst = self.hpe_sushy.get_event_service()
+        self.assertIsInstance(es_inst,
+                              event_service.HPEEventService.__class__)
+        mock_event_service.assert_called_once_with(
+            self.hpe_sushy._conn, "/redfish/v1/EventService/",
+            redfish_version=self.hpe_sushy.redfish_version)
+
     @mock.patch.object(account_service, 'HPEAccountService', autospec=True)
     def test_get_account_service(self, mock_account_service):
         acc_inst = self.hpe_sushy.get_account_service()
@@ -100,3 +110,8 @@ class HPESushyTestCase(testtools.TestCase):
         mock_account_service.assert_called_once_with(
             self.hpe_sushy._conn, "/redfish/v1/AccountService/",
             self.hpe_sushy.redfish_version)
+
+    def test_logout(self):
+        auth_mock = self.hpe_sushy._auth
+        self.hpe_sushy.logout()
+        auth_mock.close.assert_called_once_with()
@@ -19,6 +19,8 @@ import collections
 import io
 import json
 import os
+import shutil
+import tempfile
 from unittest import mock
 
 import ddt
@@ -26,6 +28,7 @@ import sushy
 from sushy.resources.system import system
 import testtools
 
+from proliantutils import content_cache
 from proliantutils import exception
 from proliantutils.ilo import constants as ilo_cons
 from proliantutils.redfish import main
@@ -81,6 +84,10 @@ class RedfishOperationsTestCase(testtools.TestCase):
             redfish.RedfishOperations,
             '1.2.3.4', username='foo', password='bar')
 
+    def test_close(self):
+        self.rf_client.close()
+        self.sushy.close.assert_called_once_with()
+
     def test__get_sushy_system_fail(self):
         self.rf_client._sushy.get_system.side_effect = (
             sushy.exceptions.SushyError)
@@ -510,6 +517,27 @@ class RedfishOperationsTestCase(testtools.TestCase):
             'The Redfish controller failed to update firmware',
             self.rf_client.update_firmware, 'fw_file_url', 'cpld')
 
+    def test_start_firmware_update(self):
+        update_service_mock = self.sushy.get_update_service.return_value
+        job = self.rf_client.start_firmware_update('fw_file_url', 'ilo')
+        update_service_mock.start_firmware_update.assert_called_once_with(
+            self.rf_client, 'fw_file_url')
+        self.assertEqual(
+            update_service_mock.start_firmware_update.return_value, job)
+
+    def test_start_firmware_update_fail(self):
+        (self.sushy.get_update_service.return_value.
+         start_firmware_update.side_effect) = sushy.exceptions.SushyError
+        self.assertRaisesRegex(
+            exception.IloError,
+            'The Redfish controller failed to update firmware',
+            self.rf_client.start_firmware_update, 'fw_file_url', 'cpld')
+
+    def test_start_firmware_update_invalid_component(self):
+        self.assertRaises(exception.InvalidInputError,
+                          self.rf_client.start_firmware_update,
+                          'fw_file_url', 'invalid_component')
+
     @mock.patch.object(redfish.RedfishOperations, 'get_current_boot_mode')
     def test__is_boot_mode_uefi_uefi(self, get_current_boot_mode_mock):
         get_current_boot_mode_mock.return_value = (
@@ -927,6 +955,75 @@ class RedfishOperationsTestCase(testtools.TestCase):
         self.assertRaises(exception.IloError,
                           self.rf_client.get_server_capabilities)
 
+    @mock.patch.object(redfish.RedfishOperations, '_get_server_capabilities')
+    @mock.patch.object(redfish.RedfishOperations,
+                       '_get_capabilities_fingerprint')
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_manager')
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_get_server_capabilities_cached(self, get_system_mock,
+                                            get_manager_mock,
+                                            fingerprint_mock,
+                                            capabilities_mock):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        content_cache.configure(directory)
+        self.addCleanup(content_cache.configure)
+        get_system_mock.return_value.uuid = 'UUID'
+        fingerprint_mock.side_effect = ['fingerprint', 'fingerprint',
+                                        'new fingerprint']
+        capabilities_mock.side_effect = [{'server_model': 'Gen10'},
+                                         {'server_model': 'Gen10 Plus'}]
+
+        self.assertEqual({'server_model': 'Gen10'},
+                         self.rf_client.get_server_capabilities())
+        self.assertEqual({'server_model': 'Gen10'},
+                         self.rf_client.get_server_capabilities())
+        self.assertEqual({'server_model': 'Gen10 Plus'},
+                         self.rf_client.get_server_capabilities())
+        fingerprint_mock.assert_called_with(get_system_mock.return_value,
+                                            get_manager_mock.return_value)
+        self.assertEqual(2, capabilities_mock.call_count)
+
+    @mock.patch.object(redfish.RedfishOperations, '_get_server_capabilities')
+    @mock.patch.object(redfish.RedfishOperations,
+                       '_get_capabilities_fingerprint')
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_manager')
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_get_server_capabilities_not_cached(self, get_system_mock,
+                                                get_manager_mock,
+                                                fingerprint_mock,
+                                                capabilities_mock):
+        capabilities_mock.return_value = {'server_model': 'Gen10'}
+
+        for i in range(2):
+            self.assertEqual({'server_model': 'Gen10'},
+                             self.rf_client.get_server_capabilities())
+
+        fingerprint_mock.assert_not_called()
+        self.assertEqual(2, capabilities_mock.call_count)
+
+    def test__get_capabilities_fingerprint(self):
+        system_mock = mock.MagicMock()
+        system_mock.json = {
+            '@odata.etag': 'W/"5E1E8E4E"',
+            'Oem': {'Hpe': {'Links': {
+                'PCIDevices': {'@odata.id': '/redfish/v1/Systems/1/PCI'}}}}}
+        system_mock.model = 'ProLiant DL180 Gen10'
+        system_mock.rom_version = 'U31 v1.00 (03/11/2017)'
+        system_mock.bios_settings.json = {'@odata.etag': 'W/"AB12"'}
+        system_mock._conn.get.return_value.json.return_value = {
+            'Members@odata.count': 7}
+        manager_mock = mock.MagicMock(firmware_version='iLO 5 v1.15')
+
+        fingerprint = self.rf_client._get_capabilities_fingerprint(
+            system_mock, manager_mock)
+
+        self.assertEqual(['W/"5E1E8E4E"', 'ProLiant DL180 Gen10',
+                          'U31 v1.00 (03/11/2017)', 'iLO 5 v1.15',
+                          'W/"AB12"', 7, None], json.loads(fingerprint))
+        system_mock._conn.get.assert_called_once_with(
+            '/redfish/v1/Systems/1/PCI')
+
     @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
     @mock.patch.object(bios.BIOSPendingSettings, 'update_bios_data_by_post')
     def test_reset_bios_to_default(self, update_bios_mock, get_system_mock):
@@ -1774,6 +1871,82 @@ class RedfishOperationsTestCase(testtools.TestCase):
             self.rf_client.get_default_bios_settings,
             only_allowed_settings)
 
+    def _configure_content_cache(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        content_cache.configure(directory)
+        self.addCleanup(content_cache.configure)
+
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_get_default_bios_settings_cached(self, get_system_mock):
+        self._configure_content_cache()
+        system_mock = get_system_mock.return_value
+        system_mock.model = 'ProLiant DL380 Gen10'
+        system_mock.rom_version = 'U30 v1.40 (06/15/2018)'
+        default_settings_mock = mock.PropertyMock(
+            return_value={'BootMode': 'Uefi'})
+        type(system_mock.bios_settings).default_settings = (
+            default_settings_mock)
+
+        for i in range(2):
+            self.assertEqual({'BootMode': 'Uefi'},
+                             self.rf_client.get_default_bios_settings())
+
+        default_settings_mock.assert_called_once_with()
+
+    def _mock_bios_attribute_registry(self, system_mock):
+        self._configure_content_cache()
+        system_mock.model = 'ProLiant DL380 Gen10'
+        system_mock.rom_version = 'U30 v1.40 (06/15/2018)'
+        bios_mock = system_mock.bios_settings
+        bios_mock.json = {'Attributes': {'BootMode': 'Uefi'}}
+        bios_mock.pending_settings.json = {'Attributes': {}}
+        bios_mock.attribute_registry = 'BiosAttributeRegistryU31.v1_1_00'
+        bios_mock.get_attribute_registry.return_value = {
+            'BootMode': {'Type': 'Enumeration', 'ReadOnly': False,
+                         'Values': ['Uefi', 'LegacyBios']}}
+        self.rf_client._sushy.json = {
+            'Registries': {'@odata.id': '/redfish/v1/Registries/'}}
+        return bios_mock
+
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_set_bios_settings_validated(self, system_mock):
+        bios_mock = self._mock_bios_attribute_registry(
+            system_mock.return_value)
+
+        self.rf_client.set_bios_settings({'BootMode': 'LegacyBios'})
+        self.rf_client.set_bios_settings({'BootMode': 'LegacyBios'})
+
+        bios_mock.get_attribute_registry.assert_called_once_with(
+            '/redfish/v1/Registries/')
+        patch_mock = bios_mock.pending_settings.update_bios_data_by_patch
+        patch_mock.assert_called_with({'BootMode': 'LegacyBios'})
+
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_set_bios_settings_invalid(self, system_mock):
+        bios_mock = self._mock_bios_attribute_registry(
+            system_mock.return_value)
+
+        self.assertRaisesRegex(
+            exception.IloInvalidInputError,
+            'BootMode must be one of Uefi, LegacyBios',
+            self.rf_client.set_bios_settings, {'BootMode': 'Legacy'})
+
+        patch_mock = bios_mock.pending_settings.update_bios_data_by_patch
+        patch_mock.assert_not_called()
+
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_set_bios_settings_registry_unavailable(self, system_mock):
+        bios_mock = self._mock_bios_attribute_registry(
+            system_mock.return_value)
+        bios_mock.get_attribute_registry.side_effect = (
+            sushy.exceptions.SushyError)
+
+        self.rf_client.set_bios_settings({'BootMode': 'Legacy'})
+
+        patch_mock = bios_mock.pending_settings.update_bios_data_by_patch
+        patch_mock.assert_called_once_with({'BootMode': 'Legacy'})
+
     @mock.patch.object(bios.BIOSPendingSettings, 'update_bios_data_by_patch')
     @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
     def test_set_bios_settings_no_data(self, system_mock, update_data_mock):
@@ -1863,6 +2036,44 @@ class RedfishOperationsTestCase(testtools.TestCase):
         self.rf_client.set_bios_settings(data, apply_filter)
         bios_ps_mock.update_bios_data_by_patch.assert_called_once_with(data)
 
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_set_bios_settings_only_changed(self, system_mock):
+        data = {
+            "BootMode": "Uefi",
+            "Sriov": "Enabled",
+            "ProcTurbo": "Disabled",
+        }
+        bios_mock = system_mock.return_value.bios_settings
+        bios_mock.json = {'Attributes': {"BootMode": "Uefi",
+                                         "Sriov": "Disabled",
+                                         "ProcTurbo": "Enabled"}}
+        bios_ps_mock = bios_mock.pending_settings
+        bios_ps_mock.json = {'Attributes': {"BootMode": "LegacyBios",
+                                            "Sriov": "Enabled",
+                                            "ProcTurbo": "Enabled"}}
+
+        changed = self.rf_client.set_bios_settings(data)
+
+        expected = {"BootMode": "Uefi", "ProcTurbo": "Disabled"}
+        self.assertEqual(expected, changed)
+        bios_ps_mock.update_bios_data_by_patch.assert_called_once_with(
+            expected)
+
+    @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
+    def test_set_bios_settings_nothing_to_apply(self, system_mock):
+        data = {"BootMode": "Uefi", "Sriov": "Enabled"}
+        bios_mock = system_mock.return_value.bios_settings
+        bios_mock.json = {'Attributes': {"BootMode": "Uefi",
+                                         "Sriov": "Disabled"}}
+        bios_ps_mock = bios_mock.pending_settings
+        bios_ps_mock.json = {'Attributes': {"BootMode": "Uefi",
+                                            "Sriov": "Enabled"}}
+
+        changed = self.rf_client.set_bios_settings(data)
+
+        self.assertEqual({}, changed)
+        bios_ps_mock.update_bios_data_by_patch.assert_not_called()
+
     @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
     def test_set_bios_settings_raises_exception(self, system_mock):
         apply_filter = True
@@ -1885,6 +2096,12 @@ class RedfishOperationsTestCase(testtools.TestCase):
             data,
             apply_filter)
 
+    def test_watch_events(self):
+        listener = mock.MagicMock()
+        self.rf_client.watch_events(listener)
+        listener.add_host.assert_called_once_with(
+            '1.2.3.4', self.sushy, root_prefix='/redfish/v1/')
+
     @mock.patch.object(redfish.RedfishOperations, '_get_sushy_system')
     def test_get_host_post_state(self, get_system_mock):
         post_state = mock.PropertyMock(return_value='poweroff')
@@ -2885,3 +3102,133 @@ class RedfishOperationsTestCase(testtools.TestCase):
         actual = (
             self.rf_client._parse_security_dashboard_values_for_capabilities())
         self.assertEqual(expected, actual)
+
+
+class ConfigTransactionTestCase(testtools.TestCase):
+
+    @mock.patch.object(main, 'HPESushy', autospec=True)
+    def setUp(self, sushy_mock):
+        super(ConfigTransactionTestCase, self).setUp()
+        self.rf_client = redfish.RedfishOperations(
+            '1.2.3.4', username='foo', password='bar')
+        get_system_patcher = mock.patch.object(
+            redfish.RedfishOperations, '_get_sushy_system', autospec=True)
+        self.get_system_mock = get_system_patcher.start()
+        self.addCleanup(get_system_patcher.stop)
+        self.system = self.get_system_mock.return_value
+        self.bios = self.system.bios_settings
+        self.bios.boot_mode = sys_cons.BIOS_BOOT_MODE_UEFI
+        self.bios.json = {'Attributes': {'BootMode': 'Uefi',
+                                         'UefiOptimizedBoot': 'Enabled',
+                                         'Sriov': 'Disabled'}}
+        self.pending = self.bios.pending_settings
+        self.pending.json = {'Attributes': {'BootMode': 'Uefi',
+                                            'UefiOptimizedBoot': 'Enabled',
+                                            'Sriov': 'Disabled'}}
+        self.iscsi_settings = self.bios.iscsi_resource.iscsi_settings
+        self.transaction = self.rf_client.config_transaction()
+
+    @mock.patch.object(redfish.RedfishOperations, '_get_iscsi_target_data',
+                       autospec=True)
+    def test_commit(self, iscsi_data_mock):
+        iscsi_data_mock.return_value = {'iSCSISources': [{'a': 'b'}]}
+        self.pending.json = {'Attributes': {'BootMode': 'LegacyBios'}}
+
+        self.transaction.set_bios_settings({'Sriov': 'Enabled'})
+        self.transaction.set_pending_boot_mode('uefi')
+        self.transaction.set_iscsi_info(
+            'iqn.2011-07.com.example.server:test1', '1', '10.10.1.30')
+        self.transaction.set_iscsi_initiator_info('iqn.2015-02.com.hpe:1')
+        self.transaction.set_secure_boot_mode(True)
+        self.transaction.update_persistent_boot(['ISCSI'])
+        result = self.transaction.commit()
+
+        self.get_system_mock.assert_called_once_with(
+            self.rf_client, redfish.PROLIANT_SYSTEM_ID)
+        bios_data = {'Sriov': 'Enabled', 'BootMode': 'Uefi'}
+        self.pending.update_bios_data_by_patch.assert_called_once_with(
+            bios_data)
+        iscsi_data_mock.assert_called_once_with(
+            self.rf_client, self.system,
+            {'iSCSITargetName': 'iqn.2011-07.com.example.server:test1',
+             'iSCSITargetInfoViaDHCP': False,
+             'iSCSILUN': '1',
+             'iSCSIConnection': 'Enabled',
+             'iSCSITargetIpAddress': '10.10.1.30',
+             'iSCSITargetTcpPort': 3260}, [])
+        iscsi_data = {'iSCSISources': [{'a': 'b'}],
+                      'iSCSIInitiatorName': 'iqn.2015-02.com.hpe:1'}
+        self.iscsi_settings.update_iscsi_settings.assert_called_once_with(
+            iscsi_data)
+        self.system.secure_boot.enable_secure_boot.assert_called_once_with(
+            True)
+        self.system.update_persistent_boot.assert_called_once_with(
+            ['ISCSI'], persistent=True)
+        self.assertEqual({'bios_settings': bios_data,
+                          'iscsi_settings': iscsi_data,
+                          'secure_boot': True,
+                          'persistent_boot': ['ISCSI']}, result)
+
+    def test_commit_bios_settings_unchanged(self):
+        with self.transaction as transaction:
+            transaction.set_bios_settings({'Sriov': 'Disabled'})
+            transaction.set_pending_boot_mode('uefi')
+
+        self.pending.update_bios_data_by_patch.assert_not_called()
+        self.assertRaisesRegex(exception.IloError, 'already committed',
+                               self.transaction.commit)
+
+    def test_commit_nothing(self):
+        self.assertEqual({}, self.transaction.commit())
+        self.get_system_mock.assert_not_called()
+
+    def test_commit_not_on_error(self):
+        def _configure():
+            with self.transaction as transaction:
+                transaction.set_bios_settings({'Sriov': 'Enabled'})
+                raise ValueError()
+
+        self.assertRaises(ValueError, _configure)
+        self.get_system_mock.assert_not_called()
+
+    def test_commit_secure_boot_legacy_boot_mode(self):
+        self.transaction.set_pending_boot_mode('legacy')
+        self.transaction.set_secure_boot_mode(False)
+
+        self.assertRaises(exception.IloCommandNotSupportedInBiosError,
+                          self.transaction.commit)
+        self.pending.update_bios_data_by_patch.assert_not_called()
+        self.system.secure_boot.enable_secure_boot.assert_not_called()
+
+    def test_commit_iscsi_bios_boot_mode(self):
+        self.bios.boot_mode = sys_cons.BIOS_BOOT_MODE_LEGACY_BIOS
+        self.transaction.set_iscsi_initiator_info('iqn.2015-02.com.hpe:1')
+
+        self.assertRaises(exception.IloCommandNotSupportedInBiosError,
+                          self.transaction.commit)
+        self.iscsi_settings.update_iscsi_settings.assert_not_called()
+
+    def test_commit_fail(self):
+        self.system.secure_boot.enable_secure_boot.side_effect = (
+            sushy.exceptions.SushyError)
+        self.transaction.set_bios_settings({'Sriov': 'Enabled'})
+        self.transaction.set_secure_boot_mode(True)
+        self.transaction.update_persistent_boot(['NETWORK'])
+
+        self.assertRaisesRegex(exception.IloError,
+                               'Applied so far: bios_settings',
+                               self.transaction.commit)
+        self.system.update_persistent_boot.assert_not_called()
+
+    def test_invalid_input(self):
+        self.assertRaises(exception.IloInvalidInputError,
+                          self.transaction.set_pending_boot_mode, 'fake')
+        self.assertRaises(exception.IloInvalidInputError,
+                          self.transaction.update_persistent_boot, ['fake'])
+        self.assertRaises(exception.IloError,
+                          self.transaction.set_secure_boot_mode, 'True')
+        self.assertRaises(exception.IloError,
+                          self.transaction.set_bios_settings,
+                          {'AdminName': 'Administrator'}, True)
+        self.assertRaises(exception.IloError,
+                          self.transaction.set_bios_settings, {})
@@ -0,0 +1,196 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import sushy
+from sushy import auth as sushy_auth
+import testtools
+
+from proliantutils import exception
+from proliantutils.redfish import connector
+from proliantutils.redfish import main
+from proliantutils.redfish import redfish
+from proliantutils.redfish import session_manager
+
+
+class SharedSessionAuthTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(SharedSessionAuthTestCase, self).setUp()
+        self.auth = session_manager.SharedSessionAuth('foo', 'bar')
+
+    @mock.patch.object(sushy_auth.SessionOrBasicAuth, 'refresh_session',
+                       autospec=True)
+    def test_refresh_session(self, refresh_mock):
+        self.auth._session_key = 'token'
+        self.auth.refresh_session()
+        refresh_mock.assert_called_once_with(self.auth)
+
+    @mock.patch.object(sushy_auth.SessionOrBasicAuth, 'refresh_session',
+                       autospec=True)
+    def test_refresh_session_already_renewed(self, refresh_mock):
+        self.auth._session_key = 'stale'
+
+        def _renew_by_other_holder(*args):
+            self.auth._session_key = 'renewed'
+            return mock.DEFAULT
+
+        # Note: the key changes while waiting for the lock, i.e. some
+        # other holder of the session renewed it in the meantime.
+        with mock.patch.object(self.auth, '_refresh_lock') as lock_mock:
+            lock_mock.__enter__.side_effect = _renew_by_other_holder
+            self.auth.refresh_session()
+        self.assertFalse(refresh_mock.called)
+
+    def test_connector_renews_expired_session(self):
+        root_mock = mock.MagicMock()
+        root_mock.create_session.return_value = (
+            'renewed', '/redfish/v1/SessionService/Sessions/2/')
+        conn = connector.HPEConnector('https://foo.bar:1234', verify=False)
+        self.auth.set_context(root_mock, conn)
+        self.auth._session_key = 'stale'
+        self.auth._session_resource_id = (
+            '/redfish/v1/SessionService/Sessions/1/')
+        unauthorized = mock.MagicMock(status_code=401)
+        unauthorized.json.side_effect = ValueError
+        ok = mock.MagicMock(status_code=200, content=b'{"Id": "1"}')
+
+        with mock.patch.object(conn._session, 'request',
+                               side_effect=[unauthorized, ok]) as req_mock:
+            resp = conn.get('/redfish/v1/Systems/1/')
+
+        self.assertEqual({'Id': '1'}, resp.json())
+        self.assertEqual(2, req_mock.call_count)
+        root_mock.create_session.assert_called_once_with('foo', 'bar')
+        self.assertEqual('renewed', self.auth.get_session_key())
+        self.assertEqual('renewed', conn._session.headers['X-Auth-Token'])
+
+
+class SessionManagerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(SessionManagerTestCase, self).setUp()
+        self.manager = session_manager.SessionManager()
+
+    @mock.patch.object(main, 'HPESushy', autospec=True)
+    def test_acquire_shares_session(self, sushy_mock):
+        key1, conn1 = self.manager.acquire('https://1.2.3.4', 'foo', 'bar')
+        key2, conn2 = self.manager.acquire('https://1.2.3.4', 'foo', 'bar')
+
+        self.assertEqual(key1, key2)
+        self.assertIs(conn1, conn2)
+        self.assertEqual(1, sushy_mock.call_count)
+        args, kwargs = sushy_mock.call_args
+        self.assertEqual(('https://1.2.3.4',), args)
+        self.assertIsInstance(kwargs['auth'],
+                              session_manager.SharedSessionAuth)
+        self.assertEqual(2, self.manager.get_refcount(key1))
+        self.assertEqual(1, len(self.manager))
+
+    @mock.patch.object(main, 'HPESushy', autospec=True)
+    def test_acquire_different_credentials(self, sushy_mock):
+        sushy_mock.side_effect = [mock.MagicMock(), mock.MagicMock(),
+                                  mock.MagicMock()]
+        key1, conn1 = self.manager.acquire('https://1.2.3.4', 'foo', 'bar')
+        key2, conn2 = self.manager.acquire('https://1.2.3.4', 'foo', 'baz')
+        key3, conn3 = self.manager.acquire('https://1.2.3.5', 'foo', 'bar')
+
+        self.assertEqual(3, len({key1, key2, key3}))
+        self.assertEqual(3, len({id(conn1), id(conn2), id(conn3)}))
+        self.assertNotIn('bar', key1)
+
+    @mock.patch.object(main, 'HPESushy', autospec=True)
+    def test_release_logs_out_on_last_reference(self, sushy_mock):
+        key, conn = self.manager.acquire('https://1.2.3.4', 'foo', 'bar')
+        self.manager.acquire('https://1.2.3.4', 'foo', 'bar')
+
+        self.manager.release(key)
+        self.assertFalse(conn.logout.called)
+        self.assertEqual(1, self.manager.get_refcount(key))
+
+        self.manager.release(key)
+        conn.logout.assert_called_once_with()
+        conn.close.assert_called_once_with()
+        self.assertEqual(0, self.manager.get_refcount(key))
+        self.assertEqual(0, len(self.manager))
+
+    @mock.patch.object(main, 'HPESushy', autospec=True)
+    def test_release_ignores_logout_error(self, sushy_mock):
+        key, conn = self.manager.acquire('https://1.2.3.4', 'foo', 'bar')
+        conn.logout.side_effect = sushy.exceptions.ConnectionError(
+            url='https://1.2.3.4', error='boom')
+
+        self.manager.release(key)
+
+        conn.close.assert_called_once_with()
+        self.assertEqual(0, len(self.manager))
+
+    @mock.patch.object(main, 'HPESushy', autospec=True)
+    def test_acquire_fail(self, sushy_mock):
+        sushy_mock.side_effect = sushy.exceptions.SushyError
+
+        self.assertRaises(sushy.exceptions.SushyError,
+                          self.manager.acquire,
+                          'https://1.2.3.4', 'foo', 'bar')
+        self.assertEqual(0, len(self.manager))
+
+
+class RedfishOperationsSharedSessionTestCase(testtools.TestCase):
+
+    @mock.patch.object(session_manager, 'SESSION_MANAGER', autospec=True)
+    def test_shared_session(self, manager_mock):
+        conn = mock.MagicMock()
+        manager_mock.acquire.return_value = ('key', conn)
+
+        rf_client = redfish.RedfishOperations(
+            '1.2.3.4', username='foo', password='bar', share_session=True)
+
+        manager_mock.acquire.assert_called_once_with(
+            'https://1.2.3.4', 'foo', 'bar', root_prefix='/redfish/v1/',
+            verify=False)
+        self.assertIs(conn, rf_client._sushy)
+
+        rf_client.close()
+        rf_client.__del__()
+        manager_mock.release.assert_called_once_with('key')
+        self.assertFalse(conn.close.called)
+
+    @mock.patch.object(session_manager, 'SESSION_MANAGER', autospec=True)
+    def test_shared_session_acquired_again_after_close(self, manager_mock):
+        first, second = mock.MagicMock(), mock.MagicMock()
+        manager_mock.acquire.side_effect = [('key1', first),
+                                            ('key2', second)]
+        rf_client = redfish.RedfishOperations(
+            '1.2.3.4', username='foo', password='bar', share_session=True)
+
+        rf_client.close()
+
+        manager_mock.release.assert_called_once_with('key1')
+        self.assertIs(second, rf_client._sushy)
+        self.assertIs(second, rf_client._sushy)
+        self.assertEqual(2, manager_mock.acquire.call_count)
+        rf_client.close()
+        manager_mock.release.assert_called_with('key2')
+
+    @mock.patch.object(session_manager, 'SESSION_MANAGER', autospec=True)
+    def test_shared_session_fail(self, manager_mock):
+        manager_mock.acquire.side_effect = sushy.exceptions.SushyError
+
+        self.assertRaisesRegex(
+            exception.IloConnectionError,
+            'The Redfish controller at "https://1.2.3.4" has thrown error',
+            redfish.RedfishOperations,
+            '1.2.3.4', username='foo', password='bar', share_session=True)
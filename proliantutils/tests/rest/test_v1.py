@@ -14,6 +14,8 @@
 
 import base64
 import json
+import threading
+import time
 from unittest import mock
 
 import requests
@@ -21,11 +23,16 @@ from requests.packages import urllib3
 from requests.packages.urllib3 import exceptions as urllib3_exceptions
 import testtools
 
+from proliantutils import circuit_breaker
 from proliantutils import exception
 from proliantutils.rest import v1
 from proliantutils.tests.rest import rest_sample_outputs as rest_outputs
 
 
+GET_HEADERS = {'Authorization': 'BASIC YWRtaW46QWRtaW4=',
+               'Accept-Encoding': 'gzip, deflate'}
+
+
 class RestConnectorBaseInitAndLowdashTestCase(testtools.TestCase):
 
     @mock.patch.object(urllib3, 'disable_warnings')
@@ -64,7 +71,7 @@ class RestConnectorBaseTestCase(testtools.TestCase):
         super(RestConnectorBaseTestCase, self).setUp()
         self.client = v1.RestConnectorBase("1.2.3.4", "admin", "Admin")
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
     def test__rest_op_okay(self, request_mock):
         sample_headers = rest_outputs.HEADERS_FOR_REST_OP
         exp_headers = dict((x.lower(), y) for x, y in sample_headers)
@@ -82,10 +89,34 @@ class RestConnectorBaseTestCase(testtools.TestCase):
         self.assertEqual(json.loads(sample_response_body), response)
         request_mock.assert_called_once_with(
             'https://1.2.3.4/v1/foo',
-            headers={'Authorization': 'BASIC YWRtaW46QWRtaW4='},
-            data="null", verify=False)
+            headers=GET_HEADERS,
+            data="null", timeout=(60, 60), verify=False)
+
+    @mock.patch.object(requests.Session, 'get')
+    def test__rest_op_keeps_accept_encoding(self, request_mock):
+        request_mock.return_value = mock.MagicMock(status_code=200, text='')
+
+        self.client._rest_op('GET', '/v1/foo',
+                             {'Accept-Encoding': 'identity'}, None)
+
+        self.assertEqual('identity', request_mock.call_args[1]['headers']
+                         ['Accept-Encoding'])
+
+    @mock.patch.object(requests.Session, 'patch')
+    def test__rest_op_patch_no_accept_encoding(self, request_mock):
+        request_mock.return_value = mock.MagicMock(status_code=200, text='')
+
+        self.client._rest_op('PATCH', '/v1/foo', None, {'a': 1})
+
+        request_mock.assert_called_once_with(
+            'https://1.2.3.4/v1/foo',
+            headers={'Authorization': 'BASIC YWRtaW46QWRtaW4=',
+                     'Content-Type': 'application/json'},
+            data=mock.ANY, timeout=(60, 60), verify=False)
+        self.assertEqual({'a': 1},
+                         json.loads(request_mock.call_args[1]['data']))
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
     def test__rest_op_request_error(self, request_mock):
         request_mock.side_effect = RuntimeError("boom")
 
@@ -95,11 +126,52 @@ class RestConnectorBaseTestCase(testtools.TestCase):
 
         request_mock.assert_called_once_with(
             'https://1.2.3.4/v1/foo',
-            headers={'Authorization': 'BASIC YWRtaW46QWRtaW4='},
-            data="null", verify=False)
+            headers=GET_HEADERS,
+            data="null", timeout=(60, 60), verify=False)
         self.assertIn("boom", str(exc))
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
+    def test__rest_op_circuit_open(self, request_mock):
+        circuit_breaker.configure(failure_threshold=1)
+        self.addCleanup(circuit_breaker.configure)
+        request_mock.side_effect = requests.ConnectionError
+
+        self.assertRaises(exception.IloConnectionError,
+                          self.client._rest_op, 'GET', '/v1/foo', {}, None)
+        self.assertRaises(exception.IloCircuitOpenError,
+                          self.client._rest_op, 'GET', '/v1/foo', {}, None)
+
+        self.assertEqual(1, request_mock.call_count)
+
+    @mock.patch.object(requests.Session, 'get')
+    def test__rest_get_coalesces_concurrent_gets(self, request_mock):
+        release = threading.Event()
+        response_mock_obj = mock.MagicMock(
+            status_code=200, text=rest_outputs.RESPONSE_BODY_FOR_REST_OP,
+            headers={})
+        request_mock.side_effect = (
+            lambda *args, **kwargs: release.wait() and response_mock_obj)
+        results = []
+        threads = [threading.Thread(
+            target=lambda: results.append(self.client._rest_get('/v1/foo')))
+            for i in range(3)]
+        for thread in threads:
+            thread.start()
+        deadline = time.monotonic() + 10
+        while self.client._get_flight.get_stats()['coalesced'] < 2:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+        release.set()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(1, request_mock.call_count)
+        self.assertEqual(3, len(results))
+        self.assertEqual(results[0], results[1])
+        # Note: Every caller gets its own copy of the response body.
+        self.assertIsNot(results[0][2], results[1][2])
+
+    @mock.patch.object(requests.Session, 'get')
     def test__rest_op_continous_redirection(self, request_mock):
         sample_response_body = rest_outputs.RESPONSE_BODY_FOR_REST_OP
         sample_headers = rest_outputs.HEADERS_FOR_REST_OP
@@ -121,7 +193,7 @@ class RestConnectorBaseTestCase(testtools.TestCase):
         self.assertEqual(5, request_mock.call_count)
         self.assertIn('https://1.2.3.4/v1/foo', str(exc))
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
     def test__rest_op_one_redirection(self, request_mock):
         sample_response_body = rest_outputs.RESPONSE_BODY_FOR_REST_OP
         sample_headers1 = rest_outputs.HEADERS_FOR_REST_OP
@@ -147,13 +219,13 @@ class RestConnectorBaseTestCase(testtools.TestCase):
         self.assertEqual(json.loads(sample_response_body), response)
         request_mock.assert_has_calls([
             mock.call('https://1.2.3.4/v1/foo',
-                      headers={'Authorization': 'BASIC YWRtaW46QWRtaW4='},
-                      data="null", verify=False),
+                      headers=GET_HEADERS,
+                      data="null", timeout=(60, 60), verify=False),
             mock.call('https://5.6.7.8/v1/foo',
-                      headers={'Authorization': 'BASIC YWRtaW46QWRtaW4='},
-                      data="null", verify=False)])
+                      headers=GET_HEADERS,
+                      data="null", timeout=(60, 60), verify=False)])
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
     def test__rest_op_response_decode_error(self, request_mock):
         sample_response_body = "{[wrong json"
         sample_headers = rest_outputs.HEADERS_FOR_REST_OP
@@ -169,10 +241,10 @@ class RestConnectorBaseTestCase(testtools.TestCase):
 
         request_mock.assert_called_once_with(
             'https://1.2.3.4/v1/foo',
-            headers={'Authorization': 'BASIC YWRtaW46QWRtaW4='},
-            data="null", verify=False)
+            headers=GET_HEADERS,
+            data="null", timeout=(60, 60), verify=False)
 
-    @mock.patch.object(requests, 'get')
+    @mock.patch.object(requests.Session, 'get')
     def test__rest_op_response_gzipped_response(self, request_mock):
         sample_response_body = rest_outputs.RESPONSE_BODY_FOR_REST_OP
         gzipped_response_body = base64.b64decode(
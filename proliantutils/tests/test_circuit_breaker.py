@@ -0,0 +1,181 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import requests
+import testtools
+
+from proliantutils import circuit_breaker
+from proliantutils import exception
+
+
+class CircuitBreakerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(CircuitBreakerTestCase, self).setUp()
+        self.now = 100.0
+        self.breaker = circuit_breaker.CircuitBreaker(
+            '1.2.3.4', failure_threshold=3, cooldown=30,
+            clock=lambda: self.now)
+
+    def _fail(self, count=1):
+        for i in range(count):
+            self.breaker.before_call()
+            self.breaker.end_call(True)
+
+    def test_opens_after_consecutive_failures(self):
+        self._fail(2)
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+
+        self._fail()
+
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state)
+        self.assertRaisesRegex(exception.IloCircuitOpenError,
+                               '1.2.3.4 after 3 consecutive',
+                               self.breaker.before_call)
+
+    def test_success_resets_failures(self):
+        self._fail(2)
+        self.breaker.before_call()
+        self.breaker.end_call(False)
+        self._fail(2)
+
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+
+    def test_half_open_probe_closes(self):
+        self._fail(3)
+        self.now += 30
+
+        self.breaker.before_call()
+
+        self.assertEqual(circuit_breaker.HALF_OPEN, self.breaker.state)
+        # Note: only one probe at a time.
+        self.assertRaises(exception.IloCircuitOpenError,
+                          self.breaker.before_call)
+        self.breaker.end_call(False)
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+        self.breaker.before_call()
+
+    def test_half_open_probe_reopens(self):
+        self._fail(3)
+        self.now += 31
+        self.breaker.before_call()
+
+        self.breaker.end_call(True)
+
+        self.assertEqual(circuit_breaker.OPEN, self.breaker.state)
+        self.now += 29
+        self.assertRaises(exception.IloCircuitOpenError,
+                          self.breaker.before_call)
+        self.now += 1
+        self.breaker.before_call()
+
+    def test_get_state(self):
+        self.assertEqual({'state': 'closed', 'failures': 0,
+                          'retry_in': None}, self.breaker.get_state())
+        self._fail(3)
+        self.now += 10
+
+        self.assertEqual({'state': 'open', 'failures': 3, 'retry_in': 20},
+                         self.breaker.get_state())
+
+    def test_disabled(self):
+        self.breaker.failure_threshold = 0
+
+        self._fail(10)
+
+        self.assertEqual(circuit_breaker.CLOSED, self.breaker.state)
+
+
+class CircuitBreakerModuleTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(CircuitBreakerModuleTestCase, self).setUp()
+        circuit_breaker.configure(failure_threshold=2, cooldown=30)
+        self.addCleanup(circuit_breaker.configure)
+        self.transitions = []
+        listener = lambda *args: self.transitions.append(args)  # noqa
+        circuit_breaker.register_listener(listener)
+        self.addCleanup(circuit_breaker.unregister_listener, listener)
+
+    def _call(self, host, error=None):
+        with circuit_breaker.guard(host):
+            if error:
+                raise error
+
+    def test_guard(self):
+        for i in range(2):
+            self.assertRaises(requests.ConnectionError, self._call,
+                              '1.2.3.4', requests.ConnectionError())
+
+        self.assertRaises(exception.IloCircuitOpenError, self._call,
+                          '1.2.3.4')
+        self._call('5.6.7.8')
+        self.assertEqual([('1.2.3.4', 'closed', 'open')], self.transitions)
+        self.assertEqual({'1.2.3.4': {'state': 'open', 'failures': 2,
+                                      'retry_in': mock.ANY},
+                          '5.6.7.8': {'state': 'closed', 'failures': 0,
+                                      'retry_in': None}},
+                         circuit_breaker.get_states())
+
+    def test_guard_other_errors_are_not_failures(self):
+        for i in range(3):
+            self.assertRaises(ValueError, self._call, '1.2.3.4',
+                              ValueError())
+
+        self.assertEqual('closed',
+                         circuit_breaker.get_states()['1.2.3.4']['state'])
+
+    def test_guard_timeouts_are_failures(self):
+        for i in range(2):
+            self.assertRaises(requests.Timeout, self._call, '1.2.3.4',
+                              requests.Timeout())
+
+        self.assertRaises(exception.IloCircuitOpenError, self._call,
+                          '1.2.3.4')
+
+    def test_hosts_are_normalized(self):
+        self.assertIs(circuit_breaker.get_breaker('[FE80::1]'),
+                      circuit_breaker.get_breaker('fe80::1'))
+
+    def test_reset(self):
+        for i in range(2):
+            self.assertRaises(requests.ConnectionError, self._call,
+                              '1.2.3.4', requests.ConnectionError())
+
+        circuit_breaker.reset('1.2.3.4')
+
+        self._call('1.2.3.4')
+
+    def test_configure_disables(self):
+        circuit_breaker.configure(failure_threshold=0)
+
+        for i in range(5):
+            self.assertRaises(requests.ConnectionError, self._call,
+                              '1.2.3.4', requests.ConnectionError())
+
+        self._call('1.2.3.4')
+
+    def test_listener_errors_are_ignored(self):
+        listener = mock.Mock(side_effect=RuntimeError)
+        circuit_breaker.register_listener(listener)
+        self.addCleanup(circuit_breaker.unregister_listener, listener)
+
+        for i in range(2):
+            self.assertRaises(requests.ConnectionError, self._call,
+                              '1.2.3.4', requests.ConnectionError())
+
+        listener.assert_called_once_with('1.2.3.4', 'closed', 'open')
@@ -0,0 +1,166 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import shutil
+import tempfile
+import threading
+from unittest import mock
+
+import testtools
+
+from proliantutils import content_cache
+
+
+MODEL = 'ProLiant DL380 Gen10'
+VERSION = 'U30 v2.42 (01/23/2021)'
+
+
+class ContentCacheTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(ContentCacheTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.cache = content_cache.ContentCache(self.directory)
+
+    def test_get_missing(self):
+        self.assertIsNone(self.cache.get(content_cache.BIOS_DEFAULTS, MODEL,
+                                         VERSION))
+
+    def test_put_get(self):
+        self.cache.put(content_cache.BIOS_DEFAULTS, MODEL, VERSION,
+                       {'BootMode': 'Uefi'})
+
+        self.assertEqual({'BootMode': 'Uefi'}, self.cache.get(
+            content_cache.BIOS_DEFAULTS, MODEL, VERSION))
+        self.assertIsNone(self.cache.get(content_cache.BIOS_REGISTRY, MODEL,
+                                         VERSION))
+        self.assertIsNone(self.cache.get(content_cache.BIOS_DEFAULTS, MODEL,
+                                         'U30 v2.50 (05/03/2021)'))
+        stats = self.cache.get_stats()
+        self.assertEqual((1, 2, 1), (stats['hits'], stats['misses'],
+                                     stats['entries']))
+
+    def test_shared_directory(self):
+        self.cache.put(content_cache.BIOS_DEFAULTS, MODEL, VERSION,
+                       {'BootMode': 'Uefi'})
+
+        other = content_cache.ContentCache(self.directory)
+        self.assertEqual({'BootMode': 'Uefi'}, other.get(
+            content_cache.BIOS_DEFAULTS, MODEL, VERSION))
+
+    def test_corrupted_entry(self):
+        self.cache.put(content_cache.BIOS_DEFAULTS, MODEL, VERSION, {})
+        for name in os.listdir(self.directory):
+            with open(os.path.join(self.directory, name), 'w') as f:
+                f.write('{"key": ')
+
+        self.assertIsNone(self.cache.get(content_cache.BIOS_DEFAULTS, MODEL,
+                                         VERSION))
+
+    def test_eviction(self):
+        cache = content_cache.ContentCache(self.directory, max_size=250)
+        document = {'Value': 'x' * 100}
+        cache.put(content_cache.BIOS_DEFAULTS, MODEL, '1', document)
+        # Note: the least recently used entry is the oldest modified.
+        for name in os.listdir(self.directory):
+            os.utime(os.path.join(self.directory, name), (1, 1))
+        cache.put(content_cache.BIOS_DEFAULTS, MODEL, '2', document)
+        cache.put(content_cache.BIOS_DEFAULTS, MODEL, '3', document)
+
+        self.assertIsNone(cache.get(content_cache.BIOS_DEFAULTS, MODEL, '1'))
+        self.assertEqual(document, cache.get(content_cache.BIOS_DEFAULTS,
+                                             MODEL, '3'))
+        self.assertLessEqual(cache.get_stats()['size'], 250)
+
+    def test_concurrent_put_get(self):
+        document = {'Attributes': ['x' * 1000] * 100}
+        errors = []
+
+        def _put_get():
+            try:
+                for i in range(20):
+                    self.cache.put(content_cache.BIOS_DEFAULTS, MODEL,
+                                   VERSION, document)
+                    self.assertEqual(document, self.cache.get(
+                        content_cache.BIOS_DEFAULTS, MODEL, VERSION))
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=_put_get) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([], errors)
+        self.assertEqual(1, self.cache.get_stats()['entries'])
+
+    def test_clear(self):
+        self.cache.put(content_cache.BIOS_DEFAULTS, MODEL, VERSION, {})
+
+        self.cache.clear()
+
+        self.assertEqual(0, self.cache.get_stats()['entries'])
+
+
+class FetchTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(FetchTestCase, self).setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.addCleanup(content_cache.configure)
+        self.func = mock.Mock(return_value={'BootMode': 'Uefi'})
+
+    def test_fetch_disabled(self):
+        content_cache.configure()
+
+        for i in range(2):
+            self.assertEqual({'BootMode': 'Uefi'}, content_cache.fetch(
+                content_cache.BIOS_DEFAULTS, MODEL, VERSION, self.func))
+
+        self.assertEqual(2, self.func.call_count)
+        self.assertIsNone(content_cache.get_cache())
+
+    def test_fetch(self):
+        content_cache.configure(self.directory)
+
+        for i in range(2):
+            self.assertEqual({'BootMode': 'Uefi'}, content_cache.fetch(
+                content_cache.BIOS_DEFAULTS, MODEL, VERSION, self.func))
+
+        self.func.assert_called_once_with()
+
+    def test_fetch_without_version(self):
+        content_cache.configure(self.directory)
+
+        for i in range(2):
+            content_cache.fetch(content_cache.BIOS_DEFAULTS, MODEL, None,
+                                self.func)
+
+        self.assertEqual(2, self.func.call_count)
+        self.assertEqual(0, content_cache.get_cache().get_stats()['entries'])
+
+    def test_fetch_error_not_cached(self):
+        content_cache.configure(self.directory)
+        self.func.side_effect = [ValueError, {'BootMode': 'Uefi'}]
+
+        self.assertRaises(ValueError, content_cache.fetch,
+                          content_cache.BIOS_DEFAULTS, MODEL, VERSION,
+                          self.func)
+        self.assertEqual({'BootMode': 'Uefi'}, content_cache.fetch(
+            content_cache.BIOS_DEFAULTS, MODEL, VERSION, self.func))
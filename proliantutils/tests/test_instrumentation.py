@@ -0,0 +1,250 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+from unittest import mock
+
+import ddt
+import requests
+from sushy import connector
+from sushy import exceptions
+import testtools
+
+from proliantutils import exception
+from proliantutils.ilo import ribcl
+from proliantutils import instrumentation
+from proliantutils.redfish import connector as hpe_connector
+from proliantutils.rest import v1
+
+
+class RecordingHook(instrumentation.InstrumentationHook):
+
+    def __init__(self):
+        self.started = []
+        self.ended = []
+
+    def on_request_start(self, info):
+        self.started.append(info)
+
+    def on_request_end(self, info):
+        self.ended.append(info)
+
+
+class InstrumentationTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(InstrumentationTestCase, self).setUp()
+        self.hook = RecordingHook()
+        instrumentation.register_hook(self.hook)
+        self.addCleanup(instrumentation.unregister_hook, self.hook)
+
+
+@ddt.ddt
+class TrackRequestTestCase(InstrumentationTestCase):
+
+    @ddt.data(('/redfish/v1/Systems/1/', '/redfish/v1/Systems/{id}/'),
+              ('https://1.2.3.4/rest/v1/Systems/1/bios/Settings?a=b',
+               '/rest/v1/Systems/{id}/bios/Settings'),
+              ('/redfish/v1/TaskService/Tasks/'
+               '0f4b2c8e-4e5a-4b8e-9a3c-2d1f0e9b8a7c',
+               '/redfish/v1/TaskService/Tasks/{id}'),
+              ('https://1.2.3.4:443/ribcl', '/ribcl'))
+    @ddt.unpack
+    def test_get_uri_template(self, uri, expected):
+        self.assertEqual(expected, instrumentation.get_uri_template(uri))
+
+    def test_track_request(self):
+        with instrumentation.track_request(
+                '1.2.3.4', instrumentation.PROTOCOL_REDFISH, 'GET',
+                '/redfish/v1/Systems/1', bytes_out=5) as info:
+            self.assertEqual([info], self.hook.started)
+            self.assertEqual([], self.hook.ended)
+            info.attempt()
+            info.attempt()
+            info.status = 200
+            info.bytes_in = 10
+
+        self.assertEqual([info], self.hook.ended)
+        self.assertEqual('/redfish/v1/Systems/{id}', info.uri_template)
+        self.assertEqual(1, info.retries)
+        self.assertEqual(5, info.bytes_out)
+        self.assertIsNone(info.error)
+        self.assertGreaterEqual(info.elapsed, 0)
+
+    def test_track_request_error(self):
+        def _request():
+            with instrumentation.track_request(
+                    '1.2.3.4', instrumentation.PROTOCOL_REDFISH, 'GET', '/'):
+                raise exceptions.HTTPError(
+                    method='GET', url='/', response=mock.MagicMock(
+                        status_code=404, json=mock.MagicMock(
+                            return_value={})))
+
+        self.assertRaises(exceptions.HTTPError, _request)
+        info = self.hook.ended[0]
+        self.assertEqual('HTTPError', info.error)
+        self.assertEqual(404, info.status)
+
+    def test_track_request_hook_error_ignored(self):
+        bad_hook = mock.MagicMock()
+        bad_hook.on_request_start.side_effect = ValueError
+        bad_hook.on_request_end.side_effect = ValueError
+        instrumentation.register_hook(bad_hook)
+        self.addCleanup(instrumentation.unregister_hook, bad_hook)
+
+        with instrumentation.track_request(
+                '1.2.3.4', instrumentation.PROTOCOL_RIS, 'GET', '/'):
+            pass
+
+        self.assertEqual(1, len(self.hook.ended))
+        bad_hook.on_request_end.assert_called_once_with(mock.ANY)
+
+    def test_track_request_disabled(self):
+        instrumentation.unregister_hook(self.hook)
+        self.assertFalse(instrumentation.is_enabled())
+        with instrumentation.track_request(
+                '1.2.3.4', instrumentation.PROTOCOL_RIS, 'GET', '/') as info:
+            self.assertIsNone(info)
+        self.assertEqual([], self.hook.started)
+
+
+class HooksTestCase(testtools.TestCase):
+
+    def _get_info(self, status=200, elapsed=0.3, retries=0):
+        info = instrumentation.RequestInfo(
+            '1.2.3.4', instrumentation.PROTOCOL_REDFISH, 'GET',
+            '/redfish/v1/Systems/1', bytes_out=2)
+        for _ in range(retries + 1):
+            info.attempt()
+        info.status = status
+        info.bytes_in = 100
+        info.elapsed = elapsed
+        return info
+
+    def test_statsd_hook(self):
+        client = mock.MagicMock()
+        hook = instrumentation.StatsdHook(client, prefix='ilo')
+
+        hook.on_request_end(self._get_info(status=500, retries=2))
+
+        client.incr.assert_has_calls([
+            mock.call('ilo.redfish.requests', 1),
+            mock.call('ilo.redfish.errors', 1),
+            mock.call('ilo.redfish.retries', 2),
+            mock.call('ilo.redfish.bytes_in', 100),
+            mock.call('ilo.redfish.bytes_out', 2)])
+        client.timing.assert_called_once_with('ilo.redfish.get', 300.0)
+
+    def test_statsd_hook_queue_wait(self):
+        client = mock.MagicMock()
+        hook = instrumentation.StatsdHook(client, prefix='ilo')
+        info = self._get_info()
+        info.queue_wait = 0.1
+
+        hook.on_request_end(info)
+
+        client.timing.assert_has_calls([
+            mock.call('ilo.redfish.get', 300.0),
+            mock.call('ilo.redfish.queue_wait', 100.0)])
+
+    def test_histogram_hook(self):
+        hook = instrumentation.HistogramHook(buckets=(0.1, 1))
+
+        hook.on_request_end(self._get_info(elapsed=0.05))
+        hook.on_request_end(self._get_info(elapsed=0.5, status=404))
+        hook.on_request_end(self._get_info(elapsed=5, retries=1))
+
+        stats = hook.snapshot()[('1.2.3.4', 'redfish', 'GET',
+                                 '/redfish/v1/Systems/{id}')]
+        self.assertEqual(3, stats['count'])
+        self.assertEqual(1, stats['errors'])
+        self.assertEqual(1, stats['retries'])
+        self.assertEqual(0.05, stats['min'])
+        self.assertEqual(5, stats['max'])
+        self.assertEqual(300, stats['bytes_in'])
+        self.assertEqual([1, 1, 1], stats['buckets'])
+
+        hook.reset()
+        self.assertEqual({}, hook.snapshot())
+
+
+class TransportInstrumentationTestCase(InstrumentationTestCase):
+
+    @mock.patch.object(ribcl.RIBCLOperations, '_serialize_xml')
+    @mock.patch.object(requests.Session, 'post')
+    def test_ribcl(self, post_mock, serialize_mock):
+        ilo = ribcl.RIBCLOperations("x.x.x.x", "admin", "Admin", 60, 443)
+        serialize_mock.return_value = 'serialized-xml'
+        post_mock.return_value = mock.MagicMock(
+            text='returned-text', content=b'returned-text', status_code=200)
+        root = ilo._create_dynamic_xml('GET_HOST_POWER_STATUS',
+                                       'SERVER_INFO', 'read')
+
+        ilo._request_ilo(root)
+
+        info = self.hook.ended[0]
+        self.assertEqual(('x.x.x.x', 'ribcl', 'POST', '/ribcl'),
+                         (info.host, info.protocol, info.method,
+                          info.uri_template))
+        self.assertEqual('GET_HOST_POWER_STATUS', info.operation)
+        self.assertEqual((200, 14, 13),
+                         (info.status, info.bytes_out, info.bytes_in))
+
+    @mock.patch.object(requests.Session, 'post')
+    def test_ribcl_error(self, post_mock):
+        ilo = ribcl.RIBCLOperations("x.x.x.x", "admin", "Admin", 60, 443)
+        post_mock.side_effect = requests.exceptions.ConnectionError
+
+        self.assertRaises(exception.IloConnectionError, ilo._request_ilo,
+                          ilo._create_dynamic_xml('GET_HOST_POWER_STATUS',
+                                                  'SERVER_INFO', 'read'))
+        self.assertEqual('IloConnectionError', self.hook.ended[0].error)
+
+    @mock.patch.object(requests.Session, 'get')
+    def test_ris_redirected(self, get_mock):
+        client = v1.RestConnectorBase('1.2.3.4', 'admin', 'Admin')
+        redirect = mock.MagicMock(status_code=301,
+                                  headers={'location': 'https://1.2.3.5/x'})
+        response = mock.MagicMock(status_code=200, text='{}', content=b'{}')
+        get_mock.side_effect = [redirect, response]
+
+        client._rest_get('/rest/v1/Systems/1')
+
+        info = self.hook.ended[0]
+        self.assertEqual(('1.2.3.4', 'ris', 'GET', '/rest/v1/Systems/{id}'),
+                         (info.host, info.protocol, info.method,
+                          info.uri_template))
+        self.assertEqual((200, 1, 2),
+                         (info.status, info.retries, info.bytes_in))
+
+    @mock.patch('retrying.time.sleep', lambda *args: None)
+    @mock.patch.object(connector.Connector, '_op', autospec=True)
+    def test_redfish_retried(self, conn_mock):
+        response = mock.MagicMock(status_code=200, content=b'{"a": 1}')
+        conn_mock.side_effect = [exceptions.ConnectionError, response]
+        hpe_conn = hpe_connector.HPEConnector('https://1.2.3.4',
+                                              verify=False)
+
+        hpe_conn._op('PATCH', path='/redfish/v1/Systems/1/',
+                     data={'a': 'b'})
+
+        self.assertEqual(2, conn_mock.call_count)
+        info = self.hook.ended[0]
+        self.assertEqual(('1.2.3.4', 'redfish', 'PATCH',
+                          '/redfish/v1/Systems/{id}/'),
+                         (info.host, info.protocol, info.method,
+                          info.uri_template))
+        self.assertEqual((200, 1, 10, 8),
+                         (info.status, info.retries, info.bytes_out,
+                          info.bytes_in))
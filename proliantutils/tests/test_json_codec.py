@@ -0,0 +1,70 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+import ddt
+import testtools
+
+from proliantutils import exception
+from proliantutils import json_codec
+
+
+@ddt.ddt
+class JsonCodecTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(JsonCodecTestCase, self).setUp()
+        self.addCleanup(json_codec.set_codec)
+
+    def test_default_codec(self):
+        self.assertEqual(json_codec.get_available_codecs()[0],
+                         json_codec.get_codec())
+        self.assertEqual(json_codec.JSON,
+                         json_codec.get_available_codecs()[-1])
+
+    def test_set_codec_not_available(self):
+        self.assertRaisesRegex(exception.InvalidInputError,
+                               'foo is not available',
+                               json_codec.set_codec, 'foo')
+
+    @ddt.data(*json_codec.get_available_codecs())
+    def test_loads(self, codec):
+        json_codec.set_codec(codec)
+        document = {'Attributes': {'BootMode': 'Uefi', 'Nics': [1, 2]}}
+
+        self.assertEqual(document, json_codec.loads(json.dumps(document)))
+        self.assertEqual(document,
+                         json_codec.loads(json.dumps(document).encode()))
+
+    @ddt.data(*json_codec.get_available_codecs())
+    def test_loads_invalid(self, codec):
+        json_codec.set_codec(codec)
+
+        self.assertRaises(ValueError, json_codec.loads, '{[wrong json')
+
+    @ddt.data(*json_codec.get_available_codecs())
+    def test_dumps(self, codec):
+        json_codec.set_codec(codec)
+        document = {'Attributes': {'BootMode': 'Uefi'}, 'Oem': None}
+
+        self.assertIsInstance(json_codec.dumps(document), str)
+        self.assertEqual(document, json.loads(json_codec.dumps(document)))
+
+    @ddt.data(*json_codec.get_available_codecs())
+    def test_dumps_non_string_keys(self, codec):
+        json_codec.set_codec(codec)
+
+        self.assertEqual({'1': 'a'}, json.loads(json_codec.dumps({1: 'a'})))
@@ -0,0 +1,126 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import copy
+import threading
+import time
+
+import testtools
+
+from proliantutils import single_flight
+
+
+def wait_for(test, condition):
+    deadline = time.monotonic() + 10
+    while not condition():
+        test.assertLess(time.monotonic(), deadline)
+        time.sleep(0.001)
+
+
+class SingleFlightTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(SingleFlightTestCase, self).setUp()
+        self.flight = single_flight.SingleFlight(copy_result=copy.deepcopy)
+        self.release = threading.Event()
+        self.calls = []
+
+    def _func(self, value, error=None):
+        self.calls.append(value)
+        self.release.wait()
+        if error:
+            raise error
+        return {'value': value}
+
+    def _run_concurrently(self, count, key, *args):
+        results = []
+
+        def run():
+            try:
+                results.append(self.flight.do(key, self._func, *args))
+            except Exception as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=run) for i in range(count)]
+        threads[0].start()
+        wait_for(self, lambda: self.calls)
+        for thread in threads[1:]:
+            thread.start()
+        wait_for(self,
+                 lambda: self.flight.get_stats()['coalesced'] == count - 1)
+        self.release.set()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_do_coalesces(self):
+        results = self._run_concurrently(4, 'key', 1)
+
+        self.assertEqual([1], self.calls)
+        self.assertEqual([{'value': 1}] * 4, results)
+        # Note: Every caller gets its own copy of the result.
+        self.assertEqual(4, len(set(id(result) for result in results)))
+        self.assertEqual({'executed': 1, 'coalesced': 3, 'in_flight': 0},
+                         self.flight.get_stats())
+
+    def test_do_shares_the_exception(self):
+        error = ValueError('boom')
+
+        results = self._run_concurrently(3, 'key', 1, error)
+
+        self.assertEqual([1], self.calls)
+        self.assertEqual([error] * 3, results)
+
+    def test_do_runs_again_once_done(self):
+        self.release.set()
+
+        self.assertEqual({'value': 1}, self.flight.do('key', self._func, 1))
+        self.assertEqual({'value': 2}, self.flight.do('key', self._func, 2))
+
+        self.assertEqual([1, 2], self.calls)
+
+    def test_do_different_keys(self):
+        self.release.set()
+
+        self.flight.do(single_flight.make_key('a', 1), self._func, 1)
+        self.flight.do(single_flight.make_key('a', 2), self._func, 2)
+
+        self.assertEqual([1, 2], self.calls)
+        self.assertEqual(2, self.flight.get_stats()['executed'])
+
+    def test_do_unhashable_key(self):
+        self.release.set()
+
+        result = self.flight.do(single_flight.make_key(data={}),
+                                self._func, 1)
+
+        self.assertEqual({'value': 1}, result)
+        self.assertEqual(0, self.flight.get_stats()['executed'])
+
+    def test_do_nested_call_with_the_same_key(self):
+        def outer():
+            return self.flight.do('key', lambda: 'inner')
+
+        self.assertEqual('inner', self.flight.do('key', outer))
+
+    def test_do_without_copy(self):
+        flight = single_flight.SingleFlight()
+        result = {}
+
+        self.assertIs(result, flight.do('key', lambda: result))
+
+    def test_make_key(self):
+        self.assertEqual(('get', 1, ('a', 2), ('b', 3)),
+                         single_flight.make_key('get', 1, b=3, a=2))
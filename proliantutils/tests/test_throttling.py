@@ -0,0 +1,163 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+import time
+
+import testtools
+
+from proliantutils import exception
+from proliantutils import instrumentation
+from proliantutils import throttling
+
+
+class HostLimiterTestCase(testtools.TestCase):
+
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + 10
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.001)
+
+    def test_concurrency(self):
+        limiter = throttling.HostLimiter('1.2.3.4', concurrency=2)
+        lock = threading.Lock()
+        running = [0]
+        peak = [0]
+
+        def request():
+            limiter.acquire()
+            with lock:
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+            time.sleep(0.01)
+            with lock:
+                running[0] -= 1
+            limiter.release()
+
+        threads = [threading.Thread(target=request) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(2, peak[0])
+        stats = limiter.get_stats()
+        self.assertEqual((8, 0, 0), (stats['acquired'], stats['active'],
+                                     stats['waiting']))
+        self.assertGreater(stats['max_wait'], 0)
+
+    def test_fifo(self):
+        limiter = throttling.HostLimiter('1.2.3.4', concurrency=1)
+        order = []
+
+        def request(i):
+            limiter.acquire()
+            order.append(i)
+            limiter.release()
+
+        limiter.acquire()
+        threads = []
+        for i in range(5):
+            thread = threading.Thread(target=request, args=(i,))
+            thread.start()
+            threads.append(thread)
+            self._wait_for(
+                lambda: limiter.get_stats()['waiting'] == i + 1)
+        limiter.release()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual([0, 1, 2, 3, 4], order)
+
+    def test_rate(self):
+        limiter = throttling.HostLimiter('1.2.3.4', rate=50, burst=2)
+        start = time.monotonic()
+
+        for i in range(6):
+            limiter.acquire()
+            limiter.release()
+
+        # Note: 2 requests start at once, the 4 others 20 ms apart.
+        self.assertGreaterEqual(time.monotonic() - start, 0.07)
+
+    def test_reentrant(self):
+        limiter = throttling.HostLimiter('1.2.3.4', concurrency=1)
+
+        limiter.acquire()
+        self.assertEqual(0.0, limiter.acquire(timeout=0))
+        limiter.release()
+        limiter.release()
+
+        self.assertEqual(0, limiter.get_stats()['active'])
+
+    def test_timeout(self):
+        limiter = throttling.HostLimiter('1.2.3.4', concurrency=1)
+        thread = threading.Thread(target=limiter.acquire)
+        thread.start()
+        thread.join()
+
+        self.assertRaisesRegex(exception.IloConnectionError, 'Timed out',
+                               limiter.acquire, timeout=0.01)
+        self.assertEqual(0, limiter.get_stats()['waiting'])
+
+    def test_unlimited(self):
+        limiter = throttling.HostLimiter('1.2.3.4')
+
+        for i in range(10):
+            limiter.acquire(timeout=0)
+
+
+class ThrottlingModuleTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(ThrottlingModuleTestCase, self).setUp()
+        self.addCleanup(throttling.configure)
+
+    def test_limit(self):
+        info = instrumentation.RequestInfo('1.2.3.4', 'redfish', 'GET', '/')
+
+        with throttling.limit('[1.2.3.4]', info) as limiter:
+            self.assertIs(limiter, throttling.get_limiter('1.2.3.4'))
+            self.assertEqual(1, limiter.get_stats()['active'])
+
+        self.assertEqual(0, limiter.get_stats()['active'])
+        self.assertGreaterEqual(info.queue_wait, 0)
+        self.assertIn('1.2.3.4', throttling.get_stats())
+
+    def test_limits_by_generation(self):
+        throttling.configure(default={'concurrency': 1},
+                             generations={9: {'concurrency': 3},
+                                          10: {'concurrency': 5,
+                                               'rate': 10}})
+        limiter = throttling.get_limiter('10.0.0.1')
+        self.assertEqual(1, limiter.concurrency)
+
+        throttling.set_model('10.0.0.1', 'ProLiant DL380 Gen11')
+        self.assertEqual((5, 10, 5),
+                         (limiter.concurrency, limiter.rate, limiter.burst))
+
+        throttling.set_model('10.0.0.2', 'ProLiant DL380 Gen9')
+        self.assertEqual(3, throttling.get_limiter('10.0.0.2').concurrency)
+
+        throttling.set_model('10.0.0.3', 'ProLiant DL380 Gen8')
+        self.assertEqual(1, throttling.get_limiter('10.0.0.3').concurrency)
+
+    def test_configure_applies_to_existing_limiters(self):
+        limiter = throttling.get_limiter('10.0.0.4')
+
+        throttling.configure(default={'concurrency': None})
+
+        self.assertIsNone(limiter.concurrency)
@@ -0,0 +1,199 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import threading
+from unittest import mock
+
+import testtools
+
+from proliantutils import exception
+from proliantutils import timeouts
+
+
+READ = ('redfish', timeouts.READ)
+
+
+class LatencyTrackerTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(LatencyTrackerTestCase, self).setUp()
+        self.tracker = timeouts.LatencyTracker('1.2.3.4', window=100)
+
+    def test_get_percentiles(self):
+        for i in range(100):
+            self.tracker.record(READ, (i + 1) / 100.0)
+
+        self.assertEqual((0.5, 0.99), self.tracker.get_percentiles(READ))
+
+    def test_get_percentiles_too_few_samples(self):
+        for i in range(timeouts.MIN_SAMPLES - 1):
+            self.tracker.record(READ, 1)
+
+        self.assertIsNone(self.tracker.get_percentiles(READ))
+
+    def test_get_percentiles_rolling_window(self):
+        for i in range(100):
+            self.tracker.record(READ, 10)
+        for i in range(100):
+            self.tracker.record(READ, 1)
+
+        self.assertEqual((1, 1), self.tracker.get_percentiles(READ))
+
+    def test_get_stats(self):
+        self.tracker.record(READ, 1)
+
+        self.assertEqual(
+            {'redfish/read': {'samples': 1, 'p50': None, 'p99': None}},
+            self.tracker.get_stats())
+
+
+class TimeoutsTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(TimeoutsTestCase, self).setUp()
+        timeouts.configure(adaptive=True)
+        self.addCleanup(timeouts.configure)
+
+    def _record(self, latency, count=timeouts.MIN_SAMPLES):
+        tracker = timeouts.get_tracker('1.2.3.4')
+        for i in range(count):
+            tracker.record(READ, latency)
+
+    def test_get_timeouts_without_samples(self):
+        self.assertEqual((60, 60), timeouts.get_timeouts('1.2.3.4', READ))
+
+    def test_get_timeouts_floors(self):
+        self._record(0.1)
+
+        self.assertEqual((timeouts.CONNECT_FLOOR, timeouts.READ_FLOOR),
+                         timeouts.get_timeouts('1.2.3.4', READ))
+
+    def test_get_timeouts_from_latency(self):
+        self._record(5)
+
+        self.assertEqual((20, 15), timeouts.get_timeouts('[1.2.3.4]', READ))
+        self.assertEqual((60, 60), timeouts.get_timeouts(
+            '1.2.3.4', ('redfish', timeouts.WRITE)))
+
+    def test_get_timeouts_ceiling(self):
+        self._record(30)
+
+        self.assertEqual((45, 45),
+                         timeouts.get_timeouts('1.2.3.4', READ, 45))
+
+    def test_get_timeouts_not_adaptive(self):
+        timeouts.configure(adaptive=False)
+        self._record(0.1)
+
+        self.assertEqual((60, 60), timeouts.get_timeouts('1.2.3.4', READ))
+
+    @mock.patch.object(timeouts.time, 'monotonic')
+    def test_get_timeouts_within_deadline(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+
+        with timeouts.deadline(30):
+            monotonic_mock.return_value = 110.0
+            self.assertEqual((20, 20),
+                             timeouts.get_timeouts('1.2.3.4', READ))
+            monotonic_mock.return_value = 130.0
+            self.assertRaisesRegex(exception.IloDeadlineExceededError,
+                                   '30 seconds exceeded .* 1.2.3.4',
+                                   timeouts.get_timeouts, '1.2.3.4', READ)
+
+        self.assertIsNone(timeouts.get_remaining())
+
+    @mock.patch.object(timeouts.time, 'monotonic')
+    def test_deadline_nested(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+
+        with timeouts.deadline(30):
+            with timeouts.deadline(60):
+                self.assertEqual(30, timeouts.get_remaining())
+            with timeouts.deadline(10):
+                self.assertEqual(10, timeouts.get_remaining())
+            self.assertEqual(30, timeouts.get_remaining())
+
+    def test_get_timeouts_none(self):
+        self._record(5)
+
+        self.assertEqual((20, 15),
+                         timeouts.get_timeouts('1.2.3.4', READ, None))
+        self.assertEqual((60, 60), timeouts.get_timeouts(
+            '1.2.3.4', ('redfish', timeouts.WRITE), None))
+
+    @mock.patch.object(timeouts.time, 'monotonic')
+    def test_get_timeouts_none_within_deadline(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+
+        with timeouts.deadline(30):
+            self.assertEqual((30, 30),
+                             timeouts.get_timeouts('1.2.3.4', READ, None))
+
+    @mock.patch.object(timeouts.time, 'monotonic')
+    def test_propagate(self, monotonic_mock):
+        monotonic_mock.return_value = 100.0
+        with timeouts.deadline(30):
+            func = timeouts.propagate(timeouts.get_remaining)
+        results = []
+        thread = threading.Thread(target=lambda: results.append(
+            (func(), timeouts.get_remaining())))
+        thread.start()
+        thread.join()
+
+        self.assertEqual([(30, None)], results)
+
+    def test_propagate_without_deadline(self):
+        func = mock.Mock()
+        self.assertIs(func, timeouts.propagate(func))
+
+    def test_measure(self):
+        with timeouts.measure('1.2.3.4', READ, 10):
+            pass
+
+        self.assertEqual(1, timeouts.get_stats()['1.2.3.4']['redfish/read']
+                         ['samples'])
+
+    def test_measure_fast_failure_not_recorded(self):
+        def fail():
+            with timeouts.measure('1.2.3.4', READ, 10):
+                raise ValueError()
+
+        self.assertRaises(ValueError, fail)
+
+        self.assertEqual({}, timeouts.get_tracker('1.2.3.4').get_stats())
+
+    def test_measure_timeout_recorded(self):
+        def fail():
+            with timeouts.measure('1.2.3.4', READ, 0):
+                raise ValueError()
+
+        self.assertRaises(ValueError, fail)
+
+        self.assertEqual(1, timeouts.get_tracker('1.2.3.4').get_stats()
+                         ['redfish/read']['samples'])
+
+    def test_measure_without_read_timeout(self):
+        def fail():
+            with timeouts.measure('1.2.3.4', READ, None):
+                raise ValueError()
+
+        self.assertRaises(ValueError, fail)
+
+        self.assertEqual({}, timeouts.get_tracker('1.2.3.4').get_stats())
+
+    def test_get_operation_class(self):
+        self.assertEqual(timeouts.READ, timeouts.get_operation_class('get'))
+        self.assertEqual(timeouts.WRITE,
+                         timeouts.get_operation_class('PATCH'))
@@ -0,0 +1,155 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+# All Rights Reserved.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import os
+import socket
+import ssl
+from unittest import mock
+
+import requests
+from requests import certs
+import testtools
+
+from proliantutils import tls
+from proliantutils.tests.benchmark import server
+
+
+class SSLContextTestCase(testtools.TestCase):
+
+    def setUp(self):
+        super(SSLContextTestCase, self).setUp()
+        environ = mock.patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        os.environ.pop('REQUESTS_CA_BUNDLE', None)
+        os.environ.pop('CURL_CA_BUNDLE', None)
+        self.server = server.ReplayServer()
+        self.server.start()
+        self.addCleanup(self.server.stop)
+        self.server.add_route('GET', '/redfish/v1/',
+                              server.Response('{"Id": "RootService"}'))
+        self.cacert = os.path.join(self.server._certdir, 'cert.pem')
+        self.url = 'https://%s/redfish/v1/' % self.server.address
+
+    def _connect(self, context, port=None):
+        sock = context.wrap_socket(
+            socket.create_connection(('127.0.0.1',
+                                      port or self.server.port)),
+            server_hostname='127.0.0.1')
+        sock.sendall(b'GET /redfish/v1/ HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+                     b'Connection: close\r\n\r\n')
+        while sock.recv(4096):
+            pass
+        reused = sock.session_reused
+        sock.close()
+        return reused
+
+    def test_get_ssl_context_is_shared(self):
+        context = tls.get_ssl_context(self.cacert)
+
+        self.assertIs(context, tls.get_ssl_context(self.cacert))
+        self.assertIs(tls.get_ssl_context(None), tls.get_ssl_context(False))
+        self.assertIsNot(context, tls.get_ssl_context(False))
+        self.assertEqual(ssl.CERT_REQUIRED, context.verify_mode)
+        self.assertEqual(ssl.CERT_NONE,
+                         tls.get_ssl_context(False).verify_mode)
+
+    def test_get_ssl_context_missing_cacert(self):
+        self.assertRaises(IOError, tls.get_ssl_context,
+                          os.path.join(self.server._certdir, 'missing.pem'))
+
+    @mock.patch.object(tls._ResumingSSLContext, 'load_default_certs')
+    @mock.patch.object(tls._ResumingSSLContext, 'load_verify_locations')
+    def test_create_ssl_context_default_cas(self, load_mock, default_mock):
+        tls._create_ssl_context(True)
+
+        load_mock.assert_called_once_with(cafile=certs.where())
+        default_mock.assert_called_once_with()
+
+    def test_session_resumption(self):
+        context = tls.get_ssl_context(self.cacert)
+        context.forget_sessions()
+
+        self.assertFalse(self._connect(context))
+        self.assertTrue(self._connect(context))
+        self.assertTrue(self._connect(context))
+
+    def test_verification_fails_without_the_ca(self):
+        context = tls.get_ssl_context(True)
+
+        self.assertRaises(ssl.SSLError, self._connect, context)
+
+    @mock.patch.object(tls, 'MAX_SESSIONS', 1)
+    def test_sessions_are_bounded(self):
+        context = tls.get_ssl_context(False)
+        context.forget_sessions()
+        other = server.ReplayServer()
+        other.start()
+        self.addCleanup(other.stop)
+
+        self._connect(context)
+        self._connect(context, port=other.port)
+
+        self.assertTrue(self._connect(context, port=other.port))
+        self.assertFalse(self._connect(context))
+
+    def test_get_session(self):
+        session = tls.get_session(self.cacert)
+        context = tls.get_ssl_context(self.cacert)
+        context.forget_sessions()
+
+        with mock.patch.object(context, 'load_verify_locations') as load_mock:
+            for i in range(3):
+                response = session.get(self.url,
+                                       headers={'Connection': 'close'})
+                self.assertEqual(200, response.status_code)
+
+        self.assertIs(session, tls.get_session(self.cacert))
+        self.assertEqual(self.cacert, session.verify)
+        self.assertFalse(load_mock.called)
+        self.assertTrue(self._connect(context))
+        self.assertEqual(ssl.CERT_REQUIRED, context.verify_mode)
+
+    def test_get_session_verify_fails(self):
+        session = tls.get_session(True)
+
+        self.assertRaises(requests.exceptions.SSLError, session.get,
+                          self.url)
+
+    def test_get_session_request_verify(self):
+        session = tls.get_session(True)
+
+        response = session.get(self.url, verify=self.cacert)
+
+        self.assertEqual(200, response.status_code)
+        self.assertRaises(requests.exceptions.SSLError, session.get,
+                          self.url)
+
+    def test_get_session_ca_bundle_from_environment(self):
+        session = tls.get_session(True)
+
+        with mock.patch.dict(os.environ, {'REQUESTS_CA_BUNDLE': self.cacert}):
+            response = session.get(self.url)
+
+        self.assertEqual(200, response.status_code)
+
+    def test_get_session_keeps_no_cookies(self):
+        self.server.add_route('GET', '/cookie', server.Response(
+            '{}', headers={'Set-Cookie': 'sessionKey=abc; Path=/'}))
+        session = tls.get_session(False)
+
+        session.get('https://%s/cookie' % self.server.address)
+
+        self.assertEqual(0, len(session.cookies))
@@ -187,6 +187,41 @@ class UtilsTestCase(testtools.TestCase):
         # | THEN |
         self.assertEqual(expected, actual)
 
+    @mock.patch.object(utils, 'HASH_CHUNK_SIZE', 7)
+    def test_hash_file_in_chunks(self):
+        # | GIVEN |
+        data = b'Mary had a little lamb, its fleece as white as snow'
+        file_like_object = six.BytesIO(data)
+        expected = hashlib.sha256(data).hexdigest()
+        # | WHEN |
+        actual = utils.hash_file(file_like_object, 'sha256')
+        # | THEN |
+        self.assertEqual(expected, actual)
+
+    @mock.patch.object(utils, 'HASH_CHUNK_SIZE', 7)
+    def test_hash_file_digests(self):
+        # | GIVEN |
+        data = b'Mary had a little lamb, its fleece as white as snow'
+        file_like_object = six.BytesIO(data)
+        # | WHEN |
+        actual = utils.hash_file_digests(file_like_object,
+                                         ['md5', 'sha256', 'sha512'])
+        # | THEN |
+        self.assertEqual({'md5': hashlib.md5(data).hexdigest(),
+                          'sha256': hashlib.sha256(data).hexdigest(),
+                          'sha512': hashlib.sha512(data).hexdigest()},
+                         actual)
+
+    def test_hash_file_digests_without_readinto(self):
+        # | GIVEN |
+        data = b'Mary had a little lamb, its fleece as white as snow'
+        file_like_object = mock.MagicMock(spec=['read'])
+        file_like_object.read.side_effect = [data[:10], data[10:], b'']
+        # | WHEN |
+        actual = utils.hash_file_digests(file_like_object, ['sha1'])
+        # | THEN |
+        self.assertEqual({'sha1': hashlib.sha1(data).hexdigest()}, actual)
+
     def test_hash_file_throws_for_invalid_or_unsupported_hash(self):
         # | GIVEN |
         data = b'Mary had a little lamb, its fleece as white as snow'
@@ -229,13 +264,42 @@ class UtilsTestCase(testtools.TestCase):
                           file_like_object,
                           invalid_hash)
 
-    @mock.patch.object(requests, 'head', autospec=True)
+    @mock.patch.object(__builtin__, 'open', autospec=True)
+    def test_verify_image_checksum_sha512(self, open_mock):
+        # | GIVEN |
+        data = b'Yankee Doodle went to town riding on a pony;'
+        open_mock().__enter__.return_value = six.BytesIO(data)
+        checksum = hashlib.sha512(data).hexdigest().upper()
+        # | WHEN |
+        utils.verify_image_checksum('/dev/disk/by-label/SPP', checksum)
+        # | THEN |
+        # no any exception thrown
+
+    @mock.patch.object(utils, 'hash_file_digests', autospec=True)
+    @mock.patch.object(__builtin__, 'open', autospec=True)
+    def test_verify_image_checksum_several(self, open_mock,
+                                           hash_file_digests_mock):
+        # | GIVEN |
+        hash_file_digests_mock.return_value = {'md5': 'aa', 'sha256': 'bb'}
+        # | WHEN | & | THEN |
+        utils.verify_image_checksum('/dev/disk/by-label/SPP',
+                                    {'md5': 'aa', 'sha256': 'bb'})
+        self.assertRaisesRegex(exception.ImageRefValidationFailed,
+                               'against checksum cc',
+                               utils.verify_image_checksum,
+                               '/dev/disk/by-label/SPP',
+                               {'md5': 'aa', 'sha256': 'cc'})
+        hash_file_digests_mock.assert_called_with(
+            open_mock().__enter__.return_value, ['md5', 'sha256'])
+        self.assertEqual(2, hash_file_digests_mock.call_count)
+
+    @mock.patch.object(requests.Session, 'head', autospec=True)
     def test_validate_href(self, head_mock):
         href = 'http://1.2.3.4/abc.iso'
         response = head_mock.return_value
         response.status_code = http_client.OK
         utils.validate_href(href)
-        head_mock.assert_called_once_with(href)
+        head_mock.assert_called_once_with(mock.ANY, href)
         response.status_code = http_client.NO_CONTENT
         self.assertRaises(exception.ImageRefValidationFailed,
                           utils.validate_href,
@@ -244,29 +308,29 @@ class UtilsTestCase(testtools.TestCase):
         self.assertRaises(exception.ImageRefValidationFailed,
                           utils.validate_href, href)
 
-    @mock.patch.object(requests, 'head', autospec=True)
+    @mock.patch.object(requests.Session, 'head', autospec=True)
     def test_validate_href_error_code(self, head_mock):
         href = 'http://1.2.3.4/abc.iso'
         head_mock.return_value.status_code = http_client.BAD_REQUEST
         self.assertRaises(exception.ImageRefValidationFailed,
                           utils.validate_href, href)
-        head_mock.assert_called_once_with(href)
+        head_mock.assert_called_once_with(mock.ANY, href)
 
-    @mock.patch.object(requests, 'head', autospec=True)
+    @mock.patch.object(requests.Session, 'head', autospec=True)
     def test_validate_href_error(self, head_mock):
         href = 'http://1.2.3.4/abc.iso'
         head_mock.side_effect = requests.ConnectionError()
         self.assertRaises(exception.ImageRefValidationFailed,
                           utils.validate_href, href)
-        head_mock.assert_called_once_with(href)
+        head_mock.assert_called_once_with(mock.ANY, href)
 
-    @mock.patch.object(requests, 'head', autospec=True)
+    @mock.patch.object(requests.Session, 'head', autospec=True)
     def test_validate_href_error_no_base_image(self, head_mock):
         href = 'http://1.2.3.4/'
         head_mock.return_value.status_code = http_client.OK
         self.assertRaises(exception.ImageRefValidationFailed,
                           utils.validate_href, href)
-        head_mock.assert_called_once_with(href)
+        head_mock.assert_called_once_with(mock.ANY, href)
 
     def test_apply_bios_properties_filter(self):
         data = {
@@ -342,3 +406,35 @@ class UtilsTestCase(testtools.TestCase):
         actual = utils.apply_bios_properties_filter(
             data, filter_to_be_applied)
         self.assertEqual(expected, actual)
+
+    def test_get_changed_bios_settings(self):
+        settings = {
+            "BootMode": "Uefi",
+            "Sriov": "Enabled",
+            "TimeFormat": "Utc",
+            "ProcTurbo": "Disabled",
+        }
+        current = {
+            "BootMode": "Uefi",
+            "Sriov": "Disabled",
+            "TimeFormat": "Utc",
+            "ProcTurbo": "Enabled",
+        }
+        pending = {
+            "BootMode": "LegacyBios",
+            "Sriov": "Enabled",
+        }
+
+        expected = {
+            "BootMode": "Uefi",
+            "ProcTurbo": "Disabled",
+        }
+        actual = utils.get_changed_bios_settings(settings, current, pending)
+        self.assertEqual(expected, actual)
+
+    def test_get_changed_bios_settings_no_pending(self):
+        settings = {"BootMode": "Uefi", "Sriov": "Enabled"}
+        current = {"BootMode": "Uefi", "Sriov": "Disabled"}
+
+        actual = utils.get_changed_bios_settings(settings, current)
+        self.assertEqual({"Sriov": "Enabled"}, actual)
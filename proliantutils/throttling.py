@@ -0,0 +1,295 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Per-host limits on the requests sent to the iLOs.
+
+The embedded web server of an iLO only serves a few requests at once, and
+returns errors or stalls beyond that. All the requests of the process to
+an iLO, whatever the client object or the transport sending them, go
+through one limiter per host, which lets at most ``concurrency`` of them
+run at once and, optionally, starts at most ``rate`` of them per second
+with bursts of up to ``burst`` requests. Requests over the limits queue
+in arrival order.
+
+The limits depend on the iLO generation, once known::
+
+    from proliantutils import throttling
+
+    throttling.configure(
+        default={'concurrency': 2},
+        generations={10: {'concurrency': 6, 'rate': 20}})
+
+The time spent queuing is reported as the ``queue_wait`` of the
+instrumentation RequestInfo, and aggregated by get_stats().
+"""
+
+import collections
+import contextlib
+import re
+import threading
+import time
+
+from proliantutils import exception
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+# Limits of the iLOs of unknown generation. A concurrency or rate of None
+# means no limit.
+DEFAULT_LIMITS = {'concurrency': 4, 'rate': None, 'burst': None}
+
+# Limits by server generation; a generation missing here gets the limits
+# of the closest older one.
+GENERATION_LIMITS = {
+    8: {'concurrency': 2, 'rate': None, 'burst': None},
+    9: {'concurrency': 4, 'rate': None, 'burst': None},
+    10: {'concurrency': 6, 'rate': None, 'burst': None},
+}
+
+_default_limits = dict(DEFAULT_LIMITS)
+_generation_limits = dict(GENERATION_LIMITS)
+_generations = {}
+_limiters = {}
+_lock = threading.Lock()
+
+
+def _host_key(host):
+    return host.strip('[]').lower()
+
+
+class HostLimiter(object):
+    """Fair concurrency and rate limiter of the requests to one host."""
+
+    def __init__(self, host, concurrency=None, rate=None, burst=None):
+        """Constructor for HostLimiter.
+
+        :param host: address of the iLO.
+        :param concurrency: maximum number of requests at once, None for
+            no limit.
+        :param rate: maximum number of requests started per second, None
+            for no limit.
+        :param burst: number of requests which can start at once within
+            the rate, defaults to the concurrency.
+        """
+        self.host = host
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._waiters = collections.deque()
+        self._active = 0
+        self._acquired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self.set_limits(concurrency, rate, burst)
+
+    def set_limits(self, concurrency=None, rate=None, burst=None):
+        """Changes the limits, for the requests not started yet."""
+        with self._cond:
+            self.concurrency = concurrency
+            self.rate = rate
+            self.burst = max(burst or concurrency or 1, 1)
+            self._tokens = float(self.burst)
+            self._refilled_at = time.monotonic()
+            self._cond.notify_all()
+
+    def _take_token(self):
+        # Note: called with the lock held. Returns 0 once a token is taken,
+        # otherwise the time in seconds until the next one.
+        if not self.rate:
+            return 0
+        now = time.monotonic()
+        self._tokens = min(
+            self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0
+        return (1 - self._tokens) / self.rate
+
+    def _can_start(self, waiter):
+        return (self._waiters[0] is waiter
+                and (not self.concurrency
+                     or self._active < self.concurrency))
+
+    def acquire(self, timeout=None):
+        """Waits for the turn of a request.
+
+        A thread already holding the limiter gets it again right away, so
+        that a request issued while handling another one (a re-login, for
+        instance) cannot deadlock.
+
+        :param timeout: maximum time in seconds to wait, None for no limit.
+        :returns: the time in seconds spent waiting.
+        :raises: IloConnectionError, on timeout.
+        """
+        depth = getattr(self._local, 'depth', 0)
+        if depth:
+            self._local.depth = depth + 1
+            return 0.0
+        start = time.monotonic()
+        waiter = object()
+        with self._cond:
+            self._waiters.append(waiter)
+            try:
+                while True:
+                    delay = None
+                    if self._can_start(waiter):
+                        delay = self._take_token()
+                        if not delay:
+                            break
+                    if timeout is not None:
+                        remaining = start + timeout - time.monotonic()
+                        if remaining <= 0:
+                            raise exception.IloConnectionError(
+                                'Timed out after %(timeout)s seconds waiting '
+                                'for a free connection to %(host)s' %
+                                {'timeout': timeout, 'host': self.host})
+                        delay = (remaining if delay is None
+                                 else min(delay, remaining))
+                    self._cond.wait(delay)
+            finally:
+                self._waiters.remove(waiter)
+                self._cond.notify_all()
+            self._active += 1
+            waited = time.monotonic() - start
+            self._acquired += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        self._local.depth = 1
+        return waited
+
+    def release(self):
+        """Ends a request started with acquire()."""
+        self._local.depth -= 1
+        if self._local.depth:
+            return
+        with self._cond:
+            self._active -= 1
+            self._cond.notify_all()
+
+    def get_stats(self):
+        """Returns the limits and the queuing statistics of the host.
+
+        :returns: a dictionary with the 'concurrency', 'rate' and 'burst'
+            limits, the number of 'active' and 'waiting' requests, the
+            number of requests 'acquired' so far, and their 'total_wait'
+            and 'max_wait' in seconds.
+        """
+        with self._cond:
+            return {'concurrency': self.concurrency, 'rate': self.rate,
+                    'burst': self.burst, 'active': self._active,
+                    'waiting': len(self._waiters),
+                    'acquired': self._acquired,
+                    'total_wait': self._total_wait,
+                    'max_wait': self._max_wait}
+
+
+def _get_limits(generation):
+    if generation is None:
+        return _default_limits
+    older = [gen for gen in _generation_limits if gen <= generation]
+    if not older:
+        return _default_limits
+    return _generation_limits[max(older)]
+
+
+def _apply_limits(limiter, limits):
+    limiter.set_limits(limits.get('concurrency'), limits.get('rate'),
+                       limits.get('burst'))
+
+
+def configure(default=None, generations=None):
+    """Sets the limits of the iLOs.
+
+    :param default: dictionary with the 'concurrency', 'rate' and 'burst'
+        of the iLOs of unknown generation, DEFAULT_LIMITS if None.
+    :param generations: dictionary of server generation (e.g. 10 for
+        Gen10) to limits, GENERATION_LIMITS if None.
+    """
+    global _default_limits, _generation_limits
+    with _lock:
+        _default_limits = dict(DEFAULT_LIMITS if default is None
+                               else default)
+        _generation_limits = dict(GENERATION_LIMITS if generations is None
+                                  else generations)
+        for key, limiter in _limiters.items():
+            _apply_limits(limiter, _get_limits(_generations.get(key)))
+
+
+def set_model(host, model):
+    """Applies the limits of the generation of an iLO.
+
+    :param host: address of the iLO.
+    :param model: server model, e.g. 'ProLiant DL380 Gen10'.
+    """
+    if not isinstance(model, str):
+        return
+    match = re.search(r'Gen(\d+)', model)
+    if not match:
+        return
+    key = _host_key(host)
+    generation = int(match.group(1))
+    with _lock:
+        if _generations.get(key) == generation:
+            return
+        _generations[key] = generation
+        limiter = _limiters.get(key)
+        if limiter is not None:
+            _apply_limits(limiter, _get_limits(generation))
+
+
+def get_limiter(host):
+    """Returns the limiter of a host.
+
+    :param host: address of the iLO.
+    :returns: a HostLimiter object.
+    """
+    key = _host_key(host)
+    with _lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = HostLimiter(key)
+            _apply_limits(limiter, _get_limits(_generations.get(key)))
+        return limiter
+
+
+def get_stats():
+    """Returns the limits and queuing statistics of every host.
+
+    :returns: a dictionary of host to the dictionary returned by
+        HostLimiter.get_stats().
+    """
+    with _lock:
+        limiters = list(_limiters.values())
+    return {limiter.host: limiter.get_stats() for limiter in limiters}
+
+
+@contextlib.contextmanager
+def limit(host, info=None, timeout=None):
+    """Context manager running a request to a host within its limits.
+
+    :param host: address of the iLO.
+    :param info: the instrumentation RequestInfo of the request, if any,
+        whose ``queue_wait`` gets the time spent waiting.
+    :param timeout: maximum time in seconds to wait, None for no limit.
+    :raises: IloConnectionError, on timeout.
+    """
+    limiter = get_limiter(host)
+    waited = limiter.acquire(timeout=timeout)
+    if info is not None:
+        info.queue_wait += waited
+    try:
+        yield limiter
+    finally:
+        limiter.release()
@@ -0,0 +1,304 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""Timeouts of the requests to the iLOs, from their observed latency.
+
+The duration of the requests to every iLO is tracked per protocol and
+class of operation ('read' or 'write'). Once enough of them are known, and
+if enabled with configure(adaptive=True), the connect timeout of the next
+requests is derived from the median latency and the read timeout from the
+99th percentile, within floors and the timeout configured by the caller
+as ceiling. A request which times out counts with its full duration, so a
+slow iLO gets longer timeouts while a dead one fails as fast as the floors
+allow.
+
+Independently, a deadline bounds the total time spent by the calls made
+in a block, through all their requests, retries and queuing::
+
+    from proliantutils import timeouts
+
+    with timeouts.deadline(30):
+        ilo_client.get_host_power_status()
+
+Requests get at most the time left, and none starts once the deadline
+has passed: IloDeadlineExceededError is raised instead. The deadline is
+kept per thread: work a call spreads over other threads is bound to it
+with propagate(), while background pollers, e.g. of firmware updates,
+outlive the block and are not bound.
+"""
+
+import collections
+import contextlib
+import functools
+import threading
+import time
+
+from proliantutils import exception
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+READ = 'read'
+WRITE = 'write'
+
+# Default timeout in seconds of the requests without a configured one.
+DEFAULT_TIMEOUT = 60
+
+# Number of latest requests per host and operation class the percentiles
+# are computed on, and how many must be known to compute them.
+WINDOW = 100
+MIN_SAMPLES = 10
+
+# The connect timeout is CONNECT_FACTOR times the median latency and the
+# read timeout READ_FACTOR times the 99th percentile, but no less than
+# the floors (in seconds).
+CONNECT_FACTOR = 4
+CONNECT_FLOOR = 3
+READ_FACTOR = 3
+READ_FLOOR = 10
+
+_adaptive = False
+_trackers = {}
+_lock = threading.Lock()
+_local = threading.local()
+
+
+def _host_key(host):
+    return host.strip('[]').lower()
+
+
+def get_operation_class(method):
+    """Returns the operation class of an HTTP method.
+
+    :param method: HTTP method, e.g. 'GET'.
+    :returns: READ for GET and HEAD, WRITE otherwise.
+    """
+    return READ if method.upper() in ('GET', 'HEAD') else WRITE
+
+
+class LatencyTracker(object):
+    """Rolling latency percentiles of the requests to one host."""
+
+    def __init__(self, host, window=WINDOW):
+        """Constructor for LatencyTracker.
+
+        :param host: address of the iLO.
+        :param window: number of latest requests per operation kept.
+        """
+        self.host = host
+        self.window = window
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._percentiles = {}
+
+    def record(self, operation, elapsed):
+        """Records the duration of a request.
+
+        :param operation: operation class, e.g. ('redfish', READ).
+        :param elapsed: duration of the request in seconds.
+        """
+        with self._lock:
+            samples = self._samples.get(operation)
+            if samples is None:
+                samples = self._samples[operation] = collections.deque(
+                    maxlen=self.window)
+            samples.append(elapsed)
+            self._percentiles.pop(operation, None)
+
+    def get_percentiles(self, operation):
+        """Returns the median and 99th percentile latencies of an operation.
+
+        :param operation: operation class, e.g. ('redfish', READ).
+        :returns: a tuple of the 50th and 99th percentiles in seconds,
+            None if fewer than MIN_SAMPLES requests are known.
+        """
+        with self._lock:
+            percentiles = self._percentiles.get(operation)
+            if percentiles is None:
+                samples = sorted(self._samples.get(operation, ()))
+                if len(samples) < MIN_SAMPLES:
+                    return None
+                last = len(samples) - 1
+                percentiles = self._percentiles[operation] = (
+                    samples[last // 2], samples[last * 99 // 100])
+            return percentiles
+
+    def get_stats(self):
+        """Returns the latency percentiles of every operation class.
+
+        :returns: a dictionary of operation class, as 'protocol/class', to
+            a dictionary with the number of 'samples' and the 'p50' and
+            'p99' latencies in seconds (None while too few are known).
+        """
+        with self._lock:
+            operations = list(self._samples)
+        stats = {}
+        for operation in operations:
+            percentiles = self.get_percentiles(operation) or (None, None)
+            with self._lock:
+                count = len(self._samples[operation])
+            stats['/'.join(operation)] = {'samples': count,
+                                          'p50': percentiles[0],
+                                          'p99': percentiles[1]}
+        return stats
+
+
+def configure(adaptive=False):
+    """Enables or disables the timeouts derived from the latency.
+
+    :param adaptive: True to derive the timeouts from the latency, False
+        to use the timeouts configured by the callers.
+    """
+    global _adaptive
+    with _lock:
+        _adaptive = adaptive
+        _trackers.clear()
+
+
+def get_tracker(host):
+    """Returns the latency tracker of a host.
+
+    :param host: address of the iLO.
+    :returns: a LatencyTracker object.
+    """
+    key = _host_key(host)
+    with _lock:
+        tracker = _trackers.get(key)
+        if tracker is None:
+            tracker = _trackers[key] = LatencyTracker(key)
+        return tracker
+
+
+def get_stats():
+    """Returns the latency percentiles of every host.
+
+    :returns: a dictionary of host to the dictionary returned by
+        LatencyTracker.get_stats().
+    """
+    with _lock:
+        trackers = list(_trackers.values())
+    return {tracker.host: tracker.get_stats() for tracker in trackers}
+
+
+@contextlib.contextmanager
+def deadline(seconds):
+    """Context manager bounding the time of the calls made in the block.
+
+    The deadline applies to the calls made by the current thread, and to
+    the functions it wraps with propagate(). Nested deadlines can only
+    shorten the enclosing one.
+
+    :param seconds: time in seconds the calls may take, in total.
+    """
+    previous = getattr(_local, 'deadline', None)
+    expiry = time.monotonic() + seconds
+    if previous is None or expiry < previous[0]:
+        _local.deadline = (expiry, seconds)
+    try:
+        yield
+    finally:
+        _local.deadline = previous
+
+
+def propagate(func):
+    """Binds a function to the deadline of the current thread.
+
+    :param func: function to be called from another thread, e.g. by an
+        executor, on behalf of the calls of the current thread.
+    :returns: a function calling func within the same deadline, or func
+        itself without deadline.
+    """
+    current = getattr(_local, 'deadline', None)
+    if current is None:
+        return func
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        previous = getattr(_local, 'deadline', None)
+        _local.deadline = current
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _local.deadline = previous
+    return wrapper
+
+
+def get_remaining(host=None):
+    """Returns the time left before the deadline of the current thread.
+
+    :param host: address of the iLO about to be contacted, for the error.
+    :returns: the time left in seconds, None without deadline.
+    :raises: IloDeadlineExceededError, if the deadline has passed.
+    """
+    current = getattr(_local, 'deadline', None)
+    if current is None:
+        return None
+    remaining = current[0] - time.monotonic()
+    if remaining <= 0:
+        raise exception.IloDeadlineExceededError(host=host,
+                                                 deadline=current[1])
+    return remaining
+
+
+def get_timeouts(host, operation, timeout=DEFAULT_TIMEOUT,
+                 read_floor=READ_FLOOR):
+    """Returns the timeouts of the next request to a host.
+
+    :param host: address of the iLO.
+    :param operation: operation class, e.g. ('redfish', READ).
+    :param timeout: timeout in seconds configured for the request, the
+        ceiling of the derived timeouts. DEFAULT_TIMEOUT if None.
+    :param read_floor: minimum derived read timeout in seconds.
+    :returns: a tuple of the connect and read timeouts in seconds.
+    :raises: IloDeadlineExceededError, if the deadline has passed.
+    """
+    if timeout is None:
+        timeout = DEFAULT_TIMEOUT
+    connect_timeout = read_timeout = timeout
+    if _adaptive:
+        percentiles = get_tracker(host).get_percentiles(operation)
+        if percentiles is not None:
+            connect_timeout = min(
+                max(percentiles[0] * CONNECT_FACTOR, CONNECT_FLOOR), timeout)
+            read_timeout = min(
+                max(percentiles[1] * READ_FACTOR, read_floor), timeout)
+    remaining = get_remaining(host)
+    if remaining is not None:
+        connect_timeout = min(connect_timeout, remaining)
+        read_timeout = min(read_timeout, remaining)
+    return connect_timeout, read_timeout
+
+
+@contextlib.contextmanager
+def measure(host, operation, read_timeout):
+    """Context manager recording the duration of a request to a host.
+
+    A request failing before its read timeout, e.g. refused, says nothing
+    of the latency of the host and is not recorded.
+
+    :param host: address of the iLO.
+    :param operation: operation class, e.g. ('redfish', READ).
+    :param read_timeout: read timeout of the request in seconds, None if
+        unknown.
+    """
+    start = time.monotonic()
+    try:
+        yield
+    except Exception:
+        elapsed = time.monotonic() - start
+        if read_timeout is not None and elapsed >= read_timeout:
+            get_tracker(host).record(operation, elapsed)
+        raise
+    get_tracker(host).record(operation, time.monotonic() - start)
@@ -0,0 +1,247 @@
+# Copyright 2026 Hewlett Packard Enterprise Development LP
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may
+# not use this file except in compliance with the License. You may obtain
+# a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+# License for the specific language governing permissions and limitations
+# under the License.
+
+"""TLS contexts shared by all the connections to the iLOs.
+
+The certificate verification settings given to proliantutils follow the
+``verify`` argument of requests: False (or None) to skip the verification,
+True to verify against the CA bundle of requests and the system CA store,
+or the path to a CA_BUNDLE file or to a directory of CA certificates.
+
+There is one SSL context per verification setting in the process, with the
+CAs loaded once, and each context keeps the last TLS session of every iLO
+it connected to, so that reconnecting to an iLO resumes the session instead
+of going through a full handshake.
+"""
+
+import collections
+from http import cookiejar
+import os
+import ssl
+import threading
+
+import requests
+from requests import adapters
+from requests import certs
+
+from proliantutils import log
+
+
+LOG = log.get_logger(__name__)
+
+# Maximum number of TLS sessions kept per SSL context.
+MAX_SESSIONS = 4096
+
+# Number of hosts whose connection pool is kept by the shared sessions.
+POOL_CONNECTIONS = 100
+
+_lock = threading.Lock()
+_contexts = {}
+_sessions = {}
+
+
+def _verify_key(verify):
+    if not verify:
+        return False
+    if verify is True:
+        return True
+    return os.path.abspath(verify)
+
+
+class _ResumingSSLSocket(ssl.SSLSocket):
+    """SSL socket saving its TLS session in its context for later reuse."""
+
+    _peer = None
+
+    def do_handshake(self, *args, **kwargs):
+        super(_ResumingSSLSocket, self).do_handshake(*args, **kwargs)
+        self.context._save_session(self)
+
+    def _real_close(self):
+        # Note: TLS 1.3 servers send the session tickets after the
+        # handshake, so the session is saved once more before closing.
+        try:
+            self.context._save_session(self)
+        finally:
+            super(_ResumingSSLSocket, self)._real_close()
+
+
+class _ResumingSSLContext(ssl.SSLContext):
+    """Client SSL context resuming the TLS sessions of known peers."""
+
+    sslsocket_class = _ResumingSSLSocket
+
+    def __new__(cls, protocol=ssl.PROTOCOL_TLS_CLIENT, *args, **kwargs):
+        self = super(_ResumingSSLContext, cls).__new__(
+            cls, protocol, *args, **kwargs)
+        self._session_lock = threading.Lock()
+        self._tls_sessions = collections.OrderedDict()
+        return self
+
+    def wrap_socket(self, sock, server_side=False,
+                    do_handshake_on_connect=True, suppress_ragged_eofs=True,
+                    server_hostname=None, session=None):
+        peer = None
+        if not server_side:
+            try:
+                peer = (sock.getpeername(), server_hostname)
+            except OSError:
+                pass
+        if peer is not None and session is None:
+            with self._session_lock:
+                session = self._tls_sessions.get(peer)
+        ssl_sock = super(_ResumingSSLContext, self).wrap_socket(
+            sock, server_side=server_side,
+            do_handshake_on_connect=do_handshake_on_connect,
+            suppress_ragged_eofs=suppress_ragged_eofs,
+            server_hostname=server_hostname, session=session)
+        ssl_sock._peer = peer
+        return ssl_sock
+
+    def _save_session(self, ssl_sock):
+        if ssl_sock._peer is None:
+            return
+        try:
+            session = ssl_sock.session
+        except (OSError, ValueError):
+            return
+        if session is None:
+            return
+        with self._session_lock:
+            self._tls_sessions[ssl_sock._peer] = session
+            self._tls_sessions.move_to_end(ssl_sock._peer)
+            while len(self._tls_sessions) > MAX_SESSIONS:
+                self._tls_sessions.popitem(last=False)
+
+    def forget_sessions(self):
+        """Drops the TLS sessions kept so far."""
+        with self._session_lock:
+            self._tls_sessions.clear()
+
+
+def _create_ssl_context(verify):
+    context = _ResumingSSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    if verify is False:
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+    elif verify is True:
+        # Note: requests verifies against its own CA bundle, which may
+        # not be part of the system CA store.
+        context.load_verify_locations(cafile=certs.where())
+        context.load_default_certs()
+    elif os.path.isdir(verify):
+        context.load_verify_locations(capath=verify)
+    else:
+        context.load_verify_locations(cafile=verify)
+    return context
+
+
+def get_ssl_context(verify):
+    """Returns the SSL context of the process for a verification setting.
+
+    :param verify: False or None to skip the certificate verification, True
+        to verify it against the CA bundle of requests and the system CAs,
+        or the path to a CA_BUNDLE file or to a directory of CA certificates.
+    :returns: an ssl.SSLContext object, shared by all the callers giving
+        the same setting.
+    :raises: IOError, if the CA certificates cannot be loaded.
+    """
+    key = _verify_key(verify)
+    with _lock:
+        context = _contexts.get(key)
+        if context is None:
+            context = _contexts[key] = _create_ssl_context(key)
+            LOG.debug('Created the SSL context for verify=%s', key)
+        return context
+
+
+def _cert_reqs(context):
+    # Note: urllib3 sets the verify mode of the context from cert_reqs,
+    # which must not change the one of a shared context.
+    return ('CERT_NONE' if context.verify_mode == ssl.CERT_NONE
+            else 'CERT_REQUIRED')
+
+
+class SSLContextAdapter(adapters.HTTPAdapter):
+    """Transport adapter for requests connecting with the shared SSL contexts.
+
+    requests otherwise builds a new SSL context, loading the CA bundle
+    again, for every new connection. Each request connects with the context
+    of the ``verify`` value it is sent with, which requests merges with the
+    REQUESTS_CA_BUNDLE and CURL_CA_BUNDLE environment variables.
+    """
+
+    def __init__(self, ssl_context, **kwargs):
+        self.ssl_context = ssl_context
+        super(SSLContextAdapter, self).__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs['ssl_context'] = self.ssl_context
+        return super(SSLContextAdapter, self).init_poolmanager(*args,
+                                                               **kwargs)
+
+    def proxy_manager_for(self, proxy, **proxy_kwargs):
+        proxy_kwargs['ssl_context'] = self.ssl_context
+        return super(SSLContextAdapter, self).proxy_manager_for(
+            proxy, **proxy_kwargs)
+
+    def build_connection_pool_key_attributes(self, request, verify,
+                                             cert=None):
+        host_params, pool_kwargs = super(
+            SSLContextAdapter, self).build_connection_pool_key_attributes(
+                request, verify, cert)
+        context = get_ssl_context(verify)
+        pool_kwargs.pop('ca_certs', None)
+        pool_kwargs.pop('ca_cert_dir', None)
+        pool_kwargs['ssl_context'] = context
+        pool_kwargs['cert_reqs'] = _cert_reqs(context)
+        return host_params, pool_kwargs
+
+    def cert_verify(self, conn, url, verify, cert):
+        super(SSLContextAdapter, self).cert_verify(conn, url, verify, cert)
+        context = get_ssl_context(verify)
+        conn.ca_certs = None
+        conn.ca_cert_dir = None
+        conn.cert_reqs = _cert_reqs(context)
+        conn.conn_kw['ssl_context'] = context
+
+
+def get_session(verify):
+    """Returns the requests session of the process for a verification setting.
+
+    The session connects over https with the context returned by
+    get_ssl_context() for the same setting, and keeps the connections to
+    the iLOs alive between requests. It is shared by all the iLOs, so it
+    keeps no cookies.
+
+    :param verify: as for get_ssl_context().
+    :returns: a requests.Session object.
+    """
+    key = _verify_key(verify)
+    with _lock:
+        session = _sessions.get(key)
+        if session is not None:
+            return session
+    context = get_ssl_context(verify)
+    with _lock:
+        session = _sessions.get(key)
+        if session is None:
+            session = requests.Session()
+            session.verify = verify if key else False
+            session.cookies.set_policy(
+                cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            session.mount('https://', SSLContextAdapter(
+                context, pool_connections=POOL_CONNECTIONS))
+            _sessions[key] = session
+        return session
@@ -15,7 +15,9 @@
 """
 Non-iLO related utilities and helper functions.
 """
+from concurrent import futures
 import hashlib
+import itertools
 import os
 import re
 from urllib import parse
@@ -27,10 +29,20 @@ from six.moves import http_client
 from proliantutils import exception
 from proliantutils.ilo import firmware_controller
 from proliantutils import log
+from proliantutils import tls
 
 
 LOG = log.get_logger(__name__)
 
+# Size of the reads when hashing a file. Large reads keep the hashing of
+# multi-GB images at disk speed rather than bound by the number of reads.
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Hash algorithm of a hex digest, by length of the digest.
+_HASH_ALGORITHM_BY_DIGEST_LENGTH = {
+    32: 'md5', 40: 'sha1', 56: 'sha224', 64: 'sha256', 96: 'sha384',
+    128: 'sha512'}
+
 
 def process_firmware_image(compact_firmware_file, ilo_object):
     """Processes the firmware file.
@@ -92,6 +104,48 @@ def _get_hash_object(hash_algo_name):
     return getattr(hashlib, hash_algo_name)()
 
 
+def _update_checksums(file_like_object, checksums):
+    """Feeds the contents of a file to hash objects."""
+    if not hasattr(file_like_object, 'readinto'):
+        for chunk in iter(lambda: file_like_object.read(HASH_CHUNK_SIZE),
+                          b''):
+            for checksum in checksums:
+                checksum.update(chunk)
+        return
+
+    # Note: the next chunk gets read, into one of two reused buffers, while
+    # the previous one is hashed. Reads and hashlib release the GIL, so the
+    # reads and the hashing with every algorithm run in parallel.
+    buffers = [bytearray(HASH_CHUNK_SIZE), bytearray(HASH_CHUNK_SIZE)]
+    pending = []
+    with futures.ThreadPoolExecutor(max_workers=len(checksums)) as executor:
+        for index in itertools.cycle((0, 1)):
+            view = memoryview(buffers[index])
+            size = file_like_object.readinto(view)
+            for future in pending:
+                future.result()
+            if not size:
+                break
+            pending = [executor.submit(checksum.update, view[:size])
+                       for checksum in checksums]
+
+
+def hash_file_digests(file_like_object, hash_algos):
+    """Generate several hashes of the contents of a file in one pass.
+
+    :param file_like_object: file like object whose hashes to be calculated.
+    :param hash_algos: names of the hashing strategies.
+    :raises: InvalidInputError, on unsupported or invalid input.
+    :returns: a dictionary of hashing strategy name to the condensed digest
+              of the bytes of contents, as hexadecimal digits.
+    """
+    checksums = {hash_algo: _get_hash_object(hash_algo)
+                 for hash_algo in hash_algos}
+    _update_checksums(file_like_object, list(checksums.values()))
+    return {hash_algo: checksum.hexdigest()
+            for hash_algo, checksum in checksums.items()}
+
+
 def hash_file(file_like_object, hash_algo='md5'):
     """Generate a hash for the contents of a file.
 
@@ -103,38 +157,49 @@ def hash_file(file_like_object, hash_algo='md5'):
     :raises: InvalidInputError, on unsupported or invalid input.
     :returns: a condensed digest of the bytes of contents.
     """
-    checksum = _get_hash_object(hash_algo)
-    for chunk in iter(lambda: file_like_object.read(32768), b''):
-        checksum.update(chunk)
-    return checksum.hexdigest()
+    return hash_file_digests(file_like_object, [hash_algo])[hash_algo]
 
 
 def verify_image_checksum(image_location, expected_checksum):
-    """Verifies checksum (md5) of image file against the expected one.
+    """Verifies checksum of image file against the expected one.
 
     This method generates the checksum of the image file on the fly and
-    verifies it against the expected checksum provided as argument.
+    verifies it against the expected checksum provided as argument. The
+    hashing algorithm is the one matching the length of the checksum: md5,
+    sha1, sha224, sha256, sha384 or sha512, md5 for any other length.
 
     :param image_location: location of image file whose checksum is verified.
-    :param expected_checksum: checksum to be checked against
+    :param expected_checksum: checksum to be checked against, or a
+        dictionary of hashing algorithm name to checksum to check several
+        checksums in one read of the image.
     :raises: ImageRefValidationFailed, if invalid file path or
              verification fails.
+    :raises: InvalidInputError, on unsupported hashing algorithm.
     """
+    if isinstance(expected_checksum, dict):
+        expected_checksums = expected_checksum
+    else:
+        hash_algo = _HASH_ALGORITHM_BY_DIGEST_LENGTH.get(
+            len(expected_checksum), 'md5')
+        expected_checksums = {hash_algo: expected_checksum}
+
     try:
         with open(image_location, 'rb') as fd:
-            actual_checksum = hash_file(fd)
+            actual_checksums = hash_file_digests(fd, list(expected_checksums))
     except IOError as e:
         raise exception.ImageRefValidationFailed(image_href=image_location,
                                                  reason=e)
 
-    if actual_checksum != expected_checksum:
-        msg = ('Error verifying image checksum. Image %(image)s failed to '
-               'verify against checksum %(checksum)s. Actual checksum is: '
-               '%(actual_checksum)s' %
-               {'image': image_location, 'checksum': expected_checksum,
-                'actual_checksum': actual_checksum})
-        raise exception.ImageRefValidationFailed(image_href=image_location,
-                                                 reason=msg)
+    for hash_algo, checksum in sorted(expected_checksums.items()):
+        actual_checksum = actual_checksums[hash_algo]
+        if actual_checksum != checksum.lower():
+            msg = ('Error verifying image checksum. Image %(image)s failed to '
+                   'verify against checksum %(checksum)s. Actual checksum '
+                   'is: %(actual_checksum)s' %
+                   {'image': image_location, 'checksum': checksum,
+                    'actual_checksum': actual_checksum})
+            raise exception.ImageRefValidationFailed(image_href=image_location,
+                                                     reason=msg)
 
 
 def validate_href(image_href):
@@ -146,7 +211,7 @@ def validate_href(image_href):
     :returns: Response to HEAD request.
     """
     try:
-        response = requests.head(image_href)
+        response = tls.get_session(True).head(image_href)
         if response.status_code != http_client.OK:
             raise exception.ImageRefValidationFailed(
                 image_href=image_href,
@@ -175,3 +240,20 @@ def apply_bios_properties_filter(settings, filter_to_be_applied):
         return settings
 
     return {k: settings[k] for k in filter_to_be_applied if k in settings}
+
+
+def get_changed_bios_settings(settings, current, pending=None):
+    """Returns the BIOS settings which differ from what is already set.
+
+    A setting needs to be applied unless the value the BIOS will use after
+    the next reboot is already the requested one, that is its pending
+    value or, when it has none, its current value.
+
+    :param settings: dict of BIOS settings to be applied.
+    :param current: dict of current BIOS settings.
+    :param pending: dict of pending BIOS settings, if any.
+    :returns: A dictionary of the BIOS settings to be applied.
+    """
+    pending = pending or {}
+    return {k: v for k, v in settings.items()
+            if pending.get(k, current.get(k)) != v}